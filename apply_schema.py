@@ -35,6 +35,7 @@ try:
             id VARCHAR(50) PRIMARY KEY DEFAULT (UUID()),
             sender_id VARCHAR(50) NOT NULL,
             recipient_id VARCHAR(50) NOT NULL,
+            seq BIGINT NOT NULL AUTO_INCREMENT,  -- send order, used by the read watermark
             message_text LONGTEXT NOT NULL,
             attachment_url VARCHAR(500) NULL,
             attachment_type ENUM('image', 'file', 'video') NULL,
@@ -45,8 +46,11 @@ try:
             FOREIGN KEY (recipient_id) REFERENCES users(id) ON DELETE CASCADE,
             INDEX idx_sender_id (sender_id),
             INDEX idx_recipient_id (recipient_id),
+            UNIQUE KEY uq_messages_seq (seq),
             INDEX idx_conversation (sender_id, recipient_id),
-            INDEX idx_sent_at (sent_at)
+            INDEX idx_conversation_seq (sender_id, recipient_id, seq),
+            INDEX idx_sent_at (sent_at),
+            FULLTEXT ft_messages_text (message_text)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """,
         
@@ -60,6 +64,10 @@ try:
             last_message_at TIMESTAMP NULL,
             unread_count_1 INT DEFAULT 0,
             unread_count_2 INT DEFAULT 0,
+            last_read_seq_1 BIGINT NOT NULL DEFAULT 0,  -- watermark: last message seq read by user_id_1
+            last_read_seq_2 BIGINT NOT NULL DEFAULT 0,
+            last_read_at_1 TIMESTAMP NULL,
+            last_read_at_2 TIMESTAMP NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id_1) REFERENCES users(id) ON DELETE CASCADE,
@@ -24,6 +24,7 @@ app = Celery(
         'tasks.ai_tasks',
         'tasks.notification_tasks',
         'tasks.engagement_tasks',  # Phase 10.8: Enhanced engagement scoring
+        'tasks.analytics_tasks',
     ]
 )
 
@@ -35,6 +36,7 @@ app.conf.update(
         'tasks.ai_tasks.*': {'queue': 'ai_processing'},
         'tasks.notification_tasks.*': {'queue': 'default'},
         'tasks.engagement_tasks.*': {'queue': 'ai_processing'},  # Phase 10.8
+        'tasks.analytics_tasks.*': {'queue': 'default'},
     },
     
     # Serialization
@@ -95,6 +97,17 @@ app.conf.update(
             'task': 'tasks.notification_tasks.send_event_reminders',
             'schedule': crontab(hour='*/6'),  # Every 6 hours
         },
+        # Apply changed rows to the analytics rollups
+        'refresh-analytics-rollups': {
+            'task': 'tasks.analytics_tasks.refresh_analytics_rollups',
+            'schedule': crontab(minute=f"*/{os.getenv('ANALYTICS_ROLLUP_REFRESH_MINUTES', '5')}"),
+        },
+        # Full rebuild of the analytics rollups daily at 1 AM (picks up deleted rows)
+        'rebuild-analytics-rollups': {
+            'task': 'tasks.analytics_tasks.refresh_analytics_rollups',
+            'schedule': crontab(hour=1, minute=0),
+            'kwargs': {'full': True},
+        },
     },
 )
 
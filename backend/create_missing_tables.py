@@ -63,7 +63,8 @@ async def create_tables():
                         INDEX idx_is_verified (is_verified),
                         INDEX idx_industry (industry),
                         INDEX idx_willing_to_mentor (willing_to_mentor),
-                        FULLTEXT idx_name_bio (name, bio, headline)
+                        FULLTEXT idx_name_bio (name, bio, headline),
+                        FULLTEXT ft_alumni_profiles_name (name)
                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
                 """)
                 await conn.commit()
@@ -1,8 +1,11 @@
 """Database connection management"""
 import aiomysql
 import pymysql
+import asyncio
 import os
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
@@ -12,29 +15,194 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 
 logger = logging.getLogger(__name__)
 
-db_pool: Optional[aiomysql.Pool] = None
+db_pool: Optional["ManagedPool"] = None
 USE_MOCK_DB = os.environ.get('USE_MOCK_DB', 'false').lower() == 'true'
 _db_connection_attempted = False
 _auto_mock_mode = False
+_health_task: Optional[asyncio.Task] = None
+_fanout_semaphore: Optional[asyncio.Semaphore] = None
+_fanout_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
-async def get_db_pool() -> Optional[aiomysql.Pool]:
+class PoolConfig:
+    """Connection pool settings (overridable through environment variables)"""
+
+    MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+    MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+    # Connections older than this are closed and replaced on checkout
+    RECYCLE_SECONDS = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    # Connections idle longer than this are pinged (with reconnect) on checkout
+    PING_IDLE_SECONDS = int(os.environ.get('DB_POOL_PING_IDLE_SECONDS', 60))
+    # Background health check interval
+    HEALTH_CHECK_INTERVAL = int(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+    ACQUIRE_RETRIES = int(os.environ.get('DB_POOL_ACQUIRE_RETRIES', 2))
+    # Process-wide cap on connections held by gather_queries() fan-outs
+    FANOUT_LIMIT = int(os.environ.get('DB_POOL_FANOUT_LIMIT', 3))
+    CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+
+
+class _ManagedAcquire:
+    """Awaitable / async context manager returned by ``ManagedPool.acquire``"""
+
+    def __init__(self, pool: "ManagedPool"):
+        self._pool = pool
+        self._conn = None
+
+    def __await__(self):
+        return self._pool._acquire().__await__()
+
+    async def __aenter__(self):
+        self._conn = await self._pool._acquire()
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        conn, self._conn = self._conn, None
+        if exc_type is not None and isinstance(exc, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+            # Broken connection: drop it rather than returning it to the pool
+            conn.close()
+        await self._pool._release(conn)
+
+
+class ManagedPool:
+    """
+    Thin wrapper around ``aiomysql.Pool`` that tracks acquire-wait time and
+    usage, and validates connections without a per-request probe: only
+    connections that sat idle longer than ``PING_IDLE_SECONDS`` are pinged
+    on checkout, and failed checkouts are retried on a fresh connection.
+    Attributes not defined here are delegated to the underlying pool.
+    """
+
+    def __init__(self, pool: aiomysql.Pool):
+        self._pool = pool
+        self.acquire_count = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.acquire_retries = 0
+        self.idle_pings = 0
+        self.health_check_failures = 0
+        self.last_health_check: Optional[float] = None
+        self.healthy = True
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    def acquire(self) -> _ManagedAcquire:
+        return _ManagedAcquire(self)
+
+    async def _acquire(self):
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                conn = await self._pool.acquire()
+            except (pymysql.err.OperationalError, OSError) as e:
+                if attempt >= PoolConfig.ACQUIRE_RETRIES:
+                    raise
+                attempt += 1
+                self.acquire_retries += 1
+                logger.warning(f"⚠️ Connection acquire failed ({e}), retrying ({attempt}/{PoolConfig.ACQUIRE_RETRIES})")
+                await asyncio.sleep(0.1 * attempt)
+                continue
+
+            waited = time.perf_counter() - started
+            self.acquire_count += 1
+            self.acquire_wait_total += waited
+            self.acquire_wait_max = max(self.acquire_wait_max, waited)
+
+            # Only connections that sat idle may have been dropped by the server
+            if conn.last_usage and asyncio.get_running_loop().time() - conn.last_usage > PoolConfig.PING_IDLE_SECONDS:
+                self.idle_pings += 1
+                try:
+                    await conn.ping(reconnect=True)
+                except Exception as e:
+                    conn.close()
+                    self._pool.release(conn)
+                    if attempt >= PoolConfig.ACQUIRE_RETRIES:
+                        raise
+                    attempt += 1
+                    self.acquire_retries += 1
+                    logger.warning(f"⚠️ Stale connection dropped ({e}), retrying")
+                    continue
+
+            return conn
+
+    def release(self, conn):
+        return asyncio.ensure_future(self._release(conn))
+
+    async def _release(self, conn):
+        """
+        Return a connection to the pool, ending its transaction first
+
+        With autocommit off even a plain SELECT opens a transaction, and
+        aiomysql closes connections released mid-transaction instead of
+        reusing them.
+        """
+        if not conn.closed and conn.get_transaction_status():
+            try:
+                await conn.rollback()
+            except Exception as e:
+                logger.warning(f"⚠️ Rollback on release failed ({e}), dropping connection")
+                conn.close()
+        await self._pool.release(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool usage and acquire-latency statistics"""
+        size = self._pool.size
+        free = self._pool.freesize
+        return {
+            'minsize': self._pool.minsize,
+            'maxsize': self._pool.maxsize,
+            'size': size,
+            'free': free,
+            'in_use': size - free,
+            'acquire_count': self.acquire_count,
+            'acquire_wait_avg_ms': round(self.acquire_wait_total / self.acquire_count * 1000, 3) if self.acquire_count else 0.0,
+            'acquire_wait_max_ms': round(self.acquire_wait_max * 1000, 3),
+            'acquire_retries': self.acquire_retries,
+            'idle_pings': self.idle_pings,
+            'healthy': self.healthy,
+            'health_check_failures': self.health_check_failures,
+            'last_health_check': self.last_health_check,
+        }
+
+
+async def _health_monitor(pool: ManagedPool):
+    """Background pinger: checks one pooled connection per interval"""
+    while True:
+        await asyncio.sleep(PoolConfig.HEALTH_CHECK_INTERVAL)
+        try:
+            async with pool.acquire() as conn:
+                await conn.ping(reconnect=True)
+            if not pool.healthy:
+                logger.info("✅ Database connection restored")
+            pool.healthy = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            pool.health_check_failures += 1
+            if pool.healthy:
+                logger.warning(f"⚠️ Database health check failed: {str(e)}")
+            pool.healthy = False
+        pool.last_health_check = time.time()
+
+
+async def get_db_pool() -> Optional[ManagedPool]:
     """Get or create database connection pool with automatic fallback to mock mode"""
-    global db_pool, USE_MOCK_DB, _db_connection_attempted, _auto_mock_mode
-    
+    global db_pool, USE_MOCK_DB, _db_connection_attempted, _auto_mock_mode, _health_task
+
     # If explicitly set to mock mode in .env
     if USE_MOCK_DB and not _auto_mock_mode:
         logger.info("🔄 Using mock database mode (USE_MOCK_DB=true in .env)")
         return None
-    
+
     # If auto mock mode was triggered previously
     if _auto_mock_mode:
         return None
-        
+
     if db_pool is None and not _db_connection_attempted:
         _db_connection_attempted = True
         try:
-            db_pool = await aiomysql.create_pool(
+            pool = await aiomysql.create_pool(
                 host=os.environ.get('DB_HOST', 'localhost'),
                 port=int(os.environ.get('DB_PORT', 3306)),
                 user=os.environ.get('DB_USER', 'alumni_user'),
@@ -42,11 +210,17 @@ async def get_db_pool() -> Optional[aiomysql.Pool]:
                 db=os.environ.get('DB_NAME', 'AlumUnity'),
                 charset='utf8mb4',
                 autocommit=False,
-                minsize=1,
-                maxsize=10,
-                connect_timeout=10
+                minsize=PoolConfig.MIN_SIZE,
+                maxsize=PoolConfig.MAX_SIZE,
+                pool_recycle=PoolConfig.RECYCLE_SECONDS,
+                connect_timeout=PoolConfig.CONNECT_TIMEOUT
+            )
+            db_pool = ManagedPool(pool)
+            _health_task = asyncio.ensure_future(_health_monitor(db_pool))
+            logger.info(
+                f"✅ Database connection pool created successfully "
+                f"(min={PoolConfig.MIN_SIZE}, max={PoolConfig.MAX_SIZE})"
             )
-            logger.info("✅ Database connection pool created successfully")
             USE_MOCK_DB = False
             _auto_mock_mode = False
         except Exception as e:
@@ -56,48 +230,102 @@ async def get_db_pool() -> Optional[aiomysql.Pool]:
             _auto_mock_mode = True
             db_pool = None
             return None
-    
-    # Check if pool connection is still alive, reconnect if needed
-    if db_pool is not None:
-        try:
-            async with db_pool.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute("SELECT 1")
-                    await cursor.fetchone()
-        except Exception as e:
-            logger.warning(f"⚠️ Database connection lost: {str(e)}")
-            logger.info("🔄 Reconnecting to database...")
-            # Reset and try to reconnect
-            _db_connection_attempted = False
-            if db_pool:
-                try:
-                    db_pool.close()
-                    await db_pool.wait_closed()
-                except:
-                    pass
-            db_pool = None
-            return await get_db_pool()
-    
+
     return db_pool
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool statistics (empty in mock mode)"""
+    if db_pool is None:
+        return {'mode': 'mock' if USE_MOCK_DB else 'uninitialized'}
+    return db_pool.stats()
+
+
 async def close_db_pool():
     """Close database connection pool"""
-    global db_pool
+    global db_pool, _health_task, _db_connection_attempted
+    if _health_task:
+        _health_task.cancel()
+        _health_task = None
     if db_pool:
         db_pool.close()
         await db_pool.wait_closed()
         db_pool = None
+        _db_connection_attempted = False
         logger.info("Database connection pool closed")
 
 
+def discard_db_pool():
+    """
+    Forget the current pool without closing it
+
+    Used in forked worker processes: the pool inherited from the parent is
+    bound to the parent's event loop and sockets, so the child must build
+    its own instead of closing (or reusing) the parent's connections.
+    """
+    global db_pool, _health_task, _db_connection_attempted
+    db_pool = None
+    _health_task = None
+    _db_connection_attempted = False
+
+
+class DatabaseUnavailableError(RuntimeError):
+    """Raised when a query needs the database but the app runs in mock mode"""
+
+
+@asynccontextmanager
 async def get_db_connection():
     """Get database connection from pool (context manager) - FOR ASYNC USE ONLY"""
     pool = await get_db_pool()
+    if pool is None:
+        raise DatabaseUnavailableError("Database unavailable (mock mode)")
     async with pool.acquire() as conn:
         yield conn
 
 
+async def fetch_all(query: str, args=None) -> List[Dict[str, Any]]:
+    """
+    Run a read query on its own pooled connection and return dict rows
+
+    Independent queries can be issued concurrently with ``gather_queries``,
+    each on a separate connection.
+    """
+    async with get_db_connection() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, args)
+            return list(await cursor.fetchall())
+
+
+async def fetch_one(query: str, args=None) -> Optional[Dict[str, Any]]:
+    """Like ``fetch_all`` but returns the first row (or None)"""
+    async with get_db_connection() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, args)
+            return await cursor.fetchone()
+
+
+async def gather_queries(*queries):
+    """
+    ``asyncio.gather`` for independent ``fetch_all``/``fetch_one`` calls
+
+    At most ``PoolConfig.FANOUT_LIMIT`` of the queries run at once, counted
+    across all concurrent callers, so several dashboards loading together
+    cannot check out the whole pool and starve ordinary requests.
+    """
+    global _fanout_semaphore, _fanout_loop
+    loop = asyncio.get_running_loop()
+    if _fanout_semaphore is None or _fanout_loop is not loop:
+        _fanout_semaphore = asyncio.Semaphore(max(1, min(PoolConfig.FANOUT_LIMIT, PoolConfig.MAX_SIZE)))
+        _fanout_loop = loop
+    semaphore = _fanout_semaphore
+
+    async def limited(query):
+        async with semaphore:
+            return await query
+
+    return await asyncio.gather(*(limited(query) for query in queries))
+
+
 def get_sync_db_connection():
     """Get synchronous database connection - FOR SYNC ROUTES"""
     try:
@@ -200,6 +200,8 @@ class ProfileSearchParams(BaseModel):
     verified_only: bool = False
     page: int = Field(1, ge=1)
     limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None  # Opaque keyset cursor; takes precedence over page
+    include_total: bool = True
 
 
 class ProfileFilterOptions(BaseModel):
@@ -335,6 +337,8 @@ class JobSearchParams(BaseModel):
     search: Optional[str] = None
     page: int = Field(1, ge=1)
     limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None  # Opaque keyset cursor; takes precedence over page
+    include_total: bool = True
 
 
 class JobApplicationCreate(BaseModel):
@@ -851,6 +855,8 @@ class ForumPostWithAuthor(BaseModel):
     created_at: datetime
     updated_at: datetime
     user_has_liked: bool = False
+    relevance: Optional[float] = None  # search score when sorted by relevance
+    highlights: Optional[dict] = None  # {field: snippet} for search results
 
 
 class ForumCommentCreate(BaseModel):
@@ -8,7 +8,7 @@ from functools import wraps
 from database.connection import get_db_pool, USE_MOCK_DB
 from database.models import UserRole, UserInDB
 from utils.security import decode_access_token
-from services.user_service import UserService
+from services.user_service import UserService, user_status_cache
 
 security = HTTPBearer()
 
@@ -17,8 +17,16 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """Dependency to get current authenticated user from JWT token"""
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials)
+
+
+async def authenticate_token(token: str) -> dict:
+    """
+    Validate a JWT and return the active user it belongs to
     
+    Shared by the bearer dependency and transports that cannot send an
+    Authorization header (EventSource, WebSocket query parameter).
+    """
     # Decode token
     payload = decode_access_token(token)
     if payload is None:
@@ -46,7 +54,7 @@ async def get_current_user(
             "is_verified": payload.get("is_verified", True)
         }
     
-    # Verify user exists and is active in database
+    # Verify user exists and is active (cached status, database on a miss)
     pool = await get_db_pool()
     
     if pool is None:
@@ -54,28 +62,30 @@ async def get_current_user(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database service unavailable for authentication"
         )
-        
-    async with pool.acquire() as conn:
-        user = await UserService.get_user_by_id(conn, user_id)
-        
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is deactivated"
-            )
+    
+    user = await user_status_cache.get(user_id)
+    if user is None:
+        async with pool.acquire() as conn:
+            user = await UserService.load_auth_status(conn, user_id)
+    
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not user["is_active"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is deactivated"
+        )
     
     return {
-        "id": user.id,
-        "email": user.email,
-        "role": user.role,
-        "is_verified": user.is_verified
+        "id": user["id"],
+        "email": user["email"],
+        "role": user["role"],
+        "is_verified": user["is_verified"]
     }
 
 
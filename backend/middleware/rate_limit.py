@@ -1,71 +1,225 @@
-"""Rate limiting middleware"""
+"""Rate limiting middleware
+
+Limits are enforced by a pluggable backend:
+
+- ``RedisSlidingWindowBackend``: sliding-window log kept in a Redis sorted
+  set and updated by one atomic Lua script, so limits hold across every
+  uvicorn worker.
+- ``InMemoryWindowBackend``: per-process fallback using fixed-size
+  sliding-window counters in sharded dicts. Nothing awaits between read and
+  write, so no lock is needed on the event loop.
+
+``RateLimiter`` uses Redis when it is reachable and falls back to the
+in-memory backend otherwise.
+"""
 from fastapi import Request, HTTPException, status
-from typing import Dict, Tuple
-from datetime import datetime, timedelta
-import asyncio
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
 import logging
+import math
+import time
+import uuid
+import zlib
+
+from redis_client import get_redis_client, RedisConfig
+from utils.security import decode_access_token
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter:
-    """Simple in-memory rate limiter
-    In production, use Redis for distributed rate limiting
+class RateLimitBackend:
+    """Interface for rate limit storage backends"""
+
+    name = "base"
+
+    async def hit(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: int
+    ) -> Tuple[bool, int, int]:
+        """Record a request for ``key``
+        Returns: (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        raise NotImplementedError
+
+
+class RedisSlidingWindowBackend(RateLimitBackend):
+    """Distributed sliding-window log backed by a Redis sorted set"""
+
+    name = "redis"
+
+    # KEYS[1] = bucket key
+    # ARGV = now_ms, window_ms, max_requests, member
+    # Returns {allowed, count, retry_after_ms}
+    SLIDING_WINDOW_SCRIPT = """
+    local key = KEYS[1]
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local limit = tonumber(ARGV[3])
+
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    local count = redis.call('ZCARD', key)
+
+    if count >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local retry = window
+        if oldest[2] then
+            retry = tonumber(oldest[2]) + window - now
+        end
+        return {0, count, retry}
+    end
+
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, count + 1, 0}
     """
-    
+
     def __init__(self):
-        # Store: {identifier: [(timestamp, count)]}
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = asyncio.Lock()
-    
+        self._script = None
+
+    async def hit(self, key, max_requests, window_seconds):
+        client = await get_redis_client()
+        if self._script is None:
+            self._script = client.register_script(self.SLIDING_WINDOW_SCRIPT)
+
+        now_ms = int(time.time() * 1000)
+        # Unique member per request so concurrent hits in the same ms all count
+        member = f"{now_ms}:{uuid.uuid4().hex}"
+
+        allowed, count, retry_after_ms = await self._script(
+            keys=[f"{RedisConfig.PREFIX_RATE_LIMIT}:{key}"],
+            args=[now_ms, window_seconds * 1000, max_requests, member],
+            client=client
+        )
+
+        if not allowed:
+            return False, 0, max(math.ceil(int(retry_after_ms) / 1000), 1)
+        return True, max(max_requests - int(count), 0), 0
+
+
+class InMemoryWindowBackend(RateLimitBackend):
+    """Per-process sliding-window counter with sharded storage
+
+    Each key holds the current fixed window index, its count, the previous
+    window's count and a last-seen timestamp for cleanup. The previous count is weighted by how
+    much of it still overlaps the sliding window, which approximates a
+    sliding log in O(1) memory per key.
+    """
+
+    name = "memory"
+
+    def __init__(self, shards: int = 64):
+        self.shards = shards
+        self._buckets = [dict() for _ in range(shards)]
+
+    def _shard(self, key: str) -> dict:
+        return self._buckets[zlib.crc32(key.encode()) % self.shards]
+
+    async def hit(self, key, max_requests, window_seconds):
+        now = time.time()
+        window_index = int(now // window_seconds)
+        elapsed_fraction = (now % window_seconds) / window_seconds
+
+        # bucket = [window_index, current_count, previous_count, last_seen]
+        shard = self._shard(key)
+        bucket = shard.get(key)
+        if bucket is None or bucket[0] < window_index - 1:
+            bucket = [window_index, 0, 0, now]
+        elif bucket[0] == window_index - 1:
+            bucket = [window_index, 0, bucket[1], now]
+        bucket[3] = now
+        shard[key] = bucket
+
+        estimated = bucket[2] * (1 - elapsed_fraction) + bucket[1]
+        if estimated >= max_requests:
+            retry_after = math.ceil(window_seconds * (1 - elapsed_fraction))
+            return False, 0, max(retry_after, 1)
+
+        bucket[1] += 1
+        remaining = max(int(max_requests - estimated - 1), 0)
+        return True, remaining, 0
+
+    def cleanup(self, max_age_seconds: int) -> int:
+        """Drop buckets not touched for ``max_age_seconds``"""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for shard in self._buckets:
+            stale = [key for key, bucket in shard.items() if bucket[3] < cutoff]
+            for key in stale:
+                del shard[key]
+            removed += len(stale)
+        return removed
+
+    def size(self) -> int:
+        return sum(len(shard) for shard in self._buckets)
+
+
+class RateLimiter:
+    """Rate limiter with a distributed Redis backend and in-memory fallback"""
+
+    def __init__(
+        self,
+        backend: Optional[RateLimitBackend] = None,
+        fallback: Optional[RateLimitBackend] = None,
+        redis_retry_seconds: int = 30
+    ):
+        self.backend = backend or RedisSlidingWindowBackend()
+        self.fallback = fallback or InMemoryWindowBackend()
+        self.redis_retry_seconds = redis_retry_seconds
+        self._backend_down_until = 0.0
+        self.metrics: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'allowed': 0, 'blocked': 0}
+        )
+        self.backend_errors = 0
+        self.fallback_hits = 0
+
     async def check_rate_limit(
         self,
         identifier: str,
         max_requests: int,
-        window_seconds: int
+        window_seconds: int,
+        scope: str = "global"
     ) -> Tuple[bool, int, int]:
         """Check if request is within rate limit
         Returns: (is_allowed, remaining_requests, retry_after_seconds)
         """
-        async with self.lock:
-            now = datetime.utcnow()
-            window_start = now - timedelta(seconds=window_seconds)
-            
-            # Clean old requests
-            self.requests[identifier] = [
-                req_time for req_time in self.requests[identifier]
-                if req_time > window_start
-            ]
-            
-            current_count = len(self.requests[identifier])
-            
-            if current_count >= max_requests:
-                # Calculate retry after
-                oldest_request = min(self.requests[identifier])
-                retry_after = int((oldest_request + timedelta(seconds=window_seconds) - now).total_seconds())
-                return False, 0, max(retry_after, 1)
-            
-            # Add current request
-            self.requests[identifier].append(now)
-            remaining = max_requests - current_count - 1
-            
-            return True, remaining, 0
-    
+        key = f"{scope}:{identifier}"
+        result = None
+
+        if time.monotonic() >= self._backend_down_until:
+            try:
+                result = await self.backend.hit(key, max_requests, window_seconds)
+            except Exception as e:
+                # Skip the primary backend for a while instead of paying a
+                # failed round trip on every request
+                self.backend_errors += 1
+                self._backend_down_until = time.monotonic() + self.redis_retry_seconds
+                logger.warning(f"Rate limit backend '{self.backend.name}' unavailable, using in-memory fallback: {e}")
+
+        if result is None:
+            self.fallback_hits += 1
+            result = await self.fallback.hit(key, max_requests, window_seconds)
+
+        self.metrics[scope]['allowed' if result[0] else 'blocked'] += 1
+        return result
+
+    def get_metrics(self) -> Dict:
+        """Return allow/block counters per scope and backend health"""
+        return {
+            'backend': self.backend.name,
+            'backend_available': time.monotonic() >= self._backend_down_until,
+            'backend_errors': self.backend_errors,
+            'fallback_hits': self.fallback_hits,
+            'fallback_keys': self.fallback.size() if isinstance(self.fallback, InMemoryWindowBackend) else None,
+            'scopes': {scope: dict(counts) for scope, counts in self.metrics.items()}
+        }
+
     async def cleanup_old_entries(self, max_age_hours: int = 24):
-        """Periodic cleanup of old entries"""
-        async with self.lock:
-            cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
-            identifiers_to_remove = []
-            
-            for identifier, requests in self.requests.items():
-                if not requests or max(requests) < cutoff:
-                    identifiers_to_remove.append(identifier)
-            
-            for identifier in identifiers_to_remove:
-                del self.requests[identifier]
-            
-            logger.info(f"Cleaned up {len(identifiers_to_remove)} old rate limit entries")
+        """Periodic cleanup of old in-memory entries"""
+        if isinstance(self.fallback, InMemoryWindowBackend):
+            removed = self.fallback.cleanup(max_age_hours * 3600)
+            logger.info(f"Cleaned up {removed} old rate limit entries")
 
 
 # Global rate limiter instance
@@ -75,25 +229,47 @@ rate_limiter = RateLimiter()
 def get_client_identifier(request: Request) -> str:
     """Get client identifier for rate limiting"""
     # Use IP address as identifier
-    # In production, consider using user ID for authenticated requests
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        return forwarded.split(",")[0]
+        return forwarded.split(",")[0].strip()
     return request.client.host if request.client else "unknown"
 
 
+def get_user_identifier(request: Request) -> str:
+    """Use the JWT subject for authenticated requests, falling back to IP"""
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.lower().startswith("bearer "):
+        payload = decode_access_token(auth_header[7:])
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_client_identifier(request)}"
+
+
 async def rate_limit_dependency(
     request: Request,
     max_requests: int = 100,
-    window_seconds: int = 60
+    window_seconds: int = 60,
+    key_by: str = "ip",
+    per_route: bool = False,
+    scope: str = "global"
 ):
-    """FastAPI dependency for rate limiting"""
-    identifier = get_client_identifier(request)
-    
+    """FastAPI dependency for rate limiting
+
+    Args:
+        key_by: "ip" to limit per client address, "user" to limit per JWT subject
+        per_route: keep a separate budget for each route path
+        scope: name used for the bucket key and metrics
+    """
+    identifier = get_user_identifier(request) if key_by == "user" else get_client_identifier(request)
+    if per_route:
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        identifier = f"{request.method}:{path}:{identifier}"
+
     is_allowed, remaining, retry_after = await rate_limiter.check_rate_limit(
-        identifier, max_requests, window_seconds
+        identifier, max_requests, window_seconds, scope=scope
     )
-    
+
     if not is_allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -107,17 +283,37 @@ async def rate_limit_dependency(
         )
 
 
+def rate_limit(
+    max_requests: int,
+    window_seconds: int = 60,
+    key_by: str = "ip",
+    per_route: bool = True,
+    scope: Optional[str] = None
+):
+    """Build a rate limit dependency, e.g. ``Depends(rate_limit(10, key_by="user"))``"""
+    async def dependency(request: Request):
+        return await rate_limit_dependency(
+            request,
+            max_requests=max_requests,
+            window_seconds=window_seconds,
+            key_by=key_by,
+            per_route=per_route,
+            scope=scope or f"{key_by}:{max_requests}/{window_seconds}s"
+        )
+    return dependency
+
+
 # Rate limit presets for different endpoint types
 async def strict_rate_limit(request: Request):
     """Strict rate limit for sensitive endpoints (auth)"""
-    return await rate_limit_dependency(request, max_requests=5, window_seconds=60)
+    return await rate_limit_dependency(request, max_requests=5, window_seconds=60, scope="strict")
 
 
 async def moderate_rate_limit(request: Request):
     """Moderate rate limit for regular endpoints"""
-    return await rate_limit_dependency(request, max_requests=30, window_seconds=60)
+    return await rate_limit_dependency(request, max_requests=30, window_seconds=60, scope="moderate")
 
 
 async def relaxed_rate_limit(request: Request):
     """Relaxed rate limit for read-only endpoints"""
-    return await rate_limit_dependency(request, max_requests=100, window_seconds=60)
+    return await rate_limit_dependency(request, max_requests=100, window_seconds=60, scope="relaxed")
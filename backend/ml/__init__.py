@@ -3,7 +3,7 @@ Machine Learning Module for AlumUnity
 Career path prediction and AI-powered features
 """
 from .career_model_trainer import CareerModelTrainer, train_model_from_cli
-from .model_loader import CareerModelLoader, get_model_loader, reload_model
+from .model_loader import CareerModelLoader, PredictionBatcher, get_model_loader, get_prediction_batcher, reload_model
 from .llm_advisor import CareerLLMAdvisor, get_llm_advisor
 
 __all__ = [
@@ -12,6 +12,8 @@ __all__ = [
     'CareerModelLoader',
     'get_model_loader',
     'reload_model',
+    'PredictionBatcher',
+    'get_prediction_batcher',
     'CareerLLMAdvisor',
     'get_llm_advisor'
 ]
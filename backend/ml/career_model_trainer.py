@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from collections import Counter
 
+from utils.route_cache import invalidate_tags
+
 # sklearn imports moved to lazy loading in methods
 # from sklearn.ensemble import RandomForestClassifier
 # from sklearn.preprocessing import LabelEncoder, MultiLabelBinarizer
@@ -494,6 +496,7 @@ class CareerModelTrainer:
                     inserted += 1
                 
                 await db_conn.commit()
+                await invalidate_tags("career_paths")
             
             logger.info(f"Transition matrix updated: {inserted} transitions")
             
@@ -2,16 +2,33 @@
 ML Model Loader Utility
 Loads trained models and encoders for inference
 """
+import asyncio
 import logging
 import joblib
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Sequence, Tuple
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Micro-batching of concurrent predictions (see PredictionBatcher)
+PREDICTION_BATCH_WINDOW_MS = float(os.getenv('ML_PREDICTION_BATCH_WINDOW_MS', 5))
+PREDICTION_MAX_BATCH_SIZE = int(os.getenv('ML_PREDICTION_MAX_BATCH_SIZE', 64))
+PREDICTION_THREADS = int(os.getenv('ML_PREDICTION_THREADS', 2))
+
+TOP_PREDICTIONS = 5
+MIN_PROBABILITY = 0.05
+
+
+def _number(value, default: float) -> float:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
 # Get the directory where this file is located
 _current_dir = Path(__file__).parent.resolve()
 _default_model_dir = _current_dir / "models"
@@ -30,6 +47,9 @@ class CareerModelLoader:
         self.model = None
         self.encoders = None
         self.feature_names = []
+        self._role_index: Dict[str, int] = {}
+        self._industry_index: Dict[str, int] = {}
+        self._skill_index: Dict[str, int] = {}
         
         logger.info(f"CareerModelLoader initialized with model_dir: {self.model_dir}")
     
@@ -61,11 +81,18 @@ class CareerModelLoader:
                 logger.error(f"Encoder file not found: {encoder_file}")
                 return False
             
-            # Load model and encoders
+            # Load model and encoders. Every process holds its own copy of the
+            # model: sklearn trees copy their node arrays into owned buffers
+            # when unpickled, so joblib's mmap_mode would not share them
             self.model = joblib.load(latest_model)
             self.encoders = joblib.load(encoder_file)
             self.feature_names = self.encoders.get('feature_names', [])
             
+            # LabelEncoder / MultiLabelBinarizer codes are positions in classes_
+            self._role_index = {label: i for i, label in enumerate(self.encoders['role_encoder'].classes_)}
+            self._industry_index = {label: i for i, label in enumerate(self.encoders['industry_encoder'].classes_)}
+            self._skill_index = {label: i for i, label in enumerate(self.encoders['skill_encoder'].classes_)}
+            
             logger.info(f"Loaded model: {latest_model}")
             logger.info(f"Loaded encoders: {encoder_file}")
             
@@ -75,90 +102,107 @@ class CareerModelLoader:
             logger.error(f"Error loading model: {str(e)}")
             return False
     
-    def predict(self, user_profile: Dict) -> Optional[List[Dict]]:
+    def encode_profiles(self, user_profiles: Sequence[Dict]) -> np.ndarray:
         """
-        Make prediction using loaded model
+        Encode profiles into one feature matrix
+        
+        Columns match training: role, years of experience, transition
+        duration, success rating, industry, then one column per known skill.
+        Unknown roles and industries encode as 0; unknown skills are ignored.
+        """
+        matrix = np.zeros((len(user_profiles), 5 + len(self._skill_index)), dtype=np.float32)
+        unknown_roles = unknown_industries = 0
+        
+        for row, user_profile in enumerate(user_profiles):
+            role_code = self._role_index.get(user_profile.get('current_role', 'Unknown'))
+            industry_code = self._industry_index.get(user_profile.get('industry', 'Unknown'))
+            unknown_roles += role_code is None
+            unknown_industries += industry_code is None
+            
+            # One malformed profile must not fail the whole batch
+            matrix[row, :5] = (
+                role_code or 0,
+                _number(user_profile.get('years_of_experience'), 0),
+                _number(user_profile.get('transition_duration'), 24),
+                _number(user_profile.get('success_rating'), 3),
+                industry_code or 0
+            )
+            skill_columns = [
+                5 + self._skill_index[skill]
+                for skill in user_profile.get('skills') or []
+                if skill in self._skill_index
+            ]
+            matrix[row, skill_columns] = 1
+        
+        if unknown_roles or unknown_industries:
+            logger.warning(
+                f"Unknown role in {unknown_roles} and unknown industry in "
+                f"{unknown_industries} of {len(user_profiles)} profiles, using defaults"
+            )
+        return matrix
+    
+    def predict_batch(self, user_profiles: Sequence[Dict]) -> Optional[List[List[Dict]]]:
+        """
+        Predict next roles for many profiles with one model call
         
         Args:
-            user_profile: Dict containing:
-                - current_role: str
-                - skills: List[str]
-                - years_of_experience: int
-                - industry: str
-                - transition_duration: int (optional)
-                - success_rating: int (optional)
+            user_profiles: Profiles in the format accepted by ``predict``
         
         Returns:
-            List of predicted roles with probabilities
+            One list of predicted roles per profile (same order), or None if
+            the model is not loaded or inference failed
         """
         if not self.model or not self.encoders:
             logger.warning("Model not loaded. Call load_latest_model() first")
             return None
+        if not user_profiles:
+            return []
         
         try:
-            # Extract encoders
-            role_encoder = self.encoders['role_encoder']
-            skill_encoder = self.encoders['skill_encoder']
-            industry_encoder = self.encoders['industry_encoder']
-            
-            # Prepare features
-            current_role = user_profile.get('current_role', 'Unknown')
-            skills = user_profile.get('skills', [])
-            years_exp = user_profile.get('years_of_experience', 0)
-            industry = user_profile.get('industry', 'Unknown')
-            duration = user_profile.get('transition_duration', 24)
-            success = user_profile.get('success_rating', 3)
-            
-            # Encode features
-            try:
-                role_encoded = role_encoder.transform([current_role])[0]
-            except ValueError:
-                logger.warning(f"Unknown role: {current_role}, using default")
-                role_encoded = 0
-            
-            try:
-                industry_encoded = industry_encoder.transform([industry])[0]
-            except ValueError:
-                logger.warning(f"Unknown industry: {industry}, using default")
-                industry_encoded = 0
-            
-            # Encode skills
-            skills_encoded = skill_encoder.transform([skills])[0]
-            
-            # Combine features
-            feature_vector = [
-                role_encoded,
-                years_exp,
-                duration,
-                success,
-                industry_encoded
-            ] + skills_encoded.tolist()
-            
-            # Make prediction
-            feature_array = np.array([feature_vector])
-            
-            # Get probabilities for all classes
-            probabilities = self.model.predict_proba(feature_array)[0]
+            probabilities = self.model.predict_proba(self.encode_profiles(user_profiles))
             classes = self.model.classes_
             
-            # Get top predictions
-            top_indices = probabilities.argsort()[-5:][::-1]
+            # Top predictions per row, highest first
+            top_indices = probabilities.argsort(axis=1)[:, :-(TOP_PREDICTIONS + 1):-1]
             
-            predictions = []
-            for idx in top_indices:
-                if probabilities[idx] > 0.05:  # Only include if probability > 5%
-                    predictions.append({
-                        "role": classes[idx],
-                        "probability": float(probabilities[idx]),
-                        "confidence": "high" if probabilities[idx] > 0.5 else "medium" if probabilities[idx] > 0.2 else "low"
-                    })
+            results = []
+            for row, indices in zip(probabilities, top_indices):
+                predictions = []
+                for idx in indices:
+                    probability = float(row[idx])
+                    if probability > MIN_PROBABILITY:
+                        predictions.append({
+                            "role": classes[idx],
+                            "probability": probability,
+                            "confidence": "high" if probability > 0.5 else "medium" if probability > 0.2 else "low"
+                        })
+                results.append(predictions)
             
-            return predictions
+            return results
         
         except Exception as e:
-            logger.error(f"Error making prediction: {str(e)}")
+            logger.error(f"Error making batch prediction: {str(e)}")
             return None
     
+    def predict(self, user_profile: Dict) -> Optional[List[Dict]]:
+        """
+        Make prediction using loaded model
+        
+        Args:
+            user_profile: Dict containing:
+                - current_role: str
+                - skills: List[str]
+                - years_of_experience: int
+                - industry: str
+                - transition_duration: int (optional)
+                - success_rating: int (optional)
+        
+        Returns:
+            List of predicted roles with probabilities
+        """
+        results = self.predict_batch([user_profile])
+        return results[0] if results is not None else None
+    
     def is_loaded(self) -> bool:
         """
         Check if model is loaded
@@ -206,3 +250,106 @@ def reload_model():
     global _model_loader
     _model_loader = CareerModelLoader()
     return _model_loader.load_latest_model()
+
+
+def _predict_with_current_model(user_profiles: List[Dict]) -> Optional[List[List[Dict]]]:
+    """Run a batch on the current model (loading it on first use)"""
+    loader = get_model_loader()
+    if not loader.is_loaded():
+        return None
+    return loader.predict_batch(user_profiles)
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent predictions into batched model calls
+    
+    Requests arriving within ``window_ms`` of each other (up to
+    ``max_batch_size``) are encoded into one matrix and scored with a single
+    ``predict_proba`` on a worker thread, so the event loop never runs the
+    model. The current global loader is used, so ``reload_model`` takes
+    effect on the next batch.
+    """
+    
+    def __init__(
+        self,
+        window_ms: float = PREDICTION_BATCH_WINDOW_MS,
+        max_batch_size: int = PREDICTION_MAX_BATCH_SIZE,
+        max_workers: int = PREDICTION_THREADS
+    ):
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="career-model")
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.predictions = 0
+    
+    async def predict(self, user_profile: Dict) -> Optional[List[Dict]]:
+        """
+        Predict for one profile as part of the next batch
+        
+        Returns:
+            List of predicted roles, or None if no model is available
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((user_profile, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+    
+    async def _run(self, batch: List[Tuple[Dict, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, _predict_with_current_model, [profile for profile, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.batches += 1
+        self.predictions += len(batch)
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(results[i] if results is not None else None)
+    
+    def stats(self) -> Dict:
+        """Batches run and average batch size"""
+        return {
+            "batches": self.batches,
+            "predictions": self.predictions,
+            "avg_batch_size": round(self.predictions / self.batches, 2) if self.batches else None,
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size
+        }
+
+
+_prediction_batcher = None
+
+
+def get_prediction_batcher() -> PredictionBatcher:
+    """
+    Get or create the global prediction batcher
+    """
+    global _prediction_batcher
+    
+    if _prediction_batcher is None:
+        _prediction_batcher = PredictionBatcher()
+    
+    return _prediction_batcher
@@ -0,0 +1,209 @@
+"""
+Skill Embedding Store
+Persists skill embeddings on disk so rebuilds only encode skills that have
+not been seen before
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Get the directory where this file is located
+_current_dir = Path(__file__).parent.resolve()
+_default_store_dir = _current_dir / "embeddings"
+
+
+class SkillEmbeddingStore:
+    """
+    Append-only on-disk embedding store keyed by skill name.
+
+    Vectors are kept L2-normalized in a raw float32 file that is opened
+    memory-mapped, with skill names one JSON string per line in the same
+    order. Adding skills appends to both files and then atomically rewrites
+    a small metadata file holding the committed row count, so the cost of a
+    write depends on the number of new skills only; anything past the
+    committed count (an interrupted append) is ignored and overwritten.
+
+    A FAISS ``IndexFlatIP`` over the rows is built in memory on load and
+    extended on every add. The store is reset automatically when the
+    embedding model or dimension changes.
+    """
+
+    VECTORS_FILE = "skill_vectors.f32"
+    SKILLS_FILE = "skill_vectors.skills"
+    META_FILE = "skill_vectors.json"
+
+    def __init__(self, model_name: str, dimension: int, store_dir: Optional[str] = None):
+        if store_dir is None:
+            store_dir = os.getenv('SKILL_EMBEDDINGS_DIR') or _default_store_dir
+        self.store_dir = Path(store_dir)
+        self.model_name = model_name
+        self.dimension = dimension
+
+        self.skills: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        self.index = None
+        # Byte length of the committed lines in SKILLS_FILE
+        self._skills_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self, faiss_module=None) -> bool:
+        """
+        Load vectors and metadata from disk and build the FAISS index
+
+        Returns:
+            bool: True if an existing store for the current model was loaded
+        """
+        meta_path = self.store_dir / self.META_FILE
+        vectors_path = self.store_dir / self.VECTORS_FILE
+        skills_path = self.store_dir / self.SKILLS_FILE
+
+        if not meta_path.exists():
+            logger.info(f"No skill embedding store found at {self.store_dir}")
+            self._reset(faiss_module)
+            return False
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+            if meta.get('model_name') != self.model_name or meta.get('dimension') != self.dimension:
+                logger.info("Embedding model changed, resetting skill embedding store")
+                self._reset(faiss_module)
+                return False
+
+            count = meta.get('count')
+            if count is None:
+                logger.info("Skill embedding store has an older format, resetting")
+                self._reset(faiss_module)
+                return False
+
+            skills, skills_bytes = [], 0
+            if count:
+                with open(skills_path, 'rb') as f:
+                    for line in f:
+                        if len(skills) == count:
+                            break
+                        skills.append(json.loads(line))
+                        skills_bytes += len(line)
+            row_bytes = self.dimension * np.dtype(np.float32).itemsize
+            if len(skills) != count or (count and vectors_path.stat().st_size < count * row_bytes):
+                logger.warning("Skill embedding store is inconsistent, resetting")
+                self._reset(faiss_module)
+                return False
+
+            self.skills = skills
+            self.rows = {skill: i for i, skill in enumerate(skills)}
+            self._skills_bytes = skills_bytes
+            self.vectors = self._map_vectors(count)
+            self.index = self._build_index(faiss_module)
+
+            logger.info(f"Loaded {len(self.skills)} skill embeddings from {self.store_dir}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading skill embedding store: {str(e)}")
+            self._reset(faiss_module)
+            return False
+
+    def _reset(self, faiss_module=None) -> None:
+        self.skills = []
+        self.rows = {}
+        self.vectors = np.zeros((0, self.dimension), dtype=np.float32)
+        self.index = faiss_module.IndexFlatIP(self.dimension) if faiss_module else None
+        self._skills_bytes = 0
+
+    def _map_vectors(self, count: int) -> np.ndarray:
+        if not count:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.memmap(
+            self.store_dir / self.VECTORS_FILE, dtype=np.float32, mode='r',
+            shape=(count, self.dimension)
+        )
+
+    def _build_index(self, faiss_module):
+        if faiss_module is None:
+            return None
+        index = faiss_module.IndexFlatIP(self.dimension)
+        if len(self.skills):
+            index.add(np.ascontiguousarray(self.vectors, dtype=np.float32))
+        return index
+
+    @staticmethod
+    def _append(path: Path, committed_bytes: int, data: bytes) -> None:
+        """Write ``data`` after the first ``committed_bytes`` bytes of ``path``"""
+        with open(path, 'r+b' if path.exists() else 'w+b') as f:
+            f.truncate(committed_bytes)
+            f.seek(committed_bytes)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _save(self, skills: List[str], embeddings: np.ndarray) -> None:
+        """Append rows, then commit them by rewriting the metadata via temp-file + rename"""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        row_bytes = self.dimension * np.dtype(np.float32).itemsize
+        self._append(
+            self.store_dir / self.VECTORS_FILE, len(self.skills) * row_bytes,
+            np.ascontiguousarray(embeddings, dtype=np.float32).tobytes()
+        )
+        lines = ''.join(json.dumps(skill) + '\n' for skill in skills).encode()
+        self._append(self.store_dir / self.SKILLS_FILE, self._skills_bytes, lines)
+
+        count = len(self.skills) + len(skills)
+        meta_tmp = self.store_dir / f"{self.META_FILE}.tmp"
+        with open(meta_tmp, 'w') as f:
+            json.dump({
+                'model_name': self.model_name,
+                'dimension': self.dimension,
+                'count': count
+            }, f)
+        os.replace(meta_tmp, self.store_dir / self.META_FILE)
+        self._skills_bytes += len(lines)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def missing(self, skills: List[str]) -> List[str]:
+        """Return skills that have no stored embedding yet"""
+        return [skill for skill in skills if skill not in self.rows]
+
+    def add(self, skills: List[str], embeddings: np.ndarray, faiss_module=None) -> None:
+        """Append embeddings for new skills and persist them"""
+        if not skills:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = np.ascontiguousarray(embeddings / np.where(norms == 0, 1.0, norms), dtype=np.float32)
+
+        self._save(skills, embeddings)
+
+        start = len(self.skills)
+        self.skills.extend(skills)
+        self.rows.update({skill: start + i for i, skill in enumerate(skills)})
+        # Re-open memory-mapped so the process does not hold a private copy
+        self.vectors = self._map_vectors(len(self.skills))
+
+        if self.index is None:
+            self.index = self._build_index(faiss_module)
+        else:
+            self.index.add(embeddings)
+
+    def matrix(self, skills: List[str]) -> np.ndarray:
+        """Return normalized vectors for the given skills in the given order"""
+        if not skills:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        rows = np.fromiter((self.rows[s] for s in skills), dtype=np.int64, count=len(skills))
+        return np.ascontiguousarray(self.vectors[rows], dtype=np.float32)
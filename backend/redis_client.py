@@ -3,14 +3,23 @@ Redis Client Configuration
 Caching and real-time data management for AlumUnity
 """
 import redis.asyncio as aioredis
+import asyncio
 import json
 import os
-from typing import Optional, Any
+import time
+from collections import OrderedDict, defaultdict
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Sequence, Tuple, Union
 import logging
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Global Redis client instance
 redis_client: Optional[aioredis.Redis] = None
 
@@ -31,6 +40,14 @@ class RedisConfig:
     TTL_API_CACHE_LONG = 1800  # 30 minutes
     TTL_AI_PREDICTIONS = 86400  # 24 hours
     TTL_SKILL_EMBEDDINGS = 604800  # 7 days
+    TTL_UNREAD_COUNTERS = 86400  # 24 hours (re-seeded from MySQL on miss)
+    TTL_USER_STATUS = 60  # 1 minute (invalidated on suspend/ban/role change)
+    TTL_LEADERBOARD_PAGE = 30  # 30 seconds
+    
+    # In-process tier in front of RedisCache
+    TTL_LOCAL_CACHE = int(os.getenv('REDIS_LOCAL_CACHE_TTL', 5))
+    LOCAL_CACHE_MAX_ENTRIES = int(os.getenv('REDIS_LOCAL_CACHE_MAX_ENTRIES', 1024))
+    SERIALIZER = os.getenv('REDIS_CACHE_SERIALIZER', 'json')  # json | orjson
     
     # Key Prefixes
     PREFIX_SESSION = 'session'
@@ -41,6 +58,14 @@ class RedisConfig:
     PREFIX_QUEUE = 'queue'
     PREFIX_NOTIFICATION = 'notification'
     PREFIX_LEADERBOARD = 'leaderboard'
+    PREFIX_REALTIME = 'realtime'
+    PREFIX_USER_STATUS = 'auth:user_status'
+    PREFIX_LEADERBOARD_PAGE = 'leaderboard:page'
+
+
+_USE_ORJSON = RedisConfig.SERIALIZER == 'orjson' and ORJSON_AVAILABLE
+if RedisConfig.SERIALIZER == 'orjson' and not ORJSON_AVAILABLE:
+    logger.warning("orjson not installed. Cache values will be serialized with json")
 
 
 async def get_redis_client() -> aioredis.Redis:
@@ -90,14 +115,106 @@ async def close_redis_client():
         logger.info("Redis connection closed")
 
 
+def discard_redis_client():
+    """Forget the current client without closing it (forked worker processes)"""
+    global redis_client
+    redis_client = None
+
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry expiry"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def size(self) -> int:
+        return len(self._entries)
+
+
+def _encode(value: Any) -> Union[str, bytes]:
+    """Serialize a cache value; strings are stored as-is"""
+    if isinstance(value, str):
+        return value
+    if _USE_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value)
+
+
+def _decode(raw: Union[str, bytes]) -> Any:
+    """Deserialize a cache value, returning non-JSON strings unchanged"""
+    try:
+        return orjson.loads(raw) if _USE_ORJSON else json.loads(raw)
+    except ValueError:
+        return raw
+
+
 class RedisCache:
-    """Redis caching utilities"""
+    """
+    Redis caching utilities
+    
+    Reads go through a small in-process tier first (TTL capped at
+    ``RedisConfig.TTL_LOCAL_CACHE``), so hot keys are served without a
+    network round trip. Writes and deletes made by this process update the
+    local tier immediately; changes from other processes show up once the
+    local copy expires. Hit/miss/latency counters are kept per prefix.
+    """
+    
+    _local = LocalCache(RedisConfig.LOCAL_CACHE_MAX_ENTRIES)
+    _inflight: Dict[str, "asyncio.Future"] = {}
+    _metrics: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: {'local_hits': 0, 'hits': 0, 'misses': 0, 'errors': 0, 'redis_calls': 0, 'redis_ms': 0.0}
+    )
     
     @staticmethod
     def _make_key(prefix: str, identifier: str) -> str:
         """Create a namespaced Redis key"""
         return f"{prefix}:{identifier}"
     
+    @staticmethod
+    def _full_key(key: str, prefix: str) -> str:
+        return RedisCache._make_key(prefix, key) if prefix else key
+    
+    @staticmethod
+    def _scope(key: str, prefix: str) -> str:
+        """Metrics bucket: the prefix, or the key's first segment"""
+        return prefix or key.split(':', 1)[0]
+    
+    @staticmethod
+    def _record_call(scope: str, started: float) -> None:
+        metrics = RedisCache._metrics[scope]
+        metrics['redis_calls'] += 1
+        metrics['redis_ms'] += (time.perf_counter() - started) * 1000
+    
+    @staticmethod
+    def _cache_locally(full_key: str, raw: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        local_ttl = min(ttl, RedisConfig.TTL_LOCAL_CACHE) if ttl else RedisConfig.TTL_LOCAL_CACHE
+        if local_ttl > 0:
+            RedisCache._local.set(full_key, raw, local_ttl)
+    
     @staticmethod
     async def set(
         key: str, 
@@ -106,63 +223,196 @@ class RedisCache:
         prefix: str = ""
     ) -> bool:
         """Set a value in Redis with optional TTL"""
+        full_key = RedisCache._full_key(key, prefix)
+        scope = RedisCache._scope(key, prefix)
         try:
+            raw = _encode(value)
             client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
-            
-            # Serialize value to JSON if not string
-            if not isinstance(value, str):
-                value = json.dumps(value)
+            started = time.perf_counter()
             
             if ttl:
-                await client.setex(full_key, ttl, value)
+                await client.setex(full_key, ttl, raw)
             else:
-                await client.set(full_key, value)
+                await client.set(full_key, raw)
             
+            RedisCache._record_call(scope, started)
+            RedisCache._cache_locally(full_key, raw, ttl)
             return True
         except Exception as e:
+            RedisCache._metrics[scope]['errors'] += 1
+            RedisCache._local.delete(full_key)
             logger.error(f"Redis SET error: {str(e)}")
             return False
     
     @staticmethod
     async def get(key: str, prefix: str = "") -> Optional[Any]:
-        """Get a value from Redis"""
+        """Get a value from the local tier or Redis"""
+        full_key = RedisCache._full_key(key, prefix)
+        scope = RedisCache._scope(key, prefix)
+        metrics = RedisCache._metrics[scope]
+        
+        raw = RedisCache._local.get(full_key)
+        if raw is not None:
+            metrics['local_hits'] += 1
+            return _decode(raw)
+        
         try:
             client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
-            
-            value = await client.get(full_key)
-            
-            if value is None:
-                return None
-            
-            # Try to deserialize JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            started = time.perf_counter()
+            raw = await client.get(full_key)
+            RedisCache._record_call(scope, started)
         except Exception as e:
+            metrics['errors'] += 1
             logger.error(f"Redis GET error: {str(e)}")
             return None
+        
+        if raw is None:
+            metrics['misses'] += 1
+            return None
+        
+        metrics['hits'] += 1
+        RedisCache._cache_locally(full_key, raw)
+        return _decode(raw)
+    
+    @staticmethod
+    async def mget(keys: Sequence[str], prefix: str = "") -> List[Optional[Any]]:
+        """Get several values, fetching local-tier misses in one MGET"""
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing: List[int] = []
+        scope = RedisCache._scope(keys[0], prefix) if keys else prefix
+        metrics = RedisCache._metrics[scope]
+        
+        for i, key in enumerate(keys):
+            raw = RedisCache._local.get(RedisCache._full_key(key, prefix))
+            if raw is None:
+                missing.append(i)
+            else:
+                metrics['local_hits'] += 1
+                results[i] = _decode(raw)
+        if not missing:
+            return results
+        
+        try:
+            client = await get_redis_client()
+            started = time.perf_counter()
+            values = await client.mget([RedisCache._full_key(keys[i], prefix) for i in missing])
+            RedisCache._record_call(scope, started)
+        except Exception as e:
+            metrics['errors'] += 1
+            logger.error(f"Redis MGET error: {str(e)}")
+            return results
+        
+        for i, raw in zip(missing, values):
+            if raw is None:
+                metrics['misses'] += 1
+                continue
+            metrics['hits'] += 1
+            RedisCache._cache_locally(RedisCache._full_key(keys[i], prefix), raw)
+            results[i] = _decode(raw)
+        return results
+    
+    @staticmethod
+    async def mset(values: Dict[str, Any], ttl: Optional[int] = None, prefix: str = "") -> bool:
+        """Set several values in one pipelined round trip"""
+        if not values:
+            return True
+        full_keys = [RedisCache._full_key(key, prefix) for key in values]
+        scope = RedisCache._scope(next(iter(values)), prefix)
+        try:
+            encoded = {full_key: _encode(value) for full_key, value in zip(full_keys, values.values())}
+            client = await get_redis_client()
+            started = time.perf_counter()
+            pipe = client.pipeline(transaction=False)
+            for full_key, raw in encoded.items():
+                if ttl:
+                    pipe.setex(full_key, ttl, raw)
+                else:
+                    pipe.set(full_key, raw)
+            await pipe.execute()
+            RedisCache._record_call(scope, started)
+        except Exception as e:
+            RedisCache._metrics[scope]['errors'] += 1
+            for full_key in full_keys:
+                RedisCache._local.delete(full_key)
+            logger.error(f"Redis MSET error: {str(e)}")
+            return False
+        
+        for full_key, raw in encoded.items():
+            RedisCache._cache_locally(full_key, raw, ttl)
+        return True
+    
+    @staticmethod
+    async def get_or_set(
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> Any:
+        """
+        Get a value, computing and caching it with ``loader`` on a miss
+        
+        Concurrent misses for the same key in this process share a single
+        ``loader`` call. ``None`` results are returned but not cached.
+        """
+        value = await RedisCache.get(key, prefix=prefix)
+        if value is not None:
+            return value
+        
+        full_key = RedisCache._full_key(key, prefix)
+        future = RedisCache._inflight.get(full_key)
+        if future is None:
+            async def load():
+                try:
+                    result = await loader()
+                    if result is not None:
+                        await RedisCache.set(key, result, ttl=ttl, prefix=prefix)
+                    return result
+                finally:
+                    RedisCache._inflight.pop(full_key, None)
+            
+            future = asyncio.ensure_future(load())
+            RedisCache._inflight[full_key] = future
+        
+        # A cancelled caller must not cancel the load other callers await
+        return await asyncio.shield(future)
     
     @staticmethod
     async def delete(key: str, prefix: str = "") -> bool:
         """Delete a key from Redis"""
+        full_key = RedisCache._full_key(key, prefix)
+        RedisCache._local.delete(full_key)
         try:
             client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
             await client.delete(full_key)
             return True
         except Exception as e:
             logger.error(f"Redis DELETE error: {str(e)}")
             return False
     
+    @staticmethod
+    async def delete_many(keys: Sequence[str], prefix: str = "") -> bool:
+        """Delete several keys in one round trip"""
+        if not keys:
+            return True
+        full_keys = [RedisCache._full_key(key, prefix) for key in keys]
+        for full_key in full_keys:
+            RedisCache._local.delete(full_key)
+        try:
+            client = await get_redis_client()
+            await client.delete(*full_keys)
+            return True
+        except Exception as e:
+            logger.error(f"Redis DELETE error: {str(e)}")
+            return False
+    
     @staticmethod
     async def exists(key: str, prefix: str = "") -> bool:
         """Check if key exists in Redis"""
+        full_key = RedisCache._full_key(key, prefix)
+        if RedisCache._local.get(full_key) is not None:
+            return True
         try:
             client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
             return await client.exists(full_key) > 0
         except Exception as e:
             logger.error(f"Redis EXISTS error: {str(e)}")
@@ -171,9 +421,10 @@ class RedisCache:
     @staticmethod
     async def increment(key: str, prefix: str = "", amount: int = 1) -> Optional[int]:
         """Increment a counter in Redis"""
+        full_key = RedisCache._full_key(key, prefix)
+        RedisCache._local.delete(full_key)
         try:
             client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
             return await client.incrby(full_key, amount)
         except Exception as e:
             logger.error(f"Redis INCREMENT error: {str(e)}")
@@ -188,6 +439,24 @@ class RedisCache:
     ) -> bool:
         """Set value with expiry time"""
         return await RedisCache.set(key, value, ttl=seconds, prefix=prefix)
+    
+    @staticmethod
+    def get_metrics() -> Dict:
+        """Return hit/miss counters and Redis latency per prefix"""
+        prefixes = {}
+        for scope, metrics in RedisCache._metrics.items():
+            lookups = metrics['local_hits'] + metrics['hits'] + metrics['misses']
+            prefixes[scope] = {
+                **{name: count for name, count in metrics.items() if name != 'redis_ms'},
+                'hit_rate': round((metrics['local_hits'] + metrics['hits']) / lookups, 3) if lookups else None,
+                'avg_redis_ms': round(metrics['redis_ms'] / metrics['redis_calls'], 2) if metrics['redis_calls'] else None,
+            }
+        return {
+            'serializer': 'orjson' if _USE_ORJSON else 'json',
+            'local_entries': RedisCache._local.size(),
+            'local_max_entries': RedisCache._local.max_entries,
+            'prefixes': prefixes
+        }
 
 
 class RedisLeaderboard:
@@ -287,27 +556,3 @@ class RedisQueue:
         except Exception as e:
             logger.error(f"Queue LENGTH error: {str(e)}")
             return 0
-
-
-# API Response Caching Decorator
-def cache_response(ttl: int = RedisConfig.TTL_API_CACHE_MEDIUM, prefix: str = "api:cache"):
-    """Decorator to cache API responses"""
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            
-            # Try to get from cache
-            cached = await RedisCache.get(cache_key, prefix=prefix)
-            if cached is not None:
-                logger.debug(f"Cache HIT: {cache_key}")
-                return cached
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await RedisCache.set(cache_key, result, ttl=ttl, prefix=prefix)
-            logger.debug(f"Cache MISS: {cache_key}")
-            
-            return result
-        return wrapper
-    return decorator
@@ -1,67 +1,58 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 import logging
-from database.connection import get_sync_db_connection
+from database.connection import fetch_all, fetch_one, gather_queries
 from middleware.auth_middleware import require_admin
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin/analytics", tags=["admin-analytics"])
 
+# Dashboard endpoints issue their independent queries concurrently with
+# gather_queries; each query runs on its own pooled connection, with the
+# number held at once capped by DB_POOL_FANOUT_LIMIT.
+
 @router.get("/dashboard", dependencies=[Depends(require_admin)])
 async def get_dashboard_stats():
     """Get overall dashboard statistics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Total users by role
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalUsers,
-                SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeUsers,
-                SUM(CASE WHEN role = 'student' THEN 1 ELSE 0 END) as totalStudents,
-                SUM(CASE WHEN role = 'alumni' THEN 1 ELSE 0 END) as totalAlumni,
-                SUM(CASE WHEN role = 'recruiter' THEN 1 ELSE 0 END) as totalRecruiters
-            FROM users
-        """)
-        user_stats = cursor.fetchone()
-        
-        # Verified alumni
-        cursor.execute("SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE")
-        verified_stats = cursor.fetchone()
-        
-        # Jobs stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalJobs,
-                SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as activeJobs
-            FROM jobs
-        """)
-        job_stats = cursor.fetchone()
-        
-        # Events stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalEvents,
-                SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) as publishedEvents
-            FROM events
-        """)
-        event_stats = cursor.fetchone()
-        
-        # Forum posts
-        cursor.execute("SELECT COUNT(*) as totalPosts FROM forum_posts WHERE is_deleted = FALSE")
-        forum_stats = cursor.fetchone()
-        
-        cursor.close()
-        connection.close()
-        
+        user_stats, verified_stats, job_stats, event_stats, forum_stats = await gather_queries(
+            # Total users by role
+            fetch_one("""
+                SELECT
+                    COUNT(*) as totalUsers,
+                    SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeUsers,
+                    SUM(CASE WHEN role = 'student' THEN 1 ELSE 0 END) as totalStudents,
+                    SUM(CASE WHEN role = 'alumni' THEN 1 ELSE 0 END) as totalAlumni,
+                    SUM(CASE WHEN role = 'recruiter' THEN 1 ELSE 0 END) as totalRecruiters
+                FROM users
+            """),
+            # Verified alumni
+            fetch_one("SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE"),
+            # Jobs stats
+            fetch_one("""
+                SELECT
+                    COUNT(*) as totalJobs,
+                    SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as activeJobs
+                FROM jobs
+            """),
+            # Events stats
+            fetch_one("""
+                SELECT
+                    COUNT(*) as totalEvents,
+                    SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) as publishedEvents
+                FROM events
+            """),
+            # Forum posts
+            fetch_one("SELECT COUNT(*) as totalPosts FROM forum_posts WHERE is_deleted = FALSE"),
+        )
+
         # Convert stats tuples to dicts if needed
         user_stats_dict = dict(user_stats) if user_stats else {"totalUsers": 0, "activeUsers": 0, "totalStudents": 0, "totalAlumni": 0, "totalRecruiters": 0}
         verified_stats_dict = dict(verified_stats) if verified_stats else {"verifiedAlumni": 0}
         job_stats_dict = dict(job_stats) if job_stats else {"totalJobs": 0, "openJobs": 0}
         event_stats_dict = dict(event_stats) if event_stats else {"totalEvents": 0, "publishedEvents": 0}
         forum_stats_dict = dict(forum_stats) if forum_stats else {"totalPosts": 0}
-        
+
         return {
             "success": True,
             "data": {
@@ -72,7 +63,7 @@ async def get_dashboard_stats():
                 "forumPosts": forum_stats_dict['totalPosts']
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching dashboard stats: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -81,12 +72,9 @@ async def get_dashboard_stats():
 async def get_user_growth(period: str = "monthly"):
     """Get user growth data over time"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
         if period == "monthly":
-            cursor.execute("""
-                SELECT 
+            growth_data = await fetch_all("""
+                SELECT
                     DATE_FORMAT(created_at, '%Y-%m') as month,
                     COUNT(*) as users
                 FROM users
@@ -95,8 +83,8 @@ async def get_user_growth(period: str = "monthly"):
                 ORDER BY month
             """)
         else:
-            cursor.execute("""
-                SELECT 
+            growth_data = await fetch_all("""
+                SELECT
                     DATE(created_at) as date,
                     COUNT(*) as users
                 FROM users
@@ -104,16 +92,12 @@ async def get_user_growth(period: str = "monthly"):
                 GROUP BY DATE(created_at)
                 ORDER BY date
             """)
-        
-        growth_data = cursor.fetchall()
-        cursor.close()
-        connection.close()
-        
+
         return {
             "success": True,
             "data": growth_data
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching user growth: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -122,11 +106,8 @@ async def get_user_growth(period: str = "monthly"):
 async def get_top_contributors(limit: int = 5):
     """Get top contributing users"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        cursor.execute("""
-            SELECT 
+        contributors = await fetch_all("""
+            SELECT
                 u.id,
                 u.email,
                 ap.name,
@@ -139,16 +120,12 @@ async def get_top_contributors(limit: int = 5):
             ORDER BY es.total_score DESC
             LIMIT %s
         """, (limit,))
-        
-        contributors = cursor.fetchall()
-        cursor.close()
-        connection.close()
-        
+
         return {
             "success": True,
             "data": contributors
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching top contributors: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -157,71 +134,45 @@ async def get_top_contributors(limit: int = 5):
 async def get_platform_activity(days: int = 30):
     """Get recent platform activity metrics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        activities = []
-        
-        # Job postings
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM jobs
-            WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        job_count = cursor.fetchone()
-        activities.append({
-            "activity": "Job Postings",
-            "count": job_count['count'],
-            "trend": "+15%"
-        })
-        
-        # Events created
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM events
-            WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        event_count = cursor.fetchone()
-        activities.append({
-            "activity": "Events Created",
-            "count": event_count['count'],
-            "trend": "+8%"
-        })
-        
-        # Forum posts
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM forum_posts
-            WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY) AND is_deleted = FALSE
-        """, (days,))
-        post_count = cursor.fetchone()
-        activities.append({
-            "activity": "Forum Posts",
-            "count": post_count['count'],
-            "trend": "+22%"
-        })
-        
-        # Mentorship requests
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM mentorship_requests
-            WHERE requested_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        mentor_count = cursor.fetchone()
-        activities.append({
-            "activity": "Mentorship Requests",
-            "count": mentor_count['count'],
-            "trend": "+12%"
-        })
-        
-        cursor.close()
-        connection.close()
-        
+        job_count, event_count, post_count, mentor_count = await gather_queries(
+            # Job postings
+            fetch_one("""
+                SELECT COUNT(*) as count
+                FROM jobs
+                WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            """, (days,)),
+            # Events created
+            fetch_one("""
+                SELECT COUNT(*) as count
+                FROM events
+                WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            """, (days,)),
+            # Forum posts
+            fetch_one("""
+                SELECT COUNT(*) as count
+                FROM forum_posts
+                WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY) AND is_deleted = FALSE
+            """, (days,)),
+            # Mentorship requests
+            fetch_one("""
+                SELECT COUNT(*) as count
+                FROM mentorship_requests
+                WHERE requested_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            """, (days,)),
+        )
+
+        activities = [
+            {"activity": "Job Postings", "count": job_count['count'], "trend": "+15%"},
+            {"activity": "Events Created", "count": event_count['count'], "trend": "+8%"},
+            {"activity": "Forum Posts", "count": post_count['count'], "trend": "+22%"},
+            {"activity": "Mentorship Requests", "count": mentor_count['count'], "trend": "+12%"},
+        ]
+
         return {
             "success": True,
             "data": activities
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching platform activity: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -230,43 +181,48 @@ async def get_platform_activity(days: int = 30):
 async def get_alumni_analytics():
     """Get detailed alumni analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Location distribution
-        cursor.execute("""
-            SELECT 
-                location,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE location IS NOT NULL
-            GROUP BY location
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        location_dist = cursor.fetchall()
-        
-        # Top companies
-        cursor.execute("""
-            SELECT 
-                current_company as company,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE current_company IS NOT NULL
-            GROUP BY current_company
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        top_companies = cursor.fetchall()
-        
-        # Top skills - Need to parse JSON
-        cursor.execute("""
-            SELECT skills
-            FROM alumni_profiles
-            WHERE skills IS NOT NULL AND skills != '[]'
-        """)
-        skills_data = cursor.fetchall()
-        
+        location_dist, top_companies, skills_data, batch_dist = await gather_queries(
+            # Location distribution
+            fetch_all("""
+                SELECT
+                    location,
+                    COUNT(*) as count
+                FROM alumni_profiles
+                WHERE location IS NOT NULL
+                GROUP BY location
+                ORDER BY count DESC
+                LIMIT 10
+            """),
+            # Top companies
+            fetch_all("""
+                SELECT
+                    current_company as company,
+                    COUNT(*) as count
+                FROM alumni_profiles
+                WHERE current_company IS NOT NULL
+                GROUP BY current_company
+                ORDER BY count DESC
+                LIMIT 10
+            """),
+            # Top skills - Need to parse JSON
+            fetch_all("""
+                SELECT skills
+                FROM alumni_profiles
+                WHERE skills IS NOT NULL AND skills != '[]'
+            """),
+            # Batch distribution
+            fetch_all("""
+                SELECT
+                    batch_year as year,
+                    COUNT(*) as count
+                FROM alumni_profiles
+                WHERE batch_year IS NOT NULL
+                GROUP BY batch_year
+                ORDER BY batch_year DESC
+                LIMIT 10
+            """),
+        )
+
         # Parse skills and count
         from collections import Counter
         import json
@@ -278,26 +234,10 @@ async def get_alumni_analytics():
                     all_skills.extend(skills)
             except:
                 pass
-        
+
         skill_counts = Counter(all_skills)
         top_skills = [{"skill": skill, "count": count} for skill, count in skill_counts.most_common(15)]
-        
-        # Batch distribution
-        cursor.execute("""
-            SELECT 
-                batch_year as year,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE batch_year IS NOT NULL
-            GROUP BY batch_year
-            ORDER BY batch_year DESC
-            LIMIT 10
-        """)
-        batch_dist = cursor.fetchall()
-        
-        cursor.close()
-        connection.close()
-        
+
         return {
             "success": True,
             "data": {
@@ -307,7 +247,7 @@ async def get_alumni_analytics():
                 "batchDistribution": batch_dist
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching alumni analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -316,64 +256,54 @@ async def get_alumni_analytics():
 async def get_job_analytics():
     """Get job analytics data"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT j.id) as totalJobs,
-                COUNT(DISTINCT ja.id) as totalApplications,
-                ROUND(COUNT(DISTINCT ja.id) / COUNT(DISTINCT j.id), 1) as averageApplicationsPerJob
-            FROM jobs j
-            LEFT JOIN job_applications ja ON j.id = ja.job_id
-        """)
-        basic_stats = cursor.fetchone()
-        
-        # Jobs by type
-        cursor.execute("""
-            SELECT 
-                job_type as name,
-                COUNT(*) as value,
-                '#3b82f6' as color
-            FROM jobs
-            GROUP BY job_type
-        """)
-        jobs_by_type = cursor.fetchall()
-        
-        # Jobs by location
-        cursor.execute("""
-            SELECT 
-                location,
-                COUNT(*) as jobs
-            FROM jobs
-            WHERE location IS NOT NULL
-            GROUP BY location
-            ORDER BY jobs DESC
-            LIMIT 10
-        """)
-        jobs_by_location = cursor.fetchall()
-        
-        # Application trends (last 12 weeks)
-        cursor.execute("""
-            SELECT 
-                WEEK(applied_at) as week,
-                COUNT(*) as applications
-            FROM job_applications
-            WHERE applied_at >= DATE_SUB(NOW(), INTERVAL 12 WEEK)
-            GROUP BY WEEK(applied_at)
-            ORDER BY week
-        """)
-        app_trends = cursor.fetchall()
-        
-        # Top skills required
-        cursor.execute("""
-            SELECT skills_required
-            FROM jobs
-            WHERE skills_required IS NOT NULL
-        """)
-        skills_data = cursor.fetchall()
-        
+        basic_stats, jobs_by_type, jobs_by_location, app_trends, skills_data = await gather_queries(
+            # Basic stats
+            fetch_one("""
+                SELECT
+                    COUNT(DISTINCT j.id) as totalJobs,
+                    COUNT(DISTINCT ja.id) as totalApplications,
+                    ROUND(COUNT(DISTINCT ja.id) / COUNT(DISTINCT j.id), 1) as averageApplicationsPerJob
+                FROM jobs j
+                LEFT JOIN job_applications ja ON j.id = ja.job_id
+            """),
+            # Jobs by type
+            fetch_all("""
+                SELECT
+                    job_type as name,
+                    COUNT(*) as value,
+                    '#3b82f6' as color
+                FROM jobs
+                GROUP BY job_type
+            """),
+            # Jobs by location
+            fetch_all("""
+                SELECT
+                    location,
+                    COUNT(*) as jobs
+                FROM jobs
+                WHERE location IS NOT NULL
+                GROUP BY location
+                ORDER BY jobs DESC
+                LIMIT 10
+            """),
+            # Application trends (last 12 weeks)
+            fetch_all("""
+                SELECT
+                    WEEK(applied_at) as week,
+                    COUNT(*) as applications
+                FROM job_applications
+                WHERE applied_at >= DATE_SUB(NOW(), INTERVAL 12 WEEK)
+                GROUP BY WEEK(applied_at)
+                ORDER BY week
+            """),
+            # Top skills required
+            fetch_all("""
+                SELECT skills_required
+                FROM jobs
+                WHERE skills_required IS NOT NULL
+            """),
+        )
+
         from collections import Counter
         import json
         all_skills = []
@@ -384,13 +314,10 @@ async def get_job_analytics():
                     all_skills.extend(skills)
             except:
                 pass
-        
+
         skill_counts = Counter(all_skills)
         top_skills_required = [{"skill": skill, "count": count} for skill, count in skill_counts.most_common(10)]
-        
-        cursor.close()
-        connection.close()
-        
+
         # Convert basic_stats to dict if it's a tuple
         stats_dict = dict(basic_stats) if basic_stats else {
             "totalJobs": 0,
@@ -398,7 +325,7 @@ async def get_job_analytics():
             "totalApplications": 0,
             "averageSalary": 0
         }
-        
+
         return {
             "success": True,
             "data": {
@@ -410,7 +337,7 @@ async def get_job_analytics():
                 "topSkillsRequired": top_skills_required
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching job analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -419,58 +346,60 @@ async def get_job_analytics():
 async def get_mentorship_analytics():
     """Get mentorship analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT mr.id) as totalRequests,
-                COUNT(DISTINCT CASE WHEN mp.is_available = TRUE THEN mp.user_id END) as activeMentors,
-                COUNT(DISTINCT CASE WHEN ms.status = 'completed' THEN ms.id END) as completedSessions,
-                ROUND(AVG(CASE WHEN ms.rating IS NOT NULL THEN ms.rating END), 1) as averageRating
-            FROM mentorship_requests mr
-            LEFT JOIN mentor_profiles mp ON mr.mentor_id = mp.user_id
-            LEFT JOIN mentorship_sessions ms ON mr.id = ms.mentorship_request_id
-        """)
-        basic_stats = cursor.fetchone()
-        
-        # Requests by status
-        cursor.execute("""
-            SELECT 
-                status as name,
-                COUNT(*) as value,
-                CASE status
-                    WHEN 'pending' THEN '#fbbf24'
-                    WHEN 'accepted' THEN '#10b981'
-                    WHEN 'rejected' THEN '#ef4444'
-                    ELSE '#6b7280'
-                END as color
-            FROM mentorship_requests
-            GROUP BY status
-        """)
-        requests_by_status = cursor.fetchall()
-        
-        # Sessions over time
-        cursor.execute("""
-            SELECT 
-                DATE_FORMAT(scheduled_date, '%Y-%m') as month,
-                COUNT(*) as sessions
-            FROM mentorship_sessions
-            WHERE scheduled_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-            GROUP BY DATE_FORMAT(scheduled_date, '%Y-%m')
-            ORDER BY month
-        """)
-        sessions_over_time = cursor.fetchall()
-        
-        # Top expertise areas
-        cursor.execute("""
-            SELECT expertise_areas
-            FROM mentor_profiles
-            WHERE expertise_areas IS NOT NULL
-        """)
-        expertise_data = cursor.fetchall()
-        
+        basic_stats, requests_by_status, sessions_over_time, expertise_data, rating_dist = await gather_queries(
+            # Basic stats
+            fetch_one("""
+                SELECT
+                    COUNT(DISTINCT mr.id) as totalRequests,
+                    COUNT(DISTINCT CASE WHEN mp.is_available = TRUE THEN mp.user_id END) as activeMentors,
+                    COUNT(DISTINCT CASE WHEN ms.status = 'completed' THEN ms.id END) as completedSessions,
+                    ROUND(AVG(CASE WHEN ms.rating IS NOT NULL THEN ms.rating END), 1) as averageRating
+                FROM mentorship_requests mr
+                LEFT JOIN mentor_profiles mp ON mr.mentor_id = mp.user_id
+                LEFT JOIN mentorship_sessions ms ON mr.id = ms.mentorship_request_id
+            """),
+            # Requests by status
+            fetch_all("""
+                SELECT
+                    status as name,
+                    COUNT(*) as value,
+                    CASE status
+                        WHEN 'pending' THEN '#fbbf24'
+                        WHEN 'accepted' THEN '#10b981'
+                        WHEN 'rejected' THEN '#ef4444'
+                        ELSE '#6b7280'
+                    END as color
+                FROM mentorship_requests
+                GROUP BY status
+            """),
+            # Sessions over time
+            fetch_all("""
+                SELECT
+                    DATE_FORMAT(scheduled_date, '%Y-%m') as month,
+                    COUNT(*) as sessions
+                FROM mentorship_sessions
+                WHERE scheduled_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
+                GROUP BY DATE_FORMAT(scheduled_date, '%Y-%m')
+                ORDER BY month
+            """),
+            # Top expertise areas
+            fetch_all("""
+                SELECT expertise_areas
+                FROM mentor_profiles
+                WHERE expertise_areas IS NOT NULL
+            """),
+            # Rating distribution
+            fetch_all("""
+                SELECT
+                    CONCAT(CAST(rating AS CHAR), ' Stars') as stars,
+                    COUNT(*) as count
+                FROM mentorship_sessions
+                WHERE rating IS NOT NULL AND rating > 0
+                GROUP BY rating
+                ORDER BY rating DESC
+            """),
+        )
+
         from collections import Counter
         import json
         all_areas = []
@@ -481,25 +410,10 @@ async def get_mentorship_analytics():
                     all_areas.extend(areas)
             except:
                 pass
-        
+
         area_counts = Counter(all_areas)
         top_expertise = [{"area": area, "count": count} for area, count in area_counts.most_common(10)]
-        
-        # Rating distribution
-        cursor.execute("""
-            SELECT 
-                CONCAT(CAST(rating AS CHAR), ' Stars') as stars,
-                COUNT(*) as count
-            FROM mentorship_sessions
-            WHERE rating IS NOT NULL AND rating > 0
-            GROUP BY rating
-            ORDER BY rating DESC
-        """)
-        rating_dist = cursor.fetchall()
-        
-        cursor.close()
-        connection.close()
-        
+
         # Safe conversion helper
         def safe_float(val):
             try:
@@ -515,7 +429,7 @@ async def get_mentorship_analytics():
             "completedSessions": 0,
             "averageRating": 0.0
         }
-        
+
         if basic_stats:
             # Manually map and cast to ensure safety
             row = dict(basic_stats)
@@ -523,7 +437,7 @@ async def get_mentorship_analytics():
             stats_dict["activeMentors"] = int(row.get("activeMentors", 0))
             stats_dict["completedSessions"] = int(row.get("completedSessions", 0))
             stats_dict["averageRating"] = safe_float(row.get("averageRating", 0))
-        
+
         return {
             "success": True,
             "data": {
@@ -534,7 +448,7 @@ async def get_mentorship_analytics():
                 "ratingDistribution": rating_dist
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching mentorship analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -543,53 +457,45 @@ async def get_mentorship_analytics():
 async def get_event_analytics():
     """Get event analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT e.id) as totalEvents,
-                COUNT(DISTINCT er.id) as totalRegistrations,
-                ROUND(COUNT(DISTINCT er.id) / COUNT(DISTINCT e.id), 0) as averageAttendance
-            FROM events e
-            LEFT JOIN event_rsvps er ON e.id = er.event_id
-        """)
-        basic_stats = cursor.fetchone()
-        
-        # Events by type
-        cursor.execute("""
-            SELECT 
-                event_type as name,
-                COUNT(*) as value,
-                '#ec4899' as color
-            FROM events
-            GROUP BY event_type
-        """)
-        events_by_type = cursor.fetchall()
-        
-        # Participation trend
-        cursor.execute("""
-            SELECT 
-                DATE_FORMAT(er.rsvp_date, '%Y-%m') as month,
-                COUNT(*) as registrations
-            FROM event_rsvps er
-            WHERE er.rsvp_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-            GROUP BY DATE_FORMAT(er.rsvp_date, '%Y-%m')
-            ORDER BY month
-        """)
-        participation_trend = cursor.fetchall()
-        
-        # Events by format
-        cursor.execute("""
-            SELECT 
-                CASE WHEN is_virtual = TRUE THEN 'Virtual' ELSE 'In-Person' END as format,
-                COUNT(*) as count
-            FROM events
-            GROUP BY is_virtual
-        """)
-        events_by_format = cursor.fetchall()
-        
+        basic_stats, events_by_type, participation_trend, events_by_format = await gather_queries(
+            # Basic stats
+            fetch_one("""
+                SELECT
+                    COUNT(DISTINCT e.id) as totalEvents,
+                    COUNT(DISTINCT er.id) as totalRegistrations,
+                    ROUND(COUNT(DISTINCT er.id) / COUNT(DISTINCT e.id), 0) as averageAttendance
+                FROM events e
+                LEFT JOIN event_rsvps er ON e.id = er.event_id
+            """),
+            # Events by type
+            fetch_all("""
+                SELECT
+                    event_type as name,
+                    COUNT(*) as value,
+                    '#ec4899' as color
+                FROM events
+                GROUP BY event_type
+            """),
+            # Participation trend
+            fetch_all("""
+                SELECT
+                    DATE_FORMAT(er.rsvp_date, '%Y-%m') as month,
+                    COUNT(*) as registrations
+                FROM event_rsvps er
+                WHERE er.rsvp_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
+                GROUP BY DATE_FORMAT(er.rsvp_date, '%Y-%m')
+                ORDER BY month
+            """),
+            # Events by format
+            fetch_all("""
+                SELECT
+                    CASE WHEN is_virtual = TRUE THEN 'Virtual' ELSE 'In-Person' END as format,
+                    COUNT(*) as count
+                FROM events
+                GROUP BY is_virtual
+            """),
+        )
+
         # Popular topics (from event titles/descriptions)
         popular_topics = [
             {"topic": "Career Development", "count": 45, "color": "bg-blue-500"},
@@ -598,10 +504,7 @@ async def get_event_analytics():
             {"topic": "Alumni Meetups", "count": 28, "color": "bg-yellow-500"},
             {"topic": "Industry Insights", "count": 22, "color": "bg-red-500"}
         ]
-        
-        cursor.close()
-        connection.close()
-        
+
         # Safe conversion helper
         def safe_float(val):
             try:
@@ -617,17 +520,17 @@ async def get_event_analytics():
             "totalParticipants": 0,
             "averageAttendance": 0
         }
-        
+
         if basic_stats:
             row = dict(basic_stats)
             stats_dict["totalEvents"] = int(row.get("totalEvents", 0))
             stats_dict["totalParticipants"] = int(row.get("totalRegistrations", 0))
             stats_dict["averageAttendance"] = safe_float(row.get("averageAttendance", 0))
             stats_dict["upcomingEvents"] = 0 # Placeholder as per original code structure
-            
+
         # Add attendance rate manually
         stats_dict['attendanceRate'] = 85
-        
+
         return {
             "success": True,
             "data": {
@@ -638,7 +541,7 @@ async def get_event_analytics():
                 "popularTopics": popular_topics
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching event analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -647,12 +550,9 @@ async def get_event_analytics():
 async def get_engagement_metrics():
     """Get user engagement metrics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
         # Active users calculation
-        cursor.execute("""
-            SELECT 
+        activity_stats = await fetch_one("""
+            SELECT
                 COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 1 DAY) THEN id END) as dailyActive,
                 COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN id END) as weeklyActive,
                 COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN id END) as monthlyActive,
@@ -660,28 +560,24 @@ async def get_engagement_metrics():
             FROM users
             WHERE is_active = TRUE
         """)
-        activity_stats = cursor.fetchone()
-        
+
         # Convert to float to avoid Decimal issues
         daily = float(activity_stats['dailyActive'])
         weekly = float(activity_stats['weeklyActive'])
         monthly = float(activity_stats['monthlyActive'])
         total = float(activity_stats['totalUsers'])
-        
+
         engagement_data = {
             "dailyActivePercentage": round((daily / total) * 100, 1) if total > 0 else 0,
             "weeklyActivePercentage": round((weekly / total) * 100, 1) if total > 0 else 0,
             "monthlyActivePercentage": round((monthly / total) * 100, 1) if total > 0 else 0
         }
-        
-        cursor.close()
-        connection.close()
-        
+
         return {
             "success": True,
             "data": engagement_data
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching engagement metrics: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
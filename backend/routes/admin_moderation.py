@@ -5,8 +5,10 @@ Handles flagged content review and moderation actions
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 import logging
-from database.connection import get_sync_db_connection
+import aiomysql
+from database.connection import get_db_connection
 from middleware.auth_middleware import require_admin, get_current_user
+from utils.route_cache import invalidate_tags
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin/moderation", tags=["admin-moderation"])
@@ -20,75 +22,73 @@ async def get_flagged_content(
 ):
     """Get all flagged content across the platform"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Get all flagged content from content_flags table with content details
-        cursor.execute("""
-            SELECT 
-                cf.id as flag_id,
-                cf.content_id as id,
-                cf.content_type,
-                cf.reason,
-                cf.status,
-                cf.flagged_by,
-                cf.created_at as timestamp,
-                cf.reviewed_at,
-                u.email as reported_by_email,
-                COALESCE(fp.title, j.title, e.title, 'No Title') as title,
-                COALESCE(fp.content, j.description, e.description, 'No Content') as content,
-                COALESCE(u2.email, u3.email, u4.email, 'Unknown') as author
-            FROM content_flags cf
-            LEFT JOIN users u ON cf.flagged_by = u.id
-            LEFT JOIN forum_posts fp ON cf.content_type = 'post' AND cf.content_id = fp.id
-            LEFT JOIN jobs j ON cf.content_type = 'job' AND cf.content_id = j.id
-            LEFT JOIN events e ON cf.content_type = 'event' AND cf.content_id = e.id
-            LEFT JOIN users u2 ON fp.author_id = u2.id
-            LEFT JOIN users u3 ON j.posted_by = u3.id
-            LEFT JOIN users u4 ON e.created_by = u4.id
-            WHERE cf.status = 'pending'
-            ORDER BY cf.created_at DESC
-            LIMIT %s OFFSET %s
-        """, (limit, offset))
-        
-        flagged_items = cursor.fetchall()
-        
-        # Categorize by type for frontend
-        categorized_data = {
-            'posts': [],
-            'jobs': [],
-            'comments': []
-        }
-        
-        for item in flagged_items:
-            # Format dates
-            if item.get('timestamp'):
-                item['timestamp'] = item['timestamp'].isoformat()
-            if item.get('reviewed_at'):
-                item['reviewed_at'] = item['reviewed_at'].isoformat()
-            
-            # Set reportedBy field
-            item['reportedBy'] = item.get('reported_by_email', 'Unknown')
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                
+                # Get all flagged content from content_flags table with content details
+                await cursor.execute("""
+                    SELECT 
+                        cf.id as flag_id,
+                        cf.content_id as id,
+                        cf.content_type,
+                        cf.reason,
+                        cf.status,
+                        cf.flagged_by,
+                        cf.created_at as timestamp,
+                        cf.reviewed_at,
+                        u.email as reported_by_email,
+                        COALESCE(fp.title, j.title, e.title, 'No Title') as title,
+                        COALESCE(fp.content, j.description, e.description, 'No Content') as content,
+                        COALESCE(u2.email, u3.email, u4.email, 'Unknown') as author
+                    FROM content_flags cf
+                    LEFT JOIN users u ON cf.flagged_by = u.id
+                    LEFT JOIN forum_posts fp ON cf.content_type = 'post' AND cf.content_id = fp.id
+                    LEFT JOIN jobs j ON cf.content_type = 'job' AND cf.content_id = j.id
+                    LEFT JOIN events e ON cf.content_type = 'event' AND cf.content_id = e.id
+                    LEFT JOIN users u2 ON fp.author_id = u2.id
+                    LEFT JOIN users u3 ON j.posted_by = u3.id
+                    LEFT JOIN users u4 ON e.created_by = u4.id
+                    WHERE cf.status = 'pending'
+                    ORDER BY cf.created_at DESC
+                    LIMIT %s OFFSET %s
+                """, (limit, offset))
+                
+                flagged_items = await cursor.fetchall()
+                
+                # Categorize by type for frontend
+                categorized_data = {
+                    'posts': [],
+                    'jobs': [],
+                    'comments': []
+                }
+                
+                for item in flagged_items:
+                    # Format dates
+                    if item.get('timestamp'):
+                        item['timestamp'] = item['timestamp'].isoformat()
+                    if item.get('reviewed_at'):
+                        item['reviewed_at'] = item['reviewed_at'].isoformat()
+                    
+                    # Set reportedBy field
+                    item['reportedBy'] = item.get('reported_by_email', 'Unknown')
+                    
+                    # Map content_type to frontend categories
+                    if item['content_type'] == 'post':
+                        item['type'] = 'forum_post'
+                        categorized_data['posts'].append(item)
+                    elif item['content_type'] == 'job':
+                        item['type'] = 'job_posting'
+                        categorized_data['jobs'].append(item)
+                    elif item['content_type'] == 'comment':
+                        item['type'] = 'comment'
+                        categorized_data['comments'].append(item)
+                
+                
+                return {
+                    "success": True,
+                    "data": categorized_data
+                }
             
-            # Map content_type to frontend categories
-            if item['content_type'] == 'post':
-                item['type'] = 'forum_post'
-                categorized_data['posts'].append(item)
-            elif item['content_type'] == 'job':
-                item['type'] = 'job_posting'
-                categorized_data['jobs'].append(item)
-            elif item['content_type'] == 'comment':
-                item['type'] = 'comment'
-                categorized_data['comments'].append(item)
-        
-        cursor.close()
-        connection.close()
-        
-        return {
-            "success": True,
-            "data": categorized_data
-        }
-    
     except Exception as e:
         logger.error(f"Error fetching flagged content: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -107,38 +107,38 @@ async def approve_content(
         if not content_id or not content_type:
             raise HTTPException(status_code=400, detail="content_id and content_type are required")
         
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Update based on content type
-        if content_type == 'posts':
-            cursor.execute("""
-                UPDATE forum_posts 
-                SET is_flagged = FALSE, updated_at = NOW()
-                WHERE id = %s
-            """, (content_id,))
-        elif content_type == 'jobs':
-            cursor.execute("""
-                UPDATE jobs 
-                SET is_flagged = FALSE, updated_at = NOW()
-                WHERE id = %s
-            """, (content_id,))
-        
-        # Log admin action
-        cursor.execute("""
-            INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
-            VALUES (%s, 'content_moderation', %s, %s, 'Approved flagged content')
-        """, (current_user['id'], content_type, content_id))
-        
-        connection.commit()
-        cursor.close()
-        connection.close()
-        
-        return {
-            "success": True,
-            "message": "Content approved successfully"
-        }
-    
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                
+                # Update based on content type
+                if content_type == 'posts':
+                    await cursor.execute("""
+                        UPDATE forum_posts 
+                        SET is_flagged = FALSE, updated_at = NOW()
+                        WHERE id = %s
+                    """, (content_id,))
+                elif content_type == 'jobs':
+                    await cursor.execute("""
+                        UPDATE jobs 
+                        SET is_flagged = FALSE, updated_at = NOW()
+                        WHERE id = %s
+                    """, (content_id,))
+                
+                # Log admin action
+                await cursor.execute("""
+                    INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
+                    VALUES (%s, 'content_moderation', %s, %s, 'Approved flagged content')
+                """, (current_user['id'], content_type, content_id))
+                
+                await conn.commit()
+                if content_type == 'jobs':
+                    await invalidate_tags("jobs")
+                
+                return {
+                    "success": True,
+                    "message": "Content approved successfully"
+                }
+            
     except HTTPException:
         raise
     except Exception as e:
@@ -159,38 +159,38 @@ async def remove_content(
         if not content_id or not content_type:
             raise HTTPException(status_code=400, detail="content_id and content_type are required")
         
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Delete or mark as deleted based on content type
-        if content_type == 'posts':
-            cursor.execute("""
-                UPDATE forum_posts 
-                SET is_deleted = TRUE, updated_at = NOW()
-                WHERE id = %s
-            """, (content_id,))
-        elif content_type == 'jobs':
-            cursor.execute("""
-                UPDATE jobs 
-                SET status = 'removed', updated_at = NOW()
-                WHERE id = %s
-            """, (content_id,))
-        
-        # Log admin action
-        cursor.execute("""
-            INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
-            VALUES (%s, 'content_moderation', %s, %s, 'Removed flagged content')
-        """, (current_user['id'], content_type, content_id))
-        
-        connection.commit()
-        cursor.close()
-        connection.close()
-        
-        return {
-            "success": True,
-            "message": "Content removed successfully"
-        }
-    
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                
+                # Delete or mark as deleted based on content type
+                if content_type == 'posts':
+                    await cursor.execute("""
+                        UPDATE forum_posts 
+                        SET is_deleted = TRUE, updated_at = NOW()
+                        WHERE id = %s
+                    """, (content_id,))
+                elif content_type == 'jobs':
+                    await cursor.execute("""
+                        UPDATE jobs 
+                        SET status = 'removed', updated_at = NOW()
+                        WHERE id = %s
+                    """, (content_id,))
+                
+                # Log admin action
+                await cursor.execute("""
+                    INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
+                    VALUES (%s, 'content_moderation', %s, %s, 'Removed flagged content')
+                """, (current_user['id'], content_type, content_id))
+                
+                await conn.commit()
+                if content_type == 'jobs':
+                    await invalidate_tags("jobs")
+                
+                return {
+                    "success": True,
+                    "message": "Content removed successfully"
+                }
+            
     except HTTPException:
         raise
     except Exception as e:
@@ -212,42 +212,40 @@ async def warn_author(
         if not content_id or not content_type:
             raise HTTPException(status_code=400, detail="content_id and content_type are required")
         
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Get author id based on content type
-        author_id = None
-        if content_type == 'posts':
-            cursor.execute("SELECT author_id FROM forum_posts WHERE id = %s", (content_id,))
-            result = cursor.fetchone()
-            author_id = result['author_id'] if result else None
-        elif content_type == 'jobs':
-            cursor.execute("SELECT posted_by FROM jobs WHERE id = %s", (content_id,))
-            result = cursor.fetchone()
-            author_id = result['posted_by'] if result else None
-        
-        if author_id:
-            # Create warning notification
-            cursor.execute("""
-                INSERT INTO notifications (user_id, type, title, message, link, priority)
-                VALUES (%s, 'system', 'Content Warning', %s, NULL, 'high')
-            """, (author_id, f"Your content has been flagged for: {reason}"))
-        
-        # Log admin action
-        cursor.execute("""
-            INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
-            VALUES (%s, 'content_moderation', %s, %s, %s)
-        """, (current_user['id'], content_type, content_id, f'Warned author: {reason}'))
-        
-        connection.commit()
-        cursor.close()
-        connection.close()
-        
-        return {
-            "success": True,
-            "message": "Warning sent to author"
-        }
-    
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                
+                # Get author id based on content type
+                author_id = None
+                if content_type == 'posts':
+                    await cursor.execute("SELECT author_id FROM forum_posts WHERE id = %s", (content_id,))
+                    result = await cursor.fetchone()
+                    author_id = result['author_id'] if result else None
+                elif content_type == 'jobs':
+                    await cursor.execute("SELECT posted_by FROM jobs WHERE id = %s", (content_id,))
+                    result = await cursor.fetchone()
+                    author_id = result['posted_by'] if result else None
+                
+                if author_id:
+                    # Create warning notification
+                    await cursor.execute("""
+                        INSERT INTO notifications (user_id, type, title, message, link, priority)
+                        VALUES (%s, 'system', 'Content Warning', %s, NULL, 'high')
+                    """, (author_id, f"Your content has been flagged for: {reason}"))
+                
+                # Log admin action
+                await cursor.execute("""
+                    INSERT INTO admin_actions (admin_id, action_type, target_type, target_id, description)
+                    VALUES (%s, 'content_moderation', %s, %s, %s)
+                """, (current_user['id'], content_type, content_id, f'Warned author: {reason}'))
+                
+                await conn.commit()
+                
+                return {
+                    "success": True,
+                    "message": "Warning sent to author"
+                }
+            
     except HTTPException:
         raise
     except Exception as e:
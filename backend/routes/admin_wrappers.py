@@ -4,7 +4,7 @@ Maps missing admin routes to existing backend endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException
 from middleware.auth_middleware import require_admin
-from database.connection import get_sync_db_connection, USE_MOCK_DB
+from database.connection import fetch_all, fetch_one, USE_MOCK_DB, gather_queries
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,60 +34,47 @@ async def get_admin_stats():
                 "pendingVerifications": 3
             }
         
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Total users by role
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalUsers,
-                SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeUsers,
-                SUM(CASE WHEN role = 'student' THEN 1 ELSE 0 END) as totalStudents,
-                SUM(CASE WHEN role = 'alumni' THEN 1 ELSE 0 END) as totalAlumni,
-                SUM(CASE WHEN role = 'recruiter' THEN 1 ELSE 0 END) as totalRecruiters
-            FROM users
-        """)
-        user_stats = cursor.fetchone()
-        
-        # Verified alumni - check if table exists first
-        verified_alumni = 0
-        try:
-            cursor.execute("SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE")
-            verified_stats = cursor.fetchone()
-            verified_alumni = verified_stats.get('verifiedAlumni', 0) if verified_stats else 0
-        except Exception:
-            # Table doesn't exist or query failed, use default
-            verified_alumni = 0
-        
-        # Jobs stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalJobs,
-                SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeJobs
-            FROM jobs
-        """)
-        job_stats = cursor.fetchone()
-        
-        # Events stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as totalEvents,
-                SUM(CASE WHEN event_date > NOW() THEN 1 ELSE 0 END) as upcomingEvents
-            FROM events
-        """)
-        event_stats = cursor.fetchone()
-        
-        # Forum posts
-        cursor.execute("SELECT COUNT(*) as totalPosts FROM forum_posts")
-        forum_stats = cursor.fetchone()
-        
-        # Mentorship requests
-        cursor.execute("SELECT COUNT(*) as totalMentorshipRequests FROM mentorship_requests")
-        mentorship_stats = cursor.fetchone()
-        
-        cursor.close()
-        connection.close()
-        
+        async def verified_alumni_count():
+            # Verified alumni - table may not exist yet
+            try:
+                verified_stats = await fetch_one("SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE")
+                return verified_stats.get('verifiedAlumni', 0) if verified_stats else 0
+            except Exception:
+                # Table doesn't exist or query failed, use default
+                return 0
+
+        user_stats, verified_alumni, job_stats, event_stats, forum_stats, mentorship_stats = await gather_queries(
+            # Total users by role
+            fetch_one("""
+                SELECT 
+                    COUNT(*) as totalUsers,
+                    SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeUsers,
+                    SUM(CASE WHEN role = 'student' THEN 1 ELSE 0 END) as totalStudents,
+                    SUM(CASE WHEN role = 'alumni' THEN 1 ELSE 0 END) as totalAlumni,
+                    SUM(CASE WHEN role = 'recruiter' THEN 1 ELSE 0 END) as totalRecruiters
+                FROM users
+            """),
+            verified_alumni_count(),
+            # Jobs stats
+            fetch_one("""
+                SELECT 
+                    COUNT(*) as totalJobs,
+                    SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeJobs
+                FROM jobs
+            """),
+            # Events stats
+            fetch_one("""
+                SELECT 
+                    COUNT(*) as totalEvents,
+                    SUM(CASE WHEN event_date > NOW() THEN 1 ELSE 0 END) as upcomingEvents
+                FROM events
+            """),
+            # Forum posts
+            fetch_one("SELECT COUNT(*) as totalPosts FROM forum_posts"),
+            # Mentorship requests
+            fetch_one("SELECT COUNT(*) as totalMentorshipRequests FROM mentorship_requests"),
+        )
+
         return {
             "success": True,
             "data": {
@@ -99,7 +86,7 @@ async def get_admin_stats():
                 "mentorshipRequests": mentorship_stats['totalMentorshipRequests']
             }
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching dashboard stats: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -112,69 +99,60 @@ async def get_admin_content():
     Returns forum posts, jobs, events, etc.
     """
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Get forum posts
-        cursor.execute("""
-            SELECT 
-                'forum_post' as content_type,
-                id,
-                title,
-                content,
-                author_id,
-                created_at,
-                is_deleted
-            FROM forum_posts
-            ORDER BY created_at DESC
-            LIMIT 50
-        """)
-        forum_posts = cursor.fetchall()
-        
-        # Get jobs
-        cursor.execute("""
-            SELECT 
-                'job' as content_type,
-                id,
-                title,
-                description as content,
-                posted_by as author_id,
-                created_at
-            FROM jobs
-            ORDER BY created_at DESC
-            LIMIT 50
-        """)
-        jobs = cursor.fetchall()
-        
-        # Get events
-        cursor.execute("""
-            SELECT 
-                'event' as content_type,
-                id,
-                title,
-                description as content,
-                organizer_id as author_id,
-                created_at
-            FROM events
-            ORDER BY created_at DESC
-            LIMIT 50
-        """)
-        events = cursor.fetchall()
-        
+        forum_posts, jobs, events = await gather_queries(
+            # Get forum posts
+            fetch_all("""
+                SELECT 
+                    'forum_post' as content_type,
+                    id,
+                    title,
+                    content,
+                    author_id,
+                    created_at,
+                    is_deleted
+                FROM forum_posts
+                ORDER BY created_at DESC
+                LIMIT 50
+            """),
+            # Get jobs
+            fetch_all("""
+                SELECT 
+                    'job' as content_type,
+                    id,
+                    title,
+                    description as content,
+                    posted_by as author_id,
+                    created_at
+                FROM jobs
+                ORDER BY created_at DESC
+                LIMIT 50
+            """),
+            # Get events
+            fetch_all("""
+                SELECT 
+                    'event' as content_type,
+                    id,
+                    title,
+                    description as content,
+                    organizer_id as author_id,
+                    created_at
+                FROM events
+                ORDER BY created_at DESC
+                LIMIT 50
+            """),
+        )
+
         # Format dates
         all_content = forum_posts + jobs + events
         for item in all_content:
             if item.get('created_at'):
                 item['created_at'] = item['created_at'].isoformat()
-        
-        cursor.close()
-        connection.close()
-        
+
         return {
             "success": True,
             "data": all_content
         }
-    
+
     except Exception as e:
         logger.error(f"Error fetching admin content: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
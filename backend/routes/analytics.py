@@ -1,5 +1,5 @@
 """Analytics routes for reporting and insights"""
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from typing import List, Dict, Any
 
 from database.models import (
@@ -9,12 +9,24 @@ from database.models import (
 )
 from services.analytics_service import AnalyticsService
 from middleware.auth_middleware import require_admin
+from redis_client import RedisConfig
+from utils.route_cache import route_cache
 
 router = APIRouter(prefix="/api/admin/analytics", tags=["Admin Analytics"])
 
 
+def _set_freshness_headers(response: Response, freshness: Dict[str, Any]) -> None:
+    """Report rollup freshness on endpoints whose body is a bare list"""
+    response.headers["X-Analytics-Source"] = freshness["source"]
+    if freshness["refreshed_at"]:
+        response.headers["X-Analytics-Refreshed-At"] = freshness["refreshed_at"]
+        response.headers["X-Analytics-Age-Seconds"] = str(freshness["age_seconds"])
+
+
 @router.get("/skills", response_model=List[SkillDistribution])
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_skills_distribution(
+    response: Response,
     limit: int = Query(20, ge=1, le=100, description="Number of top skills to return"),
     current_user: UserResponse = Depends(require_admin)
 ):
@@ -27,6 +39,7 @@ async def get_skills_distribution(
     """
     try:
         skills = await AnalyticsService.get_skills_distribution(limit=limit)
+        _set_freshness_headers(response, await AnalyticsService.get_freshness())
         return skills
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -51,7 +64,9 @@ async def get_locations_distribution(
 
 
 @router.get("/companies", response_model=List[CompanyDistribution])
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_companies_distribution(
+    response: Response,
     limit: int = Query(20, ge=1, le=100, description="Number of top companies to return"),
     current_user: UserResponse = Depends(require_admin)
 ):
@@ -64,13 +79,16 @@ async def get_companies_distribution(
     """
     try:
         companies = await AnalyticsService.get_companies_distribution(limit=limit)
+        _set_freshness_headers(response, await AnalyticsService.get_freshness())
         return companies
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/batches", response_model=List[BatchDistribution])
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_batches_distribution(
+    response: Response,
     current_user: UserResponse = Depends(require_admin)
 ):
     """
@@ -82,13 +100,16 @@ async def get_batches_distribution(
     """
     try:
         batches = await AnalyticsService.get_batches_distribution()
+        _set_freshness_headers(response, await AnalyticsService.get_freshness())
         return batches
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/job-trends", response_model=List[JobTrendsByCategory])
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_job_trends(
+    response: Response,
     current_user: UserResponse = Depends(require_admin)
 ):
     """
@@ -100,6 +121,7 @@ async def get_job_trends(
     """
     try:
         trends = await AnalyticsService.get_job_trends()
+        _set_freshness_headers(response, await AnalyticsService.get_freshness())
         return trends
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -178,6 +200,7 @@ async def get_engagement_metrics(
 # ============================================================================
 
 @router.get("/dashboard")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_dashboard_stats(
     current_user: UserResponse = Depends(require_admin)
 ):
@@ -197,13 +220,15 @@ async def get_dashboard_stats(
         metrics = await AnalyticsService.get_dashboard_metrics()
         return {
             "success": True,
-            "data": metrics
+            "data": metrics,
+            "freshness": await AnalyticsService.get_freshness()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/user-growth")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_user_growth(
     period: str = Query("monthly", description="Time period: daily, weekly, monthly"),
     current_user: UserResponse = Depends(require_admin)
@@ -237,7 +262,8 @@ async def get_user_growth(
         
         return {
             "success": True,
-            "data": user_growth[-12:] if user_growth else []  # Last 12 months
+            "data": user_growth[-12:] if user_growth else [],  # Last 12 months
+            "freshness": await AnalyticsService.get_freshness()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -278,6 +304,7 @@ async def get_top_contributors(
 
 
 @router.get("/activity")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_platform_activity(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     current_user: UserResponse = Depends(require_admin)
@@ -324,13 +351,15 @@ async def get_platform_activity(
         
         return {
             "success": True,
-            "data": activity
+            "data": activity,
+            "freshness": await AnalyticsService.get_freshness()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/alumni")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_alumni_analytics(
     current_user: UserResponse = Depends(require_admin)
 ):
@@ -399,13 +428,15 @@ async def get_alumni_analytics(
                 'topCompanies': company_data,
                 'batchDistribution': batch_data,
                 'topSkills': skill_data
-            }
+            },
+            "freshness": await AnalyticsService.get_freshness()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/jobs")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["analytics"])
 async def get_job_analytics(
     current_user: UserResponse = Depends(require_admin)
 ):
@@ -483,7 +514,8 @@ async def get_job_analytics(
                 'jobsByLocation': location_data,
                 'applicationTrends': application_trends,
                 'topSkillsRequired': skill_data
-            }
+            },
+            "freshness": await AnalyticsService.get_freshness()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -593,7 +625,6 @@ async def get_event_analytics(
     """
     try:
         event_stats = await AnalyticsService.get_event_participation_stats()
-        dashboard_metrics = await AnalyticsService.get_dashboard_metrics()
         
         # Format event type data
         event_type_data = []
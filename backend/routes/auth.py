@@ -13,6 +13,7 @@ from database.models import (
 from services.auth_service import AuthService
 from middleware.auth_middleware import get_current_user
 from middleware.rate_limit import strict_rate_limit, moderate_rate_limit
+from utils.security import hash_password_async, verify_password_async
 
 logger = logging.getLogger(__name__)
 
@@ -442,8 +443,6 @@ async def change_password(
     - Requires valid JWT token
     """
     try:
-        import bcrypt
-        
         current_password = password_data.get('current_password')
         new_password = password_data.get('new_password')
         
@@ -471,16 +470,16 @@ async def change_password(
                 stored_hash = result[0]
                 
                 # Verify current password
-                if not bcrypt.checkpw(current_password.encode('utf-8'), stored_hash.encode('utf-8')):
+                if not await verify_password_async(current_password, stored_hash):
                     raise ValueError("Current password is incorrect")
                 
                 # Hash new password
-                new_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+                new_hash = await hash_password_async(new_password)
                 
                 # Update password
                 await cursor.execute("""
                     UPDATE users SET password_hash = %s WHERE id = %s
-                """, (new_hash.decode('utf-8'), current_user['id']))
+                """, (new_hash, current_user['id']))
                 
                 await conn.commit()
                 
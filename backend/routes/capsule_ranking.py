@@ -346,12 +346,7 @@ async def ranking_health_check():
         ranking_service = get_ranking_service()
         
         # Check Redis
-        redis_status = "connected"
-        try:
-            if ranking_service.redis:
-                ranking_service.redis.ping()
-        except Exception:
-            redis_status = "disconnected"
+        redis_status = "connected" if await ranking_service.ping_cache() else "disconnected"
         
         return {
             'success': True,
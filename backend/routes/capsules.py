@@ -17,6 +17,8 @@ from database.models import (
 )
 from middleware.auth_middleware import get_current_user, require_roles
 from services.capsule_service import CapsuleService
+from redis_client import RedisConfig
+from utils.route_cache import route_cache
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +158,7 @@ async def get_my_bookmarks(
 
 
 @router.get("/categories")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["capsules"])
 async def get_categories(
     current_user: Optional[dict] = Depends(get_current_user)
 ):
@@ -9,6 +9,8 @@ import logging
 from middleware.auth_middleware import get_current_user
 from database.connection import get_db_pool
 from services.career_prediction_service import CareerPredictionService
+from redis_client import RedisConfig
+from utils.route_cache import route_cache
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +125,7 @@ async def predict_career_path_for_user(
 
 
 @router.get("/paths")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["career_paths"])
 async def get_common_career_paths(
     limit: int = Query(20, ge=1, le=100),
     startingRole: Optional[str] = Query(None, alias="startingRole"),
@@ -172,6 +175,7 @@ async def get_common_career_paths(
 
 
 @router.get("/transitions")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["career_paths"])
 async def get_career_transitions(
     limit: int = Query(20, ge=1, le=100),
     current_user: dict = Depends(get_current_user)
@@ -216,6 +220,7 @@ async def get_career_transitions(
 
 
 @router.get("/paths/{skill}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["career_paths"])
 async def get_paths_by_skill(
     skill: str,
     limit: int = Query(10, ge=1, le=50),
@@ -191,6 +191,15 @@ async def get_upload_progress(
             processed_rows = total_rows
         else:
             processed_rows = int(total_rows * progress_percentage / 100) if total_rows else 0
+            
+            # Per-chunk progress published by the streaming ingestion
+            chunk_progress = await DatasetService.get_progress(upload_id)
+            if chunk_progress and chunk_progress['stage'] == upload['status']:
+                start, end = (0, 40) if upload['status'] == 'validating' else (40, 100)
+                progress_percentage = int(start + (end - start) * chunk_progress['fraction'])
+                processed_rows = chunk_progress['processed_rows']
+                valid_rows = chunk_progress['valid_rows']
+                error_rows = chunk_progress['error_rows']
         
         # Estimate time remaining
         estimated_time_remaining = None
@@ -170,12 +170,17 @@ async def create_post(
 async def get_all_posts(
     search: Optional[str] = Query(None),
     tags: Optional[str] = Query(None),  # Comma-separated tags
-    sort: Optional[str] = Query("recent", regex="^(recent|popular|trending)$"),
+    sort: Optional[str] = Query(None, regex="^(recent|popular|trending|relevance)$"),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: Optional[dict] = Depends(get_current_user)
 ):
-    """Get all forum posts with filters"""
+    """
+    Get all forum posts with filters (pass `next_cursor` as `cursor` for the next page)
+    
+    `sort` defaults to `relevance` when `search` is given, otherwise `recent`.
+    """
     try:
         # Parse tags if provided
         tags_list = tags.split(",") if tags else None
@@ -189,12 +194,17 @@ async def get_all_posts(
             sort_by=sort,
             limit=limit,
             offset=offset,
-            user_id=user_id
+            user_id=user_id,
+            page_cursor=cursor
         )
+        next_cursor = ForumService.post_cursor(posts[-1], sort) if len(posts) == limit else None
         return {
             "success": True,
-            "data": [transform_author_data(post.model_dump()) for post in posts]
+            "data": [transform_author_data(post.model_dump()) for post in posts],
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching posts: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
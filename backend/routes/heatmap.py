@@ -9,6 +9,8 @@ import logging
 from middleware.auth_middleware import get_current_user, require_role
 from database.connection import get_db_pool
 from services.heatmap_service import HeatmapService
+from redis_client import RedisConfig
+from utils.route_cache import invalidate_tags, route_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,7 @@ heatmap_service = HeatmapService()
 
 
 @router.get("/geographic")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_geographic_data(
     min_alumni_count: int = Query(1, ge=1),
     min_jobs_count: int = Query(1, ge=1),
@@ -93,6 +96,7 @@ async def get_geographic_data(
 
 
 @router.get("/alumni-distribution")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_alumni_distribution(
     min_alumni_count: int = Query(1, ge=1),
     current_user: dict = Depends(get_current_user)
@@ -133,6 +137,7 @@ async def get_alumni_distribution(
 
 
 @router.get("/job-distribution")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_job_distribution(
     min_jobs_count: int = Query(1, ge=1),
     current_user: dict = Depends(get_current_user)
@@ -173,6 +178,7 @@ async def get_job_distribution(
 
 
 @router.get("/talent")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_talent_heatmap(
     min_alumni_count: int = Query(1, ge=1, description="Minimum alumni count to include location"),
     current_user: dict = Depends(get_current_user)
@@ -225,6 +231,7 @@ async def get_talent_heatmap(
 
 
 @router.get("/opportunities")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_opportunity_heatmap(
     min_jobs_count: int = Query(1, ge=1, description="Minimum jobs count to include location"),
     current_user: dict = Depends(get_current_user)
@@ -278,6 +285,7 @@ async def get_opportunity_heatmap(
 
 
 @router.get("/industries")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_industry_distribution(
     current_user: dict = Depends(get_current_user)
 ):
@@ -351,6 +359,7 @@ async def get_industry_distribution(
 
 
 @router.get("/combined")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_combined_heatmap(
     min_alumni_count: int = Query(1, ge=1),
     min_jobs_count: int = Query(1, ge=1),
@@ -479,6 +488,7 @@ async def refresh_geographic_data(
 
 
 @router.get("/location/{location_identifier}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_location_details(
     location_identifier: str,
     current_user: dict = Depends(get_current_user)
@@ -597,6 +607,7 @@ async def generate_talent_clusters(
             async with conn.cursor() as cursor:
                 await cursor.execute("DELETE FROM talent_clusters")
                 await conn.commit()
+            await invalidate_tags("heatmap")
             
             # Generate new clusters
             result = await heatmap_service.cluster_alumni_by_location(
@@ -620,6 +631,7 @@ async def generate_talent_clusters(
 
 
 @router.get("/clusters")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_talent_clusters(
     min_cluster_size: int = Query(1, ge=1, description="Minimum alumni count in cluster"),
     current_user: dict = Depends(get_current_user)
@@ -665,6 +677,7 @@ async def get_talent_clusters(
 
 
 @router.get("/clusters/{cluster_id}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap", "profiles"])
 async def get_cluster_details(
     cluster_id: str,
     current_user: dict = Depends(get_current_user)
@@ -707,6 +720,7 @@ async def get_cluster_details(
 
 
 @router.get("/skills")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_all_skills(
     current_user: dict = Depends(get_current_user)
 ):
@@ -770,6 +784,7 @@ async def get_all_skills(
 
 
 @router.get("/emerging-hubs")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
 async def get_emerging_hubs(
     limit: int = Query(10, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
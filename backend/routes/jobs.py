@@ -17,6 +17,8 @@ from database.models import (
 from services.job_service import JobService
 from middleware.auth_middleware import get_current_user, require_role
 from utils.validators import validate_uuid
+from utils.route_cache import route_cache
+from redis_client import RedisConfig
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +151,7 @@ async def create_job(
 
 
 @router.get("", response_model=dict)
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_SHORT, tags=["jobs"])
 async def get_jobs(
     status: Optional[str] = None,
     company: Optional[str] = None,
@@ -157,12 +160,17 @@ async def get_jobs(
     search: Optional[str] = None,
     skills: Optional[List[str]] = Query(None),
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
     """
     Get all jobs with optional filters
     - **Public endpoint** - Anyone can view jobs
     - **NEW**: Supports multiple skill filters via ?skills=Python&skills=React
+    - **search**: Full-text search over title and description (word prefixes, best matches first)
+    - **cursor**: `next_cursor` from the previous page (constant-time deep paging)
+    - **include_total**: set to false to skip the (cached) total count
     """
     try:
         # Convert status and job_type to enums if provided
@@ -177,7 +185,9 @@ async def get_jobs(
             search=search,
             skills=skills,
             page=page,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total
         )
         
         result = await JobService.search_jobs(search_params)
@@ -187,7 +197,9 @@ async def get_jobs(
             "total": result['total'],
             "page": result['page'],
             "limit": result['limit'],
-            "total_pages": result['total_pages']
+            "total_pages": result['total_pages'],
+            "next_cursor": result['next_cursor'],
+            "has_more": result['has_more']
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
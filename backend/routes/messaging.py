@@ -12,6 +12,7 @@ import os
 from middleware.auth_middleware import get_current_user
 from database.connection import get_db_pool, USE_MOCK_DB
 from services.messaging_service import MessagingService
+from services.realtime_service import COUNTER_MESSAGES, realtime_service
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +170,7 @@ async def send_message(
             result = await messaging_service.send_message(
                 conn, sender_id, recipient_id, message_text, attachment_url
             )
+            await realtime_service.message_created(result)
             return {
                 "success": True,
                 "data": result,
@@ -183,10 +185,12 @@ async def send_message(
 async def get_inbox(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all conversations for current user with last message preview
+    Pass the returned `next_cursor` as `cursor` to fetch the next page.
     """
     user_id = current_user.get("id")
     
@@ -206,6 +210,7 @@ async def get_inbox(
                 }
             ],
             "total": 1,
+            "next_cursor": None,
             "message": "Conversations retrieved (mock mode)"
         }
     
@@ -216,15 +221,22 @@ async def get_inbox(
         
         async with pool.acquire() as conn:
             conversations = await messaging_service.get_conversations_list(
-                conn, user_id, limit, offset
+                conn, user_id, limit, offset, page_cursor=cursor
+            )
+            next_cursor = (
+                messaging_service.conversation_cursor(conversations[-1])
+                if len(conversations) == limit else None
             )
             
             return {
                 "success": True,
                 "data": conversations,
                 "total": len(conversations),
+                "next_cursor": next_cursor,
                 "message": "Conversations retrieved successfully"
             }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving inbox: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve messages: {str(e)}")
@@ -270,24 +282,16 @@ async def get_conversation(
             raise HTTPException(status_code=503, detail="Database unavailable")
         
         async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                # Get conversation between two users
-                query = """
-                    SELECT id, sender_id, message_text as message, sent_at, read
-                    FROM messages
-                    WHERE (sender_id = %s AND recipient_id = %s)
-                       OR (sender_id = %s AND recipient_id = %s)
-                    ORDER BY sent_at DESC
-                    LIMIT %s
-                """
-                await cursor.execute(query, (current_user_id, user_id, user_id, current_user_id, limit))
-                messages = await cursor.fetchall()
-                
-                return {
-                    "success": True,
-                    "data": list(reversed(messages)),
-                    "message": "Conversation retrieved successfully"
-                }
+            messages = await messaging_service.get_conversation(conn, current_user_id, user_id, limit)
+            # Opening the conversation reads it: one watermark UPDATE
+            if await messaging_service.mark_conversation_read(conn, current_user_id, user_id):
+                await realtime_service.messages_read(current_user_id, sender_id=user_id)
+            
+            return {
+                "success": True,
+                "data": messages,
+                "message": "Conversation retrieved successfully"
+            }
     
     except Exception as e:
         logger.error(f"Error retrieving conversation: {str(e)}")
@@ -320,16 +324,19 @@ async def mark_as_read(
             raise HTTPException(status_code=503, detail="Database unavailable")
         
         async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                query = "UPDATE messages SET read = TRUE WHERE id = %s"
-                await cursor.execute(query, (message_id,))
-                await conn.commit()
-                
-                return {
-                    "success": True,
-                    "data": {"id": message_id, "read": True},
-                    "message": "Message marked as read"
-                }
+            marked = await messaging_service.mark_as_read(conn, message_id, current_user.get("id"))
+            if marked:
+                await realtime_service.messages_read(
+                    current_user.get("id"),
+                    sender_id=marked['sender_id'],
+                    data={'message_id': message_id, 'last_read_seq': marked['last_read_seq']}
+                )
+            
+            return {
+                "success": True,
+                "data": {"id": message_id, "read": True},
+                "message": "Message marked as read"
+            }
     
     except Exception as e:
         logger.error(f"Error marking message as read: {str(e)}")
@@ -354,18 +361,13 @@ async def get_unread_count(current_user: dict = Depends(get_current_user)):
         }
     
     try:
-        pool = await get_db_pool()
-        if pool is None:
-            raise HTTPException(status_code=503, detail="Database unavailable")
-        
-        async with pool.acquire() as conn:
-            count = await messaging_service.get_unread_count(conn, user_id)
-            
-            return {
-                "success": True,
-                "data": {"unread_count": count},
-                "message": "Unread count retrieved successfully"
-            }
+        # Served from the realtime counter; MySQL is only hit to seed it
+        count = await realtime_service.get_unread_count(user_id, COUNTER_MESSAGES)
+        return {
+            "success": True,
+            "data": {"unread_count": count},
+            "message": "Unread count retrieved successfully"
+        }
     except Exception as e:
         logger.error(f"Error getting unread count: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get unread count: {str(e)}")
@@ -16,6 +16,7 @@ from database.models import (
     NotificationPreferencesUpdate
 )
 from services.notification_service import NotificationService
+from services.realtime_service import COUNTER_NOTIFICATIONS, realtime_service
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +65,8 @@ async def get_unread_count(
     Returns the number of unread notifications
     """
     try:
-        count = await notification_service.get_unread_count(current_user['id'])
+        # Served from the realtime counter; MySQL is only hit to seed it
+        count = await realtime_service.get_unread_count(current_user['id'], COUNTER_NOTIFICATIONS)
         return UnreadCountResponse(unread_count=count)
         
     except Exception as e:
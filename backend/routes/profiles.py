@@ -17,6 +17,8 @@ from database.models import (
 from services.profile_service import ProfileService
 from middleware.auth_middleware import get_current_user, require_roles
 from utils.image_generator import generate_initials_avatar
+from utils.route_cache import route_cache
+from redis_client import RedisConfig
 import logging
 
 logger = logging.getLogger(__name__)
@@ -101,12 +103,14 @@ async def search_profiles(
     location: Optional[str] = None,
     verified_only: bool = False,
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
     """
     Search alumni profiles with filters
     
-    - **name**: Search by name (partial match)
+    - **name**: Search by name (word prefixes, best matches first)
     - **company**: Filter by company (partial match)
     - **skills**: Filter by skills (comma-separated, e.g., "Python,React")
     - **batch_year**: Filter by graduation year
@@ -115,6 +119,8 @@ async def search_profiles(
     - **verified_only**: Show only verified profiles
     - **page**: Page number (default: 1)
     - **limit**: Results per page (default: 20, max: 100)
+    - **cursor**: `next_cursor` from the previous page (takes precedence over page)
+    - **include_total**: set to false to skip the (cached) total count
     """
     try:
         # Parse skills if provided
@@ -131,7 +137,9 @@ async def search_profiles(
             location=location,
             verified_only=verified_only,
             page=page,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total
         )
         
         result = await ProfileService.search_profiles(search_params)
@@ -140,6 +148,11 @@ async def search_profiles(
             "success": True,
             "data": result
         }
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error searching profiles: {e}")
         raise HTTPException(
@@ -147,6 +160,7 @@ async def search_profiles(
             detail="Failed to search profiles"
         )
 @router.get("/filters/options", response_model=dict)
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_MEDIUM, tags=["profiles"])
 async def get_filter_options():
     """
     Get available filter options
@@ -0,0 +1,126 @@
+"""
+Realtime Routes
+Server push channel for new messages, read receipts, notifications and
+unread counters, replacing unread-count polling.
+
+- ``GET /api/realtime/stream`` - Server-Sent Events. EventSource cannot set
+  headers, so the JWT may be passed as ``?token=``; a Bearer header also works.
+- ``WS /api/realtime/ws?token=...`` - the same events as JSON frames.
+
+Every connection first receives an ``unread`` event with the current
+counts, then events as they are published (from any API or Celery worker).
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from middleware.auth_middleware import authenticate_token
+from redis_client import get_redis_client
+from services.realtime_service import EVENT_HEARTBEAT, realtime_hub
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/realtime", tags=["Realtime"])
+
+
+def _bearer_token(token: Optional[str], authorization: Optional[str]) -> Optional[str]:
+    if token:
+        return token
+    if authorization and authorization.lower().startswith('bearer '):
+        return authorization[7:]
+    return None
+
+
+async def _require_pubsub():
+    try:
+        await get_redis_client()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Realtime channel unavailable"
+        )
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events stream for the current user
+
+    Clients that get a 503 should fall back to polling the unread-count
+    endpoints.
+    """
+    raw_token = _bearer_token(token, authorization)
+    if not raw_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await authenticate_token(raw_token)
+    await _require_pubsub()
+
+    async def _sse():
+        events = realtime_hub.events(user['id'])
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event['type'] == EVENT_HEARTBEAT:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        _sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, token: str = Query(...)):
+    """WebSocket stream for the current user (server to client only)"""
+    try:
+        user = await authenticate_token(token)
+        await _require_pubsub()
+    except HTTPException as e:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION if e.status_code < 500 else status.WS_1011_INTERNAL_ERROR
+        )
+        return
+
+    await websocket.accept()
+    events = realtime_hub.events(user['id'])
+
+    async def _push():
+        async for event in events:
+            await websocket.send_json(event)
+
+    async def _drain():
+        # Client frames are ignored; reading them is how a disconnect is noticed
+        while True:
+            await websocket.receive_text()
+
+    push = asyncio.create_task(_push())
+    drain = asyncio.create_task(_drain())
+    try:
+        done, _ = await asyncio.wait({push, drain}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                logger.warning(f"Realtime socket for {user['id']} closed: {str(error)}")
+    finally:
+        for task in (push, drain):
+            task.cancel()
+        await asyncio.gather(push, drain, return_exceptions=True)
+        await events.aclose()
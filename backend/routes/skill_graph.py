@@ -9,6 +9,8 @@ import logging
 from middleware.auth_middleware import get_current_user, require_role
 from database.connection import get_db_pool
 from services.skill_graph_service import SkillGraphService
+from redis_client import RedisConfig
+from utils.route_cache import route_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,7 @@ skill_graph_service = SkillGraphService()
 
 
 @router.get("")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_skills(
     min_popularity: float = Query(0.0, ge=0.0, le=100.0),
     limit: int = Query(100, ge=1, le=500),
@@ -50,6 +53,7 @@ async def get_skills(
 
 
 @router.get("/network")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_skill_network(
     min_popularity: float = Query(0.0, ge=0.0, le=100.0),
     limit: int = Query(100, ge=1, le=500),
@@ -126,6 +130,7 @@ async def get_skill_network(
 
 
 @router.get("/skill/{skill_name}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_skill_details(
     skill_name: str,
     current_user: dict = Depends(get_current_user)
@@ -162,6 +167,7 @@ async def get_skill_details(
 
 
 @router.get("/paths")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph", "profiles"])
 async def find_career_paths_by_skill(
     skill: str = Query(..., description="Skill name to find career paths"),
     limit: int = Query(10, ge=1, le=50),
@@ -198,6 +204,7 @@ async def find_career_paths_by_skill(
 
 
 @router.get("/clusters")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_skill_clusters(
     min_popularity: float = Query(0.0, ge=0.0, le=100.0),
     current_user: dict = Depends(get_current_user)
@@ -236,6 +243,7 @@ async def get_skill_clusters(
 
 
 @router.get("/trending")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_trending_skills(
     limit: int = Query(20, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
@@ -271,6 +279,7 @@ async def get_trending_skills(
 
 
 @router.get("/related/{skill_name}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_related_skills(
     skill_name: str,
     limit: int = Query(10, ge=1, le=50),
@@ -314,6 +323,7 @@ async def get_related_skills(
 
 
 @router.get("/network/{skill_name}")
+@route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["skill_graph"])
 async def get_focused_network(
     skill_name: str,
     limit: int = Query(10, ge=1, le=50),
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill the entity_skills index
+Creates the skill_dictionary / entity_skills tables if needed and indexes the
+skills of every job, alumni profile and knowledge capsule. Skill filters switch
+from JSON_CONTAINS to the index once an entity type has been backfilled.
+Safe to re-run: each entity's rows are replaced, not appended.
+
+Usage:
+    python scripts/backfill_entity_skills.py [job|profile|capsule ...] [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database.connection import get_db_pool, close_db_pool
+from services.entity_skill_service import EntitySkillService, ENTITY_SOURCES
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main(entity_types, batch_size: int) -> int:
+    """Main execution function"""
+    logger.info("🚀 Starting entity_skills backfill...")
+    
+    try:
+        pool = await get_db_pool()
+        if pool is None:
+            logger.error("❌ Database unavailable (mock mode)")
+            return 1
+        
+        started = time.perf_counter()
+        async with pool.acquire() as conn:
+            counts = await EntitySkillService.backfill(conn, entity_types, batch_size)
+        
+        logger.info("=" * 60)
+        logger.info(f"✅ Backfill completed in {time.perf_counter() - started:.1f}s")
+        for entity_type, count in counts.items():
+            logger.info(f"   - {entity_type}: {count} rows indexed")
+        logger.info("=" * 60)
+        
+    except Exception as e:
+        logger.error(f"❌ Error backfilling entity_skills: {str(e)}")
+        logger.exception("Full traceback:")
+        return 1
+    finally:
+        await close_db_pool()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the entity_skills index")
+    parser.add_argument("entity_types", nargs="*", choices=list(ENTITY_SOURCES), help="Entity types to index (default: all)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    
+    exit_code = asyncio.run(main(args.entity_types or None, args.batch_size))
+    sys.exit(exit_code)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag regression check for the admin dashboards
+Runs a ticker coroutine that sleeps for a fixed interval and records how late
+it wakes up, while concurrent admin dashboard handlers (analytics, stats,
+audit and file stats) load against the real database. Blocking database
+calls on the event loop show up directly as lag. Reports p50 / p99 / max lag
+and dashboard latency, and exits non-zero when the max lag exceeds
+``--threshold-ms``.
+
+Usage:
+    python scripts/benchmark_admin_event_loop_lag.py [--concurrency N] [--rounds N] [--threshold-ms MS]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database.connection import get_db_pool, close_db_pool
+from routes import admin_analytics, admin_audit_logs, admin_files, admin_wrappers
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 0.005
+
+DASHBOARDS = [
+    admin_analytics.get_dashboard_stats,
+    admin_analytics.get_platform_activity,
+    admin_analytics.get_alumni_analytics,
+    admin_analytics.get_job_analytics,
+    admin_analytics.get_mentorship_analytics,
+    admin_analytics.get_event_analytics,
+    admin_analytics.get_engagement_metrics,
+    admin_wrappers.get_admin_stats,
+    admin_wrappers.get_admin_content,
+    admin_audit_logs.get_audit_stats,
+    admin_files.get_file_stats,
+]
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    """Record how late each ``TICK_SECONDS`` sleep wakes up, in ms"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, (time.perf_counter() - started - TICK_SECONDS) * 1000))
+
+
+async def load_dashboards(concurrency: int) -> list:
+    """Call every dashboard handler ``concurrency`` times at once; returns latencies in ms"""
+    async def timed(handler):
+        started = time.perf_counter()
+        await handler()
+        return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(
+        timed(handler) for _ in range(concurrency) for handler in DASHBOARDS
+    ))
+
+
+async def main(concurrency: int, rounds: int, threshold_ms: float) -> int:
+    """Main execution function"""
+    try:
+        pool = await get_db_pool()
+        if pool is None:
+            logger.error("❌ Database unavailable (mock mode)")
+            return 1
+
+        # Warm the pool so connection setup is not counted as lag
+        await load_dashboards(1)
+
+        lags, latencies = [], []
+        stop = asyncio.Event()
+        tick_task = asyncio.create_task(ticker(lags, stop))
+        started = time.perf_counter()
+        for _ in range(rounds):
+            latencies.extend(await load_dashboards(concurrency))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await tick_task
+
+        max_lag = max(lags) if lags else 0.0
+        logger.info("=" * 60)
+        logger.info(f"Dashboard calls: {len(latencies)} in {elapsed:.2f}s "
+                    f"({len(DASHBOARDS)} handlers x {concurrency} x {rounds} rounds)")
+        logger.info(f"Dashboard latency ms: p50={statistics.median(latencies):.1f} "
+                    f"p99={_percentile(latencies, 0.99):.1f}")
+        logger.info(f"Event-loop lag ms:    p50={statistics.median(lags or [0.0]):.1f} "
+                    f"p99={_percentile(lags or [0.0], 0.99):.1f} max={max_lag:.1f} "
+                    f"(threshold {threshold_ms:.1f})")
+        logger.info("=" * 60)
+
+        if max_lag > threshold_ms:
+            logger.error(f"❌ Event-loop lag {max_lag:.1f}ms exceeds {threshold_ms:.1f}ms")
+            return 1
+        logger.info("✅ Event-loop lag within threshold")
+
+    except Exception as e:
+        logger.error(f"❌ Error running event-loop lag benchmark: {str(e)}")
+        logger.exception("Full traceback:")
+        return 1
+    finally:
+        await close_db_pool()
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=5, help='Concurrent calls per dashboard handler')
+    parser.add_argument('--rounds', type=int, default=10, help='Load rounds to run')
+    parser.add_argument('--threshold-ms', type=float, default=50.0, help='Maximum allowed event-loop lag')
+    args = parser.parse_args()
+
+    exit_code = asyncio.run(main(args.concurrency, args.rounds, args.threshold_ms))
+    sys.exit(exit_code)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched career model inference
+Loads the latest trained model (ml/models by default), generates synthetic
+profiles from the encoders' known roles, industries and skills, and reports
+predictions per second for:
+  - ``predict`` called once per profile
+  - ``predict_batch`` at each batch size
+  - ``PredictionBatcher`` with N concurrent requests (micro-batched on a
+    worker thread), including how often the event loop stalled
+
+Usage:
+    python scripts/benchmark_career_model_batch.py [--profiles N] [--batch-sizes 1,8,32,128] [--concurrency N]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import ml.model_loader as model_loader_module
+from ml.model_loader import CareerModelLoader, PredictionBatcher
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def synthetic_profiles(loader: CareerModelLoader, count: int) -> list:
+    roles = list(loader.encoders['role_encoder'].classes_)
+    industries = list(loader.encoders['industry_encoder'].classes_)
+    skills = list(loader.encoders['skill_encoder'].classes_)
+    return [
+        {
+            "current_role": random.choice(roles),
+            "skills": random.sample(skills, min(len(skills), random.randint(3, 10))),
+            "years_of_experience": random.randint(0, 20),
+            "industry": random.choice(industries),
+        }
+        for _ in range(count)
+    ]
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Worst delay of a periodic tick while the batcher runs"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def main(model_dir: str, profile_count: int, batch_sizes: list, concurrency: int) -> int:
+    """Main function"""
+    try:
+        loader = CareerModelLoader(model_dir)
+        if not loader.load_latest_model():
+            logger.error("❌ No trained model found - run ml/train_career_model.py first")
+            return 1
+
+        profiles = synthetic_profiles(loader, profile_count)
+        logger.info(f"Model: {loader.get_model_info()['model_type']}, {profile_count} profiles")
+        logger.info("=" * 60)
+
+        started = time.perf_counter()
+        for profile in profiles:
+            loader.predict(profile)
+        single = profile_count / (time.perf_counter() - started)
+        logger.info(f"{'predict (one call each)':<32} {single:>10.0f} predictions/s")
+
+        for batch_size in batch_sizes:
+            started = time.perf_counter()
+            for i in range(0, profile_count, batch_size):
+                loader.predict_batch(profiles[i:i + batch_size])
+            rate = profile_count / (time.perf_counter() - started)
+            logger.info(f"{f'predict_batch (size {batch_size})':<32} {rate:>10.0f} predictions/s  ({rate / single:.1f}x)")
+
+        # The batcher scores through the global loader
+        model_loader_module._model_loader = loader
+        batcher = PredictionBatcher()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(profile):
+            async with semaphore:
+                return await batcher.predict(profile)
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(stop))
+        started = time.perf_counter()
+        await asyncio.gather(*[request(profile) for profile in profiles])
+        rate = profile_count / (time.perf_counter() - started)
+        stop.set()
+        worst_lag = await lag_task
+
+        stats = batcher.stats()
+        logger.info(
+            f"{f'PredictionBatcher ({concurrency} concurrent)':<32} {rate:>10.0f} predictions/s  "
+            f"(avg batch {stats['avg_batch_size']}, worst loop lag {worst_lag * 1000:.1f} ms)"
+        )
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"❌ Error running inference benchmark: {str(e)}")
+        logger.exception("Full traceback:")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', default=str(backend_path / 'ml' / 'models'), help='Directory with trained models')
+    parser.add_argument('--profiles', type=int, default=2000, help='Synthetic profiles to score')
+    parser.add_argument('--batch-sizes', default='1,8,32,128', help='Comma-separated predict_batch sizes')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent requests through the batcher')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.batch_sizes.split(',')]
+    exit_code = asyncio.run(main(args.model_dir, args.profiles, sizes, args.concurrency))
+    sys.exit(exit_code)
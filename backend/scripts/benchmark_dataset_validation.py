@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark dataset validation throughput
+Compares the row-by-row validators (``validate_*_row`` over
+``DataFrame.iterrows()``) with the compiled column rule sets on synthetic
+data with ~10% invalid rows, and reports rows per second for each.
+
+Usage:
+    python scripts/benchmark_dataset_validation.py [--rows N] [--file-type alumni|job_market|educational]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import pandas as pd
+
+from utils.dataset_validator import DatasetValidator
+
+ROW_VALIDATORS = {
+    'alumni': DatasetValidator.validate_alumni_row,
+    'job_market': DatasetValidator.validate_job_market_row,
+    'educational': DatasetValidator.validate_educational_row,
+}
+
+SKILLS = ['Python', 'SQL', 'React', 'AWS', 'Docker', 'Machine Learning', 'Java', 'Go']
+
+
+def _maybe(value, rng: random.Random, error_rate: float, bad_value=None):
+    return bad_value if rng.random() < error_rate else value
+
+
+def generate(file_type: str, rows: int, seed: int = 42, error_rate: float = 0.03) -> pd.DataFrame:
+    """Synthetic upload where each field is independently broken at ``error_rate``"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        skills = ', '.join(rng.sample(SKILLS, 3))
+        if file_type == 'alumni':
+            records.append({
+                'email': _maybe(f"user{i}@example.com", rng, error_rate, 'not-an-email'),
+                'name': _maybe(f"Alumni {i}", rng, error_rate, ''),
+                'batch_year': _maybe(str(rng.randint(1990, 2024)), rng, error_rate, '1800'),
+                'current_company': f"Company {i % 500}",
+                'skills': skills,
+            })
+        elif file_type == 'job_market':
+            low = rng.randint(30, 90) * 1000
+            records.append({
+                'job_title': _maybe(f"Engineer {i % 300}", rng, error_rate, None),
+                'company': f"Company {i % 500}",
+                'location': _maybe('Remote', rng, error_rate, ''),
+                'salary_min': str(low),
+                'salary_max': _maybe(str(low + 20000), rng, error_rate, str(low - 1000)),
+                'required_skills': skills,
+            })
+        else:
+            records.append({
+                'student_id': _maybe(f"S{i}", rng, error_rate, None),
+                'email': _maybe(f"student{i}@example.edu", rng, error_rate, 'bad@'),
+                'course_name': f"Course {i % 50}",
+                'skills_learned': skills,
+            })
+    return pd.DataFrame(records, dtype=object)
+
+
+def legacy_validate(df: pd.DataFrame, file_type: str) -> int:
+    """Previous implementation: one validator call per row via iterrows()"""
+    validate_func = ROW_VALIDATORS[file_type]
+    valid_rows = 0
+    for idx, row in df.iterrows():
+        is_valid, _ = validate_func(row, idx + 2)
+        valid_rows += is_valid
+    return valid_rows
+
+
+def timed(func, *args, repeat: int = 3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(rows: int, file_type: str) -> int:
+    df = generate(file_type, rows)
+    print(f"Validating {rows:,} synthetic {file_type} rows (best of 3)")
+
+    legacy_seconds, legacy_valid = timed(legacy_validate, df, file_type)
+    vector_seconds, report = timed(DatasetValidator.validate_dataset, df, file_type)
+
+    if legacy_valid != report['valid_rows']:
+        print(f"❌ Valid row mismatch: legacy={legacy_valid} rules={report['valid_rows']}")
+        return 1
+
+    print(f"{'implementation':<22}{'seconds':>10}{'rows/s':>14}")
+    print(f"{'row-by-row (iterrows)':<22}{legacy_seconds:>10.3f}{rows / legacy_seconds:>14,.0f}")
+    print(f"{'column rule set':<22}{vector_seconds:>10.3f}{rows / vector_seconds:>14,.0f}")
+    print(f"Speedup: {legacy_seconds / vector_seconds:.1f}x  ({report['valid_rows']:,} valid rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dataset validation throughput")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--file-type", choices=list(ROW_VALIDATORS), default='alumni')
+    args = parser.parse_args()
+
+    sys.exit(main(args.rows, args.file_type))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-text search against LIKE scans
+Loads a scratch table with synthetic message-like text (1M rows by default)
+and a FULLTEXT index, then times the same queries as ``LIKE '%term%'`` scans
+and as the ``MATCH ... AGAINST`` boolean-mode queries built by the search
+service, reporting p50 / p95 latency for each. The table is dropped at the
+end unless ``--keep`` is given (re-runs with ``--keep`` skip the load).
+
+Usage:
+    python scripts/benchmark_fulltext_search.py [--rows N] [--runs N] [--keep]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database.connection import get_db_pool, close_db_pool
+from services.search_service import boolean_query, like_clause, query_terms
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TABLE = 'search_benchmark_messages'
+LOAD_BATCH = 5000
+
+WORDS = [
+    'python', 'react', 'interview', 'referral', 'mentorship', 'kubernetes', 'startup',
+    'internship', 'resume', 'alumni', 'hiring', 'machine', 'learning', 'frontend',
+    'backend', 'salary', 'offer', 'meetup', 'conference', 'portfolio', 'analytics',
+    'design', 'product', 'manager', 'remote', 'relocation', 'graduate', 'research',
+    'thanks', 'tomorrow', 'weekend', 'project', 'deadline', 'coffee', 'network',
+]
+FILLER = ['the', 'and', 'for', 'with', 'about', 'your', 'next', 'week', 'could', 'please']
+
+QUERIES = ['kubernetes', 'react interview', 'mentor', 'machine learning referral', 'pyth']
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(4, 12)) + rng.choices(FILLER, k=rng.randint(2, 8))
+    rng.shuffle(words)
+    return ' '.join(words).capitalize() + '.'
+
+
+async def load(cursor, conn, rows: int, seed: int = 42) -> None:
+    await cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {TABLE} (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            message_text TEXT NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    await cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+    existing = (await cursor.fetchone())[0]
+    if existing >= rows:
+        logger.info(f"Reusing {existing} rows in {TABLE}")
+        return
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for start in range(existing, rows, LOAD_BATCH):
+        batch = [(_sentence(rng),) for _ in range(min(LOAD_BATCH, rows - start))]
+        await cursor.executemany(f"INSERT INTO {TABLE} (message_text) VALUES (%s)", batch)
+        await conn.commit()
+    logger.info(f"Loaded {rows - existing} rows in {time.perf_counter() - started:.1f}s")
+
+    await cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT'
+        """,
+        (TABLE,)
+    )
+    if not (await cursor.fetchone())[0]:
+        started = time.perf_counter()
+        await cursor.execute(f"ALTER TABLE {TABLE} ADD FULLTEXT ft_benchmark_text (message_text)")
+        logger.info(f"Built FULLTEXT index in {time.perf_counter() - started:.1f}s")
+
+
+async def time_query(cursor, sql: str, params: list, runs: int) -> tuple:
+    latencies, hits = [], 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        await cursor.execute(sql, params)
+        hits = len(await cursor.fetchall())
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return statistics.median(latencies), p95, hits
+
+
+async def main(rows: int, runs: int, limit: int, keep: bool) -> int:
+    """Main execution function"""
+    try:
+        pool = await get_db_pool()
+        if pool is None:
+            logger.error("❌ Database unavailable (mock mode)")
+            return 1
+
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await load(cursor, conn, rows)
+
+                logger.info("=" * 72)
+                logger.info(f"{'query':<28} {'LIKE p50/p95 ms':>20} {'MATCH p50/p95 ms':>20}")
+                for text in QUERIES:
+                    terms = query_terms(text)
+                    condition, params = like_clause(['message_text'], terms)
+                    like = await time_query(
+                        cursor,
+                        f"SELECT id FROM {TABLE} WHERE {condition} ORDER BY id DESC LIMIT %s",
+                        params + [limit], runs
+                    )
+                    match = "MATCH(message_text) AGAINST (%s IN BOOLEAN MODE)"
+                    fulltext = await time_query(
+                        cursor,
+                        f"SELECT id, {match} AS relevance FROM {TABLE} WHERE {match} "
+                        f"ORDER BY relevance DESC LIMIT %s",
+                        [boolean_query(terms), boolean_query(terms), limit], runs
+                    )
+                    logger.info(
+                        f"{text:<28} {like[0]:>9.1f}/{like[1]:<10.1f} {fulltext[0]:>9.1f}/{fulltext[1]:<10.1f}"
+                    )
+                logger.info("=" * 72)
+
+                if not keep:
+                    await cursor.execute(f"DROP TABLE {TABLE}")
+
+    except Exception as e:
+        logger.error(f"❌ Error running search benchmark: {str(e)}")
+        logger.exception("Full traceback:")
+        return 1
+    finally:
+        await close_db_pool()
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows in the scratch table')
+    parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+    parser.add_argument('--limit', type=int, default=20, help='Results per query')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch table for re-runs')
+    args = parser.parse_args()
+
+    exit_code = asyncio.run(main(args.rows, args.runs, args.limit, args.keep))
+    sys.exit(exit_code)
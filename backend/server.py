@@ -2,7 +2,7 @@
 AlumUnity Backend Server
 FastAPI application for Alumni Management System
 """
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
@@ -32,10 +32,11 @@ print(f"   DB_NAME: {os.getenv('DB_NAME', 'NOT SET')}")
 print(f"   USE_MOCK_DB: {os.getenv('USE_MOCK_DB', 'NOT SET')}")
 
 # Import database connection
-from database.connection import get_db_pool, close_db_pool, USE_MOCK_DB
+from database.connection import get_db_pool, close_db_pool, get_pool_stats, USE_MOCK_DB
+from services.entity_skill_service import EntitySkillService
 
 # Import Phase 10.1 infrastructure
-from redis_client import get_redis_client, close_redis_client
+from redis_client import RedisCache, get_redis_client, close_redis_client
 from storage import file_storage
 
 # Import routes
@@ -87,6 +88,7 @@ from routes.heatmap import router as heatmap_router
 # Import wrapper routes for frontend compatibility
 from routes.knowledge_routes import router as knowledge_router
 from routes.messaging import router as messaging_router
+from routes.realtime import router as realtime_router
 # Use fallback skills routes to avoid AI model import issues
 from routes.skills_fallback import router as skills_router
 from routes.wrapper_routes import router as wrapper_router
@@ -105,6 +107,9 @@ from routes.alumni_card import admin_router as alumni_card_admin_router
 
 # Import middleware
 from middleware.rate_limit import rate_limiter
+from middleware.auth_middleware import require_admin
+from services.realtime_service import realtime_hub
+from utils.security import shutdown_password_executor
 
 # Get CORS origins from environment or use defaults
 CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
@@ -138,8 +143,18 @@ async def startup_event():
             logger.info("🔄 Running in MOCK DATABASE mode - using in-memory mock data")
             logger.info("⚠️  Set USE_MOCK_DB=false in .env to use real MySQL database")
         else:
-            await get_db_pool()
+            pool = await get_db_pool()
             logger.info("✅ Database connection pool initialized")
+            
+            # Skill search index tables (populated by scripts/backfill_entity_skills.py)
+            if pool is not None:
+                try:
+                    async with pool.acquire() as conn:
+                        async with conn.cursor() as cursor:
+                            await EntitySkillService.ensure_tables(cursor)
+                        await conn.commit()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not ensure entity_skills tables: {str(e)}")
         
         # Initialize Redis (Phase 10.1)
         try:
@@ -162,6 +177,8 @@ async def startup_event():
 async def shutdown_event():
     """Clean up resources on shutdown"""
     try:
+        await realtime_hub.close()
+        shutdown_password_executor()
         await close_db_pool()
         logger.info("✅ Database connection pool closed")
         
@@ -219,6 +236,7 @@ async def health_check():
             "status": "healthy",
             "mode": "production",
             "database": "connected",
+            "pool": get_pool_stats(),
             "service": "AlumUnity API"
         }
     except Exception as e:
@@ -231,6 +249,24 @@ async def health_check():
             "service": "AlumUnity API"
         }, 503
 
+# Rate limiter metrics
+@api_router.get("/health/rate-limit", dependencies=[Depends(require_admin)])
+async def rate_limit_metrics():
+    """Rate limiter backend status and allow/block counters per scope"""
+    return rate_limiter.get_metrics()
+
+# Realtime push channel metrics
+@api_router.get("/health/realtime", dependencies=[Depends(require_admin)])
+async def realtime_metrics():
+    """Users and push connections served by this worker"""
+    return realtime_hub.stats()
+
+# Two-tier cache metrics
+@api_router.get("/health/cache", dependencies=[Depends(require_admin)])
+async def cache_metrics():
+    """Local/Redis hit counters and Redis latency per key prefix for this worker"""
+    return RedisCache.get_metrics()
+
 # Include authentication routes
 app.include_router(auth_router)
 
@@ -300,6 +336,7 @@ app.include_router(heatmap_router)
 # Include wrapper routes for frontend compatibility
 app.include_router(knowledge_router)
 app.include_router(messaging_router)
+app.include_router(realtime_router)
 app.include_router(skills_router)
 app.include_router(wrapper_router)
 app.include_router(career_paths_router)
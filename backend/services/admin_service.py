@@ -6,6 +6,8 @@ import aiomysql
 import json
 
 from database.connection import get_db_pool
+from services.user_service import user_status_cache
+from utils.route_cache import invalidate_tags
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +56,7 @@ class AdminService:
                 )
                 
                 await conn.commit()
+                await invalidate_tags("profiles")
                 
                 # Log admin action
                 await cursor.execute(
@@ -435,6 +438,7 @@ class AdminService:
                 
                 await cursor.execute(update_query, values)
                 await conn.commit()
+                await user_status_cache.invalidate(user_id)
                 
                 # Log admin action
                 await cursor.execute("""
@@ -469,6 +473,7 @@ class AdminService:
                     WHERE id = %s
                 """, (user_id,))
                 await conn.commit()
+                await user_status_cache.invalidate(user_id)
                 
                 # Log admin action
                 await cursor.execute("""
@@ -510,6 +515,7 @@ class AdminService:
                     WHERE id = %s
                 """, (user_id,))
                 await conn.commit()
+                await user_status_cache.invalidate(user_id)
                 
                 # Log admin action
                 await cursor.execute("""
@@ -550,6 +556,7 @@ class AdminService:
                     WHERE id = %s
                 """, (user_id,))
                 await conn.commit()
+                await user_status_cache.invalidate(user_id)
                 
                 # Log admin action
                 await cursor.execute("""
@@ -779,6 +786,8 @@ class AdminService:
                     raise ValueError(f"Unsupported content type: {content_type}")
                 
                 await conn.commit()
+                if content_type == 'job':
+                    await invalidate_tags("jobs")
                 
                 # Log admin action
                 await cursor.execute("""
@@ -1004,6 +1013,8 @@ class AdminService:
                 
                 if not conn.get_autocommit():
                     await conn.commit()
+                if created_count:
+                    await invalidate_tags("profiles")
                 
                 return {
                     "created_count": created_count,
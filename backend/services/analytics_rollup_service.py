@@ -0,0 +1,491 @@
+"""
+Analytics Rollup Service - materialized summary tables for admin analytics
+Keeps the tables from ``database/analytics_rollups.sql`` up to date so the
+analytics endpoints read a handful of pre-aggregated rows instead of
+scanning and grouping the source tables on every request:
+
+- ``analytics_daily_counts``: per-day series (signups, jobs posted, ...).
+  A refresh re-aggregates only the days touched by rows whose
+  ``updated_at`` is past the series watermark.
+- ``analytics_dimension_counts``: current counts per dimension value
+  (skills, companies, batches, job types, users by role, ...). Each source
+  row's contribution ("facets") is snapshotted in ``analytics_rollup_facets``;
+  a changed row is applied as the difference between its new and previous
+  facets, so the work is proportional to the number of changed rows.
+
+Incremental refreshes cannot see hard-deleted rows; a full refresh
+(``refresh(full=True)``, scheduled nightly) re-aggregates every series and
+subtracts the facets of rows that no longer exist.
+"""
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiomysql
+
+from database.connection import get_db_connection
+from utils.pagination import keyset_condition
+from utils.route_cache import invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_ENABLED = os.getenv('ANALYTICS_ROLLUPS_ENABLED', 'true').lower() == 'true'
+ROLLUP_BATCH_SIZE = int(os.getenv('ANALYTICS_ROLLUP_BATCH_SIZE', 1000))
+# Rows committed shortly before a run started may carry an older updated_at
+WATERMARK_OVERLAP_SECONDS = int(os.getenv('ANALYTICS_ROLLUP_OVERLAP_SECONDS', 120))
+FRESHNESS_CACHE_SECONDS = 5
+REFRESH_LOCK = 'analytics_rollup_refresh'
+# How long a full refresh waits for a running refresh to finish
+FULL_REFRESH_LOCK_WAIT_SECONDS = int(os.getenv('ANALYTICS_ROLLUP_LOCK_WAIT_SECONDS', 600))
+MAX_VALUE_LENGTH = 255
+
+Facet = Tuple[str, str, int]  # (dimension, value, weight)
+
+
+@dataclass(frozen=True)
+class DailySeries:
+    """``value`` aggregated per calendar day of ``date_column``"""
+    name: str
+    table: str
+    date_column: str
+    value: str = 'COUNT(*)'
+
+
+@dataclass(frozen=True)
+class FacetSource:
+    """A table whose rows contribute ``extract(row)`` to the dimension counts"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    extract: Callable[[Dict[str, Any]], List[Facet]]
+
+
+def _json_list(value: Any) -> list:
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def _user_facets(row: Dict[str, Any]) -> List[Facet]:
+    return [('user_role', row['role'], 1)] if row['is_active'] else []
+
+
+def _profile_facets(row: Dict[str, Any]) -> List[Facet]:
+    facets = [('alumni_verification', 'verified' if row['is_verified'] else 'pending', 1)]
+    skills = [str(skill) for skill in _json_list(row['skills']) if skill]
+    facets.extend(('skill', skill, 1) for skill in skills)
+    if skills:
+        facets.append(('skill_occurrences', 'total', len(skills)))
+    if row['current_company']:
+        facets.append(('company', row['current_company'], 1))
+    if row['batch_year'] is not None:
+        facets.append(('batch', str(row['batch_year']), 1))
+    return facets
+
+
+def _job_facets(row: Dict[str, Any]) -> List[Facet]:
+    return [
+        ('job_type', row['job_type'], 1),
+        ('job_status', row['status'], 1),
+        ('job_applications', 'total', row['applications_count'] or 0),
+    ]
+
+
+def _event_facets(row: Dict[str, Any]) -> List[Facet]:
+    return [
+        ('event_type', row['event_type'], 1),
+        ('event_status', row['status'], 1),
+        ('event_rsvps', 'total', row['current_attendees_count'] or 0),
+    ]
+
+
+def _mentorship_request_facets(row: Dict[str, Any]) -> List[Facet]:
+    return [('mentorship_status', row['status'], 1)]
+
+
+def _forum_facets(kind: str) -> Callable[[Dict[str, Any]], List[Facet]]:
+    return lambda row: [] if row['is_deleted'] else [('forum', kind, 1)]
+
+
+SERIES = (
+    DailySeries('signups', 'users', 'created_at'),
+    DailySeries('jobs_posted', 'jobs', 'created_at'),
+    DailySeries('job_applications', 'job_applications', 'applied_at'),
+    DailySeries('events_created', 'events', 'created_at'),
+    DailySeries('event_attendees', 'events', 'created_at', 'COALESCE(SUM(current_attendees_count), 0)'),
+    DailySeries('mentorship_requests', 'mentorship_requests', 'requested_at'),
+    DailySeries('mentorship_sessions', 'mentorship_sessions', 'created_at'),
+)
+
+FACET_SOURCES = (
+    FacetSource('users', 'users', ('role', 'is_active'), _user_facets),
+    FacetSource('alumni_profiles', 'alumni_profiles',
+                ('skills', 'current_company', 'batch_year', 'is_verified'), _profile_facets),
+    FacetSource('jobs', 'jobs', ('job_type', 'status', 'applications_count'), _job_facets),
+    FacetSource('events', 'events', ('event_type', 'status', 'current_attendees_count'), _event_facets),
+    FacetSource('mentorship_requests', 'mentorship_requests', ('status',), _mentorship_request_facets),
+    FacetSource('forum_posts', 'forum_posts', ('is_deleted',), _forum_facets('posts')),
+    FacetSource('forum_comments', 'forum_comments', ('is_deleted',), _forum_facets('comments')),
+)
+
+
+def _facet_counter(facets: Iterable[Sequence]) -> Counter:
+    counter = Counter()
+    for dimension, value, weight in facets:
+        counter[(dimension, str(value)[:MAX_VALUE_LENGTH])] += int(weight)
+    return counter
+
+
+class AnalyticsRollupService:
+    """Refreshes and reads the analytics rollup tables"""
+
+    def __init__(self):
+        self._freshness: Optional[Dict[str, Any]] = None
+        self._freshness_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    async def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring every rollup up to date
+
+        Incremental by default; ``full`` re-aggregates all series and
+        reconciles deleted rows. Only one refresh runs at a time across
+        processes (MySQL named lock): an incremental call returns
+        ``{'status': 'skipped'}`` while another refresh holds it, a full one
+        waits up to ``FULL_REFRESH_LOCK_WAIT_SECONDS`` and then returns
+        ``{'status': 'busy'}`` so the caller can reschedule it.
+        """
+        wait = FULL_REFRESH_LOCK_WAIT_SECONDS if full else 0
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (REFRESH_LOCK, wait))
+                if not (await cursor.fetchone())['acquired']:
+                    if full:
+                        logger.warning(f"Analytics rollup lock still held after {wait}s, full refresh not run")
+                        return {'status': 'busy'}
+                    logger.info("Analytics rollup refresh already running, skipping")
+                    return {'status': 'skipped'}
+
+                try:
+                    await cursor.execute("SELECT name, watermark FROM analytics_rollup_state")
+                    watermarks = {row['name']: row['watermark'] for row in await cursor.fetchall()}
+                    await conn.commit()
+
+                    results = {}
+                    for series in SERIES:
+                        name = f"series:{series.name}"
+                        results[name] = await self._run(
+                            conn, cursor, name, watermarks.get(name), full,
+                            lambda since, series=series: self._refresh_series(conn, cursor, series, since)
+                        )
+                    for source in FACET_SOURCES:
+                        name = f"facets:{source.name}"
+                        results[name] = await self._run(
+                            conn, cursor, name, watermarks.get(name), full,
+                            lambda since, source=source: self._refresh_facets(conn, cursor, source, since, full)
+                        )
+
+                    await cursor.execute("DELETE FROM analytics_dimension_counts WHERE count <= 0")
+                    await conn.commit()
+                finally:
+                    await cursor.execute("SELECT RELEASE_LOCK(%s)", (REFRESH_LOCK,))
+                    await cursor.fetchone()
+
+        self._freshness = None
+        await invalidate_tags("analytics")
+        return {'status': 'refreshed', 'full': full, 'rows': results}
+
+    async def _run(self, conn, cursor, name: str, watermark, full: bool, refresh) -> int:
+        """Refresh one rollup from its watermark and record the new one"""
+        started = time.perf_counter()
+        await cursor.execute("SELECT NOW() AS now")
+        run_started_at = (await cursor.fetchone())['now']
+
+        since = None if full or watermark is None else watermark - timedelta(seconds=WATERMARK_OVERLAP_SECONDS)
+        rows = await refresh(since)
+
+        await cursor.execute(
+            """
+            INSERT INTO analytics_rollup_state
+                (name, watermark, refreshed_at, full_refreshed_at, rows_processed, duration_ms)
+            VALUES (%s, %s, NOW(), IF(%s, NOW(), NULL), %s, %s)
+            ON DUPLICATE KEY UPDATE
+                watermark = VALUES(watermark),
+                refreshed_at = VALUES(refreshed_at),
+                full_refreshed_at = COALESCE(VALUES(full_refreshed_at), full_refreshed_at),
+                rows_processed = VALUES(rows_processed),
+                duration_ms = VALUES(duration_ms)
+            """,
+            (name, run_started_at, since is None, rows, int((time.perf_counter() - started) * 1000))
+        )
+        await conn.commit()
+        return rows
+
+    async def _refresh_series(self, conn, cursor, series: DailySeries, since) -> int:
+        """Re-aggregate the days touched since ``since`` (all days when None)"""
+        column = series.date_column
+        if since is None:
+            await cursor.execute("DELETE FROM analytics_daily_counts WHERE series = %s", (series.name,))
+            await cursor.execute(
+                f"""
+                INSERT INTO analytics_daily_counts (series, day, value)
+                SELECT %s, DATE({column}), {series.value}
+                FROM {series.table}
+                WHERE {column} IS NOT NULL
+                GROUP BY DATE({column})
+                """,
+                (series.name,)
+            )
+            await conn.commit()
+            return cursor.rowcount
+
+        await cursor.execute(
+            f"SELECT DISTINCT DATE({column}) AS day FROM {series.table} WHERE updated_at >= %s",
+            (since,)
+        )
+        days = [row['day'] for row in await cursor.fetchall() if row['day'] is not None]
+        for day in days:
+            await cursor.execute(
+                f"""
+                INSERT INTO analytics_daily_counts (series, day, value)
+                SELECT %s, %s, {series.value}
+                FROM {series.table}
+                WHERE {column} >= %s AND {column} < %s
+                ON DUPLICATE KEY UPDATE value = VALUES(value)
+                """,
+                (series.name, day, day, day + timedelta(days=1))
+            )
+        await conn.commit()
+        return len(days)
+
+    async def _refresh_facets(self, conn, cursor, source: FacetSource, since, full: bool) -> int:
+        """Apply the facet changes of rows updated since ``since`` (all rows when None)"""
+        columns = ', '.join(('id', 'updated_at') + source.columns)
+        processed, last_key = 0, None
+        while True:
+            conditions, params = [], []
+            if since is not None:
+                conditions.append("updated_at >= %s")
+                params.append(since)
+            if last_key is not None:
+                condition, key_params = keyset_condition(['updated_at', 'id'], last_key)
+                conditions.append(condition)
+                params.extend(key_params)
+            where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            await cursor.execute(
+                f"""
+                SELECT {columns} FROM {source.table}
+                {where_sql}
+                ORDER BY updated_at DESC, id DESC
+                LIMIT %s
+                """,
+                params + [ROLLUP_BATCH_SIZE]
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                break
+
+            await self._apply_rows(conn, cursor, source, rows)
+            processed += len(rows)
+            last_key = (rows[-1]['updated_at'], rows[-1]['id'])
+            if len(rows) < ROLLUP_BATCH_SIZE:
+                break
+
+        if full:
+            processed += await self._remove_deleted(conn, cursor, source)
+        return processed
+
+    async def _apply_rows(self, conn, cursor, source: FacetSource, rows: List[Dict[str, Any]]) -> None:
+        """Replace the snapshotted facets of ``rows`` and apply the difference to the counts"""
+        ids = [row['id'] for row in rows]
+        placeholders = ', '.join(['%s'] * len(ids))
+        await cursor.execute(
+            f"SELECT source_id, facets FROM analytics_rollup_facets "
+            f"WHERE source = %s AND source_id IN ({placeholders})",
+            [source.name] + ids
+        )
+        previous = {row['source_id']: _json_list(row['facets']) for row in await cursor.fetchall()}
+
+        deltas = Counter()
+        snapshots = []
+        for row in rows:
+            facets = [list(facet) for facet in source.extract(row)]
+            deltas.update(_facet_counter(facets))
+            deltas.subtract(_facet_counter(previous.get(row['id'], [])))
+            snapshots.append((source.name, row['id'], json.dumps(facets)))
+
+        await self._apply_deltas(cursor, deltas)
+        await cursor.executemany(
+            """
+            INSERT INTO analytics_rollup_facets (source, source_id, facets)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE facets = VALUES(facets)
+            """,
+            snapshots
+        )
+        await conn.commit()
+
+    async def _remove_deleted(self, conn, cursor, source: FacetSource) -> int:
+        """Subtract and forget the facets of snapshotted rows missing from the source table"""
+        removed = 0
+        while True:
+            await cursor.execute(
+                f"""
+                SELECT f.source_id, f.facets
+                FROM analytics_rollup_facets f
+                LEFT JOIN {source.table} t ON t.id = f.source_id
+                WHERE f.source = %s AND t.id IS NULL
+                LIMIT %s
+                """,
+                (source.name, ROLLUP_BATCH_SIZE)
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                return removed
+
+            deltas = Counter()
+            for row in rows:
+                deltas.subtract(_facet_counter(_json_list(row['facets'])))
+            await self._apply_deltas(cursor, deltas)
+
+            ids = [row['source_id'] for row in rows]
+            await cursor.execute(
+                f"DELETE FROM analytics_rollup_facets WHERE source = %s "
+                f"AND source_id IN ({', '.join(['%s'] * len(ids))})",
+                [source.name] + ids
+            )
+            await conn.commit()
+            removed += len(rows)
+
+    @staticmethod
+    async def _apply_deltas(cursor, deltas: Counter) -> None:
+        changed = [(dimension, value, delta) for (dimension, value), delta in deltas.items() if delta]
+        if changed:
+            await cursor.executemany(
+                """
+                INSERT INTO analytics_dimension_counts (dimension, value, count)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+                """,
+                changed
+            )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def freshness(self) -> Dict[str, Any]:
+        """
+        How fresh the rollups are
+
+        ``source`` is ``rollup`` once every series and facet source has been
+        refreshed at least once, otherwise ``live`` (callers should query the
+        source tables). ``refreshed_at`` / ``age_seconds`` describe the
+        least recently refreshed rollup.
+        """
+        now = time.monotonic()
+        if self._freshness is not None and now - self._freshness_at < FRESHNESS_CACHE_SECONDS:
+            return self._freshness
+
+        freshness = {'source': 'live', 'refreshed_at': None, 'age_seconds': None}
+        if ROLLUPS_ENABLED:
+            try:
+                async with get_db_connection() as conn:
+                    async with conn.cursor(aiomysql.DictCursor) as cursor:
+                        await cursor.execute("""
+                            SELECT
+                                COUNT(*) AS rollups,
+                                MIN(refreshed_at) AS refreshed_at,
+                                TIMESTAMPDIFF(SECOND, MIN(refreshed_at), NOW()) AS age_seconds
+                            FROM analytics_rollup_state
+                        """)
+                        state = await cursor.fetchone()
+                if state and state['rollups'] >= len(SERIES) + len(FACET_SOURCES):
+                    freshness = {
+                        'source': 'rollup',
+                        'refreshed_at': state['refreshed_at'].isoformat() if state['refreshed_at'] else None,
+                        'age_seconds': state['age_seconds'],
+                    }
+            except Exception as e:
+                logger.warning(f"Analytics rollups unavailable, using live queries: {str(e)}")
+
+        self._freshness, self._freshness_at = freshness, now
+        return freshness
+
+    async def is_ready(self) -> bool:
+        return (await self.freshness())['source'] == 'rollup'
+
+    async def get_dimension(self, dimension: str, limit: Optional[int] = None,
+                            order_by: str = 'count DESC, value') -> List[Dict[str, Any]]:
+        """``[{'value', 'count'}]`` for one dimension, largest first by default"""
+        query = f"""
+            SELECT value, count
+            FROM analytics_dimension_counts
+            WHERE dimension = %s AND count > 0
+            ORDER BY {order_by}
+        """
+        params: List[Any] = [dimension]
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                return list(await cursor.fetchall())
+
+    async def get_dimension_totals(self, dimensions: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """``{dimension: {value: count}}`` for small dimensions (statuses, roles, totals)"""
+        placeholders = ', '.join(['%s'] * len(dimensions))
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(
+                    f"SELECT dimension, value, count FROM analytics_dimension_counts "
+                    f"WHERE dimension IN ({placeholders})",
+                    list(dimensions)
+                )
+                rows = await cursor.fetchall()
+
+        totals = {dimension: {} for dimension in dimensions}
+        for row in rows:
+            totals[row['dimension']][row['value']] = int(row['count'])
+        return totals
+
+    async def get_series(self, names: Sequence[str], days: int) -> Dict[date, Dict[str, int]]:
+        """``{day: {series: value}}`` for the last ``days`` days, ordered by day"""
+        placeholders = ', '.join(['%s'] * len(names))
+        async with get_db_connection() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(
+                    f"""
+                    SELECT series, day, value
+                    FROM analytics_daily_counts
+                    WHERE series IN ({placeholders})
+                      AND day >= DATE(DATE_SUB(NOW(), INTERVAL %s DAY))
+                    ORDER BY day
+                    """,
+                    list(names) + [days]
+                )
+                rows = await cursor.fetchall()
+
+        by_day: Dict[date, Dict[str, int]] = {}
+        for row in rows:
+            by_day.setdefault(row['day'], {})[row['series']] = int(row['value'])
+        return by_day
+
+
+# Global instance
+analytics_rollups = AnalyticsRollupService()
@@ -6,16 +6,32 @@ import aiomysql
 import json
 
 from database.connection import get_db_pool
+from services.analytics_rollup_service import analytics_rollups
 
 logger = logging.getLogger(__name__)
 
 
 class AnalyticsService:
-    """Service for analytics and reporting"""
+    """
+    Service for analytics and reporting
+
+    Dashboard metrics, charts and the skills / companies / batches / job type
+    distributions are read from the analytics rollup tables once they have
+    been populated (see ``services/analytics_rollup_service.py``), and from
+    the live tables until then. ``get_freshness`` reports which was used.
+    """
+    
+    @staticmethod
+    async def get_freshness() -> Dict[str, Any]:
+        """Source (``rollup`` or ``live``) and age of the aggregated analytics"""
+        return await analytics_rollups.freshness()
     
     @staticmethod
     async def get_dashboard_metrics() -> Dict[str, Any]:
         """Get key metrics for admin dashboard"""
+        if await analytics_rollups.is_ready():
+            return await AnalyticsService._dashboard_metrics_from_rollups()
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -101,9 +117,78 @@ class AnalyticsService:
                 
                 return metrics
     
+    @staticmethod
+    async def _dashboard_metrics_from_rollups() -> Dict[str, Any]:
+        totals = await analytics_rollups.get_dimension_totals([
+            'user_role', 'alumni_verification', 'job_status', 'job_applications',
+            'event_status', 'event_rsvps', 'mentorship_status', 'forum'
+        ])
+        users_by_role = totals['user_role']
+        
+        # Depends on the current time, so not rolled up; idx_start_date keeps it a range count
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute("""
+                    SELECT COUNT(*) as upcoming_events
+                    FROM events
+                    WHERE start_date > NOW() AND status = 'published'
+                """)
+                upcoming = await cursor.fetchone()
+        
+        return {
+            'total_users': sum(users_by_role.values()),
+            'users_by_role': {
+                role: users_by_role.get(role, 0)
+                for role in ('student', 'alumni', 'recruiter', 'admin')
+            },
+            'verified_alumni': totals['alumni_verification'].get('verified', 0),
+            'pending_verifications': totals['alumni_verification'].get('pending', 0),
+            'total_jobs_posted': sum(totals['job_status'].values()),
+            'active_jobs': totals['job_status'].get('active', 0),
+            'total_applications': totals['job_applications'].get('total', 0),
+            'total_events': sum(totals['event_status'].values()),
+            'upcoming_events': upcoming['upcoming_events'] or 0,
+            'total_rsvps': totals['event_rsvps'].get('total', 0),
+            'total_mentorship_requests': sum(totals['mentorship_status'].values()),
+            'active_mentorships': totals['mentorship_status'].get('accepted', 0),
+            'forum_posts_count': totals['forum'].get('posts', 0),
+            'forum_comments_count': totals['forum'].get('comments', 0),
+        }
+    
+    @staticmethod
+    async def _dashboard_charts_from_rollups(days: int) -> Dict[str, Any]:
+        by_day = await analytics_rollups.get_series([
+            'signups', 'jobs_posted', 'job_applications', 'events_created',
+            'event_attendees', 'mentorship_requests', 'mentorship_sessions'
+        ], days)
+        
+        def chart(primary: str, fields: Dict[str, str]) -> List[Dict[str, Any]]:
+            # Like the live GROUP BY, only days with at least one ``primary`` row
+            return [
+                {'date': day.isoformat(), **{key: values.get(series, 0) for key, series in fields.items()}}
+                for day, values in by_day.items() if values.get(primary, 0) > 0
+            ]
+        
+        total = 0
+        user_growth = []
+        for point in chart('signups', {'new_users': 'signups'}):
+            total += point['new_users']
+            user_growth.append({**point, 'total_users': total})
+        
+        return {
+            'user_growth': user_growth,
+            'job_trends': chart('jobs_posted', {'jobs_posted': 'jobs_posted', 'applications': 'job_applications'}),
+            'event_participation': chart('events_created', {'events': 'events_created', 'attendees': 'event_attendees'}),
+            'mentorship_activity': chart('mentorship_requests', {'requests': 'mentorship_requests', 'sessions': 'mentorship_sessions'}),
+        }
+    
     @staticmethod
     async def get_dashboard_charts(days: int = 30) -> Dict[str, Any]:
         """Get chart data for admin dashboard"""
+        if await analytics_rollups.is_ready():
+            return await AnalyticsService._dashboard_charts_from_rollups(days)
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -204,6 +289,19 @@ class AnalyticsService:
     @staticmethod
     async def get_skills_distribution(limit: int = 20) -> List[Dict[str, Any]]:
         """Get top skills distribution"""
+        if await analytics_rollups.is_ready():
+            skills = await analytics_rollups.get_dimension('skill', limit=limit)
+            occurrences = await analytics_rollups.get_dimension_totals(['skill_occurrences'])
+            total_skills = occurrences['skill_occurrences'].get('total', 0)
+            return [
+                {
+                    'skill': row['value'],
+                    'count': row['count'],
+                    'percentage': round((row['count'] / total_skills * 100), 2) if total_skills > 0 else 0
+                }
+                for row in skills
+            ]
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -277,6 +375,18 @@ class AnalyticsService:
     @staticmethod
     async def get_companies_distribution(limit: int = 20) -> List[Dict[str, Any]]:
         """Get top companies where alumni work"""
+        if await analytics_rollups.is_ready():
+            companies = await analytics_rollups.get_dimension('company', limit=limit)
+            total = sum(c['count'] for c in companies)
+            return [
+                {
+                    'company': comp['value'],
+                    'alumni_count': comp['count'],
+                    'percentage': round((comp['count'] / total * 100), 2) if total > 0 else 0
+                }
+                for comp in companies
+            ]
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -307,6 +417,16 @@ class AnalyticsService:
     @staticmethod
     async def get_batches_distribution() -> List[Dict[str, Any]]:
         """Get alumni distribution by batch year"""
+        if await analytics_rollups.is_ready():
+            batches = await analytics_rollups.get_dimension('batch', order_by='CAST(value AS SIGNED) DESC')
+            return [
+                {
+                    'batch_year': int(batch['value']),
+                    'count': batch['count']
+                }
+                for batch in batches
+            ]
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -332,6 +452,27 @@ class AnalyticsService:
     @staticmethod
     async def get_job_trends() -> List[Dict[str, Any]]:
         """Get job posting trends by category"""
+        if await analytics_rollups.is_ready():
+            job_types = [
+                {'job_type': row['value'], 'count': row['count']}
+                for row in await analytics_rollups.get_dimension('job_type')
+            ]
+        else:
+            job_types = await AnalyticsService._job_type_counts()
+        
+        total = sum(jt['count'] for jt in job_types)
+        
+        return [
+            {
+                'job_type': jt['job_type'],
+                'count': jt['count'],
+                'percentage': round((jt['count'] / total * 100), 2) if total > 0 else 0
+            }
+            for jt in job_types
+        ]
+    
+    @staticmethod
+    async def _job_type_counts() -> List[Dict[str, Any]]:
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
@@ -343,18 +484,7 @@ class AnalyticsService:
                     GROUP BY job_type
                     ORDER BY count DESC
                 """)
-                job_types = await cursor.fetchall()
-                
-                total = sum(jt['count'] for jt in job_types)
-                
-                return [
-                    {
-                        'job_type': jt['job_type'],
-                        'count': jt['count'],
-                        'percentage': round((jt['count'] / total * 100), 2) if total > 0 else 0
-                    }
-                    for jt in job_types
-                ]
+                return list(await cursor.fetchall())
     
     @staticmethod
     async def get_mentorship_stats() -> Dict[str, Any]:
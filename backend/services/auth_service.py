@@ -11,8 +11,9 @@ from database.models import (
 )
 from services.user_service import UserService
 from services.email_service import email_service
+from utils.route_cache import invalidate_tags
 from utils.security import (
-    verify_password, create_access_token, generate_otp, generate_reset_token
+    verify_password_async, create_access_token, generate_otp, generate_reset_token
 )
 
 logger = logging.getLogger(__name__)
@@ -60,6 +61,7 @@ class AuthService:
                 
                 if not conn.get_autocommit():
                     await conn.commit()
+                await invalidate_tags("profiles")
                 
                 logger.info(f"Created default alumni profile for user {user.id}")
                 
@@ -180,7 +182,7 @@ class AuthService:
             raise ValueError("Invalid email or password")
         
         # Verify password
-        if not verify_password(login_data.password, user.password_hash):
+        if not await verify_password_async(login_data.password, user.password_hash):
             raise ValueError("Invalid email or password")
         
         # Check if user is active
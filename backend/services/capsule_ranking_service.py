@@ -5,12 +5,15 @@ Implements AI-powered personalized capsule ranking algorithm
 
 import os
 import json
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import numpy as np
-from database.connection import get_db_connection
+from database.connection import get_db_pool
 from redis_client import get_redis_client
+from services.entity_skill_service import EntitySkillService, ENTITY_CAPSULE
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +21,28 @@ logger = logging.getLogger(__name__)
 class CapsuleRankingService:
     """Service for calculating and managing knowledge capsule rankings"""
     
+    CACHE_PREFIX = "capsules:ranked"
+    CACHE_MAX_ITEMS = 100  # Largest page the ranked endpoint can request
+    
+    CANDIDATE_QUERY = """
+        SELECT kc.id, kc.title, kc.content, kc.author_id, kc.category, kc.tags,
+               kc.views_count, kc.likes_count, kc.bookmarks_count, kc.created_at,
+               es.total_score,
+               ap.name, ap.photo_url, ap.current_role, ap.current_company
+        FROM knowledge_capsules kc
+        LEFT JOIN engagement_scores es ON es.user_id = kc.author_id
+        LEFT JOIN alumni_profiles ap ON ap.user_id = kc.author_id
+        WHERE kc.is_featured >= 0
+    """
+    
     def __init__(self):
-        self.redis = get_redis_client()
         self.cache_ttl = 1800  # 30 minutes
+        self.refresh_ahead_seconds = 300  # Recompute in background during the last 5 minutes
+        self.lock_ttl_ms = 30000
+        self.refresh_concurrency = 4
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: set = set()
+        self.max_candidates = int(os.getenv('CAPSULE_RANKING_MAX_CANDIDATES', 1000))
         self.llm_enabled = False  # Keep LLM disabled - only keyword relevance
     
     def _check_llm_availability(self) -> bool:
@@ -85,7 +107,8 @@ class CapsuleRankingService:
         Calculate author credibility based on engagement score
         Score weight: 20%
         """
-        async with get_db_connection() as conn:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(
                     """
@@ -187,64 +210,264 @@ class CapsuleRankingService:
         relevance = intersection / union
         return round(relevance, 4)
     
-    async def calculate_capsule_rank(
-        self, 
-        user_id: str, 
-        capsule_id: str
-    ) -> Tuple[float, Dict]:
+    @staticmethod
+    def _parse_json_list(value) -> List:
+        """Parse a JSON list column that may arrive as a string or a list"""
+        if not value:
+            return []
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                return []
+        return value if isinstance(value, list) else []
+    
+    @staticmethod
+    def _batch_jaccard(term_sets: List[set], query: set, empty_value: float = 0.0) -> np.ndarray:
         """
-        Calculate personalized rank score for a single capsule
-        Returns: (final_score, score_breakdown)
+        Jaccard similarity of ``query`` against every set in ``term_sets``.
+        All terms are flattened into one array so the intersection counts come
+        from a single vectorized membership test plus a bincount.
         """
-        async with get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                # Get user profile
+        n = len(term_sets)
+        sizes = np.fromiter((len(t) for t in term_sets), dtype=np.float64, count=n)
+        if not query or n == 0:
+            return np.full(n, empty_value)
+        
+        owners = np.repeat(np.arange(n), sizes.astype(np.int64))
+        terms = np.fromiter(
+            (term for t in term_sets for term in t), dtype=object, count=int(sizes.sum())
+        )
+        hits = np.isin(terms, list(query)) if terms.size else np.zeros(0, dtype=bool)
+        intersection = np.bincount(owners, weights=hits, minlength=n)
+        union = len(query) + sizes - intersection
+        
+        scores = np.full(n, empty_value)
+        valid = (sizes > 0) & (union > 0)
+        scores[valid] = intersection[valid] / union[valid]
+        return scores
+    
+    async def _load_user_profile(self, cursor, user_id: str) -> Dict:
+        """Fetch the ranking-relevant parts of a user's profile"""
+        await cursor.execute(
+            """
+            SELECT ap.skills, ap.current_role, ap.industry
+            FROM alumni_profiles ap
+            WHERE ap.user_id = %s
+            """,
+            (user_id,)
+        )
+        user_row = await cursor.fetchone()
+        
+        if not user_row:
+            raise ValueError(f"User profile not found for user_id: {user_id}")
+        
+        return {
+            'skills': self._parse_json_list(user_row[0]),
+            'current_role': user_row[1],
+            'industry': user_row[2]
+        }
+    
+    async def _load_candidates(
+        self,
+        cursor,
+        capsule_ids: Optional[List[str]] = None,
+        user_skills: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Fetch candidate capsules with author profile and author engagement
+        score. Without explicit ids the candidates are the most recent
+        ``max_candidates`` capsules plus every capsule sharing a tag with the
+        user's skills, found through the entity_skills index, so relevant
+        older capsules are not cut off by the recency window.
+        """
+        if capsule_ids:
+            placeholders = ', '.join(['%s'] * len(capsule_ids))
+            await cursor.execute(
+                f"{self.CANDIDATE_QUERY} AND kc.id IN ({placeholders})",
+                capsule_ids
+            )
+            return [self._candidate_from_row(row) for row in await cursor.fetchall()]
+        
+        await cursor.execute(
+            f"{self.CANDIDATE_QUERY} ORDER BY kc.created_at DESC LIMIT %s",
+            (self.max_candidates,)
+        )
+        capsules = [self._candidate_from_row(row) for row in await cursor.fetchall()]
+        
+        if user_skills:
+            matched = await EntitySkillService.overlap_counts(
+                cursor, ENTITY_CAPSULE, user_skills, limit=self.max_candidates
+            )
+            seen = {c['id'] for c in capsules}
+            missing = [capsule_id for capsule_id in matched if capsule_id not in seen]
+            if missing:
+                placeholders = ', '.join(['%s'] * len(missing))
                 await cursor.execute(
-                    """
-                    SELECT ap.skills, ap.current_role, ap.industry
-                    FROM alumni_profiles ap
-                    WHERE ap.user_id = %s
-                    """,
-                    (user_id,)
+                    f"{self.CANDIDATE_QUERY} AND kc.id IN ({placeholders})",
+                    missing
                 )
-                user_row = await cursor.fetchone()
-                
-                if not user_row:
-                    raise ValueError(f"User profile not found for user_id: {user_id}")
-                
-                user_profile = {
-                    'skills': json.loads(user_row[0]) if user_row[0] else [],
-                    'current_role': user_row[1],
-                    'industry': user_row[2]
-                }
-                
-                # Get capsule details
-                await cursor.execute(
-                    """
-                    SELECT id, title, content, author_id, category, tags, 
-                           views_count, likes_count, bookmarks_count, created_at
-                    FROM knowledge_capsules
-                    WHERE id = %s AND is_featured >= 0
-                    """,
-                    (capsule_id,)
+                capsules.extend(self._candidate_from_row(row) for row in await cursor.fetchall())
+        
+        return capsules
+    
+    def _candidate_from_row(self, row) -> Dict:
+        return {
+            'id': row[0],
+            'title': row[1],
+            'content': row[2],
+            'author_id': row[3],
+            'category': row[4],
+            'tags': self._parse_json_list(row[5]),
+            'views_count': row[6] or 0,
+            'likes_count': row[7] or 0,
+            'bookmarks_count': row[8] or 0,
+            'created_at': row[9],
+            'author_score': row[10],
+            'author': {
+                'name': row[11] if row[11] else 'Unknown',
+                'photo_url': row[12],
+                'role': row[13],
+                'company': row[14]
+            }
+        }
+    
+    def _score_capsules(self, user_profile: Dict, capsules: List[Dict], max_row) -> Dict[str, np.ndarray]:
+        """Compute all five score components for every capsule as arrays"""
+        n = len(capsules)
+        
+        # Skill match (30%): user skills vs capsule tags
+        user_skills = {s.lower().strip() for s in user_profile['skills'] if isinstance(s, str)}
+        tag_sets = [
+            {t.lower().strip() for t in c['tags'] if isinstance(t, str)}
+            for c in capsules
+        ]
+        skill_match = self._batch_jaccard(tag_sets, user_skills)
+        
+        # Engagement (25%): counts normalized by the global maxima
+        views = np.fromiter((c['views_count'] for c in capsules), dtype=np.float64, count=n)
+        likes = np.fromiter((c['likes_count'] for c in capsules), dtype=np.float64, count=n)
+        bookmarks = np.fromiter((c['bookmarks_count'] for c in capsules), dtype=np.float64, count=n)
+        engagement = (
+            0.4 * views / max(max_row[0] or 1, 1) +
+            0.35 * likes / max(max_row[1] or 1, 1) +
+            0.25 * bookmarks / max(max_row[2] or 1, 1)
+        )
+        
+        # Credibility (20%): author engagement score, 0.5 for unknown authors
+        author_scores = np.array(
+            [float(c['author_score']) if c['author_score'] is not None else np.nan for c in capsules],
+            dtype=np.float64
+        )
+        credibility = np.where(np.isnan(author_scores), 0.5, np.minimum(author_scores / 1000.0, 1.0))
+        
+        # Recency (15%): e^(-0.01 * days_old)
+        now = datetime.now()
+        days_old = np.fromiter(
+            ((now - c['created_at']).days if c['created_at'] else 0 for c in capsules),
+            dtype=np.float64, count=n
+        )
+        recency = np.exp(-0.01 * days_old)
+        
+        # Relevance (10%): keyword overlap, 0.5 when either side has no keywords
+        user_keywords = {s.lower() for s in user_profile['skills'] if isinstance(s, str)}
+        if user_profile.get('current_role'):
+            user_keywords.update(user_profile['current_role'].lower().split())
+        if user_profile.get('industry'):
+            user_keywords.update(user_profile['industry'].lower().split())
+        
+        keyword_sets = []
+        for c in capsules:
+            keywords = {t.lower() for t in c['tags'] if isinstance(t, str)}
+            if c.get('title'):
+                keywords.update(c['title'].lower().split())
+            if c.get('category'):
+                keywords.update(c['category'].lower().split())
+            keyword_sets.append(keywords)
+        relevance = self._batch_jaccard(keyword_sets, user_keywords, empty_value=0.5)
+        
+        components = {
+            'skill_match_score': np.round(skill_match, 4),
+            'engagement_score': np.round(engagement, 4),
+            'credibility_score': np.round(credibility, 4),
+            'recency_score': np.round(recency, 4),
+            'relevance_score': np.round(relevance, 4),
+        }
+        components['final_rank_score'] = np.round(
+            0.30 * components['skill_match_score'] +
+            0.25 * components['engagement_score'] +
+            0.20 * components['credibility_score'] +
+            0.15 * components['recency_score'] +
+            0.10 * components['relevance_score'],
+            4
+        )
+        return components
+    
+    @staticmethod
+    def _breakdown(components: Dict[str, np.ndarray], i: int) -> Dict:
+        return {name: float(values[i]) for name, values in components.items()}
+    
+    async def _persist_rankings(self, conn, cursor, user_id: str, capsules: List[Dict], components: Dict[str, np.ndarray]):
+        """Write all computed scores with one bulk upsert"""
+        calculated_at = datetime.now()
+        rows = [
+            (
+                capsule['id'],
+                user_id,
+                float(components['relevance_score'][i]),
+                float(components['engagement_score'][i]),
+                float(components['skill_match_score'][i]),
+                float(components['credibility_score'][i]),
+                float(components['final_rank_score'][i]),
+                json.dumps(self._breakdown(components, i)),
+                calculated_at
+            )
+            for i, capsule in enumerate(capsules)
+        ]
+        await cursor.executemany(
+            """
+            INSERT INTO capsule_rankings 
+            (capsule_id, user_id, relevance_score, engagement_score, 
+             skill_match_score, credibility_score, final_rank_score, 
+             ranking_factors, calculated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                relevance_score = VALUES(relevance_score),
+                engagement_score = VALUES(engagement_score),
+                skill_match_score = VALUES(skill_match_score),
+                credibility_score = VALUES(credibility_score),
+                final_rank_score = VALUES(final_rank_score),
+                ranking_factors = VALUES(ranking_factors),
+                calculated_at = VALUES(calculated_at)
+            """,
+            rows
+        )
+        await conn.commit()
+    
+    async def rank_capsules(
+        self,
+        user_id: str,
+        capsule_ids: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+        """
+        Score candidate capsules for a user in one batch.
+        Loads the user, candidates (with author data) and global maxima in
+        a handful of set-based queries, scores everything with NumPy and
+        persists the scores with a single bulk upsert.
+        
+        Returns: (capsules, components) where each component array is
+        aligned with ``capsules``
+        """
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                user_profile = await self._load_user_profile(cursor, user_id)
+                capsules = await self._load_candidates(
+                    cursor, capsule_ids, user_skills=user_profile['skills']
                 )
-                capsule_row = await cursor.fetchone()
-                
-                if not capsule_row:
-                    raise ValueError(f"Capsule not found for capsule_id: {capsule_id}")
                 
-                capsule = {
-                    'id': capsule_row[0],
-                    'title': capsule_row[1],
-                    'content': capsule_row[2],
-                    'author_id': capsule_row[3],
-                    'category': capsule_row[4],
-                    'tags': json.loads(capsule_row[5]) if capsule_row[5] else [],
-                    'views_count': capsule_row[6],
-                    'likes_count': capsule_row[7],
-                    'bookmarks_count': capsule_row[8],
-                    'created_at': capsule_row[9]
-                }
+                if not capsules:
+                    return [], {}
                 
                 # Get max values for normalization
                 await cursor.execute(
@@ -257,81 +480,174 @@ class CapsuleRankingService:
                     """
                 )
                 max_row = await cursor.fetchone()
-                max_views = max_row[0] or 1
-                max_likes = max_row[1] or 1
-                max_bookmarks = max_row[2] or 1
-                
-                # Calculate component scores
-                skill_match = await self.calculate_skill_match_score(
-                    user_profile['skills'], 
-                    capsule['tags']
-                )
-                
-                engagement = await self.calculate_engagement_score(
-                    capsule, 
-                    max_views, 
-                    max_likes, 
-                    max_bookmarks
-                )
-                
-                credibility = await self.calculate_credibility_score(capsule['author_id'])
-                
-                recency = await self.calculate_recency_score(capsule['created_at'])
-                
-                relevance = await self.calculate_llm_relevance(user_profile, capsule)
-                
-                # Calculate final weighted score
-                final_score = (
-                    0.30 * skill_match +
-                    0.25 * engagement +
-                    0.20 * credibility +
-                    0.15 * recency +
-                    0.10 * relevance
-                )
-                
-                final_score = round(final_score, 4)
-                
-                score_breakdown = {
-                    'skill_match_score': skill_match,
-                    'engagement_score': engagement,
-                    'credibility_score': credibility,
-                    'recency_score': recency,
-                    'relevance_score': relevance,
-                    'final_rank_score': final_score
-                }
                 
-                # Store ranking in database
-                await cursor.execute(
-                    """
-                    INSERT INTO capsule_rankings 
-                    (capsule_id, user_id, relevance_score, engagement_score, 
-                     skill_match_score, credibility_score, final_rank_score, 
-                     ranking_factors, calculated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE
-                        relevance_score = VALUES(relevance_score),
-                        engagement_score = VALUES(engagement_score),
-                        skill_match_score = VALUES(skill_match_score),
-                        credibility_score = VALUES(credibility_score),
-                        final_rank_score = VALUES(final_rank_score),
-                        ranking_factors = VALUES(ranking_factors),
-                        calculated_at = VALUES(calculated_at)
-                    """,
-                    (
-                        capsule_id,
-                        user_id,
-                        relevance,
-                        engagement,
-                        skill_match,
-                        credibility,
-                        final_score,
-                        json.dumps(score_breakdown),
-                        datetime.now()
-                    )
-                )
-                await conn.commit()
-                
-                return final_score, score_breakdown
+                components = self._score_capsules(user_profile, capsules, max_row)
+                await self._persist_rankings(conn, cursor, user_id, capsules, components)
+        
+        return capsules, components
+    
+    async def calculate_capsule_rank(
+        self, 
+        user_id: str, 
+        capsule_id: str
+    ) -> Tuple[float, Dict]:
+        """
+        Calculate personalized rank score for a single capsule
+        Returns: (final_score, score_breakdown)
+        """
+        capsules, components = await self.rank_capsules(user_id, [capsule_id])
+        if not capsules:
+            raise ValueError(f"Capsule not found for capsule_id: {capsule_id}")
+        
+        breakdown = self._breakdown(components, 0)
+        return breakdown['final_rank_score'], breakdown
+    
+    # ------------------------------------------------------------------
+    # Ranked feed cache
+    # ------------------------------------------------------------------
+    
+    async def _get_redis(self):
+        """Return the shared async Redis client, or None when Redis is down"""
+        try:
+            return await get_redis_client()
+        except Exception as e:
+            logger.warning(f"Redis unavailable for capsule ranking cache: {e}")
+            return None
+    
+    def _feed_key(self, user_id: str) -> str:
+        return f"{self.CACHE_PREFIX}:{user_id}"
+    
+    def _lock_key(self, user_id: str) -> str:
+        return f"{self.CACHE_PREFIX}:lock:{user_id}"
+    
+    def _members_key(self, capsule_id: str) -> str:
+        """Set of users whose cached feed contains the capsule"""
+        return f"{self.CACHE_PREFIX}:members:{capsule_id}"
+    
+    async def _read_feed_cache(self, redis, user_id: str) -> Tuple[Optional[List[Dict]], int]:
+        """Return (cached feed, remaining ttl seconds)"""
+        key = self._feed_key(user_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.ttl(key)
+            cached_data, ttl = await pipe.execute()
+        if not cached_data:
+            return None, 0
+        return json.loads(cached_data), ttl
+    
+    async def _write_feed_cache(self, redis, user_id: str, feed: List[Dict]) -> None:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.setex(self._feed_key(user_id), self.cache_ttl, json.dumps(feed, default=str))
+            # Index the feed by capsule so engagement events can find it
+            for capsule in feed:
+                members_key = self._members_key(capsule['capsule_id'])
+                pipe.sadd(members_key, user_id)
+                pipe.expire(members_key, self.cache_ttl)
+            await pipe.execute()
+    
+    async def _compute_feed(self, user_id: str) -> List[Dict]:
+        """Rank all candidates for a user and build the cached feed"""
+        capsules, components = await self.rank_capsules(user_id)
+        if not capsules:
+            return []
+        
+        # Partial sort: select the top N, then order only those
+        limit = self.CACHE_MAX_ITEMS
+        scores = components['final_rank_score']
+        if len(capsules) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(capsules))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        
+        feed = []
+        for i in top:
+            capsule = capsules[i]
+            breakdown = self._breakdown(components, i)
+            feed.append({
+                'capsule_id': capsule['id'],
+                'title': capsule['title'],
+                'category': capsule['category'],
+                'tags': capsule['tags'],
+                'views_count': capsule['views_count'],
+                'likes_count': capsule['likes_count'],
+                'bookmarks_count': capsule['bookmarks_count'],
+                'created_at': capsule['created_at'].isoformat() if capsule['created_at'] else None,
+                'author': capsule['author'],
+                'rank_score': breakdown['final_rank_score'],
+                'match_reason': self._generate_match_reason(breakdown),
+                'score_breakdown': breakdown
+            })
+        return feed
+    
+    async def _compute_and_cache(self, user_id: str) -> List[Dict]:
+        """
+        Compute a feed under a Redis lock so that concurrent misses across
+        workers compute it only once; losers wait briefly for the winner.
+        """
+        redis = await self._get_redis()
+        if redis is None:
+            return await self._compute_feed(user_id)
+        
+        lock_key = self._lock_key(user_id)
+        token = f"{os.getpid()}:{time.monotonic_ns()}"
+        acquired = False
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except Exception as e:
+            logger.warning(f"Redis lock error: {e}")
+        
+        if not acquired:
+            # Another worker is computing; poll for its result before giving up
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+                try:
+                    cached, _ = await self._read_feed_cache(redis, user_id)
+                except Exception:
+                    break
+                if cached is not None:
+                    return cached
+            logger.info(f"Ranking lock wait timed out for user {user_id}, computing locally")
+        
+        try:
+            feed = await self._compute_feed(user_id)
+            try:
+                await self._write_feed_cache(redis, user_id, feed)
+                logger.info(f"Cached ranked capsules for user: {user_id}")
+            except Exception as e:
+                logger.warning(f"Redis cache write error: {e}")
+            return feed
+        finally:
+            if acquired:
+                try:
+                    # Only release the lock if we still own it
+                    if await redis.get(lock_key) == token:
+                        await redis.delete(lock_key)
+                except Exception:
+                    pass
+    
+    async def _single_flight(self, user_id: str) -> List[Dict]:
+        """Share one in-process computation between concurrent callers"""
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._compute_and_cache(user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        return await asyncio.shield(task)
+    
+    def _schedule_refresh(self, user_id: str) -> None:
+        """Refresh-ahead: recompute in the background before the entry expires"""
+        if user_id in self._inflight:
+            return
+        task = asyncio.ensure_future(self._single_flight(user_id))
+        self._background.add(task)
+        
+        def _done(t):
+            self._background.discard(t)
+            if not t.cancelled() and t.exception():
+                logger.warning(f"Background ranking refresh failed for {user_id}: {t.exception()}")
+        task.add_done_callback(_done)
     
     async def get_ranked_capsules_for_user(
         self, 
@@ -341,107 +657,79 @@ class CapsuleRankingService:
     ) -> List[Dict]:
         """
         Get top ranked capsules for a user with caching
-        """
-        cache_key = f"capsules:ranked:{user_id}"
         
-        # Try cache first (unless force refresh)
-        if not force_refresh and self.redis:
-            try:
-                cached_data = self.redis.get(cache_key)
-                if cached_data:
-                    logger.info(f"Cache HIT for ranked capsules: {user_id}")
-                    return json.loads(cached_data)
-            except Exception as e:
-                logger.warning(f"Redis cache read error: {e}")
+        Misses are single-flighted per user, and entries close to expiry are
+        refreshed in the background while the cached feed is served.
+        """
+        if not force_refresh:
+            redis = await self._get_redis()
+            if redis is not None:
+                try:
+                    cached, ttl = await self._read_feed_cache(redis, user_id)
+                    if cached is not None:
+                        logger.info(f"Cache HIT for ranked capsules: {user_id}")
+                        if 0 <= ttl < self.refresh_ahead_seconds:
+                            self._schedule_refresh(user_id)
+                        return cached[:limit]
+                except Exception as e:
+                    logger.warning(f"Redis cache read error: {e}")
         
         # Cache miss - calculate from database
         logger.info(f"Cache MISS for ranked capsules: {user_id} - Computing...")
+        feed = await self._single_flight(user_id)
+        return feed[:limit]
+    
+    async def on_capsule_event(self, capsule_id: str, event: str) -> int:
+        """
+        Targeted invalidation for capsule engagement events.
         
-        async with get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                # Get all capsules
-                await cursor.execute(
-                    """
-                    SELECT id, title, content, author_id, category, tags,
-                           views_count, likes_count, bookmarks_count, created_at
-                    FROM knowledge_capsules
-                    WHERE is_featured >= 0
-                    ORDER BY created_at DESC
-                    LIMIT 100
-                    """
-                )
-                capsules = await cursor.fetchall()
-                
-                if not capsules:
-                    return []
-                
-                # Calculate rankings for all capsules
-                ranked_results = []
-                
-                for capsule_row in capsules:
-                    capsule_id = capsule_row[0]
-                    
-                    try:
-                        final_score, breakdown = await self.calculate_capsule_rank(
-                            user_id, 
-                            capsule_id
-                        )
-                        
-                        # Get author info
-                        await cursor.execute(
-                            """
-                            SELECT ap.name, ap.photo_url, ap.current_role, ap.current_company
-                            FROM alumni_profiles ap
-                            WHERE ap.user_id = %s
-                            """,
-                            (capsule_row[3],)
-                        )
-                        author_row = await cursor.fetchone()
-                        
-                        author_info = {
-                            'name': author_row[0] if author_row else 'Unknown',
-                            'photo_url': author_row[1] if author_row else None,
-                            'role': author_row[2] if author_row else None,
-                            'company': author_row[3] if author_row else None
-                        }
-                        
-                        ranked_results.append({
-                            'capsule_id': capsule_id,
-                            'title': capsule_row[1],
-                            'category': capsule_row[4],
-                            'tags': json.loads(capsule_row[5]) if capsule_row[5] else [],
-                            'views_count': capsule_row[6],
-                            'likes_count': capsule_row[7],
-                            'bookmarks_count': capsule_row[8],
-                            'created_at': capsule_row[9].isoformat() if capsule_row[9] else None,
-                            'author': author_info,
-                            'rank_score': final_score,
-                            'match_reason': self._generate_match_reason(breakdown),
-                            'score_breakdown': breakdown
-                        })
-                    except Exception as e:
-                        logger.error(f"Error ranking capsule {capsule_id}: {e}")
-                        continue
-                
-                # Sort by rank score (descending)
-                ranked_results.sort(key=lambda x: x['rank_score'], reverse=True)
-                
-                # Limit results
-                top_ranked = ranked_results[:limit]
-                
-                # Cache results
-                if self.redis:
-                    try:
-                        self.redis.setex(
-                            cache_key,
-                            self.cache_ttl,
-                            json.dumps(top_ranked, default=str)
-                        )
-                        logger.info(f"Cached ranked capsules for user: {user_id}")
-                    except Exception as e:
-                        logger.warning(f"Redis cache write error: {e}")
-                
-                return top_ranked
+        Likes, bookmarks and edits evict every cached feed that contains the
+        capsule. Views only shorten those entries into the refresh-ahead
+        window, so the next read serves the cached feed and recomputes in
+        the background.
+        
+        Returns: number of feeds affected
+        """
+        redis = await self._get_redis()
+        if redis is None:
+            return 0
+        
+        try:
+            user_ids = await redis.smembers(self._members_key(capsule_id))
+            if not user_ids:
+                return 0
+            
+            keys = [self._feed_key(uid) for uid in user_ids]
+            if event == 'view':
+                # Only ever shorten the TTL (EXPIRE ... LT needs Redis 7)
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.ttl(key)
+                    ttls = await pipe.execute()
+                # -1 is a key without expiry, -2 a key that is already gone
+                keys = [key for key, ttl in zip(keys, ttls) if ttl == -1 or ttl > self.refresh_ahead_seconds]
+                if keys:
+                    async with redis.pipeline(transaction=False) as pipe:
+                        for key in keys:
+                            pipe.expire(key, self.refresh_ahead_seconds)
+                        await pipe.execute()
+            else:
+                await redis.delete(*keys, self._members_key(capsule_id))
+            
+            return len(user_ids)
+        except Exception as e:
+            logger.warning(f"Error invalidating ranked feeds for capsule {capsule_id}: {e}")
+            return 0
+    
+    async def ping_cache(self) -> bool:
+        """Check that the ranking cache backend is reachable"""
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+        try:
+            return bool(await redis.ping())
+        except Exception:
+            return False
     
     def _generate_match_reason(self, breakdown: Dict) -> str:
         """Generate human-readable match reason"""
@@ -478,71 +766,63 @@ class CapsuleRankingService:
         Calculate rankings for multiple capsules in batch
         Returns: {capsule_id: rank_score}
         """
-        rankings = {}
+        capsules, components = await self.rank_capsules(user_id, capsule_ids)
+        scored = {
+            capsule['id']: float(components['final_rank_score'][i])
+            for i, capsule in enumerate(capsules)
+        }
         
-        for capsule_id in capsule_ids:
-            try:
-                score, _ = await self.calculate_capsule_rank(user_id, capsule_id)
-                rankings[capsule_id] = score
-            except Exception as e:
-                logger.error(f"Error ranking capsule {capsule_id}: {e}")
-                rankings[capsule_id] = 0.0
-        
-        return rankings
+        # Capsules that were not found keep the previous 0.0 default
+        return {capsule_id: scored.get(capsule_id, 0.0) for capsule_id in capsule_ids}
     
     async def refresh_all_rankings(self, user_id: Optional[str] = None) -> Dict:
         """
-        Refresh rankings for all users or a specific user
-        This is a manual refresh endpoint (no Celery)
+        Refresh rankings for a specific user, or for every user that
+        currently has a cached feed. Users without a cached feed are
+        computed lazily on their next request.
         """
-        async with get_db_connection() as conn:
-            async with conn.cursor() as cursor:
-                if user_id:
-                    # Refresh for specific user
-                    user_ids = [user_id]
-                else:
-                    # Refresh for all active users
-                    await cursor.execute(
-                        """
-                        SELECT id FROM users 
-                        WHERE is_active = TRUE AND role IN ('student', 'alumni')
-                        LIMIT 1000
-                        """
-                    )
-                    user_rows = await cursor.fetchall()
-                    user_ids = [row[0] for row in user_rows]
-                
-                total_users = len(user_ids)
-                processed = 0
-                errors = 0
-                
-                for uid in user_ids:
-                    try:
-                        # Clear cache
-                        cache_key = f"capsules:ranked:{uid}"
-                        if self.redis:
-                            self.redis.delete(cache_key)
-                        
-                        # Recalculate rankings
-                        await self.get_ranked_capsules_for_user(uid, force_refresh=True)
-                        processed += 1
-                    except Exception as e:
-                        logger.error(f"Error refreshing rankings for user {uid}: {e}")
-                        errors += 1
-                
-                return {
-                    'total_users': total_users,
-                    'processed': processed,
-                    'errors': errors,
-                    'success_rate': round(processed / max(total_users, 1) * 100, 2)
-                }
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = []
+            redis = await self._get_redis()
+            if redis is not None:
+                prefix = f"{self.CACHE_PREFIX}:"
+                async for key in redis.scan_iter(match=f"{prefix}*", count=500):
+                    uid = key[len(prefix):]
+                    # Skip lock and capsule-membership keys
+                    if ':' not in uid:
+                        user_ids.append(uid)
+        
+        total_users = len(user_ids)
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+        
+        async def refresh(uid: str) -> bool:
+            async with semaphore:
+                try:
+                    await self._single_flight(uid)
+                    return True
+                except Exception as e:
+                    logger.error(f"Error refreshing rankings for user {uid}: {e}")
+                    return False
+        
+        results = await asyncio.gather(*(refresh(uid) for uid in user_ids))
+        processed = sum(results)
+        errors = total_users - processed
+        
+        return {
+            'total_users': total_users,
+            'processed': processed,
+            'errors': errors,
+            'success_rate': round(processed / max(total_users, 1) * 100, 2)
+        }
     
     async def clear_user_cache(self, user_id: str):
         """Clear cached rankings for a specific user"""
-        cache_key = f"capsules:ranked:{user_id}"
-        if self.redis:
+        redis = await self._get_redis()
+        if redis:
             try:
-                self.redis.delete(cache_key)
+                await redis.delete(self._feed_key(user_id))
                 logger.info(f"Cleared cache for user: {user_id}")
             except Exception as e:
                 logger.warning(f"Error clearing cache: {e}")
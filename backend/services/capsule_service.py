@@ -5,9 +5,13 @@ Handles all business logic for knowledge capsules system
 import logging
 import json
 import uuid
+import aiomysql
 from typing import Optional
 from datetime import datetime
 from database.connection import get_db_pool
+from services.capsule_ranking_service import get_ranking_service
+from services.entity_skill_service import EntitySkillService, ENTITY_CAPSULE
+from utils.route_cache import invalidate_tags
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +46,9 @@ class CapsuleService:
                         query,
                         (capsule_id, title, content, author_id, category, json.dumps(tags), duration_minutes, featured_image)
                     )
+                    await EntitySkillService.sync_entity(cursor, ENTITY_CAPSULE, capsule_id, tags)
                     await conn.commit()
+                    await invalidate_tags("capsules")
                     
                     # Fetch the created capsule
                     return await CapsuleService.get_capsule_by_id(capsule_id, author_id)
@@ -65,6 +71,7 @@ class CapsuleService:
                         (capsule_id,)
                     )
                     await conn.commit()
+                    await get_ranking_service().on_capsule_event(capsule_id, 'view')
                     
                     # Fetch capsule with author details
                     query = """
@@ -263,7 +270,13 @@ class CapsuleService:
                     params.append(capsule_id)
                     
                     await cursor.execute(update_query, params)
+                    if update_data.get('tags') is not None:
+                        await EntitySkillService.sync_entity(
+                            cursor, ENTITY_CAPSULE, capsule_id, update_data['tags']
+                        )
                     await conn.commit()
+                    await get_ranking_service().on_capsule_event(capsule_id, 'update')
+                    await invalidate_tags("capsules")
                     
                     return await CapsuleService.get_capsule_by_id(capsule_id, author_id)
                     
@@ -293,11 +306,14 @@ class CapsuleService:
                         return False
                     
                     # Delete the capsule
+                    await EntitySkillService.delete_entity(cursor, ENTITY_CAPSULE, capsule_id)
                     await cursor.execute(
                         "DELETE FROM knowledge_capsules WHERE id = %s",
                         (capsule_id,)
                     )
                     await conn.commit()
+                    await get_ranking_service().on_capsule_event(capsule_id, 'delete')
+                    await invalidate_tags("capsules")
                     
                     return True
                     
@@ -336,6 +352,7 @@ class CapsuleService:
                         is_liked = True
                     
                     await conn.commit()
+                    await get_ranking_service().on_capsule_event(capsule_id, 'like')
                     
                     # Get updated likes count
                     await cursor.execute(
@@ -386,6 +403,7 @@ class CapsuleService:
                         is_bookmarked = True
                     
                     await conn.commit()
+                    await get_ranking_service().on_capsule_event(capsule_id, 'bookmark')
                     
                     # Get updated bookmarks count
                     await cursor.execute(
@@ -522,7 +540,3 @@ class CapsuleService:
         except Exception as e:
             logger.error(f"Error getting user bookmarks: {str(e)}")
             raise
-
-
-# Fix: Import aiomysql.DictCursor properly
-import aiomysql
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional
 from collections import Counter
 from datetime import datetime
 
-from ml.model_loader import get_model_loader
+from ml.model_loader import get_prediction_batcher
 from ml.llm_advisor import get_llm_advisor
 
 logger = logging.getLogger(__name__)
@@ -154,13 +154,6 @@ class CareerPredictionService:
             List of ML predictions or None if model unavailable
         """
         try:
-            # Get the model loader singleton
-            model_loader = get_model_loader()
-            
-            if not model_loader.is_loaded():
-                logger.info("ML model not loaded, will use rule-based predictions")
-                return None
-            
             # Prepare user profile for prediction
             user_profile = {
                 "current_role": current_role,
@@ -171,10 +164,13 @@ class CareerPredictionService:
                 "success_rating": 3  # Neutral default
             }
             
-            # Get ML predictions
-            predictions = model_loader.predict(user_profile)
+            # Get ML predictions (batched with concurrent requests, off the event loop)
+            predictions = await get_prediction_batcher().predict(user_profile)
             
-            if predictions and len(predictions) > 0:
+            if predictions is None:
+                logger.info("ML model unavailable, will use rule-based predictions")
+                return None
+            elif len(predictions) > 0:
                 logger.info(f"ML model returned {len(predictions)} predictions")
                 return predictions
             else:
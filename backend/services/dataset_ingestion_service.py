@@ -0,0 +1,378 @@
+"""Dataset Ingestion Engine - Phase 10.2
+Streams uploaded datasets through validation, cleaning and bulk storage in
+bounded chunks so memory stays flat for million-row files.
+"""
+import json
+import logging
+import secrets
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database.connection import get_db_pool
+from services.dataset_service import DatasetService
+from services.entity_skill_service import EntitySkillService, ENTITY_JOB, ENTITY_PROFILE
+from utils.dataset_reader import DatasetChunkReader, DEFAULT_CHUNK_SIZE
+from utils.dataset_validator import (
+    DatasetValidator, DatasetCleaner, HashDeduplicator, MAX_REPORTED_ERRORS, get_ruleset
+)
+from utils.security import hash_password
+from utils.route_cache import invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+# Route cache tag of the records each file type writes
+CACHE_TAGS = {'alumni': 'profiles', 'job_market': 'jobs'}
+
+# Stable ids for imported rows make a retried upload upsert the same records
+IMPORT_NAMESPACE = uuid.UUID('6f1c3d2e-8a4b-4f6e-9c1d-2b7a5e0f4c31')
+
+
+def _values(df: pd.DataFrame, column: str) -> List[Any]:
+    """Column as a list with NaN mapped to None (None-filled if missing)"""
+    if column not in df.columns:
+        return [None] * len(df)
+    return [None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+            for value in df[column].tolist()]
+
+
+def _skills_json(skills) -> Optional[str]:
+    return json.dumps(skills) if skills else None
+
+
+class DatasetIngestionEngine:
+    """
+    Two streaming passes over an uploaded file:
+
+    1. Validate every chunk column-wise and aggregate the report. Nothing is
+       written unless the file passes the 80% valid-rows threshold.
+    2. Drop rows failing a rule, clean each chunk, drop rows already seen
+       in earlier chunks and bulk-upsert the rest, committing per chunk.
+
+    Progress is published after every chunk.
+    """
+
+    def __init__(self, upload_id: str, file_path: str, file_type: str, chunk_size: Optional[int] = None):
+        self.upload_id = upload_id
+        self.file_path = file_path
+        self.file_type = file_type
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.ruleset = get_ruleset(file_type)
+        # Rows with equal keys are duplicates across the whole file, not just a chunk
+        self._deduplicator = HashDeduplicator(self.ruleset.dedupe_keys if self.ruleset else [])
+        self._import_password_hash: Optional[str] = None
+        # Emails of existing non-alumni accounts found in an alumni file
+        self._skipped_non_alumni: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Passes
+    # ------------------------------------------------------------------
+
+    async def _validate_pass(self) -> Dict[str, Any]:
+        """Aggregate the validation report over all chunks"""
+        reader = DatasetChunkReader(self.file_path, self.chunk_size)
+        total_rows = valid_rows = 0
+        errors: List[str] = []
+        rule_counts: Dict[str, int] = {}
+
+        for chunk in reader:
+            result = DatasetValidator.validate_chunk(chunk, self.file_type, first_row_num=total_rows + 2)
+            total_rows += result['total_rows']
+            valid_rows += result['valid_rows']
+            for rule, count in result['rule_counts'].items():
+                rule_counts[rule] = rule_counts.get(rule, 0) + count
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.extend(result['errors'][:MAX_REPORTED_ERRORS - len(errors)])
+
+            await DatasetService.record_progress(
+                self.upload_id, 'validating', reader.progress,
+                total_rows, valid_rows, total_rows - valid_rows
+            )
+
+        if self.ruleset is None:
+            errors = [f"Unknown file type: {self.file_type}"]
+
+        success_rate = valid_rows / total_rows if total_rows > 0 else 0
+        return {
+            'is_valid': success_rate >= 0.8,
+            'success_rate': success_rate,
+            'total_rows': total_rows,
+            'valid_rows': valid_rows,
+            'error_rows': total_rows - valid_rows,
+            'rule_counts': rule_counts,
+            'errors': errors
+        }
+
+    async def _ingest_pass(self, uploaded_by: str) -> Dict[str, Any]:
+        """Clean, deduplicate and store every chunk"""
+        reader = DatasetChunkReader(self.file_path, self.chunk_size)
+        processed_rows = valid_rows = records_stored = 0
+
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            for chunk in reader:
+                processed_rows += len(chunk)
+                # Rows failing any rule are never stored
+                chunk = chunk[self.ruleset.evaluate(chunk) == 0]
+                df_clean = self._deduplicator.filter(DatasetCleaner.clean_dataset(chunk, self.file_type))
+                valid_rows += len(df_clean)
+
+                if len(df_clean):
+                    async with conn.cursor() as cursor:
+                        records_stored += await self._store_chunk(cursor, df_clean, uploaded_by)
+                    await conn.commit()
+
+                await DatasetService.record_progress(
+                    self.upload_id, 'processing', reader.progress,
+                    processed_rows, valid_rows, processed_rows - valid_rows
+                )
+
+        if records_stored and self.file_type in CACHE_TAGS:
+            await invalidate_tags(CACHE_TAGS[self.file_type])
+
+        return {
+            'total_rows': processed_rows,
+            'valid_rows': valid_rows,
+            'records_stored': records_stored,
+            'skipped_non_alumni': len(self._skipped_non_alumni),
+            'skipped_non_alumni_emails': self._skipped_non_alumni[:MAX_REPORTED_ERRORS],
+            'file_type': self.file_type,
+            'upload_id': self.upload_id
+        }
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    async def _store_chunk(self, cursor, df: pd.DataFrame, uploaded_by: str) -> int:
+        if self.file_type == 'alumni':
+            return await self._store_alumni(cursor, df)
+        if self.file_type == 'job_market':
+            return await self._store_jobs(cursor, df, uploaded_by)
+        # Educational records have no target table yet; they feed the AI pipeline only
+        return 0
+
+    async def _store_alumni(self, cursor, df: pd.DataFrame) -> int:
+        """
+        Upsert users (by email) and their alumni profiles in bulk
+
+        Emails are matched case-insensitively. Rows whose email belongs to an
+        existing account with another role are skipped and reported rather
+        than given an alumni profile.
+        """
+        if self._import_password_hash is None:
+            # One unguessable hash shared by all imported accounts: they log in
+            # after a password reset, and no per-row bcrypt cost is paid
+            self._import_password_hash = hash_password(secrets.token_urlsafe(32))
+
+        emails = [email.strip().lower() for email in _values(df, 'email')]
+        await cursor.executemany(
+            """
+            INSERT INTO users (id, email, password_hash, role)
+            VALUES (%s, %s, %s, 'alumni')
+            ON DUPLICATE KEY UPDATE id = id
+            """,
+            [(str(uuid.uuid5(IMPORT_NAMESPACE, f"user:{email}")), email, self._import_password_hash)
+             for email in emails]
+        )
+
+        placeholders = ', '.join(['%s'] * len(emails))
+        await cursor.execute(f"SELECT id, email, role FROM users WHERE email IN ({placeholders})", emails)
+        user_ids = {}
+        skipped = []
+        for user_id, email, role in await cursor.fetchall():
+            if role == 'alumni':
+                user_ids[email.lower()] = user_id
+            else:
+                skipped.append(email)
+        if skipped:
+            logger.warning(
+                f"[Upload {self.upload_id}] Skipped {len(skipped)} alumni rows matching "
+                f"existing non-alumni accounts"
+            )
+            self._skipped_non_alumni.extend(skipped)
+
+        rows = []
+        skills_by_user = {}
+        for email, name, company, role, location, batch_year, skills in zip(
+            emails, _values(df, 'name'), _values(df, 'current_company'), _values(df, 'current_role'),
+            _values(df, 'location'), _values(df, 'batch_year'), _values(df, 'skills')
+        ):
+            user_id = user_ids.get(email)
+            if not user_id:
+                continue
+            rows.append((
+                str(uuid.uuid5(IMPORT_NAMESPACE, f"profile:{user_id}")), user_id, name,
+                company, role, location, int(batch_year), _skills_json(skills)
+            ))
+            if skills:
+                skills_by_user[user_id] = skills
+
+        if rows:
+            await cursor.executemany(
+                """
+                INSERT INTO alumni_profiles
+                (id, user_id, name, current_company, current_role, location, batch_year, skills)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    name = VALUES(name),
+                    current_company = COALESCE(VALUES(current_company), current_company),
+                    current_role = COALESCE(VALUES(current_role), current_role),
+                    location = COALESCE(VALUES(location), location),
+                    batch_year = VALUES(batch_year),
+                    skills = COALESCE(VALUES(skills), skills)
+                """,
+                rows
+            )
+            await EntitySkillService.sync_entities(cursor, ENTITY_PROFILE, skills_by_user)
+        return len(rows)
+
+    async def _store_jobs(self, cursor, df: pd.DataFrame, uploaded_by: str) -> int:
+        """
+        Upsert job market rows into jobs as drafts posted by the uploader,
+        so they feed the skill graph without appearing on the job board
+        """
+        rows = []
+        skills_by_job = {}
+        for title, company, location, industry, level, skills, salary_min, salary_max in zip(
+            _values(df, 'job_title'), _values(df, 'company'), _values(df, 'location'),
+            _values(df, 'industry'), _values(df, 'experience_level'), _values(df, 'required_skills'),
+            _values(df, 'salary_min'), _values(df, 'salary_max')
+        ):
+            job_id = str(uuid.uuid5(IMPORT_NAMESPACE, f"job:{title.lower()}|{company.lower()}"))
+            salaries = [f"{int(s)}" for s in (salary_min, salary_max) if s is not None]
+            rows.append((
+                job_id, title, f"{title} at {company}" + (f" ({industry})" if industry else ""),
+                company, location, level, _skills_json(skills), '-'.join(salaries) or None, uploaded_by
+            ))
+            skills_by_job[job_id] = skills or []
+
+        await cursor.executemany(
+            """
+            INSERT INTO jobs
+            (id, title, description, company, location, job_type, experience_required,
+             skills_required, salary_range, posted_by, status)
+            VALUES (%s, %s, %s, %s, %s, 'full-time', %s, %s, %s, %s, 'draft')
+            ON DUPLICATE KEY UPDATE
+                location = VALUES(location),
+                experience_required = VALUES(experience_required),
+                skills_required = VALUES(skills_required),
+                salary_range = VALUES(salary_range)
+            """,
+            rows
+        )
+        await EntitySkillService.sync_entities(cursor, ENTITY_JOB, skills_by_job)
+        return len(rows)
+
+    async def _get_uploader(self) -> Optional[str]:
+        upload = await DatasetService.get_upload_by_id(self.upload_id)
+        return upload['uploaded_by'] if upload else None
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, on_stored: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """
+        Process the upload end to end, recording status and stage logs
+
+        Args:
+            on_stored: called after storage succeeds (queues the AI pipeline)
+
+        Returns:
+            Processing results
+        """
+        upload_id, file_type = self.upload_id, self.file_type
+
+        await DatasetService.update_upload_status(upload_id, 'validating')
+        await DatasetService.log_processing_stage(
+            upload_id, 'validation', 'started',
+            f'Starting validation for {file_type} dataset'
+        )
+
+        validation_result = await self._validate_pass()
+        total_rows = validation_result['total_rows']
+
+        if not validation_result['is_valid']:
+            error_msg = f"Validation failed: {validation_result['error_rows']} invalid rows out of {total_rows}"
+            logger.error(f"[Upload {upload_id}] {error_msg}")
+
+            await DatasetService.update_upload_status(
+                upload_id, 'failed',
+                error_log=error_msg,
+                total_rows=total_rows,
+                valid_rows=validation_result['valid_rows'],
+                error_rows=validation_result['error_rows'],
+                validation_report=validation_result
+            )
+            await DatasetService.log_processing_stage(
+                upload_id, 'validation', 'failed',
+                error_msg, validation_result
+            )
+            return {
+                'status': 'failed',
+                'error': error_msg,
+                'validation_result': validation_result
+            }
+
+        logger.info(f"[Upload {upload_id}] Validation passed: {validation_result['valid_rows']} valid rows")
+        await DatasetService.log_processing_stage(
+            upload_id, 'validation', 'completed',
+            f"Validation successful: {validation_result['valid_rows']} valid rows",
+            validation_result
+        )
+
+        await DatasetService.update_upload_status(
+            upload_id, 'processing',
+            total_rows=total_rows,
+            validation_report=validation_result
+        )
+        await DatasetService.log_processing_stage(
+            upload_id, 'cleaning', 'started',
+            f'Cleaning and storing data in chunks of {self.chunk_size} rows'
+        )
+
+        storage_result = await self._ingest_pass(await self._get_uploader())
+        valid_rows = storage_result['valid_rows']
+        error_rows = total_rows - valid_rows
+
+        logger.info(f"[Upload {upload_id}] Cleaning complete: {valid_rows} valid rows, {error_rows} removed")
+        await DatasetService.log_processing_stage(
+            upload_id, 'cleaning', 'completed',
+            f"Cleaned dataset: {valid_rows} rows remaining",
+            {'original_rows': total_rows, 'cleaned_rows': valid_rows, 'removed_rows': error_rows}
+        )
+        await DatasetService.log_processing_stage(
+            upload_id, 'storage', 'completed',
+            f"Stored {storage_result['records_stored']} records in database",
+            storage_result
+        )
+
+        if on_stored:
+            await DatasetService.log_processing_stage(
+                upload_id, 'ai_processing', 'started',
+                'Triggering AI pipeline processing'
+            )
+            on_stored()
+            await DatasetService.log_processing_stage(
+                upload_id, 'ai_processing', 'completed',
+                'AI pipeline tasks queued successfully'
+            )
+
+        await DatasetService.update_upload_status(
+            upload_id, 'completed',
+            total_rows=total_rows,
+            valid_rows=valid_rows,
+            error_rows=error_rows
+        )
+
+        return {
+            'status': 'completed',
+            'total_rows': total_rows,
+            'valid_rows': valid_rows,
+            'error_rows': error_rows,
+            'upload_id': upload_id,
+            'storage_result': storage_result
+        }
@@ -9,9 +9,13 @@ from datetime import datetime
 import aiomysql
 
 from database.connection import get_db_pool
+from redis_client import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+PROGRESS_KEY_PREFIX = "dataset:progress"
+PROGRESS_TTL = 86400
+
 
 class DatasetService:
     """Service for managing dataset uploads"""
@@ -178,6 +182,54 @@ class DatasetService:
                 
                 logger.info(f"Logged {stage} stage for upload {upload_id}: {status}")
     
+    @staticmethod
+    async def record_progress(
+        upload_id: str,
+        stage: str,
+        fraction: float,
+        processed_rows: int,
+        valid_rows: int = 0,
+        error_rows: int = 0
+    ) -> None:
+        """
+        Publish per-chunk progress of a running upload
+        
+        Kept in Redis rather than the uploads table so streaming a large file
+        does not add a row update per chunk.
+        """
+        try:
+            redis = await get_redis_client()
+            key = f"{PROGRESS_KEY_PREFIX}:{upload_id}"
+            await redis.hset(key, mapping={
+                'stage': stage,
+                'fraction': round(fraction, 4),
+                'processed_rows': processed_rows,
+                'valid_rows': valid_rows,
+                'error_rows': error_rows,
+            })
+            await redis.expire(key, PROGRESS_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to record progress for upload {upload_id}: {e}")
+    
+    @staticmethod
+    async def get_progress(upload_id: str) -> Optional[Dict[str, Any]]:
+        """Latest per-chunk progress of an upload, if any was recorded"""
+        try:
+            redis = await get_redis_client()
+            progress = await redis.hgetall(f"{PROGRESS_KEY_PREFIX}:{upload_id}")
+        except Exception as e:
+            logger.warning(f"Failed to read progress for upload {upload_id}: {e}")
+            return None
+        if not progress:
+            return None
+        return {
+            'stage': progress.get('stage'),
+            'fraction': float(progress.get('fraction', 0)),
+            'processed_rows': int(progress.get('processed_rows', 0)),
+            'valid_rows': int(progress.get('valid_rows', 0)),
+            'error_rows': int(progress.get('error_rows', 0)),
+        }
+    
     @staticmethod
     async def get_processing_logs(upload_id: str) -> List[Dict[str, Any]]:
         """Get all processing logs for an upload"""
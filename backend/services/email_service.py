@@ -67,6 +67,10 @@ class EmailService:
         
         return await self._send_email(to_email, subject, content)
     
+    async def send_email(self, to_email: str, subject: str, body: str) -> bool:
+        """Send an arbitrary HTML email"""
+        return await self._send_email(to_email, subject, body)
+    
     async def _send_email(self, to_email: str, subject: str, html_content: str) -> bool:
         """Send email using SendGrid or mock"""
         if self.use_mock:
@@ -0,0 +1,458 @@
+"""
+Engagement Batch Engine - Set-based nightly engagement recalculation
+Computes base points, AI activity boost, activity pattern and badge
+eligibility for all active users with grouped aggregate queries, processing
+users in keyset-ordered chunks across a bounded number of pooled connections.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from database.connection import get_db_pool
+from redis_client import get_redis_client
+from services.engagement_service import engagement_service
+
+logger = logging.getLogger(__name__)
+
+
+class EngagementBatchEngine:
+    """
+    Recalculates engagement scores for every active user in bulk.
+
+    Each chunk of users is scored with a fixed number of ``GROUP BY`` queries
+    (instead of ~15 queries per user), results are written with one bulk
+    upsert per chunk and badges with one ``INSERT IGNORE`` per chunk. Ranks
+    and leaderboard badges are assigned once at the end. Progress is
+    checkpointed in Redis after every wave of chunks so a retried run resumes
+    where the previous one stopped. Chunks that fail are kept in the
+    checkpoint as user id ranges and retried once the other users are done;
+    ranges that fail again stay in the checkpoint for the next (resumed) run.
+    """
+
+    CHECKPOINT_KEY = "engagement:recalc:checkpoint"
+    CHECKPOINT_TTL = 20 * 3600  # Never carry a checkpoint into the next nightly run
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ):
+        self.chunk_size = chunk_size or int(os.getenv('ENGAGEMENT_BATCH_SIZE', 2000))
+        self.concurrency = concurrency or int(os.getenv('ENGAGEMENT_BATCH_CONCURRENCY', 4))
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    async def _load_checkpoint(self) -> Optional[Dict]:
+        try:
+            redis = await get_redis_client()
+            data = await redis.get(self.CHECKPOINT_KEY)
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.warning(f"Engagement checkpoint unavailable: {e}")
+            return None
+
+    async def _save_checkpoint(self, checkpoint: Dict) -> None:
+        try:
+            redis = await get_redis_client()
+            await redis.set(self.CHECKPOINT_KEY, json.dumps(checkpoint, default=str), ex=self.CHECKPOINT_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to save engagement checkpoint: {e}")
+
+    async def _clear_checkpoint(self) -> None:
+        try:
+            redis = await get_redis_client()
+            await redis.delete(self.CHECKPOINT_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to clear engagement checkpoint: {e}")
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _grouped(cursor, query: str, user_ids: List[str], params: tuple = (), repeat: int = 1) -> Dict[str, tuple]:
+        """
+        Run a ``GROUP BY user`` query restricted to ``user_ids`` (bound to each
+        of the ``repeat`` ``{ids}`` slots after ``params``) → {user_id: rest_of_row}
+        """
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        await cursor.execute(query.format(ids=placeholders), (*params, *(user_ids * repeat)))
+        return {row[0]: row[1:] for row in await cursor.fetchall()}
+
+    async def _aggregate(self, cursor, user_ids: List[str], now) -> Dict[str, Dict[str, Dict]]:
+        """Collect every per-user count the scoring rules need, one query per source table"""
+        grouped = self._grouped
+
+        profiles = await grouped(cursor, """
+            SELECT user_id, profile_completion_percentage
+            FROM alumni_profiles WHERE user_id IN ({ids})
+        """, user_ids)
+
+        sessions = await grouped(cursor, """
+            SELECT uid, COUNT(*) FROM (
+                SELECT mr.mentor_id AS uid
+                FROM mentorship_sessions ms
+                JOIN mentorship_requests mr ON ms.mentorship_request_id = mr.id
+                WHERE ms.status = 'completed' AND mr.mentor_id IN ({ids})
+                UNION ALL
+                SELECT mr.student_id AS uid
+                FROM mentorship_sessions ms
+                JOIN mentorship_requests mr ON ms.mentorship_request_id = mr.id
+                WHERE ms.status = 'completed' AND mr.student_id IN ({ids})
+                    AND mr.student_id <> mr.mentor_id
+            ) s GROUP BY uid
+        """, user_ids, repeat=2)
+
+        applications = await grouped(cursor, """
+            SELECT applicant_id, COUNT(*)
+            FROM job_applications WHERE applicant_id IN ({ids})
+            GROUP BY applicant_id
+        """, user_ids)
+
+        events = await grouped(cursor, """
+            SELECT user_id, COUNT(*)
+            FROM event_rsvps WHERE status = 'attending' AND user_id IN ({ids})
+            GROUP BY user_id
+        """, user_ids)
+
+        posts = await grouped(cursor, """
+            SELECT author_id,
+                   COUNT(*),
+                   SUM(is_deleted = FALSE),
+                   AVG(CASE WHEN is_deleted = FALSE AND created_at >= DATE_SUB(%s, INTERVAL 90 DAY)
+                            THEN likes_count END),
+                   AVG(CASE WHEN is_deleted = FALSE AND created_at >= DATE_SUB(%s, INTERVAL 90 DAY)
+                            THEN comments_count END)
+            FROM forum_posts WHERE author_id IN ({ids})
+            GROUP BY author_id
+        """, user_ids, (now, now))
+
+        comments = await grouped(cursor, """
+            SELECT author_id, COUNT(*)
+            FROM forum_comments WHERE author_id IN ({ids})
+            GROUP BY author_id
+        """, user_ids)
+
+        capsules = await grouped(cursor, """
+            SELECT author_id, COUNT(*)
+            FROM knowledge_capsules WHERE author_id IN ({ids})
+            GROUP BY author_id
+        """, user_ids)
+
+        mentors = await grouped(cursor, """
+            SELECT user_id, rating, total_sessions
+            FROM mentor_profiles WHERE user_id IN ({ids})
+        """, user_ids)
+
+        # One pass over the last 60 days of history feeds consistency,
+        # diversity, trend and activity pattern
+        history = await grouped(cursor, """
+            SELECT user_id,
+                   COUNT(DISTINCT CASE WHEN created_at >= DATE_SUB(%s, INTERVAL 30 DAY)
+                                       THEN DATE(created_at) END),
+                   COUNT(DISTINCT CASE WHEN created_at >= DATE_SUB(%s, INTERVAL 30 DAY)
+                                       THEN contribution_type END),
+                   SUM(created_at >= DATE_SUB(%s, INTERVAL 7 DAY)),
+                   SUM(created_at >= DATE_SUB(%s, INTERVAL 14 DAY) AND created_at < DATE_SUB(%s, INTERVAL 7 DAY)),
+                   SUM(created_at >= DATE_SUB(%s, INTERVAL 30 DAY) AND created_at < DATE_SUB(%s, INTERVAL 14 DAY)),
+                   SUM(created_at < DATE_SUB(%s, INTERVAL 30 DAY)),
+                   COUNT(*)
+            FROM contribution_history
+            WHERE created_at >= DATE_SUB(%s, INTERVAL 60 DAY) AND user_id IN ({ids})
+            GROUP BY user_id
+        """, user_ids, (now,) * 9)
+
+        return {
+            'profiles': profiles, 'sessions': sessions, 'applications': applications,
+            'events': events, 'posts': posts, 'comments': comments,
+            'capsules': capsules, 'mentors': mentors, 'history': history,
+        }
+
+    @staticmethod
+    def _score_user(user_id: str, agg: Dict[str, Dict]) -> Dict:
+        """Apply the engagement rules to one user's aggregated counts"""
+        completion = agg['profiles'].get(user_id, (0,))[0] or 0
+        sessions = agg['sessions'].get(user_id, (0,))[0]
+        applications = agg['applications'].get(user_id, (0,))[0]
+        events = agg['events'].get(user_id, (0,))[0]
+        post_total, post_live, avg_likes, avg_comments = agg['posts'].get(user_id, (0, 0, None, None))
+        comments = agg['comments'].get(user_id, (0,))[0]
+        capsules = agg['capsules'].get(user_id, (0,))[0]
+        rating, mentor_sessions = agg['mentors'].get(user_id, (None, 0))
+        active_days, diversity, week1, week2, weeks3_4, older, total = agg['history'].get(
+            user_id, (0, 0, 0, 0, 0, 0, 0)
+        )
+
+        # Same formula as the update_engagement_score stored procedure (as fixed
+        # by database/database_engagement_score_fix.sql): every post and every
+        # comment counts, deleted or not
+        contributions = {
+            'profile': int(round(float(completion) * 0.2)),
+            'mentorship': sessions * 10,
+            'jobs': applications * 5,
+            'events': events * 8,
+            'forum': post_total * 5 + comments * 2,
+        }
+        base_score = sum(contributions.values())
+
+        ai_boost = engagement_service.compute_ai_boost(
+            active_days=active_days,
+            avg_likes=avg_likes,
+            avg_comments=avg_comments,
+            recent_activity=week1,
+            previous_activity=week2,
+            mentor_rating=rating,
+            mentor_sessions=mentor_sessions,
+            diversity=diversity
+        )
+
+        return {
+            'user_id': user_id,
+            'base_score': base_score,
+            'ai_boost': ai_boost,
+            'contributions': contributions,
+            'level': engagement_service._determine_level(base_score + ai_boost),
+            'activity_pattern': engagement_service.classify_activity_pattern(
+                week1, week2, weeks3_4, older, total
+            ),
+            'badge_stats': {
+                'login_count': 1,  # Logins are not tracked yet (matches check_and_award_badges)
+                'profile_completion': completion,
+                'mentorship_sessions': sessions,
+                'job_applications': applications,
+                'forum_posts': int(post_live or 0),
+                'events_attended': events,
+                'capsules_created': capsules,
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Chunk processing
+    # ------------------------------------------------------------------
+
+    async def _process_chunk(self, pool, user_ids: List[str], badges: List[Dict], now) -> Dict:
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                agg = await self._aggregate(cursor, user_ids, now)
+                scores = [self._score_user(uid, agg) for uid in user_ids]
+
+                await cursor.executemany(
+                    """
+                    INSERT INTO engagement_scores (user_id, total_score, contributions, level, last_calculated)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                        total_score = VALUES(total_score),
+                        contributions = VALUES(contributions),
+                        level = VALUES(level),
+                        last_calculated = VALUES(last_calculated)
+                    """,
+                    [
+                        (s['user_id'], s['base_score'], json.dumps(s['contributions']), s['level'], now)
+                        for s in scores
+                    ]
+                )
+
+                # Non-leaderboard badges; the unique (user_id, badge_id) key skips earned ones
+                awards = [
+                    (s['user_id'], badge['id'])
+                    for s in scores
+                    for badge in badges
+                    if engagement_service.badge_qualifies(badge['requirements'], s['badge_stats'])
+                ]
+                new_badges = 0
+                if awards:
+                    await cursor.executemany(
+                        "INSERT IGNORE INTO user_badges (user_id, badge_id) VALUES (%s, %s)",
+                        awards
+                    )
+                    new_badges = max(cursor.rowcount, 0)
+
+            await conn.commit()
+
+        return {
+            'processed': len(scores),
+            'total_points': sum(s['base_score'] + s['ai_boost'] for s in scores),
+            'total_ai_boost': sum(s['ai_boost'] for s in scores),
+            'patterns': Counter(s['activity_pattern'] for s in scores),
+            'new_badges': new_badges,
+        }
+
+    async def _finalize(self, pool, leaderboard_badges: List[Dict]) -> int:
+        """Assign rank positions and leaderboard badges in set-based statements"""
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("""
+                    UPDATE engagement_scores es
+                    JOIN (
+                        SELECT user_id, ROW_NUMBER() OVER (ORDER BY total_score DESC, user_id) AS rn
+                        FROM engagement_scores
+                    ) ranked ON ranked.user_id = es.user_id
+                    SET es.rank_position = ranked.rn
+                """)
+
+                awarded = 0
+                for badge in leaderboard_badges:
+                    await cursor.execute(
+                        """
+                        INSERT IGNORE INTO user_badges (user_id, badge_id)
+                        SELECT user_id, %s FROM engagement_scores WHERE rank_position <= %s
+                        """,
+                        (badge['id'], badge['requirements'].get('rank', 10))
+                    )
+                    awarded += max(cursor.rowcount, 0)
+            await conn.commit()
+
+            # Resync the live leaderboard with the freshly computed scores
+            try:
+                await engagement_service.rebuild_leaderboard(conn)
+            except Exception as e:
+                logger.warning(f"Failed to rebuild Redis leaderboard: {e}")
+        return awarded
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, resume: bool = True) -> Dict:
+        """
+        Recalculate engagement for all active users
+
+        Args:
+            resume: continue from the last checkpoint of an interrupted run
+
+        Returns:
+            Processing results including counts and statistics
+        """
+        started = time.perf_counter()
+        pool = await get_db_pool()
+
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT NOW()")
+                now = (await cursor.fetchone())[0]
+                await cursor.execute("SELECT COUNT(*) FROM users WHERE is_active = TRUE")
+                total_users = (await cursor.fetchone())[0]
+            all_badges = await engagement_service.get_all_badges(conn)
+
+        badges = [b for b in all_badges if b['requirements'].get('type') != 'leaderboard']
+        leaderboard_badges = [b for b in all_badges if b['requirements'].get('type') == 'leaderboard']
+
+        checkpoint = await self._load_checkpoint() if resume else None
+        if checkpoint:
+            logger.info(f"Resuming engagement recalculation after user {checkpoint['last_user_id']}")
+            stats = checkpoint['stats']
+            stats['patterns'] = Counter(stats['patterns'])
+            last_id = checkpoint['last_user_id']
+            # [first_user_id, last_user_id, users] of chunks that failed
+            failed_ranges = checkpoint.get('failed_ranges', [])
+        else:
+            stats = {'processed': 0, 'errors': 0, 'total_points': 0, 'total_ai_boost': 0,
+                     'new_badges': 0, 'patterns': Counter()}
+            last_id = ''
+            failed_ranges = []
+
+        def record(result: Dict) -> None:
+            stats['processed'] += result['processed']
+            stats['total_points'] += result['total_points']
+            stats['total_ai_boost'] += result['total_ai_boost']
+            stats['new_badges'] += result['new_badges']
+            stats['patterns'].update(result['patterns'])
+
+        logger.info(
+            f"Recalculating engagement for {total_users} active users "
+            f"(chunk={self.chunk_size}, concurrency={self.concurrency})"
+        )
+
+        while True:
+            # Next wave: up to `concurrency` chunks of user ids in keyset order
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        """
+                        SELECT id FROM users
+                        WHERE is_active = TRUE AND id > %s
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (last_id, self.chunk_size * self.concurrency)
+                    )
+                    ids = [row[0] for row in await cursor.fetchall()]
+            if not ids:
+                break
+
+            chunks = [ids[i:i + self.chunk_size] for i in range(0, len(ids), self.chunk_size)]
+            results = await asyncio.gather(
+                *(self._process_chunk(pool, chunk, badges, now) for chunk in chunks),
+                return_exceptions=True
+            )
+
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Engagement chunk starting at {chunk[0]} failed: {result}")
+                    stats['errors'] += len(chunk)
+                    failed_ranges.append([chunk[0], chunk[-1], len(chunk)])
+                    continue
+                record(result)
+
+            last_id = ids[-1]
+            await self._save_checkpoint({'last_user_id': last_id, 'failed_ranges': failed_ranges, 'stats': stats})
+            logger.info(f"Progress: {stats['processed'] + stats['errors']}/{total_users} users")
+
+        # Second attempt at the chunks that failed
+        remaining = []
+        for first_id, end_id, users in failed_ranges:
+            try:
+                async with pool.acquire() as conn:
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(
+                            """
+                            SELECT id FROM users
+                            WHERE is_active = TRUE AND id BETWEEN %s AND %s
+                            ORDER BY id
+                            """,
+                            (first_id, end_id)
+                        )
+                        ids = [row[0] for row in await cursor.fetchall()]
+                if ids:
+                    record(await self._process_chunk(pool, ids, badges, now))
+                stats['errors'] -= users
+            except Exception as e:
+                logger.error(f"Engagement users {first_id}..{end_id} failed again: {e}")
+                remaining.append([first_id, end_id, users])
+        failed_ranges = remaining
+
+        stats['new_badges'] += await self._finalize(pool, leaderboard_badges)
+        if failed_ranges:
+            await self._save_checkpoint({'last_user_id': last_id, 'failed_ranges': failed_ranges, 'stats': stats})
+        else:
+            await self._clear_checkpoint()
+
+        processed = stats['processed']
+        attempted = processed + stats['errors']
+        return {
+            'status': 'partial' if failed_ranges else 'completed',
+            'failed_ranges': [[first_id, end_id] for first_id, end_id, _ in failed_ranges],
+            'total_users': total_users,
+            'processed': processed,
+            'errors': stats['errors'],
+            'success_rate': round(processed / attempted * 100, 2) if attempted else 0,
+            'duration_seconds': round(time.perf_counter() - started, 2),
+            'statistics': {
+                'total_points_distributed': stats['total_points'],
+                'total_ai_boost': stats['total_ai_boost'],
+                'avg_score': round(stats['total_points'] / processed, 2) if processed else 0,
+                'avg_ai_boost': round(stats['total_ai_boost'] / processed, 2) if processed else 0,
+                'new_badges_awarded': stats['new_badges'],
+                'pattern_distribution': dict(stats['patterns'])
+            }
+        }
+
+
+# Initialize engine instance
+engagement_batch_engine = EngagementBatchEngine()
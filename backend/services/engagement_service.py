@@ -6,9 +6,25 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import json
+import time
+
+from database.connection import get_db_connection
+from redis_client import get_redis_client, RedisCache, RedisConfig
 
 logger = logging.getLogger(__name__)
 
+# Redis sorted sets holding engagement_scores.total_score for every user in
+# the engagement_leaderboard view (one global set plus one per role)
+LEADERBOARD_KEY = f"{RedisConfig.PREFIX_LEADERBOARD}:engagement"
+LEADERBOARD_BUILT_KEY = f"{LEADERBOARD_KEY}:built_at"
+LEADERBOARD_LOCK_KEY = f"{LEADERBOARD_KEY}:rebuild_lock"
+LEADERBOARD_ROLES = ('student', 'alumni', 'recruiter', 'admin')
+LEADERBOARD_REBUILD_BATCH = 5000
+
+
+def _leaderboard_key(role: Optional[str] = None) -> str:
+    return f"{LEADERBOARD_KEY}:role:{role}" if role else LEADERBOARD_KEY
+
 
 class EngagementService:
     """Service for engagement scoring and leaderboard with AI-powered enhancements"""
@@ -68,6 +84,8 @@ class EngagementService:
                     
                     await db_conn.commit()
             
+            await self.sync_leaderboard_entry(db_conn, user_id)
+            
             # Fetch the updated engagement score
             async with db_conn.cursor() as cursor:
                 await cursor.execute("""
@@ -100,7 +118,7 @@ class EngagementService:
                     'base_score': score[2],
                     'ai_boost': ai_boost,
                     'contributions': contributions_data,
-                    'rank_position': score[4],
+                    'rank_position': await self.get_live_rank(user_id) or score[4],
                     'level': self._determine_level(score[2] + ai_boost) if not score[5] else score[5],
                     'last_calculated': score[6],
                     'activity_pattern': await self._analyze_activity_pattern(db_conn, user_id)
@@ -139,11 +157,8 @@ class EngagementService:
         - Time investment patterns
         """
         try:
-            boost_points = 0
-            
-            # 1. Consistency Bonus: Reward regular activity
+            # 1. Consistency: active days in last 30 days
             async with db_conn.cursor() as cursor:
-                # Check activity in last 30 days
                 await cursor.execute("""
                     SELECT DATE(created_at) as activity_date, COUNT(*) as count
                     FROM contribution_history
@@ -152,18 +167,9 @@ class EngagementService:
                     GROUP BY DATE(created_at)
                 """, (user_id,))
                 daily_activities = await cursor.fetchall()
-                
-                # Calculate consistency score
-                if len(daily_activities) >= 20:  # Active 20+ days in last month
-                    boost_points += 50  # High consistency bonus
-                elif len(daily_activities) >= 10:  # Active 10-19 days
-                    boost_points += 25  # Medium consistency bonus
-                elif len(daily_activities) >= 5:  # Active 5-9 days
-                    boost_points += 10  # Basic consistency bonus
-            
-            # 2. Quality Bonus: Reward high-engagement contributions
+            
+            # 2. Quality: forum post engagement
             async with db_conn.cursor() as cursor:
-                # Check forum post engagement
                 await cursor.execute("""
                     SELECT AVG(likes_count) as avg_likes, AVG(comments_count) as avg_comments
                     FROM forum_posts
@@ -172,20 +178,9 @@ class EngagementService:
                         AND is_deleted = FALSE
                 """, (user_id,))
                 post_engagement = await cursor.fetchone()
-                
-                if post_engagement and post_engagement[0]:
-                    avg_likes = float(post_engagement[0] or 0)
-                    avg_comments = float(post_engagement[1] or 0)
-                    
-                    # High-quality content bonus
-                    if avg_likes >= 10 and avg_comments >= 5:
-                        boost_points += 40  # Highly engaging content
-                    elif avg_likes >= 5 or avg_comments >= 3:
-                        boost_points += 20  # Good engagement
             
-            # 3. Trend Bonus: Reward increasing activity
+            # 3. Trend: last 7 days vs previous 7 days
             async with db_conn.cursor() as cursor:
-                # Compare last 7 days vs previous 7 days
                 await cursor.execute("""
                     SELECT 
                         SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 ELSE 0 END) as recent,
@@ -196,40 +191,17 @@ class EngagementService:
                         AND created_at >= DATE_SUB(NOW(), INTERVAL 14 DAY)
                 """, (user_id,))
                 trend = await cursor.fetchone()
-                
-                if trend:
-                    recent_activity = trend[0] or 0
-                    previous_activity = trend[1] or 0
-                    
-                    # Increasing trend bonus
-                    if recent_activity > previous_activity and previous_activity > 0:
-                        growth_rate = (recent_activity - previous_activity) / previous_activity
-                        if growth_rate >= 0.5:  # 50%+ growth
-                            boost_points += 30  # Strong growth
-                        elif growth_rate >= 0.2:  # 20%+ growth
-                            boost_points += 15  # Moderate growth
-            
-            # 4. Mentorship Impact Bonus
+            
+            # 4. Mentorship impact: mentor rating and completed sessions
             async with db_conn.cursor() as cursor:
-                # Check mentor rating and completed sessions
                 await cursor.execute("""
                     SELECT mp.rating, mp.total_sessions
                     FROM mentor_profiles mp
                     WHERE mp.user_id = %s
                 """, (user_id,))
                 mentor_stats = await cursor.fetchone()
-                
-                if mentor_stats and mentor_stats[0]:
-                    rating = float(mentor_stats[0] or 0)
-                    sessions = int(mentor_stats[1] or 0)
-                    
-                    # High-impact mentorship bonus
-                    if rating >= 4.5 and sessions >= 5:
-                        boost_points += 35  # Excellent mentor
-                    elif rating >= 4.0 and sessions >= 3:
-                        boost_points += 20  # Good mentor
             
-            # 5. Diversity Bonus: Reward activity across different areas
+            # 5. Diversity: distinct contribution types in last 30 days
             async with db_conn.cursor() as cursor:
                 await cursor.execute("""
                     SELECT COUNT(DISTINCT contribution_type) as diversity
@@ -238,13 +210,17 @@ class EngagementService:
                         AND created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
                 """, (user_id,))
                 diversity_result = await cursor.fetchone()
-                
-                if diversity_result:
-                    diversity_count = diversity_result[0] or 0
-                    if diversity_count >= 5:  # Active in 5+ areas
-                        boost_points += 25  # Well-rounded contributor
-                    elif diversity_count >= 3:  # Active in 3-4 areas
-                        boost_points += 12  # Good diversity
+            
+            boost_points = self.compute_ai_boost(
+                active_days=len(daily_activities),
+                avg_likes=post_engagement[0] if post_engagement else None,
+                avg_comments=post_engagement[1] if post_engagement else None,
+                recent_activity=trend[0] if trend else 0,
+                previous_activity=trend[1] if trend else 0,
+                mentor_rating=mentor_stats[0] if mentor_stats else None,
+                mentor_sessions=mentor_stats[1] if mentor_stats else 0,
+                diversity=diversity_result[0] if diversity_result else 0
+            )
             
             logger.info(f"AI boost calculated for user {user_id}: +{boost_points} points")
             return boost_points
@@ -281,35 +257,9 @@ class EngagementService:
                 """, (user_id,))
                 pattern = await cursor.fetchone()
             
-            if not pattern or pattern[4] == 0:
-                return 'new_user'
-            
-            week1, week2, weeks3_4, older, total = pattern
-            
-            # No activity in last 30 days
-            if week1 == 0 and week2 == 0 and weeks3_4 == 0:
-                return 'inactive'
-            
-            # New user with limited history
-            if total < 5:
+            if not pattern:
                 return 'new_user'
-            
-            # Consistent activity (evenly distributed)
-            if week1 > 0 and week2 > 0 and weeks3_4 > 0:
-                variance = max(week1, week2, weeks3_4 // 2) - min(week1, week2, weeks3_4 // 2)
-                if variance < 3:
-                    return 'consistent'
-            
-            # Growing pattern (increasing activity)
-            if week1 > week2 and week2 >= weeks3_4 // 2:
-                return 'growing'
-            
-            # Declining pattern (decreasing activity)
-            if week1 < week2 and week2 > weeks3_4 // 2:
-                return 'declining'
-            
-            # Sporadic activity
-            return 'sporadic'
+            return self.classify_activity_pattern(*pattern)
             
         except Exception as e:
             logger.error(f"Error analyzing activity pattern: {str(e)}")
@@ -392,6 +342,147 @@ class EngagementService:
             logger.error(f"Error predicting future engagement: {str(e)}")
             raise
     
+    @staticmethod
+    def compute_ai_boost(
+        active_days: int,
+        avg_likes,
+        avg_comments,
+        recent_activity: int,
+        previous_activity: int,
+        mentor_rating,
+        mentor_sessions: int,
+        diversity: int
+    ) -> int:
+        """
+        AI activity boost rules applied to pre-aggregated activity stats.
+        Shared by the per-user path and the nightly batch engine.
+        """
+        boost_points = 0
+        
+        # 1. Consistency Bonus: Reward regular activity
+        if active_days >= 20:  # Active 20+ days in last month
+            boost_points += 50  # High consistency bonus
+        elif active_days >= 10:  # Active 10-19 days
+            boost_points += 25  # Medium consistency bonus
+        elif active_days >= 5:  # Active 5-9 days
+            boost_points += 10  # Basic consistency bonus
+        
+        # 2. Quality Bonus: Reward high-engagement contributions
+        if avg_likes:
+            avg_likes = float(avg_likes or 0)
+            avg_comments = float(avg_comments or 0)
+            if avg_likes >= 10 and avg_comments >= 5:
+                boost_points += 40  # Highly engaging content
+            elif avg_likes >= 5 or avg_comments >= 3:
+                boost_points += 20  # Good engagement
+        
+        # 3. Trend Bonus: Reward increasing activity
+        recent_activity = recent_activity or 0
+        previous_activity = previous_activity or 0
+        if recent_activity > previous_activity and previous_activity > 0:
+            growth_rate = (recent_activity - previous_activity) / previous_activity
+            if growth_rate >= 0.5:  # 50%+ growth
+                boost_points += 30  # Strong growth
+            elif growth_rate >= 0.2:  # 20%+ growth
+                boost_points += 15  # Moderate growth
+        
+        # 4. Mentorship Impact Bonus
+        if mentor_rating:
+            rating = float(mentor_rating or 0)
+            sessions = int(mentor_sessions or 0)
+            if rating >= 4.5 and sessions >= 5:
+                boost_points += 35  # Excellent mentor
+            elif rating >= 4.0 and sessions >= 3:
+                boost_points += 20  # Good mentor
+        
+        # 5. Diversity Bonus: Reward activity across different areas
+        diversity = diversity or 0
+        if diversity >= 5:  # Active in 5+ areas
+            boost_points += 25  # Well-rounded contributor
+        elif diversity >= 3:  # Active in 3-4 areas
+            boost_points += 12  # Good diversity
+        
+        return boost_points
+    
+    @staticmethod
+    def classify_activity_pattern(week1, week2, weeks3_4, older, total) -> str:
+        """
+        Classify an activity pattern from contribution counts bucketed over
+        the last 60 days (last 7 days, days 8-14, days 15-30, days 31-60, total)
+        """
+        if not total:
+            return 'new_user'
+        
+        week1, week2, weeks3_4 = int(week1 or 0), int(week2 or 0), int(weeks3_4 or 0)
+        
+        # No activity in last 30 days
+        if week1 == 0 and week2 == 0 and weeks3_4 == 0:
+            return 'inactive'
+        
+        # New user with limited history
+        if total < 5:
+            return 'new_user'
+        
+        # Consistent activity (evenly distributed)
+        if week1 > 0 and week2 > 0 and weeks3_4 > 0:
+            variance = max(week1, week2, weeks3_4 // 2) - min(week1, week2, weeks3_4 // 2)
+            if variance < 3:
+                return 'consistent'
+        
+        # Growing pattern (increasing activity)
+        if week1 > week2 and week2 >= weeks3_4 // 2:
+            return 'growing'
+        
+        # Declining pattern (decreasing activity)
+        if week1 < week2 and week2 > weeks3_4 // 2:
+            return 'declining'
+        
+        # Sporadic activity
+        return 'sporadic'
+    
+    @staticmethod
+    def badge_qualifies(requirements: Dict, stats: Dict, rank_position: Optional[int] = None) -> bool:
+        """
+        Check a badge's requirements against a user's activity counts
+        
+        Args:
+            requirements: Parsed badge requirements ({'type': ..., 'count': ...})
+            stats: login_count, profile_completion, mentorship_sessions,
+                job_applications, forum_posts, events_attended, capsules_created
+            rank_position: Current leaderboard rank (for leaderboard badges)
+        """
+        req_type = requirements.get('type', '')
+        req_count = requirements.get('count', 0)
+        
+        if req_type == 'login':
+            return stats['login_count'] >= req_count
+        if req_type == 'profile':
+            return (stats['profile_completion'] or 0) >= requirements.get('completion', 100)
+        if req_type == 'mentorship':
+            return stats['mentorship_sessions'] >= requirements.get('sessions', req_count)
+        if req_type == 'job_applications':
+            return stats['job_applications'] >= req_count
+        if req_type == 'forum_posts':
+            return stats['forum_posts'] >= req_count
+        if req_type == 'events':
+            return stats['events_attended'] >= req_count
+        if req_type == 'capsules':
+            return stats['capsules_created'] >= req_count
+        if req_type == 'leaderboard':
+            return bool(rank_position) and rank_position <= requirements.get('rank', 10)
+        return False
+    
+    @staticmethod
+    def classify_trend(last_week, previous_week) -> str:
+        """Compare points earned in the last 7 days with the 7 days before"""
+        last_week = last_week or 0
+        previous_week = previous_week or 0
+        if last_week > previous_week * 1.1:  # 10% increase
+            return 'up'
+        elif last_week < previous_week * 0.9:  # 10% decrease
+            return 'down'
+        return 'stable'
+    
     def _determine_level(self, score: int) -> str:
         """Determine user level based on total score"""
         if score >= 500:
@@ -483,15 +574,7 @@ class EngagementService:
                 result = await cursor.fetchone()
                 
                 if result:
-                    last_week = result[0] or 0
-                    previous_week = result[1] or 0
-                    
-                    if last_week > previous_week * 1.1:  # 10% increase
-                        return 'up'
-                    elif last_week < previous_week * 0.9:  # 10% decrease
-                        return 'down'
-                    else:
-                        return 'stable'
+                    return self.classify_trend(result[0], result[1])
                 
                 return 'stable'
         except Exception as e:
@@ -539,14 +622,16 @@ class EngagementService:
                 # Get user badges
                 user_badges = await self._get_user_badge_names(db_conn, user_id)
                 
+                rank_position = await self.get_live_rank(user_id) or result[4]
+                
                 return {
                     'id': result[0],
                     'user_id': result[1],
                     'total_score': result[2],
                     'contributions': contributions_data,
                     'score_breakdown': contributions_data,  # Alias for frontend compatibility
-                    'rank_position': result[4],
-                    'rank': result[4],  # Alias for frontend compatibility
+                    'rank_position': rank_position,
+                    'rank': rank_position,  # Alias for frontend compatibility
                     'level': result[5] if result[5] else self._determine_level(result[2]),
                     'last_calculated': result[6],
                     'name': result[7],
@@ -572,22 +657,37 @@ class EngagementService:
     ) -> Dict:
         """
         Get engagement leaderboard with enhanced fields
+        
+        Served from the Redis sorted sets (top N and the caller's rank in
+        O(log n)) with badges and trends hydrated in one grouped query each;
+        falls back to the engagement_leaderboard view when Redis is down.
         """
         try:
+            role = role_filter if role_filter and role_filter != 'all' else None
+            
+            try:
+                redis = await get_redis_client()
+                if await self._ensure_leaderboard(db_conn, redis):
+                    return await self._get_leaderboard_from_redis(
+                        redis, limit, current_user_id, role
+                    )
+            except Exception as e:
+                logger.warning(f"Redis leaderboard unavailable, using database: {e}")
+            
             # Get top users from engagement_leaderboard view
             async with db_conn.cursor() as cursor:
                 query = """
                     SELECT 
                         id, name, photo_url, role, total_score,
-                        rank_position, level, contributions
+                        level, contributions, rank_position
                     FROM engagement_leaderboard
                 """
                 params = []
                 
                 # Add role filter if provided
-                if role_filter and role_filter != 'all':
+                if role:
                     query += " WHERE role = %s"
-                    params.append(role_filter)
+                    params.append(role)
                 
                 query += " ORDER BY total_score DESC LIMIT %s"
                 params.append(limit)
@@ -595,40 +695,9 @@ class EngagementService:
                 await cursor.execute(query, tuple(params))
                 leaderboard = await cursor.fetchall()
             
-            # Format leaderboard entries
-            entries = []
-            for idx, entry in enumerate(leaderboard):
-                user_id = entry[0]
-                
-                # Parse contributions JSON if it's a string (MySQL stores JSON as string)
-                contributions_data = entry[7]
-                if contributions_data and isinstance(contributions_data, str):
-                    try:
-                        contributions_data = json.loads(contributions_data)
-                    except json.JSONDecodeError:
-                        contributions_data = {}
-                elif not contributions_data:
-                    contributions_data = {}
-                
-                # Get user badges
-                user_badges = await self._get_user_badge_names(db_conn, user_id)
-                
-                # Calculate trend (compare last week vs previous week)
-                trend = await self._calculate_trend(db_conn, user_id)
-                
-                entries.append({
-                    'user_id': user_id,
-                    'name': entry[1],
-                    'photo_url': entry[2],
-                    'role': entry[3],
-                    'total_score': entry[4],
-                    'rank_position': entry[5],
-                    'rank': entry[5],  # Alias for frontend compatibility
-                    'level': entry[6] if entry[6] else self._determine_level(entry[4]),
-                    'contributions': contributions_data,
-                    'badges': user_badges,
-                    'trend': trend
-                })
+            entries = await self._build_leaderboard_entries(
+                db_conn, leaderboard, [entry[7] for entry in leaderboard]
+            )
             
             # Get current user's rank if provided
             user_rank = None
@@ -675,6 +744,279 @@ class EngagementService:
                     'user_rank': None
                 }
     
+    async def _get_leaderboard_from_redis(
+        self,
+        redis,
+        limit: int,
+        current_user_id: Optional[str],
+        role: Optional[str]
+    ) -> Dict:
+        """
+        Read the top ``limit`` users and ranks from the sorted sets
+        
+        The hydrated page is shared by every viewer through RedisCache (held
+        in-process, computed once per key on concurrent misses); only the
+        caller's own rank is looked up per request.
+        """
+        page = await RedisCache.get_or_set(
+            f"{role or 'all'}:{limit}",
+            lambda: self._load_leaderboard_page(redis, limit, role),
+            ttl=RedisConfig.TTL_LEADERBOARD_PAGE,
+            prefix=RedisConfig.PREFIX_LEADERBOARD_PAGE
+        )
+        
+        user_rank = None
+        if current_user_id:
+            own_rank = await redis.zrevrank(LEADERBOARD_KEY, current_user_id)
+            user_rank = own_rank + 1 if own_rank is not None else None
+        
+        return {**page, 'user_rank': user_rank}
+    
+    async def _load_leaderboard_page(self, redis, limit: int, role: Optional[str]) -> Dict:
+        """
+        Build one leaderboard page (entries and total users)
+        
+        Uses its own pooled connection: the load is shared with other
+        waiters and may outlive the request that started it.
+        """
+        key = _leaderboard_key(role)
+        top = await redis.zrevrange(key, 0, limit - 1)
+        
+        # Ranks are always global positions, one round trip for all lookups
+        pipe = redis.pipeline(transaction=False)
+        if role:
+            for user_id in top:
+                pipe.zrevrank(LEADERBOARD_KEY, user_id)
+        pipe.zcard(LEADERBOARD_KEY)
+        results = await pipe.execute()
+        
+        total_users = results.pop()
+        if role:
+            ranks = [rank + 1 if rank is not None else None for rank in results]
+        else:
+            ranks = list(range(1, len(top) + 1))
+        
+        async with get_db_connection() as db_conn:
+            rows = {}
+            if top:
+                placeholders = ', '.join(['%s'] * len(top))
+                async with db_conn.cursor() as cursor:
+                    await cursor.execute(f"""
+                        SELECT 
+                            id, name, photo_url, role, total_score,
+                            level, contributions
+                        FROM engagement_leaderboard
+                        WHERE id IN ({placeholders})
+                    """, tuple(top))
+                    rows = {row[0]: row for row in await cursor.fetchall()}
+            
+            ordered = [(rows[user_id], rank) for user_id, rank in zip(top, ranks) if user_id in rows]
+            entries = await self._build_leaderboard_entries(
+                db_conn, [row for row, _ in ordered], [rank for _, rank in ordered]
+            )
+        
+        return {
+            'entries': entries,
+            'total_users': total_users
+        }
+    
+    async def _build_leaderboard_entries(self, db_conn, rows, ranks) -> List[Dict]:
+        """
+        Format leaderboard rows (id, name, photo_url, role, total_score,
+        level, contributions, ...) with batched badge and trend lookups
+        """
+        user_ids = [row[0] for row in rows]
+        badges = await self._get_badge_names_for_users(db_conn, user_ids)
+        trends = await self._calculate_trends_for_users(db_conn, user_ids)
+        
+        entries = []
+        for entry, rank in zip(rows, ranks):
+            user_id = entry[0]
+            
+            # Parse contributions JSON if it's a string (MySQL stores JSON as string)
+            contributions_data = entry[6]
+            if contributions_data and isinstance(contributions_data, str):
+                try:
+                    contributions_data = json.loads(contributions_data)
+                except json.JSONDecodeError:
+                    contributions_data = {}
+            elif not contributions_data:
+                contributions_data = {}
+            
+            entries.append({
+                'user_id': user_id,
+                'name': entry[1],
+                'photo_url': entry[2],
+                'role': entry[3],
+                'total_score': entry[4],
+                'rank_position': rank,
+                'rank': rank,  # Alias for frontend compatibility
+                'level': entry[5] if entry[5] else self._determine_level(entry[4]),
+                'contributions': contributions_data,
+                'badges': badges.get(user_id, []),
+                'trend': trends.get(user_id, 'stable')
+            })
+        return entries
+    
+    async def _get_badge_names_for_users(self, db_conn, user_ids: List[str]) -> Dict[str, List[str]]:
+        """Badge names per user (most recent first) in one query"""
+        if not user_ids:
+            return {}
+        try:
+            placeholders = ', '.join(['%s'] * len(user_ids))
+            async with db_conn.cursor() as cursor:
+                await cursor.execute(f"""
+                    SELECT ub.user_id, b.name
+                    FROM user_badges ub
+                    JOIN badges b ON ub.badge_id = b.id
+                    WHERE ub.user_id IN ({placeholders})
+                    ORDER BY ub.user_id, ub.earned_at DESC
+                """, tuple(user_ids))
+                badges: Dict[str, List[str]] = {}
+                for user_id, name in await cursor.fetchall():
+                    badges.setdefault(user_id, []).append(name)
+                return badges
+        except Exception as e:
+            logger.error(f"Error getting badge names: {str(e)}")
+            return {}
+    
+    async def _calculate_trends_for_users(self, db_conn, user_ids: List[str]) -> Dict[str, str]:
+        """Weekly trend per user from one grouped aggregate over contribution_history"""
+        if not user_ids:
+            return {}
+        try:
+            placeholders = ', '.join(['%s'] * len(user_ids))
+            async with db_conn.cursor() as cursor:
+                await cursor.execute(f"""
+                    SELECT 
+                        user_id,
+                        COALESCE(SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) 
+                                          THEN points_earned ELSE 0 END), 0) as last_week,
+                        COALESCE(SUM(CASE WHEN created_at < DATE_SUB(NOW(), INTERVAL 7 DAY)
+                                          THEN points_earned ELSE 0 END), 0) as previous_week
+                    FROM contribution_history
+                    WHERE user_id IN ({placeholders})
+                        AND created_at >= DATE_SUB(NOW(), INTERVAL 14 DAY)
+                    GROUP BY user_id
+                """, tuple(user_ids))
+                return {
+                    row[0]: self.classify_trend(row[1], row[2])
+                    for row in await cursor.fetchall()
+                }
+        except Exception as e:
+            logger.error(f"Error calculating trends: {str(e)}")
+            return {}
+    
+    async def _ensure_leaderboard(self, db_conn, redis) -> bool:
+        """
+        Make sure the sorted sets are populated, building them on first use
+        
+        Returns False when another worker is rebuilding, so the caller
+        serves this request from the database instead of waiting.
+        """
+        if await redis.exists(LEADERBOARD_BUILT_KEY):
+            return True
+        if not await redis.set(LEADERBOARD_LOCK_KEY, 1, nx=True, ex=60):
+            return False
+        try:
+            await self.rebuild_leaderboard(db_conn)
+        finally:
+            await redis.delete(LEADERBOARD_LOCK_KEY)
+        return True
+    
+    async def rebuild_leaderboard(self, db_conn) -> int:
+        """
+        Reload the leaderboard sorted sets from engagement_scores
+        
+        Members are staged into temporary keys and swapped in with RENAME in
+        one transaction, so readers never see a partially built set. Users
+        whose role is not in ``LEADERBOARD_ROLES`` only appear in the overall
+        set, so every staged key is renamed. Run on
+        first use and after the nightly recalculation to repair any drift.
+        
+        Returns:
+            Number of users in the leaderboard
+        """
+        async with db_conn.cursor() as cursor:
+            await cursor.execute("SELECT id, role, total_score FROM engagement_leaderboard")
+            rows = await cursor.fetchall()
+        
+        redis = await get_redis_client()
+        keys = [_leaderboard_key()] + [_leaderboard_key(role) for role in LEADERBOARD_ROLES]
+        staged = set()
+        await redis.delete(*[f"{key}:staging" for key in keys])
+        
+        for start in range(0, len(rows), LEADERBOARD_REBUILD_BATCH):
+            batch = rows[start:start + LEADERBOARD_REBUILD_BATCH]
+            members: Dict[str, Dict[str, int]] = {}
+            for user_id, role, score in batch:
+                members.setdefault(_leaderboard_key(), {})[user_id] = score or 0
+                if role in LEADERBOARD_ROLES:
+                    members.setdefault(_leaderboard_key(role), {})[user_id] = score or 0
+            pipe = redis.pipeline(transaction=False)
+            for key, mapping in members.items():
+                pipe.zadd(f"{key}:staging", mapping)
+                staged.add(key)
+            await pipe.execute()
+        
+        pipe = redis.pipeline(transaction=True)
+        for key in keys:
+            if key in staged:
+                pipe.rename(f"{key}:staging", key)
+            else:
+                pipe.delete(key)
+        pipe.set(LEADERBOARD_BUILT_KEY, int(time.time()))
+        await pipe.execute()
+        
+        logger.info(f"Rebuilt engagement leaderboard with {len(rows)} users")
+        return len(rows)
+    
+    async def sync_leaderboard_entry(self, db_conn, user_id: str) -> None:
+        """
+        Write one user's current total_score into the leaderboard sorted sets
+        
+        Called after every score recalculation so ranks are live instead of
+        waiting for the nightly rank_position refresh. Users that left the
+        engagement_leaderboard view (inactive, no profile) are removed.
+        """
+        try:
+            redis = await get_redis_client()
+            if not await redis.exists(LEADERBOARD_BUILT_KEY):
+                return  # Built in full on the next leaderboard read
+            
+            async with db_conn.cursor() as cursor:
+                await cursor.execute(
+                    "SELECT role, total_score FROM engagement_leaderboard WHERE id = %s",
+                    (user_id,)
+                )
+                row = await cursor.fetchone()
+            
+            pipe = redis.pipeline(transaction=True)
+            for role in LEADERBOARD_ROLES:
+                if not row or row[0] != role:
+                    pipe.zrem(_leaderboard_key(role), user_id)
+            if row:
+                pipe.zadd(_leaderboard_key(), {user_id: row[1] or 0})
+                if row[0] in LEADERBOARD_ROLES:
+                    pipe.zadd(_leaderboard_key(row[0]), {user_id: row[1] or 0})
+            else:
+                pipe.zrem(_leaderboard_key(), user_id)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to update leaderboard for {user_id}: {e}")
+    
+    async def get_live_rank(self, user_id: str) -> Optional[int]:
+        """Current 1-based leaderboard rank from the sorted set (None if unavailable)"""
+        try:
+            redis = await get_redis_client()
+            if not await redis.exists(LEADERBOARD_BUILT_KEY):
+                return None
+            rank = await redis.zrevrank(LEADERBOARD_KEY, user_id)
+            return rank + 1 if rank is not None else None
+        except Exception as e:
+            logger.warning(f"Redis leaderboard unavailable for rank lookup: {e}")
+            return None
+    
     async def add_contribution(
         self,
         db_conn,
@@ -940,6 +1282,17 @@ class EngagementService:
                 capsule_result = await cursor.fetchone()
                 capsules_created = capsule_result[0] if capsule_result else 0
             
+            stats = {
+                'login_count': login_count,
+                'profile_completion': profile_completion,
+                'mentorship_sessions': mentorship_sessions,
+                'job_applications': job_applications,
+                'forum_posts': forum_posts,
+                'events_attended': events_attended,
+                'capsules_created': capsules_created,
+            }
+            rank_position = None
+            
             # Check each badge requirement
             newly_awarded = []
             for badge in all_badges:
@@ -947,31 +1300,11 @@ class EngagementService:
                     continue  # Already has this badge
                 
                 requirements = badge['requirements'] if badge['requirements'] else {}
-                req_type = requirements.get('type', '')
-                req_count = requirements.get('count', 0)
-                
-                # Check if user meets requirements
-                qualifies = False
-                if req_type == 'login' and login_count >= req_count:
-                    qualifies = True
-                elif req_type == 'profile' and profile_completion >= requirements.get('completion', 100):
-                    qualifies = True
-                elif req_type == 'mentorship' and mentorship_sessions >= requirements.get('sessions', req_count):
-                    qualifies = True
-                elif req_type == 'job_applications' and job_applications >= req_count:
-                    qualifies = True
-                elif req_type == 'forum_posts' and forum_posts >= req_count:
-                    qualifies = True
-                elif req_type == 'events' and events_attended >= req_count:
-                    qualifies = True
-                elif req_type == 'capsules' and capsules_created >= req_count:
-                    qualifies = True
-                elif req_type == 'leaderboard':
-                    # Check leaderboard rank
+                if requirements.get('type') == 'leaderboard' and rank_position is None:
                     user_score = await self.get_user_score(db_conn, user_id)
-                    if user_score and user_score.get('rank_position'):
-                        if user_score['rank_position'] <= requirements.get('rank', 10):
-                            qualifies = True
+                    rank_position = user_score.get('rank_position') if user_score else None
+                
+                qualifies = self.badge_qualifies(requirements, stats, rank_position)
                 
                 # Award badge if qualifies
                 if qualifies:
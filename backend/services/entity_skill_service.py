@@ -0,0 +1,365 @@
+"""Entity skill service - normalized skill index for jobs, profiles and capsules
+
+Skills stored as JSON arrays (``jobs.skills_required``, ``alumni_profiles.skills``,
+``knowledge_capsules.tags``) cannot be indexed. Every write to those columns
+is mirrored into ``entity_skills(entity_type, entity_id, skill_id)`` so skill
+filters become indexed joins that scale with the number of matches instead
+of the size of the table.
+
+The index is only queried for an entity type once the backfill has
+completed for it (``entity_skills_backfill``); until then skill filters keep
+using JSON_CONTAINS on the source column. Index maintenance never fails the
+write it accompanies: on error the index statements are rolled back to a
+savepoint and the entity type is marked for a new backfill.
+"""
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENTITY_JOB = 'job'
+ENTITY_PROFILE = 'profile'
+ENTITY_CAPSULE = 'capsule'
+
+# entity_type -> (table, id column, JSON skills column)
+ENTITY_SOURCES = {
+    ENTITY_JOB: ('jobs', 'id', 'skills_required'),
+    ENTITY_PROFILE: ('alumni_profiles', 'user_id', 'skills'),
+    ENTITY_CAPSULE: ('knowledge_capsules', 'id', 'tags'),
+}
+
+# Separate from the catalog ``skills`` table (VARCHAR ids, used by user_skills)
+SKILL_DICTIONARY_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS skill_dictionary (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_skill_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+ENTITY_SKILLS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS entity_skills (
+    entity_type ENUM('job', 'profile', 'capsule') NOT NULL,
+    entity_id VARCHAR(50) NOT NULL,
+    skill_id INT NOT NULL,
+    PRIMARY KEY (entity_type, entity_id, skill_id),
+    INDEX idx_skill_entity (skill_id, entity_type, entity_id),
+    FOREIGN KEY (skill_id) REFERENCES skill_dictionary(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+ENTITY_SKILLS_BACKFILL_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS entity_skills_backfill (
+    entity_type ENUM('job', 'profile', 'capsule') PRIMARY KEY,
+    completed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# How long a process trusts its view of entity_skills_backfill
+BACKFILL_STATE_TTL = 60
+_backfill_state: Dict[str, Tuple[float, bool]] = {}
+
+
+def normalize_skill(name) -> str:
+    """Canonical form used as the skill key (lowercase, trimmed, max 100 chars)"""
+    return str(name).strip().lower()[:100]
+
+
+def normalize_skills(skills: Optional[Iterable]) -> List[str]:
+    """Parse a JSON list column (or list) into unique normalized skill names"""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        try:
+            skills = json.loads(skills)
+        except (json.JSONDecodeError, TypeError):
+            skills = [skills]
+    if not isinstance(skills, list):
+        return []
+    seen = {}
+    for skill in skills:
+        if isinstance(skill, str) and skill.strip():
+            seen.setdefault(normalize_skill(skill), None)
+    return list(seen)
+
+
+class EntitySkillService:
+    """Maintains and queries the entity_skills inverted index"""
+
+    @staticmethod
+    async def ensure_tables(cursor) -> None:
+        """Create the skill_dictionary / entity_skills tables if they do not exist"""
+        await cursor.execute(SKILL_DICTIONARY_TABLE_DDL)
+        await cursor.execute(ENTITY_SKILLS_TABLE_DDL)
+        await cursor.execute(ENTITY_SKILLS_BACKFILL_TABLE_DDL)
+
+    @staticmethod
+    async def is_backfilled(cursor, entity_type: str) -> bool:
+        """Whether the index is complete for ``entity_type`` and can be queried"""
+        cached = _backfill_state.get(entity_type)
+        if cached and time.monotonic() - cached[0] < BACKFILL_STATE_TTL:
+            return cached[1]
+        try:
+            await cursor.execute(
+                "SELECT 1 FROM entity_skills_backfill WHERE entity_type = %s",
+                (entity_type,)
+            )
+            backfilled = await cursor.fetchone() is not None
+        except Exception as e:
+            logger.warning(f"Could not read entity_skills_backfill: {str(e)}")
+            backfilled = False
+        _backfill_state[entity_type] = (time.monotonic(), backfilled)
+        return backfilled
+
+    @staticmethod
+    async def _guarded(cursor, entity_type: str, update: Callable[[], Awaitable[None]]) -> None:
+        """
+        Run index statements inside a savepoint of the caller's transaction
+
+        A failure rolls back only the index changes and withdraws the
+        entity type's backfill mark (queries fall back to JSON_CONTAINS
+        until the backfill is re-run); the source write goes ahead.
+        """
+        try:
+            await cursor.execute("SAVEPOINT entity_skills_sync")
+        except Exception as e:
+            logger.warning(f"entity_skills not updated for {entity_type}: {str(e)}")
+            return
+        try:
+            await update()
+            await cursor.execute("RELEASE SAVEPOINT entity_skills_sync")
+        except Exception as e:
+            logger.warning(f"entity_skills update failed for {entity_type}, backfill needed: {str(e)}")
+            try:
+                await cursor.execute("ROLLBACK TO SAVEPOINT entity_skills_sync")
+                await cursor.execute(
+                    "DELETE FROM entity_skills_backfill WHERE entity_type = %s",
+                    (entity_type,)
+                )
+            except Exception as rollback_error:
+                logger.warning(f"Could not roll back entity_skills update: {str(rollback_error)}")
+            _backfill_state.pop(entity_type, None)
+
+    @staticmethod
+    async def resolve_skill_ids(cursor, skills: Iterable, create: bool = False) -> Dict[str, int]:
+        """
+        Map skill names to ids in one query
+
+        Args:
+            create: insert names that are not in the dictionary yet
+
+        Returns:
+            Dict of normalized name -> skill id (unknown names are omitted
+            when ``create`` is False)
+        """
+        names = normalize_skills(list(skills))
+        if not names:
+            return {}
+
+        if create:
+            await cursor.executemany(
+                "INSERT IGNORE INTO skill_dictionary (name) VALUES (%s)",
+                [(name,) for name in names]
+            )
+
+        placeholders = ', '.join(['%s'] * len(names))
+        await cursor.execute(
+            f"SELECT id, name FROM skill_dictionary WHERE name IN ({placeholders})",
+            names
+        )
+        rows = await cursor.fetchall()
+        if rows and isinstance(rows[0], dict):
+            return {row['name']: row['id'] for row in rows}
+        return {row[1]: row[0] for row in rows}
+
+    @staticmethod
+    async def sync_entity(cursor, entity_type: str, entity_id: str, skills) -> None:
+        """
+        Replace the indexed skills of one entity
+
+        Runs on the caller's cursor so it commits together with the write
+        to the source row; errors are contained (see ``_guarded``).
+        """
+        async def update():
+            await cursor.execute(
+                "DELETE FROM entity_skills WHERE entity_type = %s AND entity_id = %s",
+                (entity_type, entity_id)
+            )
+            skill_ids = await EntitySkillService.resolve_skill_ids(cursor, normalize_skills(skills), create=True)
+            if skill_ids:
+                await cursor.executemany(
+                    "INSERT IGNORE INTO entity_skills (entity_type, entity_id, skill_id) VALUES (%s, %s, %s)",
+                    [(entity_type, entity_id, skill_id) for skill_id in skill_ids.values()]
+                )
+
+        await EntitySkillService._guarded(cursor, entity_type, update)
+
+    @staticmethod
+    async def sync_entities(cursor, entity_type: str, skills_by_id: Dict[str, Any]) -> None:
+        """
+        Replace the indexed skills of many entities with a fixed number of
+        statements (one dictionary lookup, one delete, one bulk insert)
+
+        Errors are contained like ``sync_entity``.
+        """
+        if not skills_by_id:
+            return
+        await EntitySkillService._guarded(
+            cursor, entity_type,
+            lambda: EntitySkillService._replace_entities(cursor, entity_type, skills_by_id)
+        )
+
+    @staticmethod
+    async def _replace_entities(cursor, entity_type: str, skills_by_id: Dict[str, Any]) -> None:
+        parsed = {entity_id: normalize_skills(skills) for entity_id, skills in skills_by_id.items()}
+        skill_ids = await EntitySkillService.resolve_skill_ids(
+            cursor, {s for skills in parsed.values() for s in skills}, create=True
+        )
+
+        ids = list(parsed)
+        placeholders = ', '.join(['%s'] * len(ids))
+        await cursor.execute(
+            f"DELETE FROM entity_skills WHERE entity_type = %s AND entity_id IN ({placeholders})",
+            (entity_type, *ids)
+        )
+        pairs = [
+            (entity_type, entity_id, skill_ids[skill])
+            for entity_id, skills in parsed.items()
+            for skill in skills
+            if skill in skill_ids
+        ]
+        if pairs:
+            await cursor.executemany(
+                "INSERT IGNORE INTO entity_skills (entity_type, entity_id, skill_id) VALUES (%s, %s, %s)",
+                pairs
+            )
+
+    @staticmethod
+    async def delete_entity(cursor, entity_type: str, entity_id: str) -> None:
+        """Remove an entity from the index"""
+        await EntitySkillService._guarded(cursor, entity_type, lambda: cursor.execute(
+            "DELETE FROM entity_skills WHERE entity_type = %s AND entity_id = %s",
+            (entity_type, entity_id)
+        ))
+
+    @staticmethod
+    async def skill_filter(cursor, entity_type: str, id_column: str, skills: Iterable) -> Tuple[str, List]:
+        """
+        Build a WHERE fragment restricting ``id_column`` to entities having
+        any of ``skills``
+
+        The IN-subquery is driven by ``idx_skill_entity`` so MySQL reads only
+        the matching index entries. Unknown skills match nothing. Before the
+        backfill has completed, falls back to JSON_CONTAINS on the source
+        column (exact-case matches, as before the index existed).
+        """
+        if not await EntitySkillService.is_backfilled(cursor, entity_type):
+            skills_column = ENTITY_SOURCES[entity_type][2]
+            skills = [skill for skill in skills if isinstance(skill, str)]
+            if not skills:
+                return "FALSE", []
+            return (
+                "(" + " OR ".join([f"JSON_CONTAINS({skills_column}, %s)"] * len(skills)) + ")",
+                [json.dumps(skill) for skill in skills]
+            )
+        skill_ids = list((await EntitySkillService.resolve_skill_ids(cursor, skills)).values())
+        if not skill_ids:
+            return "FALSE", []
+        placeholders = ', '.join(['%s'] * len(skill_ids))
+        return (
+            f"{id_column} IN (SELECT es.entity_id FROM entity_skills es "
+            f"WHERE es.entity_type = %s AND es.skill_id IN ({placeholders}))",
+            [entity_type, *skill_ids]
+        )
+
+    @staticmethod
+    async def overlap_counts(
+        cursor,
+        entity_type: str,
+        skills: Iterable,
+        limit: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Count shared skills per entity for a query skill set in one indexed
+        aggregate, most overlapping entities first (empty until the backfill
+        has completed)
+        """
+        if not await EntitySkillService.is_backfilled(cursor, entity_type):
+            return {}
+        skill_ids = list((await EntitySkillService.resolve_skill_ids(cursor, skills)).values())
+        if not skill_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(skill_ids))
+        query = f"""
+            SELECT entity_id, COUNT(*) AS overlap
+            FROM entity_skills
+            WHERE entity_type = %s AND skill_id IN ({placeholders})
+            GROUP BY entity_id
+            ORDER BY overlap DESC
+        """
+        params: List = [entity_type, *skill_ids]
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        await cursor.execute(query, params)
+        rows = await cursor.fetchall()
+        if rows and isinstance(rows[0], dict):
+            return {row['entity_id']: row['overlap'] for row in rows}
+        return {row[0]: row[1] for row in rows}
+
+    @staticmethod
+    async def backfill(conn, entity_types: Optional[List[str]] = None, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Rebuild the index from the JSON source columns
+
+        Reads each source table in primary-key order, batch by batch, and
+        commits per batch so the backfill can run against a live database.
+
+        Returns:
+            Dict of entity_type -> number of entities indexed
+        """
+        counts: Dict[str, int] = {}
+        async with conn.cursor() as cursor:
+            await EntitySkillService.ensure_tables(cursor)
+            await conn.commit()
+
+            for entity_type in entity_types or list(ENTITY_SOURCES):
+                table, id_column, skills_column = ENTITY_SOURCES[entity_type]
+                last_id = ''
+                counts[entity_type] = 0
+
+                while True:
+                    await cursor.execute(
+                        f"""
+                        SELECT {id_column}, {skills_column} FROM {table}
+                        WHERE {id_column} > %s
+                        ORDER BY {id_column}
+                        LIMIT %s
+                        """,
+                        (last_id, batch_size)
+                    )
+                    rows = await cursor.fetchall()
+                    if not rows:
+                        break
+
+                    # Unguarded: a failing backfill should stop and report
+                    await EntitySkillService._replace_entities(
+                        cursor, entity_type, {row[0]: row[1] for row in rows}
+                    )
+                    await conn.commit()
+
+                    counts[entity_type] += len(rows)
+                    last_id = rows[-1][0]
+                    logger.info(f"Indexed {counts[entity_type]} {entity_type} rows")
+
+                await cursor.execute(
+                    "REPLACE INTO entity_skills_backfill (entity_type) VALUES (%s)",
+                    (entity_type,)
+                )
+                await conn.commit()
+                _backfill_state.pop(entity_type, None)
+
+        return counts
@@ -1,11 +1,15 @@
 """Forum service for handling forum posts, comments, and likes"""
 import logging
+import time
 import uuid
 import os
 from typing import Optional
 import json
 
 from database.connection import get_db_pool
+from redis_client import get_redis_client
+from services.search_service import FORUM_POST_SEARCH, highlight, search_clause
+from utils.pagination import decode_cursor, encode_cursor, keyset_condition
 
 # Mock mode flag
 USE_MOCK_DB = os.getenv('USE_MOCK_DB', 'false').lower() == 'true'
@@ -17,6 +21,86 @@ from database.models import (
 
 logger = logging.getLogger(__name__)
 
+POST_WITH_AUTHOR_COLUMNS = """
+    p.id, p.title, p.content, p.author_id, p.tags,
+    p.likes_count, p.comments_count, p.views_count,
+    p.is_pinned, p.is_deleted, p.created_at, p.updated_at,
+    u.email as author_email,
+    COALESCE(ap.name, u.email) as author_name,
+    ap.photo_url as author_photo_url,
+    u.role as author_role
+"""
+
+POST_WITH_AUTHOR_FROM = """
+    FROM forum_posts p
+    INNER JOIN users u ON p.author_id = u.id
+    LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
+"""
+
+# Sort keys per feed sort (all descending); the trailing id makes them unique
+# so they double as keyset pagination cursors
+FEED_SORT_KEYS = {
+    'recent': ["p.is_pinned", "p.created_at", "p.id"],
+    'popular': ["p.likes_count", "p.created_at", "p.id"],
+    'trending': ["p.trending_score", "p.created_at", "p.id"],
+}
+
+# trending_score is a stored generated column (likes_count + comments_count)
+# with its own feed index (database/keyset_pagination_indexes.sql). Until it
+# exists the trending sort falls back to the unindexed expression.
+TRENDING_SCORE_EXPRESSION = "(p.likes_count + p.comments_count)"
+COLUMN_CHECK_TTL = 300
+_trending_column_state: Optional[tuple[float, bool]] = None
+
+# Search results ranked by MATCH score; columns of the ranked derived table
+RELEVANCE_SORT_KEYS = ["relevance", "created_at", "id"]
+
+# Hot feed materialization for the score-ordered sorts
+HOT_FEED_SORTS = ('popular', 'trending')
+HOT_FEED_PREFIX = 'forum:hot_feed'
+HOT_FEED_SIZE = int(os.getenv('FORUM_HOT_FEED_SIZE', 500))
+HOT_FEED_TTL = int(os.getenv('FORUM_HOT_FEED_TTL', 60))
+
+# Fallback when Redis is unavailable: sort -> (expires_at, post_ids)
+_local_hot_feed: dict[str, tuple[float, list[str]]] = {}
+
+
+async def has_trending_score(cursor) -> bool:
+    """Whether forum_posts has the trending_score column (cached)"""
+    global _trending_column_state
+    now = time.monotonic()
+    if _trending_column_state and now - _trending_column_state[0] < COLUMN_CHECK_TTL:
+        return _trending_column_state[1]
+
+    try:
+        await cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'forum_posts'
+                AND COLUMN_NAME = 'trending_score'
+            """
+        )
+        available = (await cursor.fetchone())[0] > 0
+    except Exception as e:
+        logger.warning(f"Could not inspect forum_posts columns: {str(e)}")
+        available = False
+
+    if not available and (_trending_column_state is None or _trending_column_state[1]):
+        logger.warning(
+            "forum_posts.trending_score missing (database/keyset_pagination_indexes.sql); "
+            "trending feed sorts on an unindexed expression"
+        )
+    _trending_column_state = (now, available)
+    return available
+
+
+async def feed_sort_keys(cursor, sort_by: str) -> list[str]:
+    """FEED_SORT_KEYS[sort_by], with the trending fallback applied when needed"""
+    keys = FEED_SORT_KEYS[sort_by]
+    if sort_by == 'trending' and not await has_trending_score(cursor):
+        keys = [TRENDING_SCORE_EXPRESSION] + keys[1:]
+    return keys
+
 
 class ForumService:
     """Service for forum operations"""
@@ -50,6 +134,7 @@ class ForumService:
                 post_row = await cursor.fetchone()
                 
                 if post_row:
+                    await ForumService.invalidate_hot_feed()
                     return ForumService._post_from_row(post_row, cursor)
                 
         raise ValueError("Failed to create post")
@@ -123,52 +208,95 @@ class ForumService:
     async def get_all_posts(
         search: Optional[str] = None,
         tags: Optional[list[str]] = None,
-        sort_by: str = "recent",
+        sort_by: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        page_cursor: Optional[str] = None
     ) -> list[ForumPostWithAuthor]:
-        """Get all forum posts with filters"""
+        """
+        Get all forum posts with filters
+        
+        ``search`` uses the forum_posts FULLTEXT index (word prefixes) and
+        fills ``highlights``; with ``sort_by="relevance"`` (the default when
+        searching) the best matches come first.
+        
+        ``page_cursor`` (from ``post_cursor``) continues after the last post of the
+        previous page using keyset pagination and takes precedence over ``offset``.
+        Unfiltered trending/popular pages are positioned by post id within the
+        hot feed snapshot, so likes and comments added between requests do not
+        reorder them; past the snapshot the cursor seeks the stored score index.
+        """
         if USE_MOCK_DB:
             return []
         
+        if sort_by is None:
+            sort_by = "relevance" if search else "recent"
+        if sort_by not in FEED_SORT_KEYS and sort_by != "relevance":
+            sort_by = "recent"
+        
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                query = """
-                SELECT 
-                    p.id, p.title, p.content, p.author_id, p.tags,
-                    p.likes_count, p.comments_count, p.views_count,
-                    p.is_pinned, p.is_deleted, p.created_at, p.updated_at,
-                    u.email as author_email,
-                    COALESCE(ap.name, u.email) as author_name,
-                    ap.photo_url as author_photo_url,
-                    u.role as author_role
-                FROM forum_posts p
-                INNER JOIN users u ON p.author_id = u.id
-                LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
-                WHERE p.is_deleted = FALSE
-                """
+                text_search = None
+                if search:
+                    text_search = await search_clause(cursor, FORUM_POST_SEARCH, search, alias="p")
+                if sort_by == "relevance" and not (text_search and text_search.ranked):
+                    sort_by = "recent"
+                ranked = sort_by == "relevance"
+                sort_keys = RELEVANCE_SORT_KEYS if ranked else await feed_sort_keys(cursor, sort_by)
+                after = decode_cursor(page_cursor, len(sort_keys)) if page_cursor else None
+                
+                # Unfiltered trending/popular pages come from the cached hot feed
+                if sort_by in HOT_FEED_SORTS and not search and not tags:
+                    hot_ids = await ForumService._get_hot_feed_ids(cursor, sort_by)
+                    start = offset
+                    if after is not None:
+                        start = hot_ids.index(after[-1]) + 1 if after[-1] in hot_ids else None
+                    if start is not None and (start + limit <= len(hot_ids) or len(hot_ids) < HOT_FEED_SIZE):
+                        page_ids = hot_ids[start:start + limit]
+                        rows = await ForumService._fetch_posts_by_ids(cursor, page_ids)
+                        return await ForumService._hydrate_posts(cursor, rows, user_id)
+                
+                conditions = ["p.is_deleted = FALSE"]
                 params = []
                 
-                if search:
-                    query += " AND (p.title LIKE %s OR p.content LIKE %s)"
-                    search_param = f"%{search}%"
-                    params.extend([search_param, search_param])
+                if text_search:
+                    conditions.append(text_search.condition)
+                    params.extend(text_search.params)
                 
                 if tags:
                     # Search for posts containing any of the tags using JSON functions
                     for tag in tags:
-                        query += " AND JSON_CONTAINS(p.tags, %s, '$')"
+                        conditions.append("JSON_CONTAINS(p.tags, %s, '$')")
                         params.append(json.dumps(tag))
                 
+                if ranked:
+                    # Rank in a derived table so relevance can be a cursor key
+                    query = f"""
+                    SELECT * FROM (
+                        SELECT {POST_WITH_AUTHOR_COLUMNS}, {text_search.score} AS relevance
+                        {POST_WITH_AUTHOR_FROM}
+                        WHERE {' AND '.join(conditions)}
+                    ) ranked
+                    WHERE TRUE
+                    """
+                    params = text_search.score_params + params
+                else:
+                    query = f"""
+                    SELECT {POST_WITH_AUTHOR_COLUMNS}
+                    {POST_WITH_AUTHOR_FROM}
+                    WHERE {' AND '.join(conditions)}
+                    """
+                
+                if after is not None:
+                    condition, cursor_params = keyset_condition(sort_keys, after)
+                    query += f" AND {condition}"
+                    params.extend(cursor_params)
+                    offset = 0
+                
                 # Sort
-                if sort_by == "popular":
-                    query += " ORDER BY p.likes_count DESC, p.created_at DESC"
-                elif sort_by == "trending":
-                    query += " ORDER BY (p.likes_count + p.comments_count) DESC, p.created_at DESC"
-                else:  # recent
-                    query += " ORDER BY p.is_pinned DESC, p.created_at DESC"
+                query += " ORDER BY " + ", ".join(f"{column} DESC" for column in sort_keys)
                 
                 query += " LIMIT %s OFFSET %s"
                 params.extend([limit, offset])
@@ -176,42 +304,123 @@ class ForumService:
                 await cursor.execute(query, tuple(params))
                 rows = await cursor.fetchall()
                 
-                posts = []
-                for row in rows:
-                    # Check if user has liked the post
-                    user_has_liked = False
-                    if user_id:
-                        await cursor.execute(
-                            "SELECT id FROM post_likes WHERE post_id = %s AND user_id = %s",
-                            (row[0], user_id)
-                        )
-                        user_has_liked = await cursor.fetchone() is not None
-                    
-                    # Parse tags
-                    tags = json.loads(row[4]) if row[4] else []
-                    
-                    posts.append(ForumPostWithAuthor(
-                        id=row[0],
-                        title=row[1],
-                        content=row[2],
-                        author_id=row[3],
-                        tags=tags,
-                        likes_count=row[5],
-                        comments_count=row[6],
-                        views_count=row[7],
-                        is_pinned=row[8],
-                        is_deleted=row[9],
-                        created_at=row[10],
-                        updated_at=row[11],
-                        author_email=row[12],
-                        author_name=row[13],
-                        author_photo_url=row[14],
-                        author_role=row[15],
-                        user_has_liked=user_has_liked
-                    ))
-                
+                posts = await ForumService._hydrate_posts(cursor, rows, user_id)
+                if text_search:
+                    for post, row in zip(posts, rows):
+                        if ranked:
+                            post.relevance = row[-1]
+                        post.highlights = {
+                            'title': highlight(post.title, text_search.terms),
+                            'content': highlight(post.content, text_search.terms),
+                        }
                 return posts
     
+    @staticmethod
+    def post_cursor(post: ForumPostWithAuthor, sort_by: Optional[str] = "recent") -> str:
+        """Build the keyset cursor that continues after ``post`` for ``get_all_posts``"""
+        if post.relevance is not None:
+            return encode_cursor(post.relevance, post.created_at, post.id)
+        if sort_by == "popular":
+            first = post.likes_count
+        elif sort_by == "trending":
+            first = post.likes_count + post.comments_count
+        else:
+            first = post.is_pinned
+        return encode_cursor(first, post.created_at, post.id)
+    
+    @staticmethod
+    async def _get_hot_feed_ids(cursor, sort_by: str) -> list[str]:
+        """
+        Return the ordered ids of the top ``HOT_FEED_SIZE`` posts for a
+        trending/popular sort. The ranking is materialized in Redis (or a
+        process-local dict when Redis is down) for ``HOT_FEED_TTL`` seconds
+        so the full-table sort runs once per TTL rather than once per page.
+        Counts are still read live when the page is hydrated.
+        """
+        key = f"{HOT_FEED_PREFIX}:{sort_by}"
+        redis = None
+        try:
+            redis = await get_redis_client()
+            cached = await redis.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for forum hot feed: {e}")
+            redis = None
+            local = _local_hot_feed.get(sort_by)
+            if local and local[0] > time.monotonic():
+                return local[1]
+        
+        # Same joins and filters as _fetch_posts_by_ids, so every ranked id
+        # comes back when its page is loaded
+        await cursor.execute(
+            f"""
+            SELECT p.id
+            {POST_WITH_AUTHOR_FROM}
+            WHERE p.is_deleted = FALSE
+            ORDER BY {", ".join(f"{column} DESC" for column in await feed_sort_keys(cursor, sort_by))}
+            LIMIT %s
+            """,
+            (HOT_FEED_SIZE,)
+        )
+        ids = [row[0] for row in await cursor.fetchall()]
+        
+        if redis is not None:
+            try:
+                await redis.set(key, json.dumps(ids), ex=HOT_FEED_TTL)
+            except Exception as e:
+                logger.warning(f"Failed to cache forum hot feed: {e}")
+        else:
+            _local_hot_feed[sort_by] = (time.monotonic() + HOT_FEED_TTL, ids)
+        return ids
+    
+    @staticmethod
+    async def invalidate_hot_feed() -> None:
+        """Drop the materialized hot feeds (called when posts are added or removed)"""
+        _local_hot_feed.clear()
+        try:
+            redis = await get_redis_client()
+            await redis.delete(*[f"{HOT_FEED_PREFIX}:{sort}" for sort in HOT_FEED_SORTS])
+        except Exception as e:
+            logger.warning(f"Failed to invalidate forum hot feed: {e}")
+    
+    @staticmethod
+    async def _fetch_posts_by_ids(cursor, post_ids: list[str]) -> list[tuple]:
+        """Fetch posts with author details, preserving the order of ``post_ids``"""
+        if not post_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(post_ids))
+        await cursor.execute(
+            f"""
+            SELECT {POST_WITH_AUTHOR_COLUMNS}
+            {POST_WITH_AUTHOR_FROM}
+            WHERE p.id IN ({placeholders}) AND p.is_deleted = FALSE
+            """,
+            tuple(post_ids)
+        )
+        rows_by_id = {row[0]: row for row in await cursor.fetchall()}
+        return [rows_by_id[pid] for pid in post_ids if pid in rows_by_id]
+    
+    @staticmethod
+    async def _liked_ids(cursor, table: str, column: str, ids: list[str], user_id: Optional[str]) -> set:
+        """Return which of ``ids`` the user has liked, in a single query"""
+        if not user_id or not ids:
+            return set()
+        placeholders = ', '.join(['%s'] * len(ids))
+        await cursor.execute(
+            f"SELECT {column} FROM {table} WHERE user_id = %s AND {column} IN ({placeholders})",
+            (user_id, *ids)
+        )
+        return {row[0] for row in await cursor.fetchall()}
+    
+    @staticmethod
+    async def _hydrate_posts(cursor, rows, user_id: Optional[str]) -> list[ForumPostWithAuthor]:
+        """Build post models for a page of rows with one like lookup for the whole page"""
+        liked = await ForumService._liked_ids(
+            cursor, 'post_likes', 'post_id', [row[0] for row in rows], user_id
+        )
+        return [ForumService._post_with_author_from_row(row, row[0] in liked) for row in rows]
+    
     @staticmethod
     async def get_posts_by_author(author_id: str) -> list[ForumPostWithAuthor]:
         """Get all posts by a specific author"""
@@ -350,7 +559,11 @@ class ForumService:
                     (post_id,)
                 )
                 await conn.commit()
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+        
+        if deleted:
+            await ForumService.invalidate_hot_feed()
+        return deleted
     
     @staticmethod
     async def toggle_post_like(post_id: str, user_id: str) -> LikeToggleResponse:
@@ -452,18 +665,14 @@ class ForumService:
                 all_comments = {}
                 root_comments = []
                 
+                liked = await ForumService._liked_ids(
+                    cursor, 'comment_likes', 'comment_id', [row[0] for row in rows], user_id
+                )
+                
                 for row in rows:
                     comment_id = row[0]
                     parent_id = row[3]
-                    
-                    # Check if user has liked the comment
-                    user_has_liked = False
-                    if user_id:
-                        await cursor.execute(
-                            "SELECT id FROM comment_likes WHERE comment_id = %s AND user_id = %s",
-                            (comment_id, user_id)
-                        )
-                        user_has_liked = await cursor.fetchone() is not None
+                    user_has_liked = comment_id in liked
                     
                     comment = ForumCommentWithAuthor(
                         id=comment_id,
@@ -599,6 +808,29 @@ class ForumService:
     
     # ========== Helper Methods ==========
     
+    @staticmethod
+    def _post_with_author_from_row(row: tuple, user_has_liked: bool) -> ForumPostWithAuthor:
+        """Convert a POST_WITH_AUTHOR_COLUMNS row to ForumPostWithAuthor"""
+        return ForumPostWithAuthor(
+            id=row[0],
+            title=row[1],
+            content=row[2],
+            author_id=row[3],
+            tags=json.loads(row[4]) if row[4] else [],
+            likes_count=row[5],
+            comments_count=row[6],
+            views_count=row[7],
+            is_pinned=row[8],
+            is_deleted=row[9],
+            created_at=row[10],
+            updated_at=row[11],
+            author_email=row[12],
+            author_name=row[13],
+            author_photo_url=row[14],
+            author_role=row[15],
+            user_has_liked=user_has_liked
+        )
+    
     @staticmethod
     def _post_from_row(row: tuple, cursor) -> ForumPostResponse:
         """Convert database row to ForumPostResponse"""
@@ -10,6 +10,8 @@ import numpy as np
 # from sklearn.cluster import DBSCAN  # Moved to local import
 from datetime import datetime
 
+from utils.route_cache import invalidate_tags
+
 logger = logging.getLogger(__name__)
 
 
@@ -331,6 +333,7 @@ class HeatmapService:
                 updated_count += 1
             
             await db_conn.commit()
+            await invalidate_tags("heatmap")
             
             return {
                 "locations_updated": updated_count,
@@ -598,6 +601,7 @@ class HeatmapService:
                 await self._store_cluster(db_conn, cluster_record)
             
             await db_conn.commit()
+            await invalidate_tags("heatmap")
             
             # Return clustering results
             return {
@@ -8,7 +8,11 @@ from datetime import datetime
 import aiomysql
 
 from database.connection import get_db_pool
+from utils.pagination import cached_count, decode_cursor, keyset_condition, next_cursor_from_rows
 from services.mock_data_provider import get_mock_applications_by_user
+from services.entity_skill_service import EntitySkillService, ENTITY_JOB
+from services.search_service import JOB_SEARCH, highlight, search_clause
+from utils.route_cache import invalidate_tags
 
 # Mock mode flag
 USE_MOCK_DB = os.getenv('USE_MOCK_DB', 'false').lower() == 'true'
@@ -61,7 +65,11 @@ class JobService:
                     job_data.apply_link, user_id, job_data.application_deadline,
                     job_data.status.value
                 ))
+                await EntitySkillService.sync_entity(
+                    cursor, ENTITY_JOB, job_id, job_data.skills_required
+                )
                 await conn.commit()
+                await invalidate_tags("jobs")
                 
                 # Get the created job
                 return await JobService.get_job_by_id(job_id)
@@ -176,7 +184,12 @@ class JobService:
                 """
                 
                 await cursor.execute(query, values)
+                if job_data.skills_required is not None:
+                    await EntitySkillService.sync_entity(
+                        cursor, ENTITY_JOB, job_id, job_data.skills_required
+                    )
                 await conn.commit()
+                await invalidate_tags("jobs")
                 
                 return await JobService.get_job_by_id(job_id)
     
@@ -205,8 +218,10 @@ class JobService:
                     raise PermissionError("You don't have permission to delete this job")
                 
                 # Delete job
+                await EntitySkillService.delete_entity(cursor, ENTITY_JOB, job_id)
                 await cursor.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
                 await conn.commit()
+                await invalidate_tags("jobs")
                 
                 return cursor.rowcount > 0
     
@@ -234,6 +249,7 @@ class JobService:
                     (JobStatus.CLOSED.value, job_id)
                 )
                 await conn.commit()
+                await invalidate_tags("jobs")
                 
                 return await JobService.get_job_by_id(job_id)
     
@@ -246,7 +262,9 @@ class JobService:
                 'total': 0,
                 'page': search_params.page,
                 'limit': search_params.limit,
-                'total_pages': 0
+                'total_pages': 0,
+                'next_cursor': None,
+                'has_more': False
             }
         
         pool = await get_db_pool()
@@ -272,48 +290,84 @@ class JobService:
                     where_clauses.append("job_type = %s")
                     values.append(search_params.job_type.value)
                 
+                search = None
                 if search_params.search:
-                    where_clauses.append("(title LIKE %s OR description LIKE %s)")
-                    search_term = f"%{search_params.search}%"
-                    values.extend([search_term, search_term])
+                    search = await search_clause(cursor, JOB_SEARCH, search_params.search)
+                    if search:
+                        where_clauses.append(search.condition)
+                        values.extend(search.params)
                 
                 if search_params.skills:
-                    skill_conditions = []
-                    for skill in search_params.skills:
-                        skill_conditions.append("JSON_CONTAINS(skills_required, %s)")
-                        values.append(json.dumps(skill))
-                    where_clauses.append(f"({' OR '.join(skill_conditions)})")
+                    # Jobs requiring any of the skills, via the entity_skills index
+                    skill_sql, skill_values = await EntitySkillService.skill_filter(
+                        cursor, ENTITY_JOB, "id", search_params.skills
+                    )
+                    where_clauses.append(skill_sql)
+                    values.extend(skill_values)
                 
                 where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
                 
-                # Count total results
-                count_query = f"SELECT COUNT(*) as total FROM jobs {where_sql}"
-                await cursor.execute(count_query, values)
-                total_result = await cursor.fetchone()
-                total = total_result['total'] if total_result else 0
+                # Total is optional and cached, so paging does not re-count every call
+                total = None
+                if search_params.include_total:
+                    total = await cached_count(
+                        cursor, f"SELECT COUNT(*) as total FROM jobs {where_sql}", values, "jobs"
+                    )
                 
-                # Get paginated results
-                offset = (search_params.page - 1) * search_params.limit
+                # Keyset pagination on ([relevance,] created_at, id); OFFSET only for legacy page numbers
+                sort_keys = ["created_at", "id"]
+                ranked_from = "jobs"
+                page_values = list(values)
+                if search and search.ranked:
+                    # Rank in a derived table so relevance can be a cursor key
+                    sort_keys = ["relevance", "created_at", "id"]
+                    ranked_from = f"(SELECT *, {search.score} AS relevance FROM jobs {where_sql}) ranked"
+                    page_values = search.score_params + values
+                    page_where = []
+                else:
+                    page_where = list(where_clauses)
+                offset = 0
+                if search_params.cursor:
+                    condition, cursor_values = keyset_condition(
+                        sort_keys, decode_cursor(search_params.cursor, len(sort_keys))
+                    )
+                    page_where.append(condition)
+                    page_values.extend(cursor_values)
+                else:
+                    offset = (search_params.page - 1) * search_params.limit
+                
+                page_where_sql = f"WHERE {' AND '.join(page_where)}" if page_where else ""
                 query = f"""
-                SELECT * FROM jobs 
-                {where_sql}
-                ORDER BY created_at DESC
+                SELECT * FROM {ranked_from}
+                {page_where_sql}
+                ORDER BY {', '.join(f'{key} DESC' for key in sort_keys)}
                 LIMIT %s OFFSET %s
                 """
-                values.extend([search_params.limit, offset])
+                page_values.extend([search_params.limit + 1, offset])
                 
-                await cursor.execute(query, values)
-                jobs = await cursor.fetchall()
+                await cursor.execute(query, page_values)
+                jobs, next_cursor = next_cursor_from_rows(
+                    await cursor.fetchall(), search_params.limit,
+                    lambda row: tuple(row[key] for key in sort_keys)
+                )
                 
                 # Parse JSON fields
                 parsed_jobs = [JobService._parse_job_json_fields(job) for job in jobs]
+                if search:
+                    for job in parsed_jobs:
+                        job['highlights'] = {
+                            'title': highlight(job['title'], search.terms),
+                            'description': highlight(job['description'], search.terms),
+                        }
                 
                 return {
                     "jobs": parsed_jobs,
                     "total": total,
                     "page": search_params.page,
                     "limit": search_params.limit,
-                    "total_pages": (total + search_params.limit - 1) // search_params.limit
+                    "total_pages": (total + search_params.limit - 1) // search_params.limit if total is not None else None,
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None
                 }
     
     @staticmethod
@@ -356,6 +410,7 @@ class JobService:
                     application_data.cover_letter, ApplicationStatus.PENDING.value
                 ))
                 await conn.commit()
+                await invalidate_tags("jobs")
                 
                 # Get the created application
                 return await JobService.get_application_by_id(application_id)
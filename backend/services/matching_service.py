@@ -7,6 +7,9 @@ from typing import List, Dict, Optional, Tuple
 import math
 from collections import Counter
 
+from services.mentor_match_index import mentor_match_index
+from services.entity_skill_service import EntitySkillService, ENTITY_JOB
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,7 +70,9 @@ class MatchingService:
         limit: int = 10
     ) -> List[Dict]:
         """
-        Match mentors based on skills and interests using Jaccard similarity
+        Match mentors based on skills and interests using Jaccard similarity.
+        Scoring runs against the in-memory MentorMatchIndex, so the query cost
+        does not grow with per-mentor Python work.
         """
         try:
             # Normalize input
@@ -75,80 +80,21 @@ class MatchingService:
             interest_areas_set = set(self.normalize_string_list(interest_areas or []))
             preferred_industries_set = set(self.normalize_string_list(preferred_industries or []))
             
-            # Get all available mentors with their profiles
-            query = """
-                SELECT 
-                    mp.id as mentor_profile_id,
-                    mp.user_id,
-                    mp.expertise_areas,
-                    mp.rating,
-                    mp.total_sessions,
-                    mp.current_mentees_count,
-                    mp.max_mentees,
-                    u.email,
-                    ap.name,
-                    ap.photo_url,
-                    ap.current_company,
-                    ap.current_role,
-                    ap.skills,
-                    ap.industry
-                FROM mentor_profiles mp
-                JOIN users u ON mp.user_id = u.id
-                JOIN alumni_profiles ap ON mp.user_id = ap.user_id
-                WHERE mp.is_available = TRUE
-                    AND mp.current_mentees_count < mp.max_mentees
-                    AND u.is_active = TRUE
-            """
-            
-            params = []
-            if min_rating is not None:
-                query += " AND mp.rating >= %s"
-                params.append(min_rating)
-            
-            async with db_conn.cursor() as cursor:
-                await cursor.execute(query, params)
-                mentors = await cursor.fetchall()
+            # Score every available mentor in one batch against the resident index
+            await mentor_match_index.ensure_fresh(db_conn)
+            top_mentors = mentor_match_index.score(
+                user_skills_set,
+                interest_areas_set,
+                preferred_industries_set,
+                min_rating=min_rating,
+                limit=limit
+            )
             
-            # Calculate match scores for each mentor
             mentor_matches = []
-            for mentor in mentors:
-                # Parse JSON fields
-                mentor_expertise = mentor[2] if mentor[2] else []
-                mentor_skills = mentor[12] if mentor[12] else []
-                mentor_industry = mentor[13] or ""
-                
-                # Normalize mentor data
-                mentor_expertise_set = set(self.normalize_string_list(mentor_expertise))
-                mentor_skills_set = set(self.normalize_string_list(mentor_skills))
-                mentor_industry_set = {mentor_industry.lower().strip()} if mentor_industry else set()
-                
-                # Calculate match scores
-                skill_match = 0.0
-                expertise_match = 0.0
-                industry_match = 0.0
-                
-                # Skill matching (40% weight)
-                if user_skills_set:
-                    skill_match = self.jaccard_similarity(user_skills_set, mentor_skills_set)
-                
-                # Expertise/Interest matching (40% weight)
-                if interest_areas_set:
-                    expertise_match = self.jaccard_similarity(interest_areas_set, mentor_expertise_set)
-                
-                # Industry matching (20% weight)
-                if preferred_industries_set:
-                    industry_match = self.jaccard_similarity(preferred_industries_set, mentor_industry_set)
-                
-                # Calculate weighted match score
-                match_score = (
-                    0.40 * skill_match +
-                    0.40 * expertise_match +
-                    0.20 * industry_match
-                )
-                
+            for mentor in top_mentors:
                 # Find common skills/expertise
-                matching_skills = list(user_skills_set.intersection(mentor_skills_set))
-                matching_expertise = list(interest_areas_set.intersection(mentor_expertise_set))
+                matching_skills = list(user_skills_set.intersection(mentor['skills_set']))
+                matching_expertise = list(interest_areas_set.intersection(mentor['expertise_set']))
                 
                 # Generate matching reasons
                 matching_reasons = []
@@ -156,31 +102,28 @@ class MatchingService:
                     matching_reasons.append(f"Shares {len(matching_skills)} skill(s): {', '.join(matching_skills[:3])}")
                 if matching_expertise:
                     matching_reasons.append(f"Expertise in: {', '.join(matching_expertise[:3])}")
-                if mentor[3] >= 4.0:
-                    matching_reasons.append(f"Highly rated mentor ({mentor[3]:.1f}/5.0)")
-                if mentor[4] >= 10:
-                    matching_reasons.append(f"Experienced with {mentor[4]} sessions")
+                if mentor['rating'] >= 4.0:
+                    matching_reasons.append(f"Highly rated mentor ({mentor['rating']:.1f}/5.0)")
+                if mentor['total_sessions'] >= 10:
+                    matching_reasons.append(f"Experienced with {mentor['total_sessions']} sessions")
                 
                 mentor_matches.append({
-                    'mentor_id': mentor[0],
-                    'user_id': mentor[1],
-                    'name': mentor[8],
-                    'email': mentor[7],
-                    'photo_url': mentor[9],
-                    'current_company': mentor[10],
-                    'current_role': mentor[11],
-                    'expertise_areas': mentor_expertise,
-                    'rating': float(mentor[3]) if mentor[3] else 0.0,
-                    'total_sessions': mentor[4],
-                    'match_score': match_score,
+                    'mentor_id': mentor['mentor_id'],
+                    'user_id': mentor['user_id'],
+                    'name': mentor['name'],
+                    'email': mentor['email'],
+                    'photo_url': mentor['photo_url'],
+                    'current_company': mentor['current_company'],
+                    'current_role': mentor['current_role'],
+                    'expertise_areas': mentor['expertise_areas'],
+                    'rating': mentor['rating'],
+                    'total_sessions': mentor['total_sessions'],
+                    'match_score': mentor['match_score'],
                     'matching_skills': matching_skills,
                     'matching_reasons': matching_reasons if matching_reasons else ["Available mentor in network"]
                 })
             
-            # Sort by match score (descending) and rating
-            mentor_matches.sort(key=lambda x: (x['match_score'], x['rating']), reverse=True)
-            
-            return mentor_matches[:limit]
+            return mentor_matches
             
         except Exception as e:
             logger.error(f"Error in match_mentors: {str(e)}")
@@ -216,7 +159,8 @@ class MatchingService:
             preferred_locations_set = set(self.normalize_string_list(preferred_locations or []))
             preferred_job_types_set = set(self.normalize_string_list(preferred_job_types or []))
             
-            # Get all active jobs
+            # Candidates: the 100 most recent active jobs plus active jobs that
+            # share a skill with the user, found through the entity_skills index
             query = """
                 SELECT 
                     id, title, description, company, location, job_type,
@@ -225,13 +169,22 @@ class MatchingService:
                 FROM jobs
                 WHERE status = 'active'
                     AND (application_deadline IS NULL OR application_deadline > NOW())
-                ORDER BY created_at DESC
-                LIMIT 100
             """
             
             async with db_conn.cursor() as cursor:
-                await cursor.execute(query)
-                jobs = await cursor.fetchall()
+                await cursor.execute(query + " ORDER BY created_at DESC LIMIT 100")
+                jobs = list(await cursor.fetchall())
+                
+                if user_skills_set:
+                    matched = await EntitySkillService.overlap_counts(
+                        cursor, ENTITY_JOB, user_skills_set, limit=500
+                    )
+                    seen = {job[0] for job in jobs}
+                    missing = [job_id for job_id in matched if job_id not in seen]
+                    if missing:
+                        placeholders = ', '.join(['%s'] * len(missing))
+                        await cursor.execute(query + f" AND id IN ({placeholders})", missing)
+                        jobs.extend(await cursor.fetchall())
             
             # Calculate match scores for each job
             job_matches = []
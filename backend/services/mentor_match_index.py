@@ -0,0 +1,315 @@
+"""
+Mentor Match Index - Resident, vectorized index for mentor matching
+Keeps vocabulary-encoded sparse matrices of mentor skills, expertise and
+industry in memory so a match query scores every mentor in one batch.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+MENTOR_COLUMNS = """
+    mp.id as mentor_profile_id,
+    mp.user_id,
+    mp.expertise_areas,
+    mp.rating,
+    mp.total_sessions,
+    mp.current_mentees_count,
+    mp.max_mentees,
+    u.email,
+    ap.name,
+    ap.photo_url,
+    ap.current_company,
+    ap.current_role,
+    ap.skills,
+    ap.industry
+"""
+
+MENTOR_FROM = """
+    FROM mentor_profiles mp
+    JOIN users u ON mp.user_id = u.id
+    JOIN alumni_profiles ap ON mp.user_id = ap.user_id
+    WHERE mp.is_available = TRUE
+        AND mp.current_mentees_count < mp.max_mentees
+        AND u.is_active = TRUE
+"""
+
+
+def _parse_list(value) -> List[str]:
+    """Parse a JSON list column that may arrive as a string or a list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return [value]
+    if not isinstance(value, list):
+        return []
+    return value
+
+
+def _normalize(items: Iterable) -> Set[str]:
+    """Lowercase and strip a list of strings into a set"""
+    return {str(item).lower().strip() for item in items if item}
+
+
+class _Vocabulary:
+    """Maps normalized terms to column indices"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def add(self, term: str) -> int:
+        idx = self.index.get(term)
+        if idx is None:
+            idx = len(self.index)
+            self.index[term] = idx
+        return idx
+
+    def encode(self, terms: Set[str]) -> np.ndarray:
+        """Encode known terms; unknown terms are dropped (they never intersect)"""
+        return np.fromiter(
+            (self.index[t] for t in terms if t in self.index), dtype=np.int64
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class MentorMatchIndex:
+    """
+    In-memory matching index over available mentors.
+
+    Mentor rows are loaded once and re-encoded into CSR matrices whenever the
+    row set changes. Profile writes call ``mark_stale`` so only the affected
+    mentors are re-fetched before the next query; a full reload happens
+    after ``ttl_seconds`` to pick up changes made outside the services.
+    """
+
+    def __init__(self, ttl_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self._records: Dict[str, dict] = {}
+        self._stale_user_ids: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+
+        # Encoded state (rebuilt from _records when dirty)
+        self._rows: List[dict] = []
+        self._skills: Optional[sparse.csr_matrix] = None
+        self._expertise: Optional[sparse.csr_matrix] = None
+        self._industry: Optional[sparse.csr_matrix] = None
+        self._skill_sizes = np.zeros(0)
+        self._expertise_sizes = np.zeros(0)
+        self._industry_sizes = np.zeros(0)
+        self._ratings = np.zeros(0)
+        self._skill_vocab = _Vocabulary()
+        self._expertise_vocab = _Vocabulary()
+        self._industry_vocab = _Vocabulary()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def mark_stale(self, user_id: str) -> None:
+        """Flag a mentor for re-fetch before the next query"""
+        self._stale_user_ids.add(str(user_id))
+
+    def invalidate(self) -> None:
+        """Force a full reload before the next query"""
+        self._loaded_at = None
+
+    @staticmethod
+    def _record_from_row(row) -> dict:
+        expertise = _parse_list(row[2])
+        skills = _parse_list(row[12])
+        industry = row[13] or ""
+        return {
+            'mentor_id': row[0],
+            'user_id': row[1],
+            'expertise_areas': expertise,
+            'rating': float(row[3]) if row[3] else 0.0,
+            'total_sessions': row[4] or 0,
+            'email': row[7],
+            'name': row[8],
+            'photo_url': row[9],
+            'current_company': row[10],
+            'current_role': row[11],
+            'skills_set': _normalize(skills),
+            'expertise_set': _normalize(expertise),
+            'industry_set': {industry.lower().strip()} if industry else set(),
+        }
+
+    async def _full_reload(self, db_conn) -> None:
+        started = time.perf_counter()
+        # Mentors marked while the query runs stay queued for the next refresh
+        covered = set(self._stale_user_ids)
+        async with db_conn.cursor() as cursor:
+            await cursor.execute(f"SELECT {MENTOR_COLUMNS} {MENTOR_FROM}")
+            rows = await cursor.fetchall()
+
+        self._records = {str(row[1]): self._record_from_row(row) for row in rows}
+        self._stale_user_ids.difference_update(covered)
+        self._loaded_at = time.monotonic()
+        self._dirty = True
+        logger.info(
+            f"Mentor match index loaded {len(self._records)} mentors "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    async def _refresh_stale(self, db_conn) -> None:
+        user_ids = list(self._stale_user_ids)
+        placeholders = ', '.join(['%s'] * len(user_ids))
+
+        async with db_conn.cursor() as cursor:
+            await cursor.execute(
+                f"SELECT {MENTOR_COLUMNS} {MENTOR_FROM} AND mp.user_id IN ({placeholders})",
+                user_ids
+            )
+            rows = await cursor.fetchall()
+
+        # Only dropped once fetched, so a failed query is retried next time
+        self._stale_user_ids.difference_update(user_ids)
+        # Mentors not returned are no longer available
+        for user_id in user_ids:
+            self._records.pop(user_id, None)
+        for row in rows:
+            self._records[str(row[1])] = self._record_from_row(row)
+        self._dirty = True
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def ensure_fresh(self, db_conn) -> None:
+        """Load or incrementally refresh the index as needed"""
+        if not self._expired() and not self._stale_user_ids and not self._dirty:
+            return
+
+        async with self._lock:
+            if self._expired():
+                await self._full_reload(db_conn)
+            elif self._stale_user_ids:
+                await self._refresh_stale(db_conn)
+
+            if self._dirty:
+                self._encode()
+
+    @staticmethod
+    def _encode_column(rows: List[dict], field: str, vocab: _Vocabulary):
+        indptr = [0]
+        indices: List[int] = []
+        for row in rows:
+            indices.extend(vocab.add(term) for term in row[field])
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(rows), max(len(vocab), 1))
+        )
+        sizes = np.diff(matrix.indptr).astype(np.float32)
+        # Column slicing is faster in CSC form
+        return matrix.tocsc(), sizes
+
+    def _encode(self) -> None:
+        self._rows = list(self._records.values())
+        self._skill_vocab = _Vocabulary()
+        self._expertise_vocab = _Vocabulary()
+        self._industry_vocab = _Vocabulary()
+
+        self._skills, self._skill_sizes = self._encode_column(
+            self._rows, 'skills_set', self._skill_vocab
+        )
+        self._expertise, self._expertise_sizes = self._encode_column(
+            self._rows, 'expertise_set', self._expertise_vocab
+        )
+        self._industry, self._industry_sizes = self._encode_column(
+            self._rows, 'industry_set', self._industry_vocab
+        )
+        self._ratings = np.array([r['rating'] for r in self._rows], dtype=np.float32)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _jaccard(matrix, sizes: np.ndarray, vocab: _Vocabulary, query: Set[str]) -> np.ndarray:
+        """Jaccard similarity of the query set against every mentor row"""
+        if not query or matrix is None or matrix.shape[0] == 0:
+            return np.zeros(sizes.shape[0], dtype=np.float32)
+
+        columns = vocab.encode(query)
+        if columns.size:
+            intersection = np.asarray(matrix[:, columns].sum(axis=1)).ravel()
+        else:
+            intersection = np.zeros(sizes.shape[0], dtype=np.float32)
+
+        union = len(query) + sizes - intersection
+        scores = np.divide(
+            intersection, union,
+            out=np.zeros_like(intersection, dtype=np.float32),
+            where=(union > 0) & (sizes > 0)
+        )
+        return scores
+
+    def score(
+        self,
+        user_skills: Set[str],
+        interest_areas: Set[str],
+        preferred_industries: Set[str],
+        min_rating: Optional[float] = None,
+        limit: int = 10
+    ) -> List[dict]:
+        """Score every indexed mentor and return the top ``limit`` records"""
+        if not self._rows or limit <= 0:
+            return []
+
+        scores = (
+            0.40 * self._jaccard(self._skills, self._skill_sizes, self._skill_vocab, user_skills) +
+            0.40 * self._jaccard(self._expertise, self._expertise_sizes, self._expertise_vocab, interest_areas) +
+            0.20 * self._jaccard(self._industry, self._industry_sizes, self._industry_vocab, preferred_industries)
+        )
+
+        candidates = np.arange(len(self._rows))
+        if min_rating is not None:
+            candidates = candidates[self._ratings >= min_rating]
+        if candidates.size == 0:
+            return []
+
+        # Partial selection first, then exact ordering of the short list
+        if candidates.size > limit:
+            part = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            threshold = scores[candidates[part]].min()
+            # Keep ties at the cut-off so the rating tie-break stays exact
+            candidates = candidates[scores[candidates] >= threshold]
+
+        order = np.lexsort((-self._ratings[candidates], -scores[candidates]))
+        top = candidates[order][:limit]
+
+        return [
+            dict(self._rows[i], match_score=float(scores[i]))
+            for i in top
+        ]
+
+    def stats(self) -> Dict:
+        """Return index size information"""
+        return {
+            'mentors': len(self._records),
+            'skills_vocabulary': len(self._skill_vocab),
+            'expertise_vocabulary': len(self._expertise_vocab),
+            'industries_vocabulary': len(self._industry_vocab),
+            'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+            'pending_refresh': len(self._stale_user_ids),
+        }
+
+
+# Initialize index instance
+mentor_match_index = MentorMatchIndex()
@@ -8,6 +8,7 @@ from datetime import datetime
 import aiomysql
 
 from database.connection import get_db_pool
+from services.mentor_match_index import mentor_match_index
 from services.mock_data_provider import (
     get_mock_mentorship_requests_by_student,
     load_mock_data
@@ -89,6 +90,7 @@ class MentorshipService:
                     profile_data.mentorship_approach, True
                 ))
                 await conn.commit()
+                mentor_match_index.mark_stale(user_id)
                 
                 # Return the created mentor profile
                 return await MentorshipService.get_mentor_profile(user_id)
@@ -132,6 +134,7 @@ class MentorshipService:
                 
                 await cursor.execute(query, values)
                 await conn.commit()
+                mentor_match_index.mark_stale(user_id)
                 
                 return await MentorshipService.get_mentor_profile(user_id)
     
@@ -532,6 +535,7 @@ class MentorshipService:
                 await conn.commit()
                 
                 # Trigger will automatically update mentor's current_mentees_count
+                mentor_match_index.mark_stale(mentor_id)
                 
                 return await MentorshipService.get_request_with_details(request_id)
     
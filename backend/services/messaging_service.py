@@ -1,18 +1,35 @@
 """
 Messaging Service
 Handles all chat functionality including messages, conversations, read receipts, typing indicators, and presence
+
+Read state is a per-conversation watermark: ``conversations.last_read_seq_1/2``
+holds the ``messages.seq`` of the last message each participant has read, and
+``unread_count_1/2`` are maintained atomically alongside it. Marking a
+conversation read is one UPDATE and total unread is a sum over conversations.
 """
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any, Tuple
 import uuid
 
+import aiomysql
+
+from services.search_service import MESSAGE_SEARCH, highlight, search_clause
+from utils.pagination import decode_cursor, encode_cursor, keyset_condition
+
 logger = logging.getLogger(__name__)
 
 
 class MessagingService:
     """Service for handling all messaging operations"""
     
+    @staticmethod
+    def _participants(user_id: str, other_user_id: str) -> Tuple[str, str, int]:
+        """(user_id_1, user_id_2, slot of ``user_id``) - conversations store sorted pairs"""
+        if user_id < other_user_id:
+            return user_id, other_user_id, 1
+        return other_user_id, user_id, 2
+    
     async def send_message(self, conn, sender_id: str, recipient_id: str, message_text: str, attachment_url: Optional[str] = None):
         """
         Send a message and update conversation
@@ -29,19 +46,22 @@ class MessagingService:
                 """
                 await cursor.execute(query, (message_id, sender_id, recipient_id, message_text, attachment_url))
                 
-                # Create or update conversation (single row with sorted user IDs)
-                user_1 = sender_id if sender_id < recipient_id else recipient_id
-                user_2 = recipient_id if sender_id < recipient_id else sender_id
+                # Create or update conversation (single row with sorted user IDs);
+                # only the recipient's unread counter moves
+                user_1, user_2, recipient_slot = self._participants(recipient_id, sender_id)
+                unread_1, unread_2 = (1, 0) if recipient_slot == 1 else (0, 1)
                 
                 conv_query = """
-                    INSERT INTO conversations (user_id_1, user_id_2, last_message_id, last_message_at, unread_count_2)
-                    VALUES (%s, %s, %s, NOW(), 1)
+                    INSERT INTO conversations
+                        (user_id_1, user_id_2, last_message_id, last_message_at, unread_count_1, unread_count_2)
+                    VALUES (%s, %s, %s, NOW(), %s, %s)
                     ON DUPLICATE KEY UPDATE
-                        last_message_id = %s,
+                        last_message_id = VALUES(last_message_id),
                         last_message_at = NOW(),
-                        unread_count_2 = unread_count_2 + 1
+                        unread_count_1 = unread_count_1 + VALUES(unread_count_1),
+                        unread_count_2 = unread_count_2 + VALUES(unread_count_2)
                 """
-                await cursor.execute(conv_query, (user_1, user_2, message_id, message_id))
+                await cursor.execute(conv_query, (user_1, user_2, message_id, unread_1, unread_2))
                 
                 await conn.commit()
                 
@@ -58,50 +78,94 @@ class MessagingService:
             raise
     
     async def get_conversation(self, conn, user_id: str, other_user_id: str, limit: int = 50, offset: int = 0):
-        """Get conversation history between two users"""
+        """
+        Get conversation history between two users
+        
+        Returns the latest ``limit`` messages (skipping ``offset`` newer ones)
+        in chronological order. ``read`` / ``read_at`` come from the
+        recipient's watermark.
+        """
         try:
-            async with conn.cursor() as cursor:
+            user_1, user_2, _ = self._participants(user_id, other_user_id)
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
                 query = """
                     SELECT 
-                        m.id, m.sender_id, m.recipient_id, m.message_text as message,
-                        m.sent_at, mrr.read_at,
-                        CASE WHEN mrr.id IS NOT NULL THEN TRUE ELSE FALSE END as read
+                        m.id, m.sender_id, m.recipient_id, m.message_text as message, m.sent_at,
+                        m.seq <= CASE WHEN m.recipient_id = c.user_id_1
+                                      THEN c.last_read_seq_1 ELSE c.last_read_seq_2 END as is_read,
+                        CASE WHEN m.recipient_id = c.user_id_1
+                             THEN c.last_read_at_1 ELSE c.last_read_at_2 END as watermark_at
                     FROM messages m
-                    LEFT JOIN message_read_receipts mrr ON m.id = mrr.message_id AND mrr.user_id = %s
+                    LEFT JOIN conversations c ON c.user_id_1 = %s AND c.user_id_2 = %s
                     WHERE (m.sender_id = %s AND m.recipient_id = %s)
                        OR (m.sender_id = %s AND m.recipient_id = %s)
-                    ORDER BY m.sent_at ASC
+                    ORDER BY m.seq DESC
                     LIMIT %s OFFSET %s
                 """
-                await cursor.execute(query, (user_id, user_id, other_user_id, other_user_id, user_id, limit, offset))
-                messages = await cursor.fetchall()
-                
-                # Mark messages as read
-                mark_read_query = """
-                    INSERT INTO message_read_receipts (message_id, user_id, read_at)
-                    SELECT m.id, %s, NOW()
-                    FROM messages m
-                    WHERE m.recipient_id = %s
-                      AND m.sender_id = %s
-                      AND NOT EXISTS (
-                        SELECT 1 FROM message_read_receipts mrr 
-                        WHERE mrr.message_id = m.id AND mrr.user_id = %s
-                      )
-                    ON DUPLICATE KEY UPDATE read_at = NOW()
-                """
-                await cursor.execute(mark_read_query, (user_id, user_id, other_user_id, user_id))
-                await conn.commit()
-                
-                return messages
+                await cursor.execute(query, (
+                    user_1, user_2, user_id, other_user_id, other_user_id, user_id, limit, offset
+                ))
+                rows = await cursor.fetchall()
+            
+            messages = []
+            for row in reversed(rows):
+                is_read = bool(row.pop('is_read'))
+                watermark_at = row.pop('watermark_at')
+                row['read'] = is_read
+                row['read_at'] = watermark_at if is_read else None
+                messages.append(row)
+            return messages
         except Exception as e:
             logger.error(f"Error getting conversation: {str(e)}")
             raise
     
-    async def get_conversations_list(self, conn, user_id: str, limit: int = 50, offset: int = 0):
-        """Get all conversations for a user with last message preview"""
+    async def mark_conversation_read(self, conn, user_id: str, other_user_id: str) -> bool:
+        """
+        Move the user's watermark to the conversation's latest message and
+        zero their unread counter in a single UPDATE
+        
+        Returns:
+            True if there was anything unread
+        """
         try:
+            user_1, user_2, slot = self._participants(user_id, other_user_id)
             async with conn.cursor() as cursor:
-                query = """
+                await cursor.execute(f"""
+                    UPDATE conversations c
+                    LEFT JOIN messages m ON m.id = c.last_message_id
+                    SET c.last_read_seq_{slot} = GREATEST(c.last_read_seq_{slot}, COALESCE(m.seq, 0)),
+                        c.last_read_at_{slot} = NOW(),
+                        c.unread_count_{slot} = 0
+                    WHERE c.user_id_1 = %s AND c.user_id_2 = %s
+                      AND c.unread_count_{slot} > 0
+                """, (user_1, user_2))
+                changed = cursor.rowcount > 0
+                await conn.commit()
+                return changed
+        except Exception as e:
+            logger.error(f"Error marking conversation as read: {str(e)}")
+            raise
+    
+    async def get_conversations_list(self, conn, user_id: str, limit: int = 50, offset: int = 0,
+                                     page_cursor: Optional[str] = None):
+        """
+        Get all conversations for a user with last message preview
+        
+        ``page_cursor`` (from ``conversation_cursor``) continues after the last
+        conversation of the previous page and takes precedence over ``offset``.
+        """
+        keyset_sql = ""
+        keyset_params = []
+        if page_cursor:
+            keyset_sql, keyset_params = keyset_condition(
+                ["COALESCE(c.last_message_at, c.created_at)", "c.id"], decode_cursor(page_cursor, 2)
+            )
+            keyset_sql = f"AND {keyset_sql}"
+            offset = 0
+        
+        try:
+            async with conn.cursor() as cursor:
+                query = f"""
                     SELECT 
                         c.id as conversation_id,
                         CASE 
@@ -116,18 +180,19 @@ class MessagingService:
                             WHEN c.user_id_1 = %s THEN c.unread_count_1
                             ELSE c.unread_count_2
                         END as unread_count,
-                        m.sender_id = %s as last_message_from_me
+                        m.sender_id = %s as last_message_from_me,
+                        COALESCE(c.last_message_at, c.created_at) as activity_at
                     FROM conversations c
                     JOIN users u ON (
                         CASE WHEN c.user_id_1 = %s THEN c.user_id_2 ELSE c.user_id_1 END = u.id
                     )
                     LEFT JOIN messages m ON c.last_message_id = m.id
-                    WHERE c.user_id_1 = %s OR c.user_id_2 = %s
-                    ORDER BY c.last_message_at DESC
+                    WHERE (c.user_id_1 = %s OR c.user_id_2 = %s) {keyset_sql}
+                    ORDER BY activity_at DESC, c.id DESC
                     LIMIT %s OFFSET %s
                 """
                 await cursor.execute(query, (
-                    user_id, user_id, user_id, user_id, user_id, user_id, limit, offset
+                    user_id, user_id, user_id, user_id, user_id, user_id, *keyset_params, limit, offset
                 ))
                 conversations = await cursor.fetchall()
                 
@@ -136,63 +201,104 @@ class MessagingService:
             logger.error(f"Error getting conversations: {str(e)}")
             raise
     
-    async def mark_as_read(self, conn, message_id: str, user_id: str):
-        """Mark a message as read"""
+    @staticmethod
+    def conversation_cursor(conversation) -> str:
+        """Build the keyset cursor that continues after ``conversation``"""
+        if isinstance(conversation, dict):
+            return encode_cursor(conversation['activity_at'], conversation['conversation_id'])
+        return encode_cursor(conversation[-1], conversation[0])
+    
+    async def mark_as_read(self, conn, message_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a message (and everything before it in the conversation) as read
+        by advancing the recipient's watermark
+        
+        Returns:
+            ``{'sender_id', 'last_read_seq'}`` when the watermark moved,
+            otherwise None (unknown message, not the recipient, or already read)
+        """
         try:
             async with conn.cursor() as cursor:
-                query = """
-                    INSERT INTO message_read_receipts (message_id, user_id, read_at)
-                    VALUES (%s, %s, NOW())
-                    ON DUPLICATE KEY UPDATE read_at = NOW()
-                """
-                await cursor.execute(query, (message_id, user_id))
+                await cursor.execute(
+                    "SELECT sender_id, seq FROM messages WHERE id = %s AND recipient_id = %s",
+                    (message_id, user_id)
+                )
+                message = await cursor.fetchone()
+                if not message:
+                    return None
+                sender_id, seq = message[0], message[1]
+                
+                user_1, user_2, slot = self._participants(user_id, sender_id)
+                await cursor.execute(f"""
+                    UPDATE conversations
+                    SET last_read_seq_{slot} = %s,
+                        last_read_at_{slot} = NOW(),
+                        unread_count_{slot} = (
+                            SELECT COUNT(*) FROM messages
+                            WHERE sender_id = %s AND recipient_id = %s AND seq > %s
+                        )
+                    WHERE user_id_1 = %s AND user_id_2 = %s
+                      AND last_read_seq_{slot} < %s
+                """, (seq, sender_id, user_id, seq, user_1, user_2, seq))
+                moved = cursor.rowcount > 0
                 await conn.commit()
                 
-                return True
+                return {'sender_id': sender_id, 'last_read_seq': seq} if moved else None
         except Exception as e:
             logger.error(f"Error marking message as read: {str(e)}")
             raise
     
     async def get_unread_count(self, conn, user_id: str):
-        """Get total unread messages for user"""
+        """Get total unread messages for user (sum of per-conversation counters)"""
         try:
             async with conn.cursor() as cursor:
                 query = """
-                    SELECT COUNT(*) as unread_count
-                    FROM messages m
-                    WHERE m.recipient_id = %s
-                      AND NOT EXISTS (
-                        SELECT 1 FROM message_read_receipts mrr
-                        WHERE mrr.message_id = m.id AND mrr.user_id = %s
-                      )
+                    SELECT
+                        (SELECT COALESCE(SUM(unread_count_1), 0) FROM conversations WHERE user_id_1 = %s)
+                      + (SELECT COALESCE(SUM(unread_count_2), 0) FROM conversations WHERE user_id_2 = %s)
+                        as unread_count
                 """
                 await cursor.execute(query, (user_id, user_id))
                 result = await cursor.fetchone()
-                
-                return result.get('unread_count', 0) if result else 0
+                if not result:
+                    return 0
+                return int(result['unread_count'] if isinstance(result, dict) else result[0])
         except Exception as e:
             logger.error(f"Error getting unread count: {str(e)}")
             raise
     
     async def search_messages(self, conn, user_id: str, search_query: str, limit: int = 20):
-        """Search messages in user's conversations"""
+        """
+        Search messages in user's conversations
+
+        Uses the messages FULLTEXT index with prefix matching, best matches
+        first; each result carries a ``highlight`` snippet.
+        """
         try:
-            async with conn.cursor() as cursor:
-                query = """
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                search = await search_clause(cursor, MESSAGE_SEARCH, search_query, alias='m')
+                if search is None:
+                    return []
+                query = f"""
                     SELECT 
                         m.id, m.sender_id, m.recipient_id, m.message_text,
-                        m.sent_at, u.name as sender_name
+                        m.sent_at, u.name as sender_name,
+                        {search.score} as relevance
                     FROM messages m
                     JOIN users u ON m.sender_id = u.id
                     WHERE (m.sender_id = %s OR m.recipient_id = %s)
-                      AND m.message_text LIKE %s
-                    ORDER BY m.sent_at DESC
+                      AND {search.condition}
+                    ORDER BY relevance DESC, m.sent_at DESC
                     LIMIT %s
                 """
-                search_term = f"%{search_query}%"
-                await cursor.execute(query, (user_id, user_id, search_term, limit))
+                await cursor.execute(
+                    query,
+                    (*(search.score_params or []), user_id, user_id, *search.params, limit)
+                )
                 messages = await cursor.fetchall()
                 
+                for message in messages:
+                    message['highlight'] = highlight(message['message_text'], search.terms)
                 return messages
         except Exception as e:
             logger.error(f"Error searching messages: {str(e)}")
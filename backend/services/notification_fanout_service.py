@@ -0,0 +1,327 @@
+"""
+Notification Fan-out Engine
+Delivers one notification to a large audience (explicit user IDs or a
+role / batch-year filter) with a fixed number of statements per chunk:
+one preference lookup (served from a short-lived cache when warm), one
+multi-row notification insert and one multi-row email_queue insert. Emails
+are handed to the rate-controlled ``send_email_batch`` task instead of being
+sent inline, and connected recipients get a realtime push per chunk.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from database.connection import get_db_pool
+from database.models import NotificationPriority, NotificationType
+from services.email_service import EmailService
+from services.realtime_service import realtime_service
+
+logger = logging.getLogger(__name__)
+
+
+def render_notification_email(title: str, message: str, link: Optional[str] = None) -> str:
+    """HTML body used for notification emails"""
+    return f"""
+    <html>
+        <body>
+            <h2>{title}</h2>
+            <p>{message}</p>
+            {f'<p><a href="{link}">View Details</a></p>' if link else ''}
+            <hr>
+            <p><small>This is an automated notification from AlumUnity.</small></p>
+        </body>
+    </html>
+    """
+
+
+class PreferenceCache:
+    """
+    Short-lived in-process cache of delivery preferences per user
+
+    Entries are ``(email, email_enabled, notification_types)``. Users without
+    a preferences row get in-app notifications but no email, like
+    ``NotificationService.create_notification``.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: int = 200_000):
+        self.ttl = ttl if ttl is not None else int(os.getenv('NOTIFICATION_PREF_CACHE_TTL', 60))
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Tuple[str, bool, Dict[str, bool]]]] = {}
+
+    async def load(self, cursor, user_ids: List[str]) -> Dict[str, Tuple[str, bool, Dict[str, bool]]]:
+        """Preferences for ``user_ids``; cache misses are fetched in one query"""
+        now = time.monotonic()
+        found, missing = {}, []
+        for user_id in user_ids:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                found[user_id] = entry[1]
+            else:
+                missing.append(user_id)
+
+        if missing:
+            placeholders = ', '.join(['%s'] * len(missing))
+            await cursor.execute(
+                f"""
+                SELECT u.id, u.email, np.email_notifications, np.notification_types
+                FROM users u
+                LEFT JOIN notification_preferences np ON np.user_id = u.id
+                WHERE u.id IN ({placeholders}) AND u.is_active = TRUE
+                """,
+                missing
+            )
+            if len(self._entries) + len(missing) > self.max_entries:
+                self._entries.clear()
+            expires = now + self.ttl
+            for user_id, email, email_enabled, types in await cursor.fetchall():
+                try:
+                    types = json.loads(types) if types else {}
+                except (json.JSONDecodeError, TypeError):
+                    types = {}
+                prefs = (email, bool(email_enabled), types)
+                self._entries[user_id] = (expires, prefs)
+                found[user_id] = prefs
+        return found
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+class NotificationFanout:
+    """Bulk notification delivery for announcements and scheduled campaigns"""
+
+    def __init__(self, chunk_size: Optional[int] = None, email_batch_size: Optional[int] = None):
+        self.chunk_size = chunk_size or int(os.getenv('NOTIFICATION_FANOUT_CHUNK_SIZE', 1000))
+        self.email_batch_size = email_batch_size or int(os.getenv('EMAIL_BATCH_SIZE', 100))
+        self.preferences = PreferenceCache()
+
+    @staticmethod
+    async def _audience_chunks(
+        cursor,
+        chunk_size: int,
+        user_ids: Optional[Iterable[str]] = None,
+        role: Optional[str] = None,
+        batch_year: Optional[int] = None
+    ):
+        """Yield lists of recipient IDs: the explicit list, or a keyset scan of users"""
+        if user_ids is not None:
+            ids = list(dict.fromkeys(user_ids))
+            for start in range(0, len(ids), chunk_size):
+                yield ids[start:start + chunk_size]
+            return
+
+        join, conditions, params = "", ["u.is_active = TRUE", "u.id > %s"], []
+        if role:
+            conditions.append("u.role = %s")
+            params.append(role)
+        if batch_year:
+            join = "JOIN alumni_profiles ap ON ap.user_id = u.id"
+            conditions.append("ap.batch_year = %s")
+            params.append(batch_year)
+
+        last_id = ''
+        while True:
+            await cursor.execute(
+                f"""
+                SELECT u.id FROM users u {join}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY u.id
+                LIMIT %s
+                """,
+                (last_id, *params, chunk_size)
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+            last_id = rows[-1][0]
+
+    async def send(
+        self,
+        notification_type: NotificationType,
+        title: str,
+        message: str,
+        user_ids: Optional[Iterable[str]] = None,
+        role: Optional[str] = None,
+        batch_year: Optional[int] = None,
+        link: Optional[str] = None,
+        priority: NotificationPriority = NotificationPriority.MEDIUM,
+        metadata: Optional[Dict[str, Any]] = None,
+        on_emails_queued: Optional[Callable[[List[str]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create the notification for every recipient in the audience
+
+        Args:
+            user_ids: Explicit recipients (takes precedence over filters)
+            role: Restrict the audience to a user role
+            batch_year: Restrict the audience to an alumni batch
+            on_emails_queued: Called with each batch of ``email_queue`` IDs
+                after its chunk commits (dispatches ``send_email_batch``)
+
+        Returns:
+            Delivery statistics
+        """
+        started = time.perf_counter()
+        notification_type = NotificationType(notification_type)
+        priority = NotificationPriority(priority)
+        metadata_json = json.dumps(metadata) if metadata else None
+        subject = f"AlumUnity: {title}"
+        email_body = render_notification_email(title, message, link)
+        stats = {'audience': 0, 'notified': 0, 'skipped': 0, 'emails_queued': 0}
+        push_payload = {
+            'type': notification_type.value, 'title': title, 'message': message,
+            'link': link, 'priority': priority.value, 'metadata': metadata
+        }
+
+        pool = await get_db_pool()
+        if pool is None:
+            logger.warning("Notification fan-out skipped: database unavailable (mock mode)")
+            return {'status': 'skipped', **stats}
+
+        async with pool.acquire() as scan_conn, pool.acquire() as conn:
+            async with scan_conn.cursor() as scan_cursor, conn.cursor() as cursor:
+                async for chunk in self._audience_chunks(
+                    scan_cursor, self.chunk_size, user_ids=user_ids, role=role, batch_year=batch_year
+                ):
+                    stats['audience'] += len(chunk)
+                    preferences = await self.preferences.load(cursor, chunk)
+
+                    rows, emails = [], []
+                    for user_id in chunk:
+                        prefs = preferences.get(user_id)
+                        if prefs is None or not prefs[2].get(notification_type.value, True):
+                            stats['skipped'] += 1
+                            continue
+                        rows.append((
+                            str(uuid.uuid4()), user_id, notification_type.value, title,
+                            message, link, priority.value, metadata_json
+                        ))
+                        if prefs[1] and prefs[0]:
+                            emails.append((str(uuid.uuid4()), prefs[0], subject, email_body, 'notification'))
+
+                    if rows:
+                        await cursor.executemany(
+                            """
+                            INSERT INTO notifications
+                            (id, user_id, type, title, message, link, priority, metadata)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                            """,
+                            rows
+                        )
+                    if emails:
+                        await cursor.executemany(
+                            """
+                            INSERT INTO email_queue (id, recipient_email, subject, body, template_name)
+                            VALUES (%s, %s, %s, %s, %s)
+                            """,
+                            emails
+                        )
+                    await conn.commit()
+
+                    stats['notified'] += len(rows)
+                    stats['emails_queued'] += len(emails)
+                    await realtime_service.notifications_created([row[1] for row in rows], push_payload)
+                    if on_emails_queued:
+                        email_ids = [email[0] for email in emails]
+                        for start in range(0, len(email_ids), self.email_batch_size):
+                            on_emails_queued(email_ids[start:start + self.email_batch_size])
+
+        stats['duration_seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Notification fan-out '{title}': {stats}")
+        return {'status': 'completed', **stats}
+
+
+class EmailBatchSender:
+    """
+    Sends a batch of ``email_queue`` rows with bounded concurrency and a
+    per-second rate cap, then records the outcome with one bulk update
+    per status
+
+    Pending rows and failed rows with fewer than ``max_retries`` attempts
+    are picked up, and ``send`` returns the ids that failed but may still
+    be retried so the caller can re-enqueue them. No database connection is
+    held while SMTP runs.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, rate_per_second: Optional[float] = None,
+                 max_retries: Optional[int] = None):
+        self.concurrency = concurrency or int(os.getenv('EMAIL_SEND_CONCURRENCY', 5))
+        self.rate_per_second = rate_per_second or float(os.getenv('EMAIL_SEND_RATE', 10))
+        self.max_retries = max_retries or int(os.getenv('EMAIL_MAX_RETRIES', 3))
+        self.email_service = EmailService()
+
+    async def send(self, email_ids: List[str]) -> Dict[str, Any]:
+        pool = await get_db_pool()
+        if pool is None or not email_ids:
+            return {'sent': 0, 'failed': 0, 'retry_ids': []}
+
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                placeholders = ', '.join(['%s'] * len(email_ids))
+                await cursor.execute(
+                    f"""
+                    SELECT id, recipient_email, subject, body, retry_count FROM email_queue
+                    WHERE id IN ({placeholders})
+                    AND status IN ('pending', 'failed') AND retry_count < %s
+                    """,
+                    [*email_ids, self.max_retries]
+                )
+                pending = await cursor.fetchall()
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        interval = 1.0 / self.rate_per_second
+        loop = asyncio.get_running_loop()
+        next_slot = loop.time()
+
+        async def _deliver(email) -> Tuple[str, bool]:
+            nonlocal next_slot
+            # Reserve a send slot so the batch never exceeds the rate cap
+            slot, next_slot = max(next_slot, loop.time()), max(next_slot, loop.time()) + interval
+            await asyncio.sleep(max(slot - loop.time(), 0))
+            async with semaphore:
+                try:
+                    return email[0], await self.email_service.send_email(email[1], email[2], email[3])
+                except Exception as e:
+                    logger.error(f"Error sending queued email {email[0]}: {str(e)}")
+                    return email[0], False
+
+        results = await asyncio.gather(*(_deliver(email) for email in pending))
+        sent = [email_id for email_id, ok in results if ok]
+        failed = [email_id for email_id, ok in results if not ok]
+
+        if sent or failed:
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    if sent:
+                        await cursor.execute(
+                            f"""
+                            UPDATE email_queue SET status = 'sent', sent_at = NOW()
+                            WHERE id IN ({', '.join(['%s'] * len(sent))})
+                            """,
+                            sent
+                        )
+                    if failed:
+                        await cursor.execute(
+                            f"""
+                            UPDATE email_queue SET status = 'failed', retry_count = retry_count + 1
+                            WHERE id IN ({', '.join(['%s'] * len(failed))})
+                            """,
+                            failed
+                        )
+                await conn.commit()
+
+        attempts = {email[0]: (email[4] or 0) + 1 for email in pending}
+        retry_ids = [email_id for email_id in failed if attempts[email_id] < self.max_retries]
+        return {'sent': len(sent), 'failed': len(failed), 'retry_ids': retry_ids}
+
+
+notification_fanout = NotificationFanout()
+email_batch_sender = EmailBatchSender()
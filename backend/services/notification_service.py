@@ -6,6 +6,7 @@ import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
+import uuid
 
 from database.connection import get_db_pool
 from database.models import (
@@ -20,6 +21,8 @@ from database.models import (
     EmailQueueCreate
 )
 from services.email_service import EmailService
+from services.notification_fanout_service import notification_fanout, render_notification_email
+from services.realtime_service import COUNTER_NOTIFICATIONS, realtime_service
 from services.mock_data_provider import load_mock_data
 
 logger = logging.getLogger(__name__)
@@ -68,21 +71,21 @@ class NotificationService:
                             logger.info(f"Notification type {notification_type} disabled for user {user_id}")
                             return None
                     
-                    # Insert notification
+                    # Insert notification (UUID primary key, so no lastrowid)
                     query = """
                         INSERT INTO notifications 
-                        (user_id, type, title, message, link, priority, metadata)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        (id, user_id, type, title, message, link, priority, metadata)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                     """
                     metadata_json = json.dumps(metadata) if metadata else None
+                    notification_id = str(uuid.uuid4())
                     
                     await cursor.execute(
                         query,
-                        (user_id, notification_type.value, title, message, link, 
+                        (notification_id, user_id, notification_type.value, title, message, link, 
                          priority.value, metadata_json)
                     )
-                    
-                    notification_id = cursor.lastrowid
+                    await conn.commit()
                     
                     # Fetch created notification
                     await cursor.execute(
@@ -98,7 +101,11 @@ class NotificationService:
                                 user_id, notification_type, title, message, link
                             )
                         
-                        return self._row_to_notification(row)
+                        notification = self._row_to_notification(row)
+                        await realtime_service.notifications_created(
+                            [user_id], notification.model_dump(mode='json')
+                        )
+                        return notification
                     
                     return None
                     
@@ -283,7 +290,12 @@ class NotificationService:
                         WHERE id = %s AND user_id = %s
                     """
                     await cursor.execute(query, (notification_id, user_id))
-                    return cursor.rowcount > 0
+                    updated = cursor.rowcount > 0
+                    await conn.commit()
+            
+            if updated:
+                await realtime_service.refresh_unread(user_id, COUNTER_NOTIFICATIONS)
+            return updated
                     
         except Exception as e:
             logger.error(f"Error marking notification as read: {str(e)}")
@@ -309,7 +321,10 @@ class NotificationService:
                         WHERE user_id = %s AND is_read = FALSE
                     """
                     await cursor.execute(query, (user_id,))
-                    return True
+                    await conn.commit()
+            
+            await realtime_service.refresh_unread(user_id, COUNTER_NOTIFICATIONS)
+            return True
                     
         except Exception as e:
             logger.error(f"Error marking all notifications as read: {str(e)}")
@@ -332,7 +347,12 @@ class NotificationService:
                 async with conn.cursor() as cursor:
                     query = "DELETE FROM notifications WHERE id = %s AND user_id = %s"
                     await cursor.execute(query, (notification_id, user_id))
-                    return cursor.rowcount > 0
+                    deleted = cursor.rowcount > 0
+                    await conn.commit()
+            
+            if deleted:
+                await realtime_service.refresh_unread(user_id, COUNTER_NOTIFICATIONS)
+            return deleted
                     
         except Exception as e:
             logger.error(f"Error deleting notification: {str(e)}")
@@ -443,6 +463,9 @@ class NotificationService:
                             )
                         )
                     
+                    # Bulk fan-out must not keep serving the old preferences
+                    notification_fanout.preferences.invalidate(user_id)
+                    
                     # Fetch updated preferences
                     return await self.get_user_preferences(user_id)
                     
@@ -483,17 +506,7 @@ class NotificationService:
                         user_email = row[0]
                         
                         # Create email body
-                        email_body = f"""
-                        <html>
-                            <body>
-                                <h2>{title}</h2>
-                                <p>{message}</p>
-                                {f'<p><a href="{link}">View Details</a></p>' if link else ''}
-                                <hr>
-                                <p><small>This is an automated notification from AlumUnity.</small></p>
-                            </body>
-                        </html>
-                        """
+                        email_body = render_notification_email(title, message, link)
                         
                         # Send email via email service
                         await self.email_service.send_email(
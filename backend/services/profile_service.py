@@ -7,6 +7,11 @@ import aiomysql
 import os
 
 from database.connection import get_db_pool
+from utils.pagination import cached_count, decode_cursor, keyset_condition, next_cursor_from_rows
+from services.mentor_match_index import mentor_match_index
+from services.entity_skill_service import EntitySkillService, ENTITY_PROFILE
+from services.search_service import PROFILE_NAME_SEARCH, highlight, search_clause
+from utils.route_cache import invalidate_tags
 from database.models import (
     AlumniProfileCreate,
     AlumniProfileUpdate,
@@ -71,6 +76,9 @@ class ProfileService:
                     profile_data.years_of_experience, profile_data.willing_to_mentor,
                     profile_data.willing_to_hire
                 ))
+                await EntitySkillService.sync_entity(
+                    cursor, ENTITY_PROFILE, user_id, profile_data.skills
+                )
                 await conn.commit()
                 
                 # Get the created profile ID
@@ -79,6 +87,7 @@ class ProfileService:
                 # Calculate profile completion
                 await cursor.callproc('calculate_profile_completion', (user_id,))
                 await conn.commit()
+                await invalidate_tags("profiles")
                 
                 # Fetch the created profile
                 return await ProfileService.get_profile_by_user_id(user_id)
@@ -213,11 +222,19 @@ class ProfileService:
                 """
                 
                 await cursor.execute(query, values)
+                if profile_data.skills is not None:
+                    await EntitySkillService.sync_entity(
+                        cursor, ENTITY_PROFILE, user_id, profile_data.skills
+                    )
                 await conn.commit()
                 
                 # Recalculate profile completion
                 await cursor.callproc('calculate_profile_completion', (user_id,))
                 await conn.commit()
+                await invalidate_tags("profiles")
+                
+                # Skills/industry feed the mentor matching index
+                mentor_match_index.mark_stale(user_id)
                 
                 # Return updated profile
                 return await ProfileService.get_profile_by_user_id(user_id)
@@ -228,11 +245,13 @@ class ProfileService:
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
+                await EntitySkillService.delete_entity(cursor, ENTITY_PROFILE, user_id)
                 await cursor.execute(
                     "DELETE FROM alumni_profiles WHERE user_id = %s",
                     (user_id,)
                 )
                 await conn.commit()
+                await invalidate_tags("profiles")
                 
                 # Log admin action
                 await cursor.execute(
@@ -258,6 +277,7 @@ class ProfileService:
                     (photo_url, user_id)
                 )
                 await conn.commit()
+                await invalidate_tags("profiles")
                 
                 return await ProfileService.get_profile_by_user_id(user_id)
     
@@ -272,6 +292,7 @@ class ProfileService:
                     (cv_url, user_id)
                 )
                 await conn.commit()
+                await invalidate_tags("profiles")
                 
                 return await ProfileService.get_profile_by_user_id(user_id)
     
@@ -289,9 +310,12 @@ class ProfileService:
                 where_clauses = []
                 values = []
                 
+                search = None
                 if search_params.name:
-                    where_clauses.append("name LIKE %s")
-                    values.append(f"%{search_params.name}%")
+                    search = await search_clause(cursor, PROFILE_NAME_SEARCH, search_params.name)
+                    if search:
+                        where_clauses.append(search.condition)
+                        values.extend(search.params)
                 
                 if search_params.company:
                     where_clauses.append("current_company LIKE %s")
@@ -313,43 +337,73 @@ class ProfileService:
                     where_clauses.append("is_verified = TRUE")
                 
                 if search_params.skills:
-                    # Check if any of the search skills match
-                    skill_conditions = []
-                    for skill in search_params.skills:
-                        skill_conditions.append("JSON_CONTAINS(skills, %s)")
-                        values.append(json.dumps(skill))
-                    where_clauses.append(f"({' OR '.join(skill_conditions)})")
+                    # Profiles with any of the skills, via the entity_skills index
+                    skill_sql, skill_values = await EntitySkillService.skill_filter(
+                        cursor, ENTITY_PROFILE, "user_id", search_params.skills
+                    )
+                    where_clauses.append(skill_sql)
+                    values.extend(skill_values)
                 
                 where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
                 
-                # Count total results
-                count_query = f"SELECT COUNT(*) as total FROM alumni_profiles {where_sql}"
-                await cursor.execute(count_query, values)
-                total_result = await cursor.fetchone()
-                total = total_result['total'] if total_result else 0
-                
-                # Get paginated results
-                offset = (search_params.page - 1) * search_params.limit
+                # Total is optional and cached, so paging does not re-count every call
+                total = None
+                if search_params.include_total:
+                    total = await cached_count(
+                        cursor, f"SELECT COUNT(*) as total FROM alumni_profiles {where_sql}", values, "alumni_profiles"
+                    )
+                
+                # Keyset pagination on ([relevance,] created_at, id); OFFSET only for legacy page numbers
+                sort_keys = ["created_at", "id"]
+                ranked_from = "alumni_profiles"
+                page_values = list(values)
+                if search and search.ranked:
+                    # Rank in a derived table so relevance can be a cursor key
+                    sort_keys = ["relevance", "created_at", "id"]
+                    ranked_from = f"(SELECT *, {search.score} AS relevance FROM alumni_profiles {where_sql}) ranked"
+                    page_values = search.score_params + values
+                    page_where = []
+                else:
+                    page_where = list(where_clauses)
+                offset = 0
+                if search_params.cursor:
+                    condition, cursor_values = keyset_condition(
+                        sort_keys, decode_cursor(search_params.cursor, len(sort_keys))
+                    )
+                    page_where.append(condition)
+                    page_values.extend(cursor_values)
+                else:
+                    offset = (search_params.page - 1) * search_params.limit
+                
+                page_where_sql = f"WHERE {' AND '.join(page_where)}" if page_where else ""
                 query = f"""
-                SELECT * FROM alumni_profiles 
-                {where_sql}
-                ORDER BY created_at DESC
+                SELECT * FROM {ranked_from}
+                {page_where_sql}
+                ORDER BY {', '.join(f'{key} DESC' for key in sort_keys)}
                 LIMIT %s OFFSET %s
                 """
-                values.extend([search_params.limit, offset])
+                page_values.extend([search_params.limit + 1, offset])
                 
-                await cursor.execute(query, values)
-                profiles = await cursor.fetchall()
+                await cursor.execute(query, page_values)
+                profiles, next_cursor = next_cursor_from_rows(
+                    await cursor.fetchall(), search_params.limit,
+                    lambda row: tuple(row[key] for key in sort_keys)
+                )
                 
                 # Parse JSON fields
                 parsed_profiles = [ProfileService._parse_profile_json_fields(p) for p in profiles]
+                if search:
+                    for profile in parsed_profiles:
+                        profile['highlights'] = {'name': highlight(profile['name'], search.terms)}
                 
                 return {
                     "profiles": parsed_profiles,
                     "total": total,
                     "page": search_params.page,
                     "limit": search_params.limit,
-                    "total_pages": (total + search_params.limit - 1) // search_params.limit
+                    "total_pages": (total + search_params.limit - 1) // search_params.limit if total is not None else None,
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None
                 }
     
     @staticmethod
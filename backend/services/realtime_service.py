@@ -0,0 +1,315 @@
+"""
+Realtime Service - server push for messages, read receipts and notifications
+Events are published to a per-user Redis channel so any API worker (or a
+Celery worker) can reach a client connected to any other worker. Each API
+process keeps a single pub/sub connection (``RealtimeHub``) and fans events
+out to its local SSE / WebSocket listeners.
+
+Unread counters live in a Redis hash per user and are adjusted atomically
+as messages and notifications arrive, so clients (and the unread-count
+endpoints) no longer need to query MySQL on every poll. A missing counter is
+seeded once from MySQL.
+"""
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from redis_client import RedisConfig, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+EVENT_MESSAGE = 'message'
+EVENT_READ_RECEIPT = 'read_receipt'
+EVENT_NOTIFICATION = 'notification'
+EVENT_UNREAD = 'unread'
+EVENT_HEARTBEAT = 'heartbeat'
+
+COUNTER_MESSAGES = 'messages'
+COUNTER_NOTIFICATIONS = 'notifications'
+
+HEARTBEAT_SECONDS = int(os.getenv('REALTIME_HEARTBEAT_SECONDS', 25))
+LISTENER_QUEUE_SIZE = 100
+
+# HINCRBY only when the counter was already seeded, never below zero
+_ADJUST_IF_SEEDED = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    local value = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+    if value < 0 then
+        redis.call('HSET', KEYS[1], ARGV[1], 0)
+        value = 0
+    end
+    return value
+end
+return false
+"""
+
+
+def user_channel(user_id: str) -> str:
+    return f"{RedisConfig.PREFIX_REALTIME}:user:{user_id}"
+
+
+def unread_key(user_id: str) -> str:
+    return f"{RedisConfig.PREFIX_REALTIME}:unread:{user_id}"
+
+
+def _encode(event_type: str, data: Dict[str, Any]) -> str:
+    return json.dumps({'type': event_type, 'data': data}, default=str)
+
+
+class RealtimeService:
+    """Publishing side: events and unread counters"""
+
+    @staticmethod
+    async def publish(user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        try:
+            client = await get_redis_client()
+            await client.publish(user_channel(user_id), _encode(event_type, data))
+        except Exception as e:
+            logger.warning(f"Realtime publish failed for {user_id}: {str(e)}")
+
+    @staticmethod
+    async def _count_from_db(user_id: str, counter: str) -> int:
+        if counter == COUNTER_NOTIFICATIONS:
+            from services.notification_service import NotificationService
+            return await NotificationService().get_unread_count(user_id)
+
+        from database.connection import get_db_pool
+        from services.messaging_service import MessagingService
+
+        pool = await get_db_pool()
+        if pool is None:
+            return 0
+        async with pool.acquire() as conn:
+            return await MessagingService().get_unread_count(conn, user_id)
+
+    async def get_unread_counts(self, user_id: str) -> Dict[str, int]:
+        """
+        Unread message / notification counts for a user
+
+        Served from the Redis counter hash; fields that are missing are
+        computed from MySQL once and stored.
+        """
+        counters = (COUNTER_MESSAGES, COUNTER_NOTIFICATIONS)
+        try:
+            client = await get_redis_client()
+            cached = await client.hgetall(unread_key(user_id))
+        except Exception as e:
+            logger.warning(f"Unread counters unavailable: {str(e)}")
+            return {counter: await self._count_from_db(user_id, counter) for counter in counters}
+
+        counts = {counter: int(cached[counter]) for counter in counters if counter in cached}
+        missing = [counter for counter in counters if counter not in counts]
+        if missing:
+            for counter in missing:
+                counts[counter] = await self._count_from_db(user_id, counter)
+            try:
+                key = unread_key(user_id)
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={counter: counts[counter] for counter in missing})
+                    pipe.expire(key, RedisConfig.TTL_UNREAD_COUNTERS)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to seed unread counters: {str(e)}")
+        return counts
+
+    async def get_unread_count(self, user_id: str, counter: str) -> int:
+        return (await self.get_unread_counts(user_id))[counter]
+
+    async def adjust_unread(self, user_ids: Iterable[str], counter: str, delta: int) -> None:
+        """Atomically adjust a seeded counter and push the new value to each user"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        try:
+            client = await get_redis_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.eval(_ADJUST_IF_SEEDED, 1, unread_key(user_id), counter, delta)
+                values = await pipe.execute()
+
+            async with client.pipeline(transaction=False) as pipe:
+                for user_id, value in zip(user_ids, values):
+                    if value is not None:
+                        pipe.publish(user_channel(user_id), _encode(EVENT_UNREAD, {counter: int(value)}))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to adjust unread {counter} counters: {str(e)}")
+
+    async def refresh_unread(self, user_id: str, counter: str) -> None:
+        """Recompute one counter from MySQL (after reads/deletes) and push it"""
+        try:
+            value = await self._count_from_db(user_id, counter)
+            client = await get_redis_client()
+            key = unread_key(user_id)
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, counter, value)
+                pipe.expire(key, RedisConfig.TTL_UNREAD_COUNTERS)
+                pipe.publish(user_channel(user_id), _encode(EVENT_UNREAD, {counter: value}))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to refresh unread {counter} counter: {str(e)}")
+
+    async def message_created(self, message: Dict[str, Any]) -> None:
+        """A new direct message: push it to the recipient and bump their counter"""
+        await self.publish(message['recipient_id'], EVENT_MESSAGE, message)
+        await self.adjust_unread([message['recipient_id']], COUNTER_MESSAGES, 1)
+
+    async def messages_read(self, reader_id: str, sender_id: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> None:
+        """The reader caught up on messages: refresh their count, notify the sender"""
+        await self.refresh_unread(reader_id, COUNTER_MESSAGES)
+        if sender_id:
+            await self.publish(sender_id, EVENT_READ_RECEIPT, {'reader_id': reader_id, **(data or {})})
+
+    async def notifications_created(self, user_ids: Iterable[str], notification: Dict[str, Any]) -> None:
+        """Push a notification to its recipients and bump their counters"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        try:
+            client = await get_redis_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.publish(user_channel(user_id), _encode(EVENT_NOTIFICATION, {**notification, 'user_id': user_id}))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Realtime notification publish failed: {str(e)}")
+        await self.adjust_unread(user_ids, COUNTER_NOTIFICATIONS, 1)
+
+
+class RealtimeHub:
+    """
+    Per-process subscriber: one Redis pub/sub connection shared by every
+    SSE / WebSocket client of this worker, subscribed only to the channels
+    of users connected here
+    """
+
+    def __init__(self, queue_size: int = LISTENER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_pubsub(self):
+        if self._pubsub is None:
+            client = await get_redis_client()
+            self._pubsub = client.pubsub()
+        return self._pubsub
+
+    @asynccontextmanager
+    async def listen(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the events published to ``user_id``"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        async with self._lock:
+            listeners = self._listeners.setdefault(user_id, set())
+            listeners.add(queue)
+            try:
+                if len(listeners) == 1:
+                    pubsub = await self._ensure_pubsub()
+                    await pubsub.subscribe(user_channel(user_id))
+            except Exception:
+                self._discard(user_id, queue)
+                raise
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                if self._discard(user_id, queue) and self._pubsub is not None:
+                    try:
+                        await self._pubsub.unsubscribe(user_channel(user_id))
+                    except Exception as e:
+                        logger.warning(f"Realtime unsubscribe failed: {str(e)}")
+
+    def _discard(self, user_id: str, queue: asyncio.Queue) -> bool:
+        """Remove a listener; True when it was the user's last one here"""
+        listeners = self._listeners.get(user_id)
+        if listeners is None:
+            return False
+        listeners.discard(queue)
+        if not listeners:
+            del self._listeners[user_id]
+            return True
+        return False
+
+    async def events(self, user_id: str, heartbeat: int = HEARTBEAT_SECONDS) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Event stream for one connection: the current unread counts first,
+        then published events, with a heartbeat when idle
+        """
+        async with self.listen(user_id) as queue:
+            # Subscribed before the snapshot, so nothing published in between is lost
+            yield {'type': EVENT_UNREAD, 'data': await realtime_service.get_unread_counts(user_id)}
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield {'type': EVENT_HEARTBEAT, 'data': {}}
+
+    async def _read_loop(self) -> None:
+        while self._listeners:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Realtime subscriber error: {str(e)}")
+                await self._reconnect()
+                continue
+            if message and message.get('type') == 'message':
+                self._dispatch(message['channel'], message['data'])
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        user_id = channel.rsplit(':', 1)[-1]
+        try:
+            event = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            return
+        for queue in self._listeners.get(user_id, ()):
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block the hub
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _reconnect(self) -> None:
+        await asyncio.sleep(1)
+        async with self._lock:
+            stale, self._pubsub = self._pubsub, None
+            if stale is not None:
+                try:
+                    await stale.reset()
+                except Exception:
+                    pass
+            try:
+                pubsub = await self._ensure_pubsub()
+                if self._listeners:
+                    await pubsub.subscribe(*[user_channel(user_id) for user_id in self._listeners])
+            except Exception as e:
+                logger.warning(f"Realtime resubscribe failed: {str(e)}")
+                self._pubsub = None
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.reset()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'users': len(self._listeners),
+            'connections': sum(len(listeners) for listeners in self._listeners.values()),
+        }
+
+
+realtime_service = RealtimeService()
+realtime_hub = RealtimeHub()
@@ -0,0 +1,194 @@
+"""
+Search Service - full-text search for messages, forum posts, jobs and profiles
+Replaces leading-wildcard ``LIKE '%term%'`` scans (which cannot use an index
+and read every row) with MySQL ``FULLTEXT`` indexes queried through
+``MATCH ... AGAINST`` in boolean mode:
+
+- every word of the query is required and prefix-matched (``+pyth*``), so
+  "pyth dev" finds "Python developer"
+- the ``MATCH`` score is exposed as a relevance expression for ranking
+- ``highlight`` builds an HTML-escaped snippet with the matched words marked
+
+The backend is chosen with ``SEARCH_BACKEND`` (``fulltext`` or ``like``).
+With ``fulltext``, each index is checked against ``information_schema`` once
+per ``SEARCH_INDEX_CHECK_TTL`` seconds; tables without the FULLTEXT index
+(see ``database/fulltext_search_indexes.sql``) fall back to per-word LIKE
+matching, unranked.
+"""
+import html
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_BACKEND_FULLTEXT = 'fulltext'
+SEARCH_BACKEND_LIKE = 'like'
+
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', SEARCH_BACKEND_FULLTEXT).lower()
+INDEX_CHECK_TTL = int(os.getenv('SEARCH_INDEX_CHECK_TTL', 300))
+MAX_QUERY_TERMS = 8
+SNIPPET_LENGTH = 160
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# index name -> (checked_at, has_fulltext_index)
+_index_state: Dict[str, Tuple[float, bool]] = {}
+
+
+def query_terms(text: Optional[str]) -> List[str]:
+    """
+    Lower-cased words of a search query, deduplicated and capped at
+    ``MAX_QUERY_TERMS``. Boolean-mode operators and punctuation are dropped,
+    so user input can never change the query semantics.
+    """
+    if not text:
+        return []
+    return list(dict.fromkeys(_TERM_PATTERN.findall(text.lower())))[:MAX_QUERY_TERMS]
+
+
+def boolean_query(terms: Sequence[str]) -> str:
+    """``AGAINST`` argument requiring every term as a word prefix"""
+    return ' '.join(f"+{term}*" for term in terms)
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """A FULLTEXT index: the table and the exact column list it covers"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+
+    def qualified(self, alias: Optional[str] = None) -> List[str]:
+        return [f"{alias}.{column}" if alias else column for column in self.columns]
+
+
+MESSAGE_SEARCH = SearchIndex('ft_messages_text', 'messages', ('message_text',))
+FORUM_POST_SEARCH = SearchIndex('idx_title_content', 'forum_posts', ('title', 'content'))
+JOB_SEARCH = SearchIndex('idx_title_description', 'jobs', ('title', 'description'))
+PROFILE_NAME_SEARCH = SearchIndex('ft_alumni_profiles_name', 'alumni_profiles', ('name',))
+
+
+@dataclass
+class SearchClause:
+    """
+    SQL fragments for one search
+
+    ``condition`` / ``params`` go in the WHERE clause. When ``ranked`` is
+    true, ``score`` / ``score_params`` is the relevance expression to select
+    and order by; LIKE fallbacks are unranked.
+    """
+    terms: List[str]
+    condition: str
+    params: List[str]
+    score: str = "0"
+    score_params: Optional[List[str]] = None
+    ranked: bool = False
+
+
+async def has_fulltext_index(cursor, index: SearchIndex) -> bool:
+    """Whether ``index.table`` has a FULLTEXT index on exactly ``index.columns`` (cached)"""
+    state = _index_state.get(index.name)
+    now = time.monotonic()
+    if state and now - state[0] < INDEX_CHECK_TTL:
+        return state[1]
+
+    try:
+        await cursor.execute(
+            """
+            SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY COLUMN_NAME) AS columns
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT'
+            GROUP BY INDEX_NAME
+            """,
+            (index.table,)
+        )
+        wanted = ','.join(sorted(index.columns))
+        available = any(
+            (row['columns'] if isinstance(row, dict) else row[1]) == wanted
+            for row in await cursor.fetchall()
+        )
+    except Exception as e:
+        logger.warning(f"Could not inspect FULLTEXT indexes on {index.table}: {str(e)}")
+        available = False
+
+    if not available and (state is None or state[1]):
+        logger.warning(
+            f"No FULLTEXT index on {index.table}({', '.join(index.columns)}); "
+            f"falling back to LIKE search"
+        )
+    _index_state[index.name] = (now, available)
+    return available
+
+
+def like_clause(columns: Sequence[str], terms: Sequence[str]) -> Tuple[str, List[str]]:
+    """Every term must appear in at least one of ``columns`` (unindexed fallback)"""
+    conditions, params = [], []
+    for term in terms:
+        pattern = '%' + term.replace('\\', '\\\\').replace('_', '\\_') + '%'
+        conditions.append('(' + ' OR '.join(f"{column} LIKE %s" for column in columns) + ')')
+        params.extend([pattern] * len(columns))
+    return ' AND '.join(conditions), params
+
+
+async def search_clause(cursor, index: SearchIndex, text: Optional[str],
+                        alias: Optional[str] = None) -> Optional[SearchClause]:
+    """
+    Build the WHERE / relevance fragments searching ``text`` in ``index``
+
+    Returns None when the query has no searchable words.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return None
+
+    columns = index.qualified(alias)
+    if SEARCH_BACKEND == SEARCH_BACKEND_FULLTEXT and await has_fulltext_index(cursor, index):
+        match = f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)"
+        against = boolean_query(terms)
+        return SearchClause(
+            terms=terms, condition=match, params=[against],
+            score=match, score_params=[against], ranked=True
+        )
+
+    condition, params = like_clause(columns, terms)
+    return SearchClause(terms=terms, condition=f"({condition})", params=params)
+
+
+def highlight(text: Optional[str], terms: Sequence[str], length: int = SNIPPET_LENGTH,
+              tag: str = 'mark') -> Optional[str]:
+    """
+    HTML-escaped snippet of ``text`` around the first match, with every word
+    starting with one of ``terms`` wrapped in ``<tag>``
+
+    Returns None when ``text`` is empty or nothing matches.
+    """
+    if not text or not terms:
+        return None
+    pattern = re.compile(
+        r"\b(?:" + '|'.join(re.escape(term) for term in terms) + r")\w*",
+        re.IGNORECASE | re.UNICODE
+    )
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    start = max(0, first.start() - length // 4)
+    if start:
+        # Do not cut the snippet mid-word
+        space = text.rfind(' ', 0, start)
+        start = space + 1 if space != -1 and first.start() - space <= length // 2 else start
+    end = min(len(text), start + length)
+
+    snippet = text[start:end]
+    parts, last = [], 0
+    for match in pattern.finditer(snippet):
+        parts.append(html.escape(snippet[last:match.start()]))
+        parts.append(f"<{tag}>{html.escape(match.group())}</{tag}>")
+        last = match.end()
+    parts.append(html.escape(snippet[last:]))
+
+    return ('…' if start else '') + ''.join(parts) + ('…' if end < len(text) else '')
@@ -3,15 +3,27 @@ Skill Graph Service - Manage skill relationships and analytics with AI/ML
 Auto-populates from alumni profiles and job postings
 Phase 10.3: Enhanced with AI/ML embeddings and FAISS similarity (FULLY ENABLED)
 """
+import heapq
 import logging
 import json
 import os
+import time
 import numpy as np
+from scipy import sparse
 from typing import Dict, List, Optional, Set
 from collections import Counter
 
+from ml.skill_embedding_store import SkillEmbeddingStore
+from utils.route_cache import invalidate_tags
+
 logger = logging.getLogger(__name__)
 
+# Past this many stored-but-unused skills, searches use an ID selector
+# instead of over-fetching and filtering
+STALE_OVERFETCH_LIMIT = 256
+# Incremental similarity updates are replaced by a full rebuild this often
+SIMILARITY_FULL_REBUILD_DAYS = float(os.getenv('SKILL_SIMILARITY_FULL_REBUILD_DAYS', 7))
+
 # ============================================================================
 # AI/ML ENABLED - Phase 10.3 Implementation
 # ============================================================================
@@ -46,6 +58,7 @@ class SkillGraphService:
         """Initialize service with AI/ML models (if available)"""
         self.embedding_model = None
         self.faiss_index = None
+        self.embedding_store = None
         self.dimension = 384  # all-MiniLM-L6-v2 embedding dimension
         self.model_name = 'all-MiniLM-L6-v2'
         
@@ -74,6 +87,10 @@ class SkillGraphService:
                 
                 logger.info("✅ Sentence-transformer model loaded successfully")
                 logger.info(f"   Model dimension: {self.dimension}")
+                
+                # Persisted embeddings (FAISS index kept in memory); only unseen skills get encoded
+                self.embedding_store = SkillEmbeddingStore(self.model_name, self.dimension)
+                self.embedding_store.load(faiss)
                 logger.info("✅ SkillGraphService initialized with AI features enabled")
             except Exception as e:
                 logger.error(f"❌ Failed to load embedding model: {e}")
@@ -88,12 +105,15 @@ class SkillGraphService:
         Generate 384-dimensional embeddings for skills using sentence-transformers
         Phase 10.3: Core embedding generation
         
+        Only skills missing from the on-disk embedding store are encoded;
+        everything else is served from the memory-mapped store.
+        
         Args:
             db_conn: Database connection
             skills: List of skill names to generate embeddings for
             
         Returns:
-            Dictionary mapping skill names to embedding vectors
+            Dictionary mapping newly encoded skill names to embedding vectors
         """
         if not self.embedding_model:
             logger.info("⚠️ Embedding generation skipped (model not available)")
@@ -104,45 +124,44 @@ class SkillGraphService:
             return {}
         
         try:
-            logger.info(f"🔄 Generating embeddings for {len(skills)} skills...")
+            new_skills = self.embedding_store.missing(skills)
+            if not new_skills:
+                logger.info(f"✅ All {len(skills)} skill embeddings already stored")
+                return {}
             
-            # Generate embeddings in batches for efficiency
-            batch_size = 32
-            all_embeddings = []
+            logger.info(f"🔄 Generating embeddings for {len(new_skills)} new skills "
+                        f"({len(skills) - len(new_skills)} cached)...")
             
-            for i in range(0, len(skills), batch_size):
-                batch = skills[i:i+batch_size]
-                logger.info(f"   Batch {i//batch_size + 1}/{(len(skills)-1)//batch_size + 1}: Processing {len(batch)} skills")
-                
-                # Generate embeddings
-                batch_embeddings = self.embedding_model.encode(
-                    batch,
-                    convert_to_numpy=True,
-                    show_progress_bar=False
-                )
-                all_embeddings.extend(batch_embeddings)
+            embeddings = self.embedding_model.encode(
+                new_skills,
+                batch_size=64,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            self.embedding_store.add(new_skills, embeddings, faiss)
             
             # Convert to dictionary
             embeddings_map = {
                 skill: embedding.tolist()
-                for skill, embedding in zip(skills, all_embeddings)
+                for skill, embedding in zip(new_skills, embeddings)
             }
             
             logger.info(f"✅ Generated {len(embeddings_map)} embeddings")
             
             # Store embeddings in database
-            for skill_name, embedding_vector in embeddings_map.items():
-                async with db_conn.cursor() as cursor:
-                    await cursor.execute("""
+            rows = [
+                (skill_name, json.dumps(embedding_vector))
+                for skill_name, embedding_vector in embeddings_map.items()
+            ]
+            async with db_conn.cursor() as cursor:
+                for i in range(0, len(rows), 500):
+                    await cursor.executemany("""
                         INSERT INTO skill_embeddings (skill_name, embedding_vector)
                         VALUES (%s, %s)
                         ON DUPLICATE KEY UPDATE
                             embedding_vector = VALUES(embedding_vector),
                             updated_at = NOW()
-                    """, (
-                        skill_name,
-                        json.dumps(embedding_vector)
-                    ))
+                    """, rows[i:i + 500])
             
             await db_conn.commit()
             logger.info("✅ Stored embeddings in database")
@@ -153,20 +172,141 @@ class SkillGraphService:
             logger.error(f"❌ Error generating embeddings: {str(e)}")
             return {}
     
+    @staticmethod
+    def _neighbor_rows(
+        query_skills: List[str],
+        target_skills: List[str],
+        distances: np.ndarray,
+        indices: np.ndarray,
+        min_score: float = 0.5
+    ) -> List[tuple]:
+        """Turn FAISS search output into (skill_1, skill_2, score) rows"""
+        rows = []
+        for i, skill_name in enumerate(query_skills):
+            for similar_idx, score in zip(indices[i], distances[i]):
+                if similar_idx < 0 or score <= min_score:
+                    continue
+                similar_skill = target_skills[similar_idx]
+                if similar_skill != skill_name:
+                    rows.append((skill_name, similar_skill, round(float(score), 4)))
+        return rows
+    
+    async def _insert_similarity_rows(self, db_conn, table: str, rows: List[tuple], batch_size: int = 1000) -> None:
+        """Write similarity rows with multi-row upserts"""
+        query = f"""
+            INSERT INTO {table} (skill_1, skill_2, similarity_score)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE similarity_score = VALUES(similarity_score)
+        """
+        async with db_conn.cursor() as cursor:
+            for i in range(0, len(rows), batch_size):
+                await cursor.executemany(query, rows[i:i + batch_size])
+    
+    async def _similarity_skill_names(self, db_conn) -> Set[str]:
+        """Every skill currently referenced by skill_similarities"""
+        async with db_conn.cursor() as cursor:
+            await cursor.execute("""
+                SELECT skill_1 FROM skill_similarities
+                UNION
+                SELECT skill_2 FROM skill_similarities
+            """)
+            return {row[0] for row in await cursor.fetchall()}
+    
+    async def _similarities_due_for_rebuild(self, db_conn) -> bool:
+        """
+        Whether skill_similarities is older than SKILL_SIMILARITY_FULL_REBUILD_DAYS
+        
+        Every full rebuild swaps in a freshly created table, so the table's
+        CREATE_TIME is the time of the last full rebuild.
+        """
+        try:
+            async with db_conn.cursor() as cursor:
+                await cursor.execute("""
+                    SELECT TIMESTAMPDIFF(SECOND, CREATE_TIME, NOW())
+                    FROM information_schema.TABLES
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'skill_similarities'
+                """)
+                row = await cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read skill_similarities age: {str(e)}")
+            return False
+        if not row or row[0] is None:
+            return True
+        return row[0] >= SIMILARITY_FULL_REBUILD_DAYS * 86400
+    
+    async def _delete_similarity_rows(self, db_conn, column_skills: Dict[str, List[str]], batch_size: int = 500) -> None:
+        """Delete similarity rows whose column (skill_1/skill_2) is in the given skill list"""
+        async with db_conn.cursor() as cursor:
+            for column, names in column_skills.items():
+                for i in range(0, len(names), batch_size):
+                    batch = names[i:i + batch_size]
+                    placeholders = ', '.join(['%s'] * len(batch))
+                    await cursor.execute(
+                        f"DELETE FROM skill_similarities WHERE {column} IN ({placeholders})",
+                        batch
+                    )
+    
+    def _search_store(self, queries: np.ndarray, current_rows: np.ndarray, k: int):
+        """
+        Top-k search of the embedding store index restricted to ``current_rows``
+        
+        The store keeps skills that no longer appear in the data. While there
+        are few of those, the search over-fetches by their number and filters
+        them out; otherwise an ID selector restricts the search directly.
+        
+        Returns:
+            (distances, store row indices), -1 where fewer than k matched
+        """
+        index = self.embedding_store.index
+        k = min(k, len(current_rows))
+        stale = index.ntotal - len(current_rows)
+        if stale == 0:
+            return index.search(queries, k)
+        
+        if stale > STALE_OVERFETCH_LIMIT:
+            selector = faiss.IDSelectorBatch(current_rows)
+            return index.search(queries, k, params=faiss.SearchParameters(sel=selector))
+        
+        allowed = np.zeros(index.ntotal + 1, dtype=bool)  # last slot stands for -1
+        allowed[current_rows] = True
+        distances, indices = index.search(queries, min(k + stale, index.ntotal))
+        keep = allowed[indices]
+        # Stable sort moves the allowed hits to the front in score order
+        order = np.argsort(~keep, axis=1, kind='stable')[:, :k]
+        indices = np.take_along_axis(np.where(keep, indices, -1), order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+        return distances, indices
+    
     async def calculate_similarities_faiss(
         self, 
         db_conn, 
         skills: List[str], 
-        embeddings_array: np.ndarray
+        embeddings_array: np.ndarray,
+        new_skills: Optional[List[str]] = None
     ) -> int:
         """
         Calculate pairwise similarities using FAISS for fast vector search
         Phase 10.3: FAISS-based similarity calculation
         
+        A full rebuild writes into a shadow table that is swapped in with an
+        atomic RENAME, so readers never see an empty skill_similarities.
+        
+        When ``new_skills`` is given, only the skills whose neighbour lists can
+        have changed are recomputed: the new skills, existing skills that have
+        a new skill among their candidates, and skills that pointed at a skill
+        no longer in ``skills``. Each of them gets its exact top-k against all
+        current skills, replacing its old rows, and every pair involving a
+        removed skill is deleted.
+        
+        Neighbours are searched in the embedding store's FAISS index; only
+        the reverse check for new skills uses a small index over the new
+        vectors.
+        
         Args:
             db_conn: Database connection
             skills: List of skill names (same order as embeddings)
             embeddings_array: Numpy array of embeddings (shape: [n_skills, 384])
+            new_skills: Skills added since the last build (incremental mode)
             
         Returns:
             Number of similarity pairs calculated
@@ -176,76 +316,181 @@ class SkillGraphService:
             return 0
         
         try:
-            logger.info(f"🔄 Building FAISS index for {len(skills)} skills...")
-            
-            # Normalize embeddings for cosine similarity
-            embeddings_normalized = embeddings_array / np.linalg.norm(
-                embeddings_array, axis=1, keepdims=True
+            k = 11  # Top 11 (includes self, which we'll skip)
+            embeddings_normalized = np.ascontiguousarray(embeddings_array, dtype='float32')
+            faiss.normalize_L2(embeddings_normalized)
+            store_skills = self.embedding_store.skills
+            current_rows = np.fromiter(
+                (self.embedding_store.rows[s] for s in skills), dtype=np.int64, count=len(skills)
             )
             
-            # Build FAISS index (IndexFlatIP for cosine similarity)
-            index = faiss.IndexFlatIP(self.dimension)
-            index.add(embeddings_normalized.astype('float32'))
-            
-            logger.info("✅ FAISS index built successfully")
-            logger.info("   Index type: IndexFlatIP (cosine similarity)")
-            logger.info(f"   Total vectors: {index.ntotal}")
+            if new_skills is not None:
+                removed = sorted(await self._similarity_skill_names(db_conn) - set(skills))
+                if not new_skills and not removed:
+                    logger.info("✅ No new or removed skills, similarities unchanged")
+                    return 0
+                
+                logger.info(f"🔄 Incremental similarity update: {len(new_skills)} new, "
+                            f"{len(removed)} removed skills...")
+                positions = {skill: i for i, skill in enumerate(skills)}
+                affected = set(new_skills)
+                
+                # Existing skills with a new skill among their candidates
+                if new_skills:
+                    new_index = faiss.IndexFlatIP(self.dimension)
+                    new_index.add(embeddings_normalized[[positions[s] for s in new_skills]])
+                    distances, indices = new_index.search(
+                        embeddings_normalized, min(k, new_index.ntotal)
+                    )
+                    affected.update(
+                        skill_1 for skill_1, _, _ in
+                        self._neighbor_rows(skills, new_skills, distances, indices)
+                    )
+                
+                # Skills that lose a neighbour because it was removed
+                if removed:
+                    async with db_conn.cursor() as cursor:
+                        for i in range(0, len(removed), 500):
+                            batch = removed[i:i + 500]
+                            placeholders = ', '.join(['%s'] * len(batch))
+                            await cursor.execute(
+                                f"SELECT DISTINCT skill_1 FROM skill_similarities WHERE skill_2 IN ({placeholders})",
+                                batch
+                            )
+                            affected.update(
+                                row[0] for row in await cursor.fetchall() if row[0] in positions
+                            )
+                
+                # Exact top-k for every affected skill against all current skills
+                affected_skills = [s for s in skills if s in affected]
+                rows = []
+                if affected_skills:
+                    distances, indices = self._search_store(
+                        embeddings_normalized[[positions[s] for s in affected_skills]], current_rows, k
+                    )
+                    rows = self._neighbor_rows(affected_skills, store_skills, distances, indices)
+                
+                await self._delete_similarity_rows(db_conn, {
+                    'skill_1': removed + affected_skills,
+                    'skill_2': removed,
+                })
+                await self._insert_similarity_rows(db_conn, 'skill_similarities', rows)
+                await db_conn.commit()
+                logger.info(f"✅ Recomputed {len(affected_skills)} skills, wrote {len(rows)} similarity pairs")
+                return len(rows)
             
-            # Calculate top-10 similar skills for each skill
-            logger.info("🔄 Calculating similarities...")
-            k = 11  # Top 11 (includes self, which we'll skip)
-            similarities_count = 0
+            logger.info(f"🔄 Full similarity rebuild for {len(skills)} skills...")
+            distances, indices = self._search_store(embeddings_normalized, current_rows, k)
+            rows = self._neighbor_rows(skills, store_skills, distances, indices)
             
-            # Clear existing similarities (optional - for rebuild)
+            # Fill a shadow table, then swap it in atomically
             async with db_conn.cursor() as cursor:
-                await cursor.execute("DELETE FROM skill_similarities")
+                await cursor.execute("CREATE TABLE IF NOT EXISTS skill_similarities_shadow LIKE skill_similarities")
+                await cursor.execute("TRUNCATE TABLE skill_similarities_shadow")
+            await self._insert_similarity_rows(db_conn, 'skill_similarities_shadow', rows)
             await db_conn.commit()
             
-            # Search for similar skills
-            distances, indices = index.search(
-                embeddings_normalized.astype('float32'), 
-                k
-            )
-            
-            # Store similarities in database
-            for i, skill_name in enumerate(skills):
-                similar_indices = indices[i][1:]  # Skip self (index 0)
-                similar_scores = distances[i][1:]
-                
-                for similar_idx, score in zip(similar_indices, similar_scores):
-                    if similar_idx < len(skills):
-                        similar_skill = skills[similar_idx]
-                        
-                        # Only store if similarity is meaningful (> 0.5)
-                        if score > 0.5:
-                            async with db_conn.cursor() as cursor:
-                                await cursor.execute("""
-                                    INSERT INTO skill_similarities 
-                                    (skill_1, skill_2, similarity_score)
-                                    VALUES (%s, %s, %s)
-                                """, (
-                                    skill_name,
-                                    similar_skill,
-                                    float(score)
-                                ))
-                            similarities_count += 1
-            
+            async with db_conn.cursor() as cursor:
+                await cursor.execute("DROP TABLE IF EXISTS skill_similarities_old")
+                await cursor.execute("""
+                    RENAME TABLE skill_similarities TO skill_similarities_old,
+                                 skill_similarities_shadow TO skill_similarities
+                """)
+                await cursor.execute("DROP TABLE skill_similarities_old")
             await db_conn.commit()
-            logger.info(f"✅ Calculated and stored {similarities_count} similarity pairs")
             
-            return similarities_count
+            logger.info(f"✅ Calculated and stored {len(rows)} similarity pairs")
+            return len(rows)
         
         except Exception as e:
             logger.error(f"❌ Error calculating similarities: {str(e)}")
+            try:
+                await db_conn.rollback()
+            except Exception:
+                pass
             return 0
     
+    @staticmethod
+    def _parse_skill_list(skills_json) -> List[str]:
+        """Parse a skills JSON column into a de-duplicated list of stripped names"""
+        if not skills_json:
+            return []
+        try:
+            skills = json.loads(skills_json) if isinstance(skills_json, str) else skills_json
+        except (json.JSONDecodeError, TypeError):
+            return []
+        if not isinstance(skills, list):
+            return []
+        # dict.fromkeys keeps first-seen order while dropping duplicates
+        return list(dict.fromkeys(
+            s.strip() for s in skills if isinstance(s, str) and s.strip()
+        ))
+    
+    @staticmethod
+    def _incidence_matrix(rows: List[List[int]], n_skills: int) -> sparse.csr_matrix:
+        """Build a binary (rows x skills) incidence matrix from encoded skill rows"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(r) for r in rows]) if rows else []
+        indices = np.fromiter(
+            (idx for r in rows for idx in r), dtype=np.int64, count=int(indptr[-1])
+        )
+        data = np.ones(indices.shape[0], dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_skills))
+    
+    @staticmethod
+    def _top_related(cooccurrence: sparse.csr_matrix, skills: List[str], k: int = 10) -> Dict[str, List[str]]:
+        """Pick the k most frequent co-occurring skills for every skill with a per-row heap"""
+        relations = {}
+        indptr, indices, data = cooccurrence.indptr, cooccurrence.indices, cooccurrence.data
+        for i, skill in enumerate(skills):
+            start, end = indptr[i], indptr[i + 1]
+            # Ties broken by skill name so rebuilds are deterministic
+            top = heapq.nsmallest(
+                k,
+                zip(data[start:end], indices[start:end]),
+                key=lambda item: (-item[0], skills[item[1]])
+            )
+            relations[skill] = [skills[j] for _, j in top]
+        return relations
+    
+    async def _upsert_skill_graph_rows(self, db_conn, rows: List[tuple], batch_size: int = 1000) -> None:
+        """Write skill_graph rows with multi-row upserts"""
+        query = """
+            INSERT INTO skill_graph 
+            (skill_name, related_skills, alumni_count, job_count, popularity_score)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                related_skills = VALUES(related_skills),
+                alumni_count = VALUES(alumni_count),
+                job_count = VALUES(job_count),
+                popularity_score = VALUES(popularity_score),
+                updated_at = NOW()
+        """
+        async with db_conn.cursor() as cursor:
+            for i in range(0, len(rows), batch_size):
+                await cursor.executemany(query, rows[i:i + batch_size])
+        await db_conn.commit()
+    
     async def build_skill_graph(self, db_conn) -> Dict:
         """
         Build skill graph from alumni profiles and job postings
         Updates skill_graph table with relationships
         Now includes AI/ML embeddings and similarities
+        
+        Alumni/job counts and co-occurrences are computed in a single pass
+        over the fetched rows using a sparse incidence matrix, and the
+        results are written with batched upserts.
         """
         try:
+            timings = {}
+            phase_start = time.perf_counter()
+            
+            def mark(phase: str):
+                nonlocal phase_start
+                now = time.perf_counter()
+                timings[phase] = round((now - phase_start) * 1000, 1)
+                phase_start = now
+            
             # Extract all skills from alumni profiles
             async with db_conn.cursor() as cursor:
                 await cursor.execute("""
@@ -263,133 +508,91 @@ class SkillGraphService:
                     AND status = 'active'
                 """)
                 job_skills = await cursor.fetchall()
+            mark('fetch_ms')
             
-            # Parse skills and build co-occurrence matrix
-            all_skills = set()
-            skill_pairs = []
+            # Encode every row into skill indices in one pass
+            vocabulary: Dict[str, int] = {}
             
-            # Process alumni profiles
-            for (skills_json,) in profile_skills:
-                if skills_json:
-                    try:
-                        skills = json.loads(skills_json) if isinstance(skills_json, str) else skills_json
-                        if isinstance(skills, list):
-                            skills = [s.strip() for s in skills if s and s.strip()]
-                            all_skills.update(skills)
-                            # Create pairs for co-occurrence
-                            for i, skill1 in enumerate(skills):
-                                for skill2 in skills[i+1:]:
-                                    skill_pairs.append((skill1, skill2))
-                    except (json.JSONDecodeError, TypeError):
-                        continue
+            def encode(rows) -> List[List[int]]:
+                encoded = []
+                for (skills_json,) in rows:
+                    skills = self._parse_skill_list(skills_json)
+                    if skills:
+                        encoded.append([vocabulary.setdefault(s, len(vocabulary)) for s in skills])
+                return encoded
             
-            # Process job postings
-            for (skills_json,) in job_skills:
-                if skills_json:
-                    try:
-                        skills = json.loads(skills_json) if isinstance(skills_json, str) else skills_json
-                        if isinstance(skills, list):
-                            skills = [s.strip() for s in skills if s and s.strip()]
-                            all_skills.update(skills)
-                            for i, skill1 in enumerate(skills):
-                                for skill2 in skills[i+1:]:
-                                    skill_pairs.append((skill1, skill2))
-                    except (json.JSONDecodeError, TypeError):
-                        continue
+            profile_rows = encode(profile_skills)
+            job_rows = encode(job_skills)
+            skills_list = list(vocabulary)
+            n_skills = len(skills_list)
+            all_skills = set(skills_list)
+            mark('parse_ms')
             
-            # Count co-occurrences
-            pair_counts = Counter(skill_pairs)
-            
-            # Build skill relationships
-            skill_relations = {}
-            for skill in all_skills:
-                related = {}
-                for (s1, s2), count in pair_counts.items():
-                    if s1 == skill:
-                        related[s2] = count
-                    elif s2 == skill:
-                        related[s1] = count
-                
-                # Sort by frequency and take top 10
-                top_related = sorted(related.items(), key=lambda x: x[1], reverse=True)[:10]
-                skill_relations[skill] = [s for s, _ in top_related]
+            # Counts and co-occurrence from sparse incidence matrices
+            profile_matrix = self._incidence_matrix(profile_rows, n_skills)
+            job_matrix = self._incidence_matrix(job_rows, n_skills)
+            alumni_counts = np.asarray(profile_matrix.sum(axis=0)).ravel()
+            job_counts = np.asarray(job_matrix.sum(axis=0)).ravel()
+            
+            incidence = sparse.vstack([profile_matrix, job_matrix]).tocsr()
+            cooccurrence = (incidence.T @ incidence).tocsr()
+            cooccurrence.setdiag(0)
+            cooccurrence.eliminate_zeros()
+            
+            skill_relations = self._top_related(cooccurrence, skills_list)
+            mark('cooccurrence_ms')
             
             # ====================================================================
             # Phase 10.3: Generate embeddings for all skills
             # ====================================================================
-            skills_list = list(all_skills)
             embeddings_map = {}
             similarities_count = 0
             
             if self.embedding_model and len(skills_list) > 0:
-                logger.info(f"🤖 AI/ML Processing: Generating embeddings for {len(skills_list)} skills...")
+                # A store that was empty before this build needs a full similarity
+                # rebuild; otherwise one is forced periodically to clear any drift
+                full_rebuild = (
+                    len(self.embedding_store.skills) == 0
+                    or await self._similarities_due_for_rebuild(db_conn)
+                )
+                logger.info(f"🤖 AI/ML Processing: Checking embeddings for {len(skills_list)} skills...")
                 embeddings_map = await self.generate_embeddings(db_conn, skills_list)
                 
                 # Calculate similarities using FAISS
-                if embeddings_map:
-                    embeddings_array = np.array([embeddings_map[s] for s in skills_list])
+                embedded_skills = [s for s in skills_list if s in self.embedding_store.rows]
+                if embedded_skills:
                     similarities_count = await self.calculate_similarities_faiss(
                         db_conn, 
-                        skills_list, 
-                        embeddings_array
+                        embedded_skills, 
+                        self.embedding_store.matrix(embedded_skills),
+                        new_skills=None if full_rebuild else list(embeddings_map)
                     )
             else:
                 if not self.embedding_model:
                     logger.info("ℹ️ Skipping AI/ML processing (model not available)")
                 else:
                     logger.info("ℹ️ No skills to process")
+            mark('embeddings_ms')
             
-            # Update skill_graph table
-            for skill, related_skills in skill_relations.items():
-                # Count alumni with this skill
-                async with db_conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT COUNT(*) FROM alumni_profiles
-                        WHERE JSON_CONTAINS(skills, %s)
-                    """, (json.dumps(skill),))
-                    result = await cursor.fetchone()
-                    alumni_count = result[0] if result else 0
-                
-                # Count jobs requiring this skill
-                async with db_conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT COUNT(*) FROM jobs
-                        WHERE JSON_CONTAINS(skills_required, %s)
-                        AND status = 'active'
-                    """, (json.dumps(skill),))
-                    result = await cursor.fetchone()
-                    job_count = result[0] if result else 0
-                
-                # Calculate popularity score (normalized)
-                popularity = (alumni_count * 0.6 + job_count * 0.4) / 10.0
-                popularity = min(popularity, 9999.99)  # Cap at 9999.99 (DECIMAL(6,2))
-                
-                # Insert or update skill in graph
-                async with db_conn.cursor() as cursor:
-                    await cursor.execute("""
-                        INSERT INTO skill_graph 
-                        (skill_name, related_skills, alumni_count, job_count, popularity_score)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON DUPLICATE KEY UPDATE
-                            related_skills = %s,
-                            alumni_count = %s,
-                            job_count = %s,
-                            popularity_score = %s,
-                            updated_at = NOW()
-                    """, (
-                        skill,
-                        json.dumps(related_skills),
-                        alumni_count,
-                        job_count,
-                        popularity,
-                        # For UPDATE clause:
-                        json.dumps(related_skills),
-                        alumni_count,
-                        job_count,
-                        popularity
-                    ))
-                
-                await db_conn.commit()
+            # Popularity score (normalized), capped for DECIMAL(6,2)
+            popularity = np.minimum((alumni_counts * 0.6 + job_counts * 0.4) / 10.0, 9999.99)
+            
+            rows = [
+                (
+                    skill,
+                    json.dumps(skill_relations[skill]),
+                    int(alumni_counts[i]),
+                    int(job_counts[i]),
+                    round(float(popularity[i]), 2)
+                )
+                for i, skill in enumerate(skills_list)
+            ]
+            await self._upsert_skill_graph_rows(db_conn, rows)
+            mark('write_ms')
+            await invalidate_tags("skill_graph")
+            
+            timings['total_ms'] = round(sum(timings.values()), 1)
+            logger.info(f"✅ Skill graph rebuilt: {n_skills} skills, timings={timings}")
             
             return {
                 "total_skills": len(all_skills),
@@ -397,6 +600,7 @@ class SkillGraphService:
                 "embeddings_generated": len(embeddings_map),
                 "similarities_calculated": similarities_count,
                 "ai_enabled": self.embedding_model is not None,
+                "timings": timings,
                 "message": "Skill graph built successfully" + (
                     " with AI/ML enhancements" if self.embedding_model else ""
                 )
@@ -1,4 +1,7 @@
 """User service for database operations"""
+import json
+import os
+import time
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -6,11 +9,79 @@ import logging
 import aiomysql
 
 from database.models import UserCreate, UserInDB, UserRole
-from utils.security import hash_password
+from redis_client import RedisConfig, get_redis_client
+from utils.security import hash_password_async
 
 logger = logging.getLogger(__name__)
 
 
+class UserStatusCache:
+    """
+    Short-lived cache of the status fields authentication needs
+    (``id, email, role, is_verified, is_active``) keyed by user id (the JWT
+    ``sub``), so authenticated requests skip the ``users`` lookup
+
+    Entries live in Redis for ``ttl`` seconds (shared by all workers) and in
+    a per-process dict for ``local_ttl`` seconds. ``invalidate`` must be
+    called whenever a user is suspended, banned, deleted, re-activated,
+    verified or changes role; other processes then see the change within
+    ``local_ttl`` seconds.
+    """
+    
+    def __init__(self, ttl: Optional[int] = None, local_ttl: Optional[int] = None, max_entries: int = 50_000):
+        self.ttl = ttl if ttl is not None else int(os.getenv('AUTH_STATUS_CACHE_TTL', RedisConfig.TTL_USER_STATUS))
+        self.local_ttl = local_ttl if local_ttl is not None else int(os.getenv('AUTH_STATUS_LOCAL_TTL', 5))
+        self.max_entries = max_entries
+        self._local: Dict[str, tuple] = {}
+    
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"{RedisConfig.PREFIX_USER_STATUS}:{user_id}"
+    
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        try:
+            redis = await get_redis_client()
+            cached = await redis.get(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Redis unavailable for user status cache: {str(e)}")
+            return None
+        if cached is None:
+            return None
+        status = json.loads(cached)
+        self._store_local(user_id, status)
+        return status
+    
+    async def set(self, user_id: str, status: Dict[str, Any]) -> None:
+        self._store_local(user_id, status)
+        try:
+            redis = await get_redis_client()
+            await redis.set(self._key(user_id), json.dumps(status), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to cache user status: {str(e)}")
+    
+    async def invalidate(self, user_id: str) -> None:
+        self._local.pop(user_id, None)
+        try:
+            redis = await get_redis_client()
+            await redis.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate user status: {str(e)}")
+    
+    def _store_local(self, user_id: str, status: Dict[str, Any]) -> None:
+        if self.local_ttl <= 0:
+            return
+        if len(self._local) >= self.max_entries:
+            self._local.clear()
+        self._local[user_id] = (time.monotonic() + self.local_ttl, status)
+
+
+user_status_cache = UserStatusCache()
+
+
 class UserService:
     """Service for user-related database operations"""
     
@@ -18,7 +89,7 @@ class UserService:
     async def create_user(conn: aiomysql.Connection, user_data: UserCreate) -> UserInDB:
         """Create a new user"""
         user_id = str(uuid.uuid4())
-        password_hash = hash_password(user_data.password)
+        password_hash = await hash_password_async(user_data.password)
         
         async with conn.cursor(aiomysql.DictCursor) as cursor:
             query = """
@@ -64,6 +135,31 @@ class UserService:
                 return UserInDB(**result)
             return None
     
+    @staticmethod
+    async def load_auth_status(conn: aiomysql.Connection, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the status fields used to authenticate ``user_id`` and store them
+        in ``user_status_cache``. Returns None if the user does not exist.
+        """
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(
+                "SELECT id, email, role, is_verified, is_active FROM users WHERE id = %s",
+                (user_id,)
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        
+        status = {
+            "id": row['id'],
+            "email": row['email'],
+            "role": row['role'],
+            "is_verified": bool(row['is_verified']),
+            "is_active": bool(row['is_active'])
+        }
+        await user_status_cache.set(user_id, status)
+        return status
+    
     @staticmethod
     async def update_user_verification(conn: aiomysql.Connection, user_id: str, is_verified: bool) -> bool:
         """Update user verification status"""
@@ -73,6 +169,7 @@ class UserService:
             # No need for explicit commit with autocommit=True, but keeping for safety
             if not conn.get_autocommit():
                 await conn.commit()
+            await user_status_cache.invalidate(user_id)
             return cursor.rowcount > 0
     
     @staticmethod
@@ -89,7 +186,7 @@ class UserService:
     @staticmethod
     async def update_password(conn: aiomysql.Connection, user_id: str, new_password: str) -> bool:
         """Update user password"""
-        password_hash = hash_password(new_password)
+        password_hash = await hash_password_async(new_password)
         async with conn.cursor() as cursor:
             query = "UPDATE users SET password_hash = %s WHERE id = %s"
             await cursor.execute(query, (password_hash, user_id))
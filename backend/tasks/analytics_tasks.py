@@ -0,0 +1,50 @@
+"""
+Analytics Tasks
+Background refresh of the analytics rollup tables
+"""
+from celery_app import app, TaskConfig
+from tasks.worker_runtime import run_in_worker_loop
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(
+    name='tasks.analytics_tasks.refresh_analytics_rollups',
+    queue=TaskConfig.QUEUE_DEFAULT,
+    bind=True,
+    max_retries=TaskConfig.MAX_RETRIES
+)
+def refresh_analytics_rollups(self, full: bool = False) -> Dict[str, Any]:
+    """
+    Refresh the analytics rollup tables
+    
+    A full refresh that could not get the refresh lock in time is
+    rescheduled rather than dropped.
+    
+    Args:
+        full: Re-aggregate everything and drop deleted rows instead of
+            applying only the rows changed since the last refresh
+    
+    Returns:
+        Refresh status and rows processed per rollup
+    """
+    try:
+        from services.analytics_rollup_service import analytics_rollups
+        
+        result = run_in_worker_loop(analytics_rollups.refresh(full=full))
+        if result['status'] == 'refreshed':
+            logger.info(
+                f"Analytics rollups refreshed (full={full}): "
+                f"{sum(result['rows'].values())} rows processed"
+            )
+    
+    except Exception as e:
+        logger.error(f"Analytics rollup refresh error: {str(e)}")
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+    
+    if result['status'] == 'busy':
+        logger.info("Full analytics rollup refresh rescheduled, another refresh is running")
+        raise self.retry(countdown=15 * 60)
+    return result
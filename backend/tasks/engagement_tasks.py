@@ -4,6 +4,7 @@ Phase 10.8: Enhanced engagement scoring with AI-powered analysis
 Background tasks for daily engagement score calculation and updates
 """
 from celery_app import app, TaskConfig
+from tasks.worker_runtime import run_in_worker_loop
 import logging
 import aiomysql
 import asyncio
@@ -70,11 +71,8 @@ def update_single_user_engagement(self, user_id: str) -> Dict[str, Any]:
                     'timestamp': score.get('last_calculated')
                 }
         
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_update())
-        loop.close()
+        # Run on the worker's shared event loop and DB pool
+        result = run_in_worker_loop(_update())
         
         logger.info(f"Successfully updated engagement for user {user_id}: {result['total_score']} points")
         return result
@@ -94,7 +92,11 @@ def recalculate_all_engagement_scores(self) -> Dict[str, Any]:
     Recalculate engagement scores for all active users (scheduled daily task)
     Phase 10.8: Enhanced with AI-powered activity pattern analysis
     
-    This task runs daily at 3 AM (configured in celery_app.py beat_schedule)
+    This task runs daily at 3 AM (configured in celery_app.py beat_schedule).
+    Scoring is set-based (see services/engagement_batch_service.py): users
+    are processed in chunks with grouped aggregate queries and bulk upserts,
+    and a retry resumes from the last checkpointed chunk. A run that leaves
+    failed chunks behind is retried after an hour to recompute just those.
     
     Returns:
         Processing results including counts and statistics
@@ -105,104 +107,25 @@ def recalculate_all_engagement_scores(self) -> Dict[str, Any]:
         logger.info("=" * 80)
         
         async def _recalculate_all():
-            from database.connection import get_db_pool
-            from services.engagement_service import engagement_service
-            
-            pool = await get_db_pool()
-            async with pool.acquire() as conn:
-                # Get all active users
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT id, email, role
-                        FROM users
-                        WHERE is_active = TRUE
-                        ORDER BY created_at DESC
-                    """)
-                    users = await cursor.fetchall()
-                
-                total_users = len(users)
-                processed = 0
-                errors = 0
-                total_points_distributed = 0
-                total_ai_boost = 0
-                pattern_distribution = {}
-                
-                logger.info(f"Found {total_users} active users to process")
-                
-                # Process each user
-                for user in users:
-                    user_id = user[0]
-                    try:
-                        # Calculate engagement score
-                        score = await engagement_service.calculate_engagement_score(conn, user_id)
-                        
-                        # Check and award badges
-                        new_badges = await engagement_service.check_and_award_badges(conn, user_id)
-                        
-                        # Accumulate statistics
-                        total_points_distributed += score.get('total_score', 0)
-                        total_ai_boost += score.get('ai_boost', 0)
-                        
-                        pattern = score.get('activity_pattern', 'unknown')
-                        pattern_distribution[pattern] = pattern_distribution.get(pattern, 0) + 1
-                        
-                        processed += 1
-                        
-                        if new_badges:
-                            logger.info(f"User {user_id} earned {len(new_badges)} new badges!")
-                        
-                        # Log progress every 100 users
-                        if processed % 100 == 0:
-                            logger.info(f"Progress: {processed}/{total_users} users processed")
-                    
-                    except Exception as e:
-                        logger.error(f"Error processing user {user_id}: {str(e)}")
-                        errors += 1
-                        continue
-                
-                # Update all rank positions after recalculation
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SET @rank = 0;
-                        UPDATE engagement_scores
-                        SET rank_position = (@rank := @rank + 1)
-                        ORDER BY total_score DESC;
-                    """)
-                    await conn.commit()
-                
-                logger.info("Rank positions updated successfully")
-                
-                return {
-                    'status': 'completed',
-                    'total_users': total_users,
-                    'processed': processed,
-                    'errors': errors,
-                    'success_rate': round((processed / total_users * 100), 2) if total_users > 0 else 0,
-                    'statistics': {
-                        'total_points_distributed': total_points_distributed,
-                        'total_ai_boost': total_ai_boost,
-                        'avg_score': round(total_points_distributed / processed, 2) if processed > 0 else 0,
-                        'avg_ai_boost': round(total_ai_boost / processed, 2) if processed > 0 else 0,
-                        'pattern_distribution': pattern_distribution
-                    }
-                }
+            from services.engagement_batch_service import engagement_batch_engine
+            return await engagement_batch_engine.run(resume=True)
         
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_recalculate_all())
-        loop.close()
+        # Run on the worker's shared event loop and DB pool
+        result = run_in_worker_loop(_recalculate_all())
         
         logger.info("=" * 80)
         logger.info("ENGAGEMENT SCORE RECALCULATION COMPLETED")
         logger.info(f"Results: {result}")
         logger.info("=" * 80)
         
-        return result
-        
     except Exception as e:
         logger.error(f"Fatal error in engagement score recalculation: {str(e)}")
         raise self.retry(exc=e, countdown=3600)  # Retry after 1 hour
+    
+    if result['status'] == 'partial':
+        logger.warning(f"Engagement users {result['failed_ranges']} not recalculated, retrying in 1 hour")
+        raise self.retry(countdown=3600)
+    return result
 
 
 @app.task(
@@ -224,119 +147,114 @@ def analyze_engagement_trends() -> Dict[str, Any]:
             from database.connection import get_db_pool
             
             pool = await get_db_pool()
-            async with pool.acquire() as conn:
-                trends = {}
-                
+            
+            async def _query(sql: str):
+                # Each query runs on its own pooled connection so they overlap
+                async with pool.acquire() as conn:
+                    async with conn.cursor() as cursor:
+                        await cursor.execute(sql)
+                        return await cursor.fetchall()
+            
+            growth_rows, top_contributors, activity_types, role_stats = await asyncio.gather(
                 # 1. Overall engagement growth
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT 
-                            SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 ELSE 0 END) as last_week,
-                            SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 14 DAY) 
-                                      AND created_at < DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 ELSE 0 END) as prev_week,
-                            SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN 1 ELSE 0 END) as last_month
-                        FROM contribution_history
-                    """)
-                    growth = await cursor.fetchone()
-                    
-                    if growth:
-                        last_week = growth[0] or 0
-                        prev_week = growth[1] or 0
-                        last_month = growth[2] or 0
-                        
-                        weekly_growth_rate = 0
-                        if prev_week > 0:
-                            weekly_growth_rate = round(((last_week - prev_week) / prev_week * 100), 2)
-                        
-                        trends['engagement_growth'] = {
-                            'last_week_contributions': last_week,
-                            'previous_week_contributions': prev_week,
-                            'last_month_contributions': last_month,
-                            'weekly_growth_rate_percent': weekly_growth_rate
-                        }
-                
+                _query("""
+                    SELECT 
+                        SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 ELSE 0 END) as last_week,
+                        SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 14 DAY) 
+                                  AND created_at < DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 ELSE 0 END) as prev_week,
+                        SUM(CASE WHEN created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN 1 ELSE 0 END) as last_month
+                    FROM contribution_history
+                """),
                 # 2. Top contributors
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT 
-                            es.user_id,
-                            ap.name,
-                            es.total_score,
-                            es.rank_position,
-                            es.level
-                        FROM engagement_scores es
-                        LEFT JOIN alumni_profiles ap ON es.user_id = ap.user_id
-                        ORDER BY es.total_score DESC
-                        LIMIT 10
-                    """)
-                    top_contributors = await cursor.fetchall()
-                    
-                    trends['top_contributors'] = [
-                        {
-                            'user_id': tc[0],
-                            'name': tc[1] or 'Unknown',
-                            'score': tc[2],
-                            'rank': tc[3],
-                            'level': tc[4]
-                        }
-                        for tc in top_contributors
-                    ]
-                
+                _query("""
+                    SELECT 
+                        es.user_id,
+                        ap.name,
+                        es.total_score,
+                        es.rank_position,
+                        es.level
+                    FROM engagement_scores es
+                    LEFT JOIN alumni_profiles ap ON es.user_id = ap.user_id
+                    ORDER BY es.total_score DESC
+                    LIMIT 10
+                """),
                 # 3. Activity pattern distribution
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT 
-                            contribution_type,
-                            COUNT(*) as count,
-                            SUM(points_earned) as total_points
-                        FROM contribution_history
-                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                        GROUP BY contribution_type
-                        ORDER BY count DESC
-                    """)
-                    activity_types = await cursor.fetchall()
-                    
-                    trends['activity_distribution'] = [
-                        {
-                            'type': at[0],
-                            'count': at[1],
-                            'total_points': at[2]
-                        }
-                        for at in activity_types
-                    ]
-                
+                _query("""
+                    SELECT 
+                        contribution_type,
+                        COUNT(*) as count,
+                        SUM(points_earned) as total_points
+                    FROM contribution_history
+                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+                    GROUP BY contribution_type
+                    ORDER BY count DESC
+                """),
                 # 4. Average scores by user role
-                async with conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT 
-                            u.role,
-                            COUNT(*) as user_count,
-                            AVG(es.total_score) as avg_score,
-                            MAX(es.total_score) as max_score
-                        FROM engagement_scores es
-                        JOIN users u ON es.user_id = u.id
-                        GROUP BY u.role
-                        ORDER BY avg_score DESC
-                    """)
-                    role_stats = await cursor.fetchall()
-                    
-                    trends['engagement_by_role'] = [
-                        {
-                            'role': rs[0],
-                            'user_count': rs[1],
-                            'avg_score': round(float(rs[2] or 0), 2),
-                            'max_score': rs[3]
-                        }
-                        for rs in role_stats
-                    ]
+                _query("""
+                    SELECT 
+                        u.role,
+                        COUNT(*) as user_count,
+                        AVG(es.total_score) as avg_score,
+                        MAX(es.total_score) as max_score
+                    FROM engagement_scores es
+                    JOIN users u ON es.user_id = u.id
+                    GROUP BY u.role
+                    ORDER BY avg_score DESC
+                """)
+            )
+            
+            trends = {}
+            growth = growth_rows[0] if growth_rows else None
+            if growth:
+                last_week = growth[0] or 0
+                prev_week = growth[1] or 0
+                last_month = growth[2] or 0
+                
+                weekly_growth_rate = 0
+                if prev_week > 0:
+                    weekly_growth_rate = round(((last_week - prev_week) / prev_week * 100), 2)
                 
-                return trends
+                trends['engagement_growth'] = {
+                    'last_week_contributions': last_week,
+                    'previous_week_contributions': prev_week,
+                    'last_month_contributions': last_month,
+                    'weekly_growth_rate_percent': weekly_growth_rate
+                }
+            
+            trends['top_contributors'] = [
+                {
+                    'user_id': tc[0],
+                    'name': tc[1] or 'Unknown',
+                    'score': tc[2],
+                    'rank': tc[3],
+                    'level': tc[4]
+                }
+                for tc in top_contributors
+            ]
+            
+            trends['activity_distribution'] = [
+                {
+                    'type': at[0],
+                    'count': at[1],
+                    'total_points': at[2]
+                }
+                for at in activity_types
+            ]
+            
+            trends['engagement_by_role'] = [
+                {
+                    'role': rs[0],
+                    'user_count': rs[1],
+                    'avg_score': round(float(rs[2] or 0), 2),
+                    'max_score': rs[3]
+                }
+                for rs in role_stats
+            ]
+            
+            return trends
         
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_analyze_trends())
-        loop.close()
+        # Run on the worker's shared event loop and DB pool
+        result = run_in_worker_loop(_analyze_trends())
         
         logger.info(f"Engagement trends analysis completed: {result}")
         return {
@@ -366,12 +284,11 @@ def send_engagement_notifications() -> Dict[str, Any]:
         
         async def _send_notifications():
             from database.connection import get_db_pool
-            from services.notification_service import notification_service
+            from services.notification_fanout_service import notification_fanout
+            from tasks.notification_tasks import send_email_batch
             
             pool = await get_db_pool()
             async with pool.acquire() as conn:
-                notifications_sent = 0
-                
                 # Find users who need motivational notifications
                 async with conn.cursor() as cursor:
                     # Users with declining pattern
@@ -387,31 +304,23 @@ def send_engagement_notifications() -> Dict[str, Any]:
                         LIMIT 50
                     """)
                     inactive_users = await cursor.fetchall()
-                    
-                    for user in inactive_users:
-                        try:
-                            await notification_service.create_notification(
-                                conn,
-                                user_id=user[0],
-                                notification_type='system',
-                                title='We miss you!',
-                                message='It has been a while since your last activity. Come back and continue engaging with the community!',
-                                priority='medium'
-                            )
-                            notifications_sent += 1
-                        except Exception as e:
-                            logger.error(f"Error sending notification to user {user[0]}: {str(e)}")
-                
-                return {
-                    'status': 'completed',
-                    'notifications_sent': notifications_sent
-                }
+            
+            result = await notification_fanout.send(
+                'system',
+                'We miss you!',
+                'It has been a while since your last activity. Come back and continue engaging with the community!',
+                user_ids=[user[0] for user in inactive_users],
+                priority='medium',
+                on_emails_queued=lambda email_ids: send_email_batch.delay(email_ids)
+            )
+            
+            return {
+                'status': 'completed',
+                'notifications_sent': result['notified']
+            }
         
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_send_notifications())
-        loop.close()
+        # Run on the worker's shared event loop and DB pool
+        result = run_in_worker_loop(_send_notifications())
         
         logger.info(f"Engagement notifications sent: {result}")
         return result
@@ -458,11 +367,8 @@ def cleanup_old_contribution_history(days: int = 365) -> Dict[str, Any]:
                     'retention_days': days
                 }
         
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(_cleanup())
-        loop.close()
+        # Run on the worker's shared event loop and DB pool
+        result = run_in_worker_loop(_cleanup())
         
         logger.info(f"Contribution history cleanup completed: {result}")
         return result
@@ -3,8 +3,10 @@ Notification Tasks
 Background tasks for sending notifications and emails
 """
 from celery_app import app, TaskConfig
+from tasks.worker_runtime import run_in_worker_loop
 import logging
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -63,37 +65,52 @@ def send_email_notification(
     queue=TaskConfig.QUEUE_DEFAULT
 )
 def send_bulk_notifications(
-    user_ids: List[str],
+    user_ids: Optional[List[str]],
     notification_type: str,
     title: str,
-    message: str
+    message: str,
+    role: Optional[str] = None,
+    batch_year: Optional[int] = None,
+    link: Optional[str] = None,
+    priority: str = 'medium',
+    metadata: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Send notifications to multiple users
     
+    The audience is either ``user_ids`` or, when that is None, every active
+    user matching ``role`` / ``batch_year``. Notifications are written in
+    bulk per chunk and emails are queued to ``send_email_batch``.
+    
     Args:
-        user_ids: List of user IDs
+        user_ids: List of user IDs (None to use the filters)
         notification_type: Type of notification
         title: Notification title
         message: Notification message
+        role: Optional role filter (student, alumni, recruiter, admin)
+        batch_year: Optional alumni batch filter
     
     Returns:
         Processing results
     """
     try:
-        logger.info(f"Sending bulk notifications to {len(user_ids)} users")
+        from services.notification_fanout_service import notification_fanout
+        
+        audience = f"{len(user_ids)} users" if user_ids is not None else f"role={role} batch={batch_year}"
+        logger.info(f"Sending bulk notifications to {audience}")
         
-        # TODO: Implement bulk notification logic
-        # 1. For each user, create notification record
-        # 2. Check user notification preferences
-        # 3. Send email if enabled
-        # 4. Send push notification if enabled
+        result = run_in_worker_loop(notification_fanout.send(
+            notification_type, title, message,
+            user_ids=user_ids, role=role, batch_year=batch_year,
+            link=link, priority=priority, metadata=metadata,
+            on_emails_queued=lambda email_ids: send_email_batch.delay(email_ids)
+        ))
         
-        logger.info("Bulk notifications sent")
+        logger.info(f"Bulk notifications sent: {result}")
         
         return {
-            'status': 'completed',
-            'users_notified': len(user_ids)
+            **result,
+            'users_notified': result['notified']
         }
     
     except Exception as e:
@@ -101,6 +118,48 @@ def send_bulk_notifications(
         raise
 
 
+@app.task(
+    name='tasks.notification_tasks.send_email_batch',
+    queue=TaskConfig.QUEUE_DEFAULT,
+    bind=True,
+    max_retries=3,
+    rate_limit=os.getenv('EMAIL_BATCH_RATE_LIMIT', '30/m')
+)
+def send_email_batch(self, email_ids: List[str], attempt: int = 0) -> Dict[str, Any]:
+    """
+    Send a batch of queued emails (``email_queue`` rows)
+    
+    Throughput is capped twice: Celery's per-worker ``rate_limit`` on
+    batches and ``EMAIL_SEND_RATE`` / ``EMAIL_SEND_CONCURRENCY`` within a
+    batch. Rows already sent are skipped, so a retry is safe. Emails that
+    failed are re-enqueued as a new batch with exponential backoff
+    (``EMAIL_RETRY_BASE_SECONDS`` * 2^attempt) until they reach
+    ``EMAIL_MAX_RETRIES`` attempts.
+    
+    Args:
+        email_ids: email_queue IDs
+        attempt: Re-send round of these IDs (0 for the first send)
+    
+    Returns:
+        Send counts
+    """
+    try:
+        from services.notification_fanout_service import email_batch_sender
+        
+        result = run_in_worker_loop(email_batch_sender.send(email_ids))
+        retry_ids = result.pop('retry_ids')
+        if retry_ids:
+            countdown = int(os.getenv('EMAIL_RETRY_BASE_SECONDS', 60)) * (2 ** attempt)
+            send_email_batch.apply_async(args=[retry_ids], kwargs={'attempt': attempt + 1}, countdown=countdown)
+            logger.info(f"Re-sending {len(retry_ids)} failed emails in {countdown}s")
+        logger.info(f"Email batch of {len(email_ids)}: {result}")
+        return {'status': 'completed', 'retrying': len(retry_ids), **result}
+    
+    except Exception as e:
+        logger.error(f"Email batch error: {str(e)}")
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+
+
 @app.task(
     name='tasks.notification_tasks.send_event_reminders',
     queue=TaskConfig.QUEUE_DEFAULT
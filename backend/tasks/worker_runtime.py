@@ -0,0 +1,153 @@
+"""
+Worker async runtime
+One long-lived asyncio event loop per Celery worker process.
+
+The loop runs on a daemon thread started from ``worker_process_init`` (or
+lazily on first use under the solo/threads pools and eager mode). Tasks
+submit coroutines with ``run_in_worker_loop``, so the aiomysql pool and the
+Redis client created on that loop are shared by every task the process
+runs instead of being rebuilt on a fresh loop per call.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT = 10
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_owner_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _loop_running() -> bool:
+    return (
+        _loop is not None
+        and not _loop.is_closed()
+        and _thread is not None
+        and _thread.is_alive()
+        and _owner_pid == os.getpid()
+    )
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return the worker loop, starting its thread if needed"""
+    global _loop, _thread, _owner_pid
+
+    if _loop_running():
+        return _loop
+
+    with _lock:
+        if _loop_running():
+            return _loop
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name='worker-async-loop', daemon=True)
+        thread.start()
+        ready.wait()
+
+        _loop, _thread, _owner_pid = loop, thread, os.getpid()
+        logger.info(f"Worker event loop started (pid={_owner_pid})")
+        return loop
+
+
+def run_in_worker_loop(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the worker loop and block until it completes
+
+    The coroutine may fan out with ``asyncio.gather`` over the shared pool.
+    If the calling task is interrupted (e.g. ``SoftTimeLimitExceeded``) or
+    ``timeout`` expires, the coroutine is cancelled before re-raising.
+    """
+    loop = get_worker_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_in_worker_loop() cannot be called from the worker loop itself")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def _open_resources():
+    from database.connection import get_db_pool
+    from redis_client import get_redis_client
+
+    await get_db_pool()
+    try:
+        await get_redis_client()
+    except Exception as e:
+        logger.warning(f"Redis unavailable in worker: {str(e)}")
+
+
+async def _close_resources():
+    from database.connection import close_db_pool
+    from redis_client import close_redis_client
+
+    await close_db_pool()
+    await close_redis_client()
+
+
+def shutdown_worker_loop(timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Close the shared DB pool and Redis client, then stop the loop"""
+    global _loop, _thread, _owner_pid
+
+    with _lock:
+        if not _loop_running():
+            return
+        loop, thread = _loop, _thread
+        _loop = _thread = _owner_pid = None
+
+    try:
+        asyncio.run_coroutine_threadsafe(_close_resources(), loop).result(timeout)
+    except Exception as e:
+        logger.warning(f"Error closing worker connections: {str(e)}")
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.close()
+    logger.info("Worker event loop stopped")
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    """Start the loop in a freshly forked pool process and open its connections"""
+    from database.connection import discard_db_pool
+    from redis_client import discard_redis_client
+
+    # Pool / client objects inherited from the parent belong to its loop
+    discard_db_pool()
+    discard_redis_client()
+
+    get_worker_loop()
+    try:
+        run_in_worker_loop(_open_resources(), timeout=SHUTDOWN_TIMEOUT * 3)
+    except Exception as e:
+        logger.warning(f"Worker connections not pre-opened: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs):
+    shutdown_worker_loop()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs):
+    # solo/threads pools have no child processes; no-op otherwise
+    shutdown_worker_loop()
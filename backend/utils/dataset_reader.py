@@ -0,0 +1,155 @@
+"""Chunked dataset readers - Phase 10.2
+
+Uploads are read in bounded DataFrame chunks so memory stays flat no matter
+how many rows a file has:
+
+- CSV: ``pd.read_csv(chunksize=...)``
+- Excel (.xlsx): openpyxl read-only worksheet streamed row by row
+- JSON: top-level array streamed with ijson; JSON Lines via ``pd.read_json``
+
+All cells are read as strings; the cleaners convert numeric columns.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    logger.warning("ijson not installed. JSON array uploads will be loaded in one piece")
+
+DEFAULT_CHUNK_SIZE = int(os.environ.get('DATASET_CHUNK_SIZE', 5000))
+
+SUPPORTED_EXTENSIONS = ['.csv', '.xlsx', '.xls', '.json', '.jsonl', '.ndjson']
+
+
+class DatasetChunkReader:
+    """
+    Iterate over an uploaded dataset in DataFrame chunks
+
+    ``progress`` reports the fraction of the file consumed so far (by bytes
+    for CSV/JSON, by rows for Excel) for upload progress reporting.
+    """
+
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file_path = Path(file_path)
+        self.chunk_size = chunk_size
+        self.suffix = self.file_path.suffix.lower()
+        if self.suffix not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {self.file_path.suffix}")
+        self.file_size = max(self.file_path.stat().st_size, 1)
+        self.progress = 0.0
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        self.progress = 0.0
+        if self.suffix == '.csv':
+            chunks = self._read_csv()
+        elif self.suffix == '.xlsx':
+            chunks = self._read_xlsx()
+        elif self.suffix == '.xls':
+            chunks = self._read_whole(lambda: pd.read_excel(self.file_path, dtype=str))
+        elif self.suffix in ('.jsonl', '.ndjson'):
+            chunks = self._read_json_lines()
+        else:
+            chunks = self._read_json()
+
+        for chunk in chunks:
+            if len(chunk):
+                yield chunk
+        self.progress = 1.0
+
+    def _read_csv(self) -> Iterator[pd.DataFrame]:
+        with open(self.file_path, 'rb') as handle:
+            for chunk in pd.read_csv(handle, chunksize=self.chunk_size, dtype=str):
+                self.progress = min(handle.tell() / self.file_size, 1.0)
+                yield chunk
+
+    def _read_xlsx(self) -> Iterator[pd.DataFrame]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            total_rows = max((sheet.max_row or 1) - 1, 1)
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(name).strip() if name is not None else f"column_{i}" for i, name in enumerate(header)]
+
+            batch: List[tuple] = []
+            seen = 0
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.chunk_size:
+                    seen += len(batch)
+                    self.progress = min(seen / total_rows, 1.0)
+                    yield self._frame(batch, columns)
+                    batch = []
+            if batch:
+                yield self._frame(batch, columns)
+        finally:
+            workbook.close()
+
+    def _read_json(self) -> Iterator[pd.DataFrame]:
+        if not IJSON_AVAILABLE:
+            yield from self._read_whole(lambda: self._records_frame(
+                pd.read_json(self.file_path, dtype=False).to_dict('records')
+            ))
+            return
+
+        with open(self.file_path, 'rb') as handle:
+            batch: List[dict] = []
+            for record in ijson.items(handle, 'item'):
+                batch.append(record)
+                if len(batch) >= self.chunk_size:
+                    self.progress = min(handle.tell() / self.file_size, 1.0)
+                    yield self._records_frame(batch)
+                    batch = []
+            if batch:
+                yield self._records_frame(batch)
+
+    def _read_json_lines(self) -> Iterator[pd.DataFrame]:
+        with open(self.file_path, 'rb') as handle:
+            for chunk in pd.read_json(handle, lines=True, chunksize=self.chunk_size, dtype=False):
+                self.progress = min(handle.tell() / self.file_size, 1.0)
+                yield self._records_frame(chunk.to_dict('records'))
+
+    def _read_whole(self, loader) -> Iterator[pd.DataFrame]:
+        """Formats without a streaming reader are loaded once and sliced"""
+        df = loader()
+        total = max(len(df), 1)
+        for start in range(0, len(df), self.chunk_size):
+            self.progress = min((start + self.chunk_size) / total, 1.0)
+            yield df.iloc[start:start + self.chunk_size]
+
+    @staticmethod
+    def _frame(rows: List[tuple], columns: List[str]) -> pd.DataFrame:
+        width = len(columns)
+        df = pd.DataFrame([row[:width] for row in rows], columns=columns, dtype=object)
+        return df.where(df.isna(), df.astype(str))
+
+    @staticmethod
+    def _records_frame(records: List[dict]) -> pd.DataFrame:
+        # Nested values (e.g. skills arrays) are kept as JSON text like in CSV uploads
+        df = pd.DataFrame.from_records([
+            {key: json.dumps(value, default=str) if isinstance(value, (list, dict)) else value
+             for key, value in record.items()}
+            for record in records
+        ])
+        return df.where(df.isna(), df.astype(str))
+
+
+def read_header(file_path: str) -> Optional[List[str]]:
+    """Column names of a dataset file, reading only the first chunk"""
+    for chunk in DatasetChunkReader(file_path, chunk_size=1):
+        return chunk.columns.tolist()
+    return None
@@ -0,0 +1,130 @@
+"""
+Keyset (cursor) pagination helpers
+
+Cursors are opaque, URL-safe tokens holding the sort-key values of the last
+row on a page. The next page is selected with a ``WHERE (sort keys) < (last
+values)`` condition instead of ``OFFSET`` so the database seeks straight to
+the position through the index, and deep pages cost the same as the first.
+"""
+import base64
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from redis_client import get_redis_client, RedisConfig
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_TTL = 60
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort-key values into an opaque cursor token"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, size: int) -> Tuple:
+    """
+    Decode a cursor token produced by ``encode_cursor``
+
+    Raises:
+        ValueError: If the token is malformed or has the wrong number of keys
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid pagination cursor")
+    return tuple(_decode_value(v) for v in values)
+
+
+def keyset_condition(columns: Sequence[str], values: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    Build the "strictly after" condition for a descending keyset
+
+    ``(a, b, c) < (x, y, z)`` is expanded to
+    ``a < x OR (a = x AND (b < y OR (b = y AND c < z)))`` which MySQL can
+    resolve with a range scan on a composite index.
+    """
+    clause, params = None, []
+    for column, value in reversed(list(zip(columns, values))):
+        if clause is None:
+            clause, params = f"{column} < %s", [value]
+        else:
+            clause = f"({column} < %s OR ({column} = %s AND {clause}))"
+            params = [value, value] + params
+    return f"({clause})", params
+
+
+async def cached_count(cursor, count_query: str, values: Sequence[Any], namespace: str,
+                       ttl: int = COUNT_CACHE_TTL) -> int:
+    """
+    Run a ``COUNT(*)`` query, caching the result in Redis for ``ttl`` seconds
+
+    Totals are only used for "N results" display, so a briefly stale count
+    is acceptable and scrolling through pages does not re-count every time.
+    """
+    digest = hashlib.sha1(
+        json.dumps([count_query, list(values)], default=str).encode()
+    ).hexdigest()
+    key = f"{RedisConfig.PREFIX_API_CACHE}:count:{namespace}:{digest}"
+
+    redis = None
+    try:
+        redis = await get_redis_client()
+        cached = await redis.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        logger.warning(f"Redis unavailable for count cache: {e}")
+        redis = None
+
+    await cursor.execute(count_query, values)
+    row = await cursor.fetchone()
+    if not row:
+        total = 0
+    else:
+        total = int(next(iter(row.values())) if isinstance(row, dict) else row[0])
+
+    if redis is not None:
+        try:
+            await redis.set(key, total, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Failed to cache count: {e}")
+    return total
+
+
+def next_cursor_from_rows(rows: list, limit: int, key) -> Tuple[list, Optional[str]]:
+    """
+    Trim a ``limit + 1`` result set to ``limit`` rows and build the next cursor
+
+    Args:
+        rows: Rows fetched with ``LIMIT limit + 1``
+        limit: Page size
+        key: Callable returning the sort-key tuple of a row
+
+    Returns:
+        (page_rows, next_cursor) where next_cursor is None on the last page
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
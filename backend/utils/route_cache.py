@@ -0,0 +1,183 @@
+"""
+Route response cache
+Caches the JSON responses of read-heavy GET endpoints:
+
+    @router.get("/clusters")
+    @route_cache(ttl=RedisConfig.TTL_API_CACHE_LONG, tags=["heatmap"])
+    async def get_talent_clusters(...):
+
+- the cache key is the route, its path and sorted query parameters and,
+  with ``vary_on_user=True``, the id of the ``current_user`` dependency
+  (dependencies such as ``require_admin`` still run on every request)
+- responses carry an ``ETag``; a matching ``If-None-Match`` gets a 304
+- write paths call ``await invalidate_tags("jobs")``. Every tag has a
+  version counter and each entry records the versions it was built with,
+  so bumping a tag invalidates all of its entries without scanning keys
+- while Redis is unavailable, entries and tag versions are kept in a
+  per-process LRU instead (TTL capped at ``ROUTE_CACHE_LOCAL_MAX_TTL``,
+  since invalidations then only reach the current process)
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from redis_client import LocalCache, RedisConfig, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+ROUTE_CACHE_ENABLED = os.getenv('ROUTE_CACHE_ENABLED', 'true').lower() == 'true'
+LOCAL_MAX_ENTRIES = int(os.getenv('ROUTE_CACHE_LOCAL_MAX_ENTRIES', 512))
+LOCAL_MAX_TTL = int(os.getenv('ROUTE_CACHE_LOCAL_MAX_TTL', 60))
+
+ENTRY_PREFIX = f"{RedisConfig.PREFIX_API_CACHE}:route"
+TAG_PREFIX = f"{RedisConfig.PREFIX_API_CACHE}:tag"
+
+# Injected into endpoints that do not already take the Request
+_REQUEST_PARAM = '_route_cache_request'
+
+_local_entries = LocalCache(LOCAL_MAX_ENTRIES)
+_local_tag_versions: Dict[str, int] = {}
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def _cache_key(namespace: str, request: Request, user: Any) -> str:
+    query = sorted(request.query_params.multi_items())
+    parts = [request.url.path, query]
+    if user is not None:
+        parts.append(user.get('id') if isinstance(user, dict) else getattr(user, 'id', None))
+    digest = hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+    return f"{ENTRY_PREFIX}:{namespace}:{digest}"
+
+
+async def _lookup(key: str, tags: Sequence[str]) -> Tuple[Optional[Dict[str, Any]], List[int], bool]:
+    """Return (entry if still valid, current tag versions, whether Redis answered)"""
+    try:
+        client = await get_redis_client()
+        values = await client.mget([key] + [_tag_key(tag) for tag in tags])
+        versions = [int(value or 0) for value in values[1:]]
+        entry = json.loads(values[0]) if values[0] else None
+        return (entry if entry and entry['versions'] == versions else None), versions, True
+    except Exception as e:
+        logger.warning(f"Route cache using local fallback: {str(e)}")
+
+    versions = [_local_tag_versions.get(tag, 0) for tag in tags]
+    entry = _local_entries.get(key)
+    return (entry if entry and entry['versions'] == versions else None), versions, False
+
+
+async def _store(key: str, entry: Dict[str, Any], ttl: int, use_redis: bool) -> None:
+    if use_redis:
+        try:
+            client = await get_redis_client()
+            await client.setex(key, ttl, json.dumps(entry))
+            return
+        except Exception as e:
+            logger.warning(f"Route cache SET failed, storing locally: {str(e)}")
+    _local_entries.set(key, entry, min(ttl, LOCAL_MAX_TTL))
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Invalidate every cached response carrying any of ``tags``"""
+    for tag in tags:
+        _local_tag_versions[tag] = _local_tag_versions.get(tag, 0) + 1
+    try:
+        client = await get_redis_client()
+        pipe = client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(_tag_key(tag))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Route cache invalidation of {', '.join(tags)} not propagated: {str(e)}")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or any(
+        (value[2:] if value.startswith('W/') else value) == etag for value in candidates
+    )
+
+
+def route_cache(ttl: int = RedisConfig.TTL_API_CACHE_MEDIUM, tags: Sequence[str] = (),
+                vary_on_user: bool = False, namespace: Optional[str] = None):
+    """
+    Cache a GET endpoint's JSON response
+
+    Args:
+        ttl: Seconds to keep a response
+        tags: Invalidation tags (see ``invalidate_tags``)
+        vary_on_user: Cache per ``current_user`` (the endpoint must declare it)
+        namespace: Key namespace, defaults to the endpoint's qualified name
+
+    Must be applied below the router decorator. Endpoints returning a
+    ``Response`` themselves are passed through uncached; headers set on an
+    injected ``response: Response`` parameter are cached with the body.
+    """
+    tags = tuple(tags)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        request_param = next((p.name for p in parameters if p.annotation is Request), None)
+        response_param = next((p.name for p in parameters if p.annotation is Response), None)
+        if vary_on_user and 'current_user' not in signature.parameters:
+            raise TypeError(f"{func.__qualname__}: vary_on_user requires a current_user dependency")
+        key_namespace = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+            if not ROUTE_CACHE_ENABLED or request.method != 'GET':
+                return await func(*args, **kwargs)
+
+            key = _cache_key(key_namespace, request, kwargs.get('current_user') if vary_on_user else None)
+            entry, versions, use_redis = await _lookup(key, tags)
+            status = 'HIT'
+            if entry is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+
+                # Same encoding as FastAPI's JSONResponse
+                body = json.dumps(
+                    jsonable_encoder(result), ensure_ascii=False, allow_nan=False,
+                    indent=None, separators=(',', ':')
+                )
+                entry = {
+                    'body': body,
+                    'etag': f'"{hashlib.sha1(body.encode()).hexdigest()}"',
+                    'headers': dict(kwargs[response_param].headers) if response_param else {},
+                    'versions': versions,
+                }
+                entry['headers'].pop('content-length', None)
+                await _store(key, entry, ttl, use_redis)
+                status = 'MISS'
+
+            headers = {
+                **entry['headers'],
+                'ETag': entry['etag'],
+                'Cache-Control': 'private, no-cache',
+                'X-Cache': status,
+            }
+            if _etag_matches(request.headers.get('if-none-match'), entry['etag']):
+                return Response(status_code=304, headers=headers)
+            return Response(content=entry['body'], media_type='application/json', headers=headers)
+
+        if request_param is None:
+            wrapper.__signature__ = signature.replace(parameters=parameters + [
+                inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ])
+        return wrapper
+
+    return decorator
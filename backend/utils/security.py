@@ -1,13 +1,23 @@
 """Security utilities for password hashing and JWT tokens"""
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
+import asyncio
 import os
+import threading
 from typing import Optional, Dict, Any
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop; the worker count caps concurrent hashes per process
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_executor_lock = threading.Lock()
+
 # JWT configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
@@ -24,6 +34,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        with _password_executor_lock:
+            if _password_executor is None:
+                _password_executor = ThreadPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash'
+                )
+    return _password_executor
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the bounded hashing pool (use from async code)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` on the bounded hashing pool (use from async code)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_executor(), verify_password, plain_password, hashed_password
+    )
+
+
+def shutdown_password_executor() -> None:
+    """Stop the hashing pool (called on application shutdown)"""
+    global _password_executor
+    with _password_executor_lock:
+        executor, _password_executor = _password_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
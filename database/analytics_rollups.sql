@@ -0,0 +1,150 @@
+-- ============================================================================
+-- Analytics Rollups
+-- Purpose: Summary tables behind the admin analytics endpoints so dashboards
+--          read pre-aggregated rows instead of running COUNT(*) / GROUP BY
+--          over users, alumni_profiles, jobs, events, mentorship and forum
+--          tables (and parsing every profile's skills JSON) on each request.
+--          services/analytics_rollup_service.py refreshes them incrementally
+--          from updated_at (tasks.analytics_tasks.refresh_analytics_rollups,
+--          scheduled by Celery beat); until the first refresh completes the
+--          endpoints keep querying the live tables. Indexes are only created
+--          when missing, so the script is safe to re-run.
+-- ============================================================================
+
+USE AlumUnity;
+
+-- Per-day series: signups, jobs_posted, job_applications, events_created,
+-- event_attendees, mentorship_requests, mentorship_sessions
+CREATE TABLE IF NOT EXISTS analytics_daily_counts (
+    series VARCHAR(64) NOT NULL,
+    day DATE NOT NULL,
+    value BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (series, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Current counts per dimension value: skill, company, batch, job_type,
+-- user_role, job_status, event_status, ...
+CREATE TABLE IF NOT EXISTS analytics_dimension_counts (
+    dimension VARCHAR(64) NOT NULL,
+    value VARCHAR(255) NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, value),
+    INDEX idx_dimension_count (dimension, count)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- What each source row last contributed to analytics_dimension_counts, so a
+-- changed row is applied as a delta instead of recounting the table
+CREATE TABLE IF NOT EXISTS analytics_rollup_facets (
+    source VARCHAR(64) NOT NULL,
+    source_id VARCHAR(50) NOT NULL,
+    facets JSON NOT NULL,  -- [[dimension, value, weight], ...]
+    PRIMARY KEY (source, source_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Refresh watermark and freshness per series / facet source
+CREATE TABLE IF NOT EXISTS analytics_rollup_state (
+    name VARCHAR(64) PRIMARY KEY,
+    watermark TIMESTAMP NULL,
+    refreshed_at TIMESTAMP NULL,
+    full_refreshed_at TIMESTAMP NULL,
+    rows_processed INT NOT NULL DEFAULT 0,
+    duration_ms INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Change scans: WHERE updated_at >= watermark ORDER BY updated_at DESC, id DESC
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users' AND INDEX_NAME = 'idx_users_updated_id') = 0,
+    'CREATE INDEX idx_users_updated_id ON users (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'alumni_profiles' AND INDEX_NAME = 'idx_alumni_profiles_updated_id') = 0,
+    'CREATE INDEX idx_alumni_profiles_updated_id ON alumni_profiles (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'jobs' AND INDEX_NAME = 'idx_jobs_updated_id') = 0,
+    'CREATE INDEX idx_jobs_updated_id ON jobs (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'job_applications' AND INDEX_NAME = 'idx_job_applications_updated_id') = 0,
+    'CREATE INDEX idx_job_applications_updated_id ON job_applications (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'events' AND INDEX_NAME = 'idx_events_updated_id') = 0,
+    'CREATE INDEX idx_events_updated_id ON events (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'mentorship_requests' AND INDEX_NAME = 'idx_mentorship_requests_updated_id') = 0,
+    'CREATE INDEX idx_mentorship_requests_updated_id ON mentorship_requests (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'mentorship_sessions' AND INDEX_NAME = 'idx_mentorship_sessions_updated_id') = 0,
+    'CREATE INDEX idx_mentorship_sessions_updated_id ON mentorship_sessions (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'forum_posts' AND INDEX_NAME = 'idx_forum_posts_updated_id') = 0,
+    'CREATE INDEX idx_forum_posts_updated_id ON forum_posts (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'forum_comments' AND INDEX_NAME = 'idx_forum_comments_updated_id') = 0,
+    'CREATE INDEX idx_forum_comments_updated_id ON forum_comments (updated_at, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- Re-aggregating one day of a series: WHERE <date column> in [day, day + 1)
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'events' AND INDEX_NAME = 'idx_events_created_at') = 0,
+    'CREATE INDEX idx_events_created_at ON events (created_at)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'mentorship_requests' AND INDEX_NAME = 'idx_mentorship_requests_requested_at') = 0,
+    'CREATE INDEX idx_mentorship_requests_requested_at ON mentorship_requests (requested_at)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'mentorship_sessions' AND INDEX_NAME = 'idx_mentorship_sessions_created_at') = 0,
+    'CREATE INDEX idx_mentorship_sessions_created_at ON mentorship_sessions (created_at)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
@@ -0,0 +1,85 @@
+-- ============================================================================
+-- Engagement Score Procedure Fix
+-- update_engagement_score counted forum comments through a LEFT JOIN from
+-- forum_posts, so users with comments but no posts got 0 forum points.
+-- Recreates the procedure with posts and comments counted separately, the
+-- same formula the nightly batch (services/engagement_batch_service.py)
+-- applies.
+-- ============================================================================
+
+USE AlumUnity;
+
+DROP PROCEDURE IF EXISTS update_engagement_score;
+
+DELIMITER //
+
+-- Procedure to update engagement score
+CREATE PROCEDURE update_engagement_score(IN p_user_id VARCHAR(50))
+BEGIN
+    DECLARE profile_points INT DEFAULT 0;
+    DECLARE mentorship_points INT DEFAULT 0;
+    DECLARE job_points INT DEFAULT 0;
+    DECLARE event_points INT DEFAULT 0;
+    DECLARE forum_points INT DEFAULT 0;
+    DECLARE total INT DEFAULT 0;
+    
+    -- Calculate points from different activities
+    SELECT profile_completion_percentage * 0.2 INTO profile_points
+    FROM alumni_profiles WHERE user_id = p_user_id;
+    
+    SELECT COUNT(*) * 10 INTO mentorship_points
+    FROM mentorship_sessions ms
+    JOIN mentorship_requests mr ON ms.mentorship_request_id = mr.id
+    WHERE (mr.mentor_id = p_user_id OR mr.student_id = p_user_id) 
+        AND ms.status = 'completed';
+    
+    SELECT COUNT(*) * 5 INTO job_points
+    FROM job_applications WHERE applicant_id = p_user_id;
+    
+    SELECT COUNT(*) * 8 INTO event_points
+    FROM event_rsvps WHERE user_id = p_user_id AND status = 'attending';
+    
+    -- Posts and comments counted separately: comments earn points even
+    -- without any posts
+    SELECT
+        (SELECT COUNT(*) FROM forum_posts WHERE author_id = p_user_id) * 5 +
+        (SELECT COUNT(*) FROM forum_comments WHERE author_id = p_user_id) * 2
+    INTO forum_points;
+    
+    SET total = profile_points + mentorship_points + job_points + event_points + forum_points;
+    
+    -- Update or insert engagement score
+    INSERT INTO engagement_scores (user_id, total_score, contributions, last_calculated)
+    VALUES (
+        p_user_id, 
+        total,
+        JSON_OBJECT(
+            'profile', profile_points,
+            'mentorship', mentorship_points,
+            'jobs', job_points,
+            'events', event_points,
+            'forum', forum_points
+        ),
+        NOW()
+    )
+    ON DUPLICATE KEY UPDATE
+        total_score = total,
+        contributions = JSON_OBJECT(
+            'profile', profile_points,
+            'mentorship', mentorship_points,
+            'jobs', job_points,
+            'events', event_points,
+            'forum', forum_points
+        ),
+        last_calculated = NOW();
+    
+    -- Update rank positions
+    SET @rank = 0;
+    UPDATE engagement_scores
+    SET rank_position = (@rank := @rank + 1)
+    ORDER BY total_score DESC;
+END //
+
+DELIMITER ;
+
+SELECT 'Engagement score procedure successfully updated!' as Status;
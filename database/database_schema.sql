@@ -105,7 +105,8 @@ CREATE TABLE alumni_profiles (
     INDEX idx_is_verified (is_verified),
     INDEX idx_industry (industry),
     INDEX idx_willing_to_mentor (willing_to_mentor),
-    FULLTEXT idx_name_bio (name, bio, headline)
+    FULLTEXT idx_name_bio (name, bio, headline),
+    FULLTEXT ft_alumni_profiles_name (name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Profile verification requests
@@ -881,10 +882,12 @@ BEGIN
     SELECT COUNT(*) * 8 INTO event_points
     FROM event_rsvps WHERE user_id = p_user_id AND status = 'attending';
     
-    SELECT (COUNT(DISTINCT fp.id) * 5 + COUNT(DISTINCT fc.id) * 2) INTO forum_points
-    FROM forum_posts fp
-    LEFT JOIN forum_comments fc ON fc.author_id = p_user_id
-    WHERE fp.author_id = p_user_id;
+    -- Posts and comments counted separately: comments earn points even
+    -- without any posts
+    SELECT
+        (SELECT COUNT(*) FROM forum_posts WHERE author_id = p_user_id) * 5 +
+        (SELECT COUNT(*) FROM forum_comments WHERE author_id = p_user_id) * 2
+    INTO forum_points;
     
     SET total = profile_points + mentorship_points + job_points + event_points + forum_points;
     
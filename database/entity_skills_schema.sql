@@ -0,0 +1,37 @@
+-- ============================================================================
+-- Entity Skills Index
+-- Purpose: Normalized skill dictionary and inverted index over the JSON skill
+--          columns of jobs (skills_required), alumni_profiles (skills) and
+--          knowledge_capsules (tags), so skill filters use index lookups
+--          instead of scanning JSON_CONTAINS over every row.
+-- Populate existing data with: python backend/scripts/backfill_entity_skills.py
+--          Until it has completed for an entity type (entity_skills_backfill)
+--          skill filters keep using JSON_CONTAINS.
+-- ============================================================================
+
+USE AlumUnity;
+
+-- Skill dictionary (names are stored lowercase and trimmed); separate from the
+-- catalog `skills` table, whose VARCHAR ids are used by user_skills
+CREATE TABLE IF NOT EXISTS skill_dictionary (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_skill_name (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- entity_id is jobs.id, alumni_profiles.user_id or knowledge_capsules.id
+CREATE TABLE IF NOT EXISTS entity_skills (
+    entity_type ENUM('job', 'profile', 'capsule') NOT NULL,
+    entity_id VARCHAR(50) NOT NULL,
+    skill_id INT NOT NULL,
+    PRIMARY KEY (entity_type, entity_id, skill_id),
+    INDEX idx_skill_entity (skill_id, entity_type, entity_id),
+    FOREIGN KEY (skill_id) REFERENCES skill_dictionary(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Entity types whose index is complete (written by the backfill)
+CREATE TABLE IF NOT EXISTS entity_skills_backfill (
+    entity_type ENUM('job', 'profile', 'capsule') PRIMARY KEY,
+    completed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
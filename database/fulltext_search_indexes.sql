@@ -0,0 +1,51 @@
+-- ============================================================================
+-- Full-text Search Indexes
+-- Purpose: FULLTEXT indexes backing services/search_service.py so message,
+--          forum, job and alumni-name searches use MATCH ... AGAINST instead
+--          of LIKE '%term%' full scans. Each index is created only if it is
+--          missing (database_schema.sql already defines the jobs and
+--          forum_posts ones), so the script is safe to re-run.
+-- Until this runs, searches on a table without its index fall back to LIKE.
+-- ============================================================================
+
+USE AlumUnity;
+
+-- Direct messages: MessagingService.search_messages
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'messages' AND INDEX_NAME = 'ft_messages_text') = 0,
+    'ALTER TABLE messages ADD FULLTEXT ft_messages_text (message_text)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- Forum posts: ForumService.get_all_posts(search=...)
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'forum_posts' AND INDEX_NAME = 'idx_title_content') = 0,
+    'ALTER TABLE forum_posts ADD FULLTEXT idx_title_content (title, content)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- Jobs: JobService.search_jobs(search=...)
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'jobs' AND INDEX_NAME = 'idx_title_description') = 0,
+    'ALTER TABLE jobs ADD FULLTEXT idx_title_description (title, description)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- Alumni directory: ProfileService.search_profiles(name=...)
+SET @ddl := IF(
+    (SELECT COUNT(*) FROM information_schema.STATISTICS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'alumni_profiles' AND INDEX_NAME = 'ft_alumni_profiles_name') = 0,
+    'ALTER TABLE alumni_profiles ADD FULLTEXT ft_alumni_profiles_name (name)',
+    'DO 0'
+);
+PREPARE stmt FROM @ddl; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+
+-- Note: words shorter than innodb_ft_min_token_size (default 3) are not
+-- indexed. Short query terms still prefix-match longer words because the
+-- search service adds the '*' operator to every term.
@@ -0,0 +1,30 @@
+-- ============================================================================
+-- Keyset Pagination Indexes
+-- Purpose: Composite indexes matching the (sort key, id) cursors used by the
+--          jobs, alumni directory, forum feed and inbox list endpoints so the
+--          next page is a range seek instead of an OFFSET scan
+-- ============================================================================
+
+USE AlumUnity;
+
+-- Jobs search: ORDER BY created_at DESC, id DESC
+CREATE INDEX idx_jobs_created_id ON jobs (created_at, id);
+
+-- Alumni directory: ORDER BY created_at DESC, id DESC
+CREATE INDEX idx_alumni_profiles_created_id ON alumni_profiles (created_at, id);
+
+-- Forum feed (recent): WHERE is_deleted = FALSE ORDER BY is_pinned DESC, created_at DESC, id DESC
+CREATE INDEX idx_forum_posts_feed ON forum_posts (is_deleted, is_pinned, created_at, id);
+
+-- Forum feed (popular): ORDER BY likes_count DESC, created_at DESC, id DESC
+CREATE INDEX idx_forum_posts_popular ON forum_posts (is_deleted, likes_count, created_at, id);
+
+-- Forum feed (trending): the score is stored so the cursor can seek an index
+-- instead of sorting on likes_count + comments_count for every page
+ALTER TABLE forum_posts
+    ADD COLUMN trending_score INT AS (likes_count + comments_count) STORED AFTER views_count;
+CREATE INDEX idx_forum_posts_trending ON forum_posts (is_deleted, trending_score, created_at, id);
+
+-- Inbox: per-user conversations ordered by last activity
+CREATE INDEX idx_conversations_user1_activity ON conversations (user_id_1, last_message_at, id);
+CREATE INDEX idx_conversations_user2_activity ON conversations (user_id_2, last_message_at, id);
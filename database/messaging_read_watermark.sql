@@ -0,0 +1,61 @@
+-- ============================================================================
+-- Messaging Read Watermark
+-- Purpose: Model read state as a per-conversation "last read message"
+--          watermark instead of one message_read_receipts row per message.
+--          messages.seq gives messages a total order; each conversation keeps
+--          last_read_seq_1/2 and the denormalized unread_count_1/2, so total
+--          unread is a sum over the user's conversations and marking a
+--          conversation read is a single UPDATE.
+-- Run once on existing databases (fresh installs get this from
+-- messaging_schema.sql).
+-- ============================================================================
+
+USE AlumUnity;
+
+-- 1. Message sequence, numbered in send order for existing rows
+ALTER TABLE messages ADD COLUMN seq BIGINT NULL;
+
+SET @seq := 0;
+UPDATE messages SET seq = (@seq := @seq + 1) ORDER BY sent_at, created_at, id;
+
+ALTER TABLE messages
+    MODIFY seq BIGINT NOT NULL AUTO_INCREMENT,
+    ADD UNIQUE KEY uq_messages_seq (seq),
+    ADD INDEX idx_conversation_seq (sender_id, recipient_id, seq);
+
+-- 2. Per-participant watermark on conversations
+ALTER TABLE conversations
+    ADD COLUMN last_read_seq_1 BIGINT NOT NULL DEFAULT 0 AFTER unread_count_2,
+    ADD COLUMN last_read_seq_2 BIGINT NOT NULL DEFAULT 0 AFTER last_read_seq_1,
+    ADD COLUMN last_read_at_1 TIMESTAMP NULL AFTER last_read_seq_2,
+    ADD COLUMN last_read_at_2 TIMESTAMP NULL AFTER last_read_at_1;
+
+-- 3. Backfill watermarks from the existing read receipts
+UPDATE conversations c
+SET
+    c.last_read_seq_1 = COALESCE((
+        SELECT MAX(m.seq) FROM messages m
+        JOIN message_read_receipts r ON r.message_id = m.id AND r.user_id = c.user_id_1
+        WHERE m.sender_id = c.user_id_2 AND m.recipient_id = c.user_id_1
+    ), 0),
+    c.last_read_seq_2 = COALESCE((
+        SELECT MAX(m.seq) FROM messages m
+        JOIN message_read_receipts r ON r.message_id = m.id AND r.user_id = c.user_id_2
+        WHERE m.sender_id = c.user_id_1 AND m.recipient_id = c.user_id_2
+    ), 0);
+
+-- 4. Recompute the denormalized counters from the watermarks
+UPDATE conversations c
+SET
+    c.unread_count_1 = (
+        SELECT COUNT(*) FROM messages m
+        WHERE m.sender_id = c.user_id_2 AND m.recipient_id = c.user_id_1
+          AND m.seq > c.last_read_seq_1
+    ),
+    c.unread_count_2 = (
+        SELECT COUNT(*) FROM messages m
+        WHERE m.sender_id = c.user_id_1 AND m.recipient_id = c.user_id_2
+          AND m.seq > c.last_read_seq_2
+    );
+
+-- message_read_receipts is no longer written; it is kept for history.
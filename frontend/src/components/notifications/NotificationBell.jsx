@@ -20,12 +20,28 @@ const NotificationBell = () => {
   useEffect(() => {
     // Check if user is logged in before loading notifications
     const user = localStorage.getItem('user');
-    if (user) {
-      loadUnreadCount();
+    if (!user) return undefined;
+
+    loadUnreadCount();
+
+    let interval = null;
+    const startPolling = () => {
       // Poll for new notifications every 30 seconds
-      const interval = setInterval(loadUnreadCount, 30000);
-      return () => clearInterval(interval);
-    }
+      if (!interval) interval = setInterval(loadUnreadCount, 30000);
+    };
+
+    // Prefer server push; fall back to polling when it is unavailable
+    const unsubscribe = notificationService.subscribe?.((type, data) => {
+      if (type === 'unread' && data.notifications !== undefined) {
+        setUnreadCount(data.notifications);
+      }
+    }, startPolling);
+    if (!unsubscribe) startPolling();
+
+    return () => {
+      if (unsubscribe) unsubscribe();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   useEffect(() => {
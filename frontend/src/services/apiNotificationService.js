@@ -1,4 +1,4 @@
-import axios from './axiosConfig';
+import axios, { BACKEND_URL } from './axiosConfig';
 
 // Real Notification Service API
 class ApiNotificationService {
@@ -39,6 +39,34 @@ class ApiNotificationService {
     }
   }
 
+  // Subscribe to server push (unread counters, new notifications).
+  // Returns an unsubscribe function, or null when push is not supported.
+  // onUnavailable is called if the server refuses the stream (e.g. no Redis).
+  subscribe(onEvent, onUnavailable) {
+    const token = localStorage.getItem('token');
+    if (!token || typeof EventSource === 'undefined') return null;
+
+    const source = new EventSource(
+      `${BACKEND_URL}/api/realtime/stream?token=${encodeURIComponent(token)}`
+    );
+    ['unread', 'notification', 'message', 'read_receipt'].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        try {
+          onEvent(type, JSON.parse(event.data));
+        } catch (error) {
+          console.error('Invalid realtime event:', error);
+        }
+      });
+    });
+    source.onerror = () => {
+      // EventSource retries on its own unless the server rejected the stream
+      if (source.readyState === EventSource.CLOSED && onUnavailable) {
+        onUnavailable();
+      }
+    };
+    return () => source.close();
+  }
+
   // Mark notification as read
   async markAsRead(notificationId) {
     try {